@@ -5,6 +5,7 @@ import discord
 from discord.ext import commands
 from dotenv import load_dotenv
 from utils.logger import setup_logger
+from utils.message_router import router
 import config
 
 # Setup logging
@@ -157,6 +158,10 @@ async def on_message(message):
     # Process commands first to get context
     ctx = await bot.get_context(message)
     
+    # Anything that isn't a command may be an answer to a running game
+    if ctx.command is None and await router.dispatch(message):
+        return
+    
     # Check maintenance mode BEFORE processing commands
     from config import MAINTENANCE_MODE, OWNER_ID
     if MAINTENANCE_MODE and message.author.id != OWNER_ID:
@@ -206,6 +211,14 @@ async def on_message(message):
 async def main():
     async with bot:
         await load_cogs()
+        # Pay out bets held by games that were running when the bot last stopped
+        try:
+            from utils.session_journal import recover_sessions
+            recovered = await recover_sessions()
+            if recovered:
+                print(f"Recovered {len(recovered)} interrupted game session(s).")
+        except Exception as e:
+            logger.error(f"Session recovery failed: {e}", exc_info=True)
         try:
             await bot.start(token)
         except discord.errors.LoginFailure:
@@ -3,9 +3,13 @@ import discord
 from discord.ext import commands
 from discord import ui
 from config import DB_PATH
-from utils.database import get_user_data, get_account_level, require_enrollment, get_game_stat
+from utils.database import get_user_data, get_account_level, require_enrollment, ACHIEVEMENT_STATS
+from utils.stat_store import get_stats
 from utils.embed import send_embed
 
+PROFILE_WIN_STATS = ('rps_wins', 'connect4_wins', 'tictactoe_wins', 'blackjack_wins', 'coinflip_wins')
+PROFILE_PLAY_STATS = ('rps_plays', 'connect4_plays', 'tictactoe_plays', 'blackjack_plays', 'slots_plays', 'coinflip_plays')
+
 
 def _build_progress_bar(current: int, needed: int, segments: int = 15) -> tuple[str, int]:
     """Build a progress bar for achievements."""
@@ -72,20 +76,11 @@ class Achievements(commands.Cog):
                     ach_count = (await cur.fetchone())[0]
                 
                 # Get game stats
-                cursor = await db.execute("SELECT * FROM game_stats WHERE user_id=?", (target.id,))
-                stats_row = await cursor.fetchone()
-                
-                if stats_row:
-                    # Calculate totals
-                    total_wins = (stats_row[1] or 0) + (stats_row[3] or 0) + (stats_row[5] or 0) + (stats_row[7] or 0) + (stats_row[11] or 0)  # rps, c4, ttt, bj, cf wins
-                    total_plays = (stats_row[2] or 0) + (stats_row[4] or 0) + (stats_row[6] or 0) + (stats_row[8] or 0) + (stats_row[10] or 0) + (stats_row[12] or 0) + (stats_row[14] or 0)  # all plays
-                    total_losses = total_plays - total_wins if total_plays > total_wins else 0
-                    win_rate = (total_wins / total_plays * 100) if total_plays > 0 else 0
-                else:
-                    total_wins = 0
-                    total_plays = 0
-                    total_losses = 0
-                    win_rate = 0
+                stats = await get_stats(target.id, PROFILE_WIN_STATS + PROFILE_PLAY_STATS, db)
+                total_wins = sum(stats[name] for name in PROFILE_WIN_STATS)
+                total_plays = sum(stats[name] for name in PROFILE_PLAY_STATS)
+                total_losses = total_plays - total_wins if total_plays > total_wins else 0
+                win_rate = (total_wins / total_plays * 100) if total_plays > 0 else 0
             
             # Get premium status
             premium_cog = self.bot.get_cog('Premium')
@@ -195,20 +190,21 @@ class Achievements(commands.Cog):
                 bank_total = row[0] if row and row[0] else 0
             
             # Get game stats
-            rps_wins = await get_game_stat(ctx.author.id, 'rps_wins')
-            connect4_wins = await get_game_stat(ctx.author.id, 'connect4_wins')
-            tictactoe_wins = await get_game_stat(ctx.author.id, 'tictactoe_wins')
-            blackjack_wins = await get_game_stat(ctx.author.id, 'blackjack_wins')
-            blackjack_naturals = await get_game_stat(ctx.author.id, 'blackjack_naturals')
-            slots_plays = await get_game_stat(ctx.author.id, 'slots_plays')
-            slots_jackpots = await get_game_stat(ctx.author.id, 'slots_jackpots')
-            coinflip_wins = await get_game_stat(ctx.author.id, 'coinflip_wins')
-            coinflip_streak = await get_game_stat(ctx.author.id, 'coinflip_streak')
-            mines_max_tiles = await get_game_stat(ctx.author.id, 'mines_max_tiles')
-            multiplayer_games = await get_game_stat(ctx.author.id, 'multiplayer_games')
-            total_earned = await get_game_stat(ctx.author.id, 'total_earned')
-            max_wallet = await get_game_stat(ctx.author.id, 'max_wallet')
-            rob_success = await get_game_stat(ctx.author.id, 'rob_success')
+            stats = await get_stats(ctx.author.id, ACHIEVEMENT_STATS)
+            rps_wins = stats['rps_wins']
+            connect4_wins = stats['connect4_wins']
+            tictactoe_wins = stats['tictactoe_wins']
+            blackjack_wins = stats['blackjack_wins']
+            blackjack_naturals = stats['blackjack_naturals']
+            slots_plays = stats['slots_plays']
+            slots_jackpots = stats['slots_jackpots']
+            coinflip_wins = stats['coinflip_wins']
+            coinflip_streak = stats['coinflip_streak']
+            mines_max_tiles = stats['mines_max_tiles']
+            multiplayer_games = stats['multiplayer_games']
+            total_earned = stats['total_earned']
+            max_wallet = stats['max_wallet']
+            rob_success = stats['rob_success']
             
             # Build achievement list by category
             pages = []
@@ -10,6 +10,7 @@ from utils.permissions import (
     is_command_disabled, get_disabled_commands_in_channel
 )
 from utils.embed import send_embed
+from utils.edit_dispatcher import edits
 
 
 class Admin(commands.Cog):
@@ -646,5 +647,13 @@ class Admin(commands.Cog):
             await ctx.send(f"<a:X_:1437951830393884788> Failed to send message: {str(e)}")
 
 
+    @commands.command(name="editstats")
+    async def edit_stats(self, ctx):
+        """Show how many game message edits were sent, coalesced or dropped (Owner only)"""
+        if ctx.author.id != OWNER_ID:
+            return await ctx.send("❌ Only the bot owner can view edit stats!")
+        await ctx.send(f"✏️ Message edits: {edits.summary()}")
+
+
 async def setup(bot):
     await bot.add_cog(Admin(bot))
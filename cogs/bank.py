@@ -7,6 +7,14 @@ from config import DB_PATH
 from utils.database import get_user_data, update_user_data, get_account_level, ensure_user_db, require_enrollment
 from utils.embed import send_embed
 from utils.transaction_logger import log_transaction
+from utils import epoch, global_bank
+from utils.deadline_queue import DeadlineQueue
+from utils.bank_view import get_balance_view, get_pool_stats, invalidate_pool_stats
+from utils.game_math import GOLDEN_CARD_CASHBACK
+
+# Loan deadlines, measured from the loan's due date
+LOAN_PENALTY_AFTER = timedelta(hours=12)      # first 20% penalty
+LOAN_ESCALATION_AFTER = timedelta(hours=24)   # second penalty, auto-deduct and 1-week ban
 
 
 class LoanConfirmationView(discord.ui.View):
@@ -136,17 +144,27 @@ class Bank(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
+        self.loan_deadlines = DeadlineQueue("LoanDeadlines")
         self.daily_tasks.start()  # Start background tasks
+        self.flush_bank.start()
     
     def cog_unload(self):
         self.daily_tasks.cancel()
+        self.flush_bank.cancel()
+        self.bot.loop.create_task(self.loan_deadlines.stop())
+        # write out any buffered game-loss credits before the cog goes away
+        self.bot.loop.create_task(global_bank.flush_pending())
+    
+    @tasks.loop(seconds=global_bank.FLUSH_SECONDS)
+    async def flush_bank(self):
+        """Write buffered global bank credits (only used with BANK_WRITE_BEHIND)"""
+        await global_bank.flush_pending()
     
     @tasks.loop(hours=1)  # Check every hour
     async def daily_tasks(self):
-        """Background task for daily interest and loan deadlines"""
+        """Background task for daily interest (loan deadlines fire from self.loan_deadlines)"""
         try:
             await self.distribute_daily_interest()
-            await self.check_loan_deadlines()
         except Exception as e:
             print(f"Error in daily tasks: {e}")
     
@@ -179,7 +197,8 @@ class Bank(commands.Cog):
                         last_loan_date TEXT,
                         daily_loan_count INTEGER DEFAULT 0,
                         loan_count_date TEXT,
-                        loan_ban_until TEXT
+                        loan_ban_until TEXT,
+                        due_date_ts INTEGER
                     )
                 """)
                 
@@ -197,6 +216,10 @@ class Bank(commands.Cog):
                     )
                 """)
                 
+                # Deadline queue is rebuilt from these on startup (superseded by the due_date_ts index)
+                await db.execute("DROP INDEX IF EXISTS idx_user_loans_due")
+                await epoch.ensure_epoch_column(db, "user_loans", "due_date", where="loan_amount > 0")
+                
                 # Migrations: Add new columns if they don't exist
                 try:
                     await db.execute("ALTER TABLE user_loans ADD COLUMN daily_loan_count INTEGER DEFAULT 0")
@@ -240,32 +263,22 @@ class Bank(commands.Cog):
                     )
                 """)
                 
-                # Initialize global bank if not exists (starts with 1 million)
-                await db.execute("""
-                    INSERT INTO global_bank (id, balance) 
-                    VALUES (1, 1000000) 
-                    ON CONFLICT(id) DO NOTHING
-                """)
+                # Balance shards (start with 1 million, or the old single-row balance)
+                await global_bank.init_global_bank(db)
                 
                 await db.commit()
+            
+            await self.schedule_all_loan_deadlines()
         except Exception as e:
             print(f"Error loading Bank cog: {e}")
     
-    async def add_to_bank(self, amount: int):
+    async def add_to_bank(self, amount: int, user_id: int = None):
         """Add money to the global bank"""
-        async with aiosqlite.connect(DB_PATH) as db:
-            await db.execute(
-                "UPDATE global_bank SET balance = balance + ? WHERE id = 1",
-                (amount,)
-            )
-            await db.commit()
+        await global_bank.add_to_bank(amount, user_id)
     
     async def get_bank_balance(self) -> int:
         """Get current global bank balance"""
-        async with aiosqlite.connect(DB_PATH) as db:
-            cursor = await db.execute("SELECT balance FROM global_bank WHERE id = 1")
-            row = await cursor.fetchone()
-            return row[0] if row else 0
+        return await global_bank.get_bank_balance()
     
     async def get_user_card_tier(self, user_id: int) -> int:
         """Get user's bank card tier (0-5)"""
@@ -293,7 +306,7 @@ class Bank(commands.Cog):
         """Apply 10% cashback for golden card holders. Returns cashback amount."""
         card_tier = await self.get_user_card_tier(user_id)
         if card_tier == 2:  # Golden card
-            cashback = int(loss_amount * 0.10)
+            cashback = int(loss_amount * GOLDEN_CARD_CASHBACK)
             if cashback > 0:
                 from utils.database import get_user_data, update_user_data
                 user_data = await get_user_data(user_id)
@@ -313,41 +326,25 @@ class Bank(commands.Cog):
     
     async def check_and_apply_penalty(self, user_id: int):
         """Check if loan is overdue and apply penalty"""
-        loan_data = await self.get_user_loan(user_id)
-        if not loan_data or loan_data[0] == 0:
-            return False
-        
-        loan_amount, penalty_amount, due_date_str, penalty_applied, _ = loan_data
-        
-        # Already has penalty
-        if penalty_applied:
-            return False
-        
-        # Check if overdue (12 hours past loan time)
-        due_date = datetime.fromisoformat(due_date_str)
-        now = datetime.now()
-        
-        if now > due_date:
-            # Apply 20% penalty (0.2x the original amount)
-            penalty = int(loan_amount * 0.2)
-            total_owed = loan_amount + penalty
-            
-            async with aiosqlite.connect(DB_PATH) as db:
-                await db.execute(
-                    """UPDATE user_loans 
-                       SET penalty_amount = ?, penalty_applied = 1 
-                       WHERE user_id = ?""",
-                    (penalty, user_id)
-                )
-                await db.execute(
-                    "UPDATE global_bank SET total_penalties_collected = total_penalties_collected + ? WHERE id = 1",
-                    (penalty,)
-                )
-                await db.commit()
-            
-            return True
-        
-        return False
+        async with aiosqlite.connect(DB_PATH) as db:
+            # Overdue (past the due date) with no penalty yet: 20% penalty (0.2x the original amount)
+            cursor = await db.execute(
+                f"""UPDATE user_loans 
+                   SET penalty_amount = CAST(loan_amount * 0.2 AS INTEGER), penalty_applied = 1 
+                   WHERE user_id = ? AND loan_amount > 0 AND COALESCE(penalty_applied, 0) = 0
+                     AND {epoch.epoch_sql('due_date')} < ?""",
+                (user_id, epoch.now())
+            )
+            if cursor.rowcount == 0:
+                return False
+            await db.execute(
+                """UPDATE global_bank SET total_penalties_collected = total_penalties_collected +
+                       (SELECT penalty_amount FROM user_loans WHERE user_id = ?)
+                   WHERE id = 1""",
+                (user_id,)
+            )
+            await db.commit()
+        return True
     
     async def distribute_daily_interest(self):
         """Distribute 3% daily interest to all depositors (except those with active loans)"""
@@ -388,66 +385,90 @@ class Bank(commands.Cog):
             
             await db.commit()
     
-    async def check_loan_deadlines(self):
-        """Check all loans for first (12h) and second (24h) deadlines"""
+    def schedule_loan_deadline(self, user_id: int, due_date: datetime, penalty_applied: int):
+        """Queue a loan's next deadline: first penalty 12h past due, auto-deduct + ban 24h past due"""
+        key = ("loan", user_id)
+        if penalty_applied >= 2:
+            self.loan_deadlines.cancel(key)
+            return
+        offset = LOAN_ESCALATION_AFTER if penalty_applied else LOAN_PENALTY_AFTER
+        self.loan_deadlines.schedule_at(key, due_date + offset, self.process_loan_deadline, user_id)
+    
+    async def schedule_all_loan_deadlines(self):
+        """Rebuild the deadline queue from the due_date_ts index (on cog load, after the backfill)"""
+        async with aiosqlite.connect(DB_PATH) as db:
+            cursor = await db.execute(
+                "SELECT user_id, due_date_ts, penalty_applied FROM user_loans "
+                "WHERE loan_amount > 0 AND due_date_ts IS NOT NULL AND penalty_applied < 2 ORDER BY due_date_ts"
+            )
+            loans = await cursor.fetchall()
+        for user_id, due_ts, penalty_applied in loans:
+            self.schedule_loan_deadline(user_id, epoch.from_epoch(due_ts), penalty_applied or 0)
+    
+    async def process_loan_deadline(self, user_id: int):
+        """Apply whichever loan deadline has passed (fired by the deadline queue)"""
         now = datetime.now()
         
         async with aiosqlite.connect(DB_PATH) as db:
             cursor = await db.execute(
-                "SELECT user_id, loan_amount, penalty_amount, due_date, penalty_applied FROM user_loans WHERE loan_amount > 0"
+                f"SELECT loan_amount, penalty_amount, {epoch.epoch_sql('due_date')}, penalty_applied FROM user_loans WHERE user_id = ? AND loan_amount > 0",
+                (user_id,)
             )
-            loans = await cursor.fetchall()
-            
-            for user_id, loan_amt, penalty_amt, due_date_str, penalty_applied in loans:
-                due_date = datetime.fromisoformat(due_date_str)
-                time_passed = now - due_date
-                
-                # Second deadline (24h): Auto-deduct + ban
-                if time_passed.total_seconds() >= 86400:  # 24 hours
-                    if penalty_applied < 2:  # Haven't applied second penalty yet
-                        # Apply second 20% penalty
-                        second_penalty = int(loan_amt * 0.2)
-                        total_owed = loan_amt + penalty_amt + second_penalty
-                        
-                        # Get user balance
-                        user_data = await get_user_data(user_id)
-                        user_mora = user_data.get('mora', 0)
-                        
-                        # Deduct what we can
-                        deducted = min(user_mora, total_owed)
-                        remaining_loan = max(0, total_owed - deducted)
-                        
-                        # Update user balance
-                        await update_user_data(user_id, mora=user_mora - deducted)
-                        
-                        # Add deducted amount back to bank
-                        await db.execute(
-                            "UPDATE global_bank SET balance = balance + ? WHERE id = 1",
-                            (deducted,)
-                        )
-                        
-                        # Set 1-week ban
-                        ban_until = (now + timedelta(days=7)).isoformat()
-                        
-                        # Update loan record
-                        await db.execute(
-                            """UPDATE user_loans 
-                               SET loan_amount = ?, penalty_amount = 0, penalty_applied = 2, loan_ban_until = ?
-                               WHERE user_id = ?""",
-                            (remaining_loan, ban_until, user_id)
-                        )
-                
-                # First deadline (12h): Apply first 20% penalty
-                elif time_passed.total_seconds() >= 43200 and penalty_applied == 0:  # 12 hours
-                    first_penalty = int(loan_amt * 0.2)
+            loan = await cursor.fetchone()
+            if not loan:
+                return  # repaid or reset since it was scheduled
+            
+            loan_amt, penalty_amt, due_ts, penalty_applied = loan
+            due_date = epoch.from_epoch(due_ts)
+            time_passed = now - due_date
+            
+            # Second deadline (24h): Auto-deduct + ban
+            if time_passed >= LOAN_ESCALATION_AFTER:
+                if penalty_applied < 2:  # Haven't applied second penalty yet
+                    # Apply second 20% penalty
+                    second_penalty = int(loan_amt * 0.2)
+                    total_owed = loan_amt + penalty_amt + second_penalty
+                    
+                    # Get user balance
+                    user_data = await get_user_data(user_id)
+                    user_mora = user_data.get('mora', 0)
+                    
+                    # Deduct what we can
+                    deducted = min(user_mora, total_owed)
+                    remaining_loan = max(0, total_owed - deducted)
+                    
+                    # Update user balance
+                    await update_user_data(user_id, mora=user_mora - deducted)
+                    
+                    # Add deducted amount back to bank
+                    await global_bank.add_to_bank(deducted, user_id, db=db, exact=True)
+                    
+                    # Set 1-week ban
+                    ban_until = (now + timedelta(days=7)).isoformat()
+                    
+                    # Update loan record
                     await db.execute(
                         """UPDATE user_loans 
-                           SET penalty_amount = penalty_amount + ?, penalty_applied = 1
+                           SET loan_amount = ?, penalty_amount = 0, penalty_applied = 2, loan_ban_until = ?
                            WHERE user_id = ?""",
-                        (first_penalty, user_id)
+                        (remaining_loan, ban_until, user_id)
                     )
+                    penalty_applied = 2
+            
+            # First deadline (12h): Apply first 20% penalty
+            elif time_passed >= LOAN_PENALTY_AFTER and penalty_applied == 0:
+                first_penalty = int(loan_amt * 0.2)
+                await db.execute(
+                    """UPDATE user_loans 
+                       SET penalty_amount = penalty_amount + ?, penalty_applied = 1
+                       WHERE user_id = ?""",
+                    (first_penalty, user_id)
+                )
+                penalty_applied = 1
             
             await db.commit()
+        
+        self.schedule_loan_deadline(user_id, due_date, penalty_applied)
     
     @commands.command(name="bal", aliases=["balance", "wallet"])
     async def balance(self, ctx):
@@ -456,19 +477,11 @@ class Bank(commands.Cog):
             return
         
         try:
-            # Get wallet balance
-            data = await get_user_data(ctx.author.id)
-            mora = data.get("mora", 0)
-            
-            # Get bank deposit
-            async with aiosqlite.connect(DB_PATH) as db:
-                cursor = await db.execute(
-                    "SELECT deposited_amount, interest_earned FROM user_bank_deposits WHERE user_id = ?",
-                    (ctx.author.id,)
-                )
-                deposit_row = await cursor.fetchone()
-                deposited = deposit_row[0] if deposit_row else 0
-                interest = deposit_row[1] if deposit_row else 0
+            # Wallet, deposit and loan in one query
+            view = await get_balance_view(ctx.author.id)
+            mora = view["mora"]
+            deposited = view["deposited"]
+            interest = view["interest"]
             
             # Check premium status
             premium_cog = self.bot.get_cog('Premium')
@@ -504,6 +517,14 @@ class Bank(commands.Cog):
                     inline=False
                 )
             
+            owed = view["loan_amount"] + view["penalty_amount"]
+            if view["loan_amount"] > 0:
+                embed.add_field(
+                    name="Loan Owed",
+                    value=f"{owed:,} <:mora:1437958309255577681> (`gmyloan` for details)",
+                    inline=False
+                )
+            
             await send_embed(ctx, embed)
         except Exception as e:
             print(f"Error in balance command: {e}")
@@ -516,43 +537,23 @@ class Bank(commands.Cog):
             return
         
         try:
-            async with aiosqlite.connect(DB_PATH) as db:
-                # Get global bank info
-                cursor = await db.execute(
-                    "SELECT balance, total_loans_given, total_penalties_collected FROM global_bank WHERE id = 1"
-                )
-                row = await cursor.fetchone()
-                balance, total_loans, total_penalties = row if row else (0, 0, 0)
-                
-                # Get user's deposit
-                cursor = await db.execute(
-                    "SELECT deposited_amount, interest_earned FROM user_bank_deposits WHERE user_id = ?",
-                    (ctx.author.id,)
-                )
-                user_row = await cursor.fetchone()
-                user_deposit = user_row[0] if user_row else 0
-                user_interest = user_row[1] if user_row else 0
-                
-                # Get total deposits from all users
-                cursor = await db.execute("SELECT SUM(deposited_amount), SUM(interest_earned) FROM user_bank_deposits")
-                deposit_row = await cursor.fetchone()
-                total_deposits, total_interest = deposit_row if deposit_row else (0, 0)
-                total_deposits = total_deposits or 0
-                total_interest = total_interest or 0
-                
-                # Get rob items for defense calculation
-                cursor = await db.execute(
-                    "SELECT shotgun, mask, night_vision, lockpicker, guard_dog, guard_dog_expires, spiky_fence, lock FROM rob_items WHERE user_id = ?",
-                    (ctx.author.id,)
-                )
-                rob_row = await cursor.fetchone()
+            # Deposit, loan stats and rob items in one query; server-wide totals from a short cache
+            view = await get_balance_view(ctx.author.id, with_rob_items=True)
+            pool = await get_pool_stats()
+            total_loans = view["total_loans_given"]
+            total_penalties = view["total_penalties_collected"]
+            balance = pool["balance"]
+            user_deposit = view["deposited"]
+            user_interest = view["interest"]
+            total_deposits = pool["total_deposits"]
+            rob_row = view["rob_items"]
             
             # Calculate robbery stats
             offense_bonus = 0
             defense_bonus = 0
             
             if rob_row:
-                shotgun, mask, night_vision, lockpicker, guard_dog, guard_dog_expires, spiky_fence, lock_item = rob_row
+                shotgun, mask, night_vision, lockpicker, guard_dog, guard_dog_expires, spiky_fence, lock_item = rob_row.values()
                 
                 # Offense
                 if shotgun:
@@ -825,6 +826,7 @@ class Bank(commands.Cog):
                 (ctx.author.id, deposit_amount, deposit_amount)
             )
             await db.commit()
+        invalidate_pool_stats()
         
         # Take money from user
         await update_user_data(ctx.author.id, mora=user_mora - deposit_amount)
@@ -929,6 +931,7 @@ class Bank(commands.Cog):
                     (new_deposit, new_interest, ctx.author.id)
                 )
             await db.commit()
+        invalidate_pool_stats()
         
         # Give money to user
         user_data = await get_user_data(ctx.author.id)
@@ -1209,47 +1212,28 @@ class Bank(commands.Cog):
             
             # Update user loan with daily count
             await db.execute(
-                """INSERT INTO user_loans (user_id, loan_amount, penalty_amount, due_date, penalty_applied, last_loan_date, daily_loan_count, loan_count_date)
-                   VALUES (?, ?, 0, ?, 0, ?, ?, ?)
+                """INSERT INTO user_loans (user_id, loan_amount, penalty_amount, due_date, due_date_ts, penalty_applied, last_loan_date, daily_loan_count, loan_count_date)
+                   VALUES (?, ?, 0, ?, ?, 0, ?, ?, ?)
                    ON CONFLICT(user_id) DO UPDATE SET
-                   loan_amount = ?, penalty_amount = 0, due_date = ?, penalty_applied = 0, last_loan_date = ?, daily_loan_count = ?, loan_count_date = ?""",
-                (ctx.author.id, loan_amount, due_date.isoformat(), now.isoformat(), new_count, now.isoformat(),
-                 loan_amount, due_date.isoformat(), now.isoformat(), new_count, now.isoformat())
+                   loan_amount = ?, penalty_amount = 0, due_date = ?, due_date_ts = ?, penalty_applied = 0, last_loan_date = ?, daily_loan_count = ?, loan_count_date = ?""",
+                (ctx.author.id, loan_amount, due_date.isoformat(), epoch.to_epoch(due_date), now.isoformat(), new_count, now.isoformat(),
+                 loan_amount, due_date.isoformat(), epoch.to_epoch(due_date), now.isoformat(), new_count, now.isoformat())
             )
             
-            # Distribute 5% interest to depositors
-            # Get total deposits
-            cursor = await db.execute("SELECT SUM(deposited_amount) FROM user_bank_deposits")
-            total_row = await cursor.fetchone()
-            total_deposits = total_row[0] if total_row and total_row[0] else 0
-            
-            if total_deposits > 0:
-                # Get all depositors
-                cursor = await db.execute("SELECT user_id, deposited_amount FROM user_bank_deposits WHERE deposited_amount > 0")
-                depositors = await cursor.fetchall()
-                
-                # Distribute interest proportionally
-                for depositor_id, deposit_amount in depositors:
-                    # Calculate this user's share of the interest
-                    share = (deposit_amount / total_deposits) * interest_amount
-                    share = int(share)
-                    
-                    await db.execute(
-                        "UPDATE user_bank_deposits SET interest_earned = interest_earned + ? WHERE user_id = ?",
-                        (share, depositor_id)
-                    )
+            # Distribute 5% interest to depositors proportionally (one statement, shares add up exactly)
+            interest_paid = await global_bank.distribute_to_depositors(db, interest_amount)
             
             # Update bank (deduct loan + interest paid to depositors)
+            await global_bank.add_to_bank(-(loan_amount + interest_paid), ctx.author.id, db=db, exact=True)
             await db.execute(
-                """UPDATE global_bank 
-                   SET balance = balance - ? - ?, 
-                       total_loans_given = total_loans_given + ?
-                   WHERE id = 1""",
-                (loan_amount, interest_amount, loan_amount)
+                "UPDATE global_bank SET total_loans_given = total_loans_given + ? WHERE id = 1",
+                (loan_amount,)
             )
             
             await db.commit()
         
+        self.schedule_loan_deadline(ctx.author.id, due_date, 0)
+        
         # Give user the money
         user_data = await get_user_data(ctx.author.id)
         await update_user_data(ctx.author.id, mora=user_data['mora'] + loan_amount)
@@ -1390,6 +1374,7 @@ class Bank(commands.Cog):
                     "UPDATE user_loans SET loan_amount = 0, penalty_amount = 0, penalty_applied = 0 WHERE user_id = ?",
                     (ctx.author.id,)
                 )
+                self.loan_deadlines.cancel(("loan", ctx.author.id))
             else:
                 await db.execute(
                     "UPDATE user_loans SET loan_amount = ?, penalty_amount = ? WHERE user_id = ?",
@@ -1397,10 +1382,7 @@ class Bank(commands.Cog):
                 )
             
             # Add money back to bank
-            await db.execute(
-                "UPDATE global_bank SET balance = balance + ? WHERE id = 1",
-                (repay_amount,)
-            )
+            await global_bank.add_to_bank(repay_amount, ctx.author.id, db=db, exact=True)
             
             await db.commit()
         
@@ -1581,19 +1563,13 @@ class Bank(commands.Cog):
         async with aiosqlite.connect(DB_PATH) as db:
             if action.lower() in ['set', 's']:
                 # Set exact balance
-                await db.execute(
-                    "UPDATE global_bank SET balance = ? WHERE id = 1",
-                    (change_amount,)
-                )
+                await global_bank.set_bank_balance(change_amount, db=db)
                 new_balance = change_amount
                 action_text = "set to"
                 
             elif action.lower() in ['add', 'a', '+']:
                 # Add to balance
-                await db.execute(
-                    "UPDATE global_bank SET balance = balance + ? WHERE id = 1",
-                    (change_amount,)
-                )
+                await global_bank.add_to_bank(change_amount, ctx.author.id, db=db, exact=True)
                 new_balance = current_balance + change_amount
                 action_text = "increased by"
                 
@@ -1602,10 +1578,7 @@ class Bank(commands.Cog):
                 if change_amount > current_balance:
                     return await ctx.send(f"❌ Cannot remove `{change_amount:,}` <:mora:1437958309255577681>! Bank only has `{current_balance:,}` <:mora:1437958309255577681>")
                 
-                await db.execute(
-                    "UPDATE global_bank SET balance = balance - ? WHERE id = 1",
-                    (change_amount,)
-                )
+                await global_bank.add_to_bank(-change_amount, ctx.author.id, db=db, exact=True)
                 new_balance = current_balance - change_amount
                 action_text = "decreased by"
                 
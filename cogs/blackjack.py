@@ -1,45 +1,29 @@
+import asyncio
 import random
+from concurrent.futures import ThreadPoolExecutor
 import discord
 from discord.ext import commands
-import aiosqlite
-from config import DB_PATH
-from utils.database import get_user_data, update_user_data, require_enrollment, track_game_stat, check_and_award_game_achievements, add_account_exp
+from utils.database import get_user_data, update_user_data, require_enrollment, track_game_stat, track_game_stats, check_and_award_game_achievements, add_account_exp
 from utils.embed import send_embed
+from utils.global_bank import add_to_bank
+from utils.timer_wheel import TimedView
+from utils.session_journal import open_session, checkpoint, close_session
 
 
-RANKS = ["A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K"]
-SUITS = ["♠", "♥", "♦", "♣"]
+# Deck and hand rules live in utils/game_math.py (shared with the RTP simulator)
+from utils.game_math import (
+    BLACKJACK_PAYOUT,
+    DEALER_STANDS_ON,
+    GOLDEN_CHIP_BONUS,
+    make_deck,
+    hand_value,
+    blackjack_settle,
+)
+from utils.blackjack_ev import ACTIONS, action_evs, best_action
 
 
-def make_deck():
-    return [f"{r}{s}" for r in RANKS for s in SUITS]
-
-
-def hand_value(cards):
-    # returns best value <=21 or minimal over 21
-    total = 0
-    aces = 0
-    for c in cards:
-        rank = c[:-1]
-        if rank == "A":
-            aces += 1
-            total += 11
-        elif rank in ("J", "Q", "K"):
-            total += 10
-        else:
-            try:
-                total += int(rank)
-            except Exception:
-                total += 0
-    # downgrade aces from 11 to 1 as needed
-    while total > 21 and aces:
-        total -= 10
-        aces -= 1
-    return total
-
-
-class BlackjackView(discord.ui.View):
-    def __init__(self, ctx, initial_bet, deck, player_cards, dealer_cards, reserved_total, cog, start_balance=None):
+class BlackjackView(TimedView):
+    def __init__(self, ctx, initial_bet, deck, player_cards, dealer_cards, reserved_total, cog, start_balance=None, session_id=None):
         super().__init__(timeout=120)
         self.ctx = ctx
         self.initial_bet = int(initial_bet)
@@ -60,6 +44,8 @@ class BlackjackView(discord.ui.View):
         # starting user balance BEFORE the initial reservation (used to compute net change accurately)
         self._starting_balance = start_balance
         self.cog = cog
+        # journal row holding the reserved stake until the game settles
+        self.session_id = session_id
 
     def card_str(self, cards):
         return " ".join(f"`{c}`" for c in cards)
@@ -96,7 +82,7 @@ class BlackjackView(discord.ui.View):
         if has_chip > 0 and payouts > self._original_reserved:
             # Only apply to wins (when payout exceeds original bet)
             profit = payouts - self._original_reserved
-            chip_bonus = int(profit * 0.3)
+            chip_bonus = int(profit * GOLDEN_CHIP_BONUS)
             payouts += chip_bonus
             await consume_inventory_item(self.ctx.author.id, "golden_chip")
             note += f" <:goldenchip:1457964285207646264> Golden Chip: +{chip_bonus:,} Mora!"
@@ -108,6 +94,7 @@ class BlackjackView(discord.ui.View):
             await update_user_data(self.ctx.author.id, mora=data['mora'])
         except Exception as e:
             print(f"Error crediting payout: {e}")
+        await close_session(self.session_id)
 
         # remove lock
         try:
@@ -128,6 +115,7 @@ class BlackjackView(discord.ui.View):
                 data = await get_user_data(self.ctx.author.id)
                 data['mora'] += int(self.reserved_total)
                 await update_user_data(self.ctx.author.id, mora=data['mora'])
+                await close_session(self.session_id)
             except Exception as e:
                 print(f"Error returning bet on timeout: {e}")
                 try:
@@ -139,6 +127,10 @@ class BlackjackView(discord.ui.View):
     def current_hand(self):
         return self.hands[self.current]
 
+    async def _journal_escrow(self):
+        # everything still owed back to the player if the bot dies now
+        await checkpoint(self.session_id, escrow=self.reserved_total + self._immediate_awarded)
+
     async def _award_hand_immediately(self, h):
         """Award a single hand immediately when it reaches 21.
         Credits the payout for that hand and adjusts reserved_total so it won't be double-counted later.
@@ -153,6 +145,7 @@ class BlackjackView(discord.ui.View):
             self._immediate_awarded += payout
             h['finished'] = True
             h['awarded'] = True
+            await self._journal_escrow()
             return payout
         except Exception as e:
             print(f"Error awarding immediate 21 payout: {e}")
@@ -244,6 +237,7 @@ class BlackjackView(discord.ui.View):
         h['stake'] += extra
         h['doubled'] = True
         self.reserved_total += extra
+        await self._journal_escrow()
         # draw one card
         card = self.deck.pop()
         h['cards'].append(card)
@@ -294,6 +288,7 @@ class BlackjackView(discord.ui.View):
         data['mora'] -= extra
         await update_user_data(self.ctx.author.id, mora=data['mora'])
         self.reserved_total += extra
+        await self._journal_escrow()
         # create two hands
         card1 = h['cards'][0]
         card2 = h['cards'][1]
@@ -321,6 +316,7 @@ class BlackjackView(discord.ui.View):
         await update_user_data(self.ctx.author.id, mora=data['mora'])
         # reduce reserved_total accordingly (we reserved full stake initially)
         self.reserved_total -= half
+        await self._journal_escrow()
         h['surrendered'] = True
         await self.end_game(f"Surrendered - returned {half:,} Mora.", payouts=0, color=0xDC143C)
         try:
@@ -328,6 +324,36 @@ class BlackjackView(discord.ui.View):
         except Exception:
             pass
 
+    @discord.ui.button(label="Hint", style=discord.ButtonStyle.gray, emoji="💡")
+    async def hint(self, interaction: discord.Interaction, button: discord.ui.Button):
+        # show the exact EV of every available action for the current hand (only to the player)
+        if interaction.user.id != self.ctx.author.id:
+            return await interaction.response.send_message("This is not your game.", ephemeral=True)
+        if self.finished:
+            return await interaction.response.defer()
+        h = self.current_hand()
+        cards = list(h['cards'])
+        seen = [c for hand in self.hands for c in hand['cards']] + [self.dealer[0]]
+        first_action = len(self.hands) == 1 and len(cards) == 2
+        can_double = len(cards) == 2
+        can_split = first_action and cards[0][:-1] == cards[1][:-1]
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            loop = asyncio.get_running_loop()
+            evs = await loop.run_in_executor(
+                self.cog.executor, action_evs, cards, self.dealer[0], seen, can_double, can_split, first_action
+            )
+        except Exception as e:
+            print(f"Error computing blackjack hint: {e}")
+            return await interaction.followup.send("Could not compute a hint right now.", ephemeral=True)
+        best = best_action(evs)
+        lines = [f"💡 **Best play: {best.title()}**"]
+        for action in ACTIONS:
+            if action in evs:
+                marker = " ◀" if action == best else ""
+                lines.append(f"{action.title()}: {evs[action]:+.1%} of stake{marker}")
+        await interaction.followup.send("\n".join(lines), ephemeral=True)
+
     async def finish_and_settle(self, interaction=None):
         # Determine if there are any player hands that still require dealer resolution.
         # We treat a hand as requiring resolution if it's not surrendered, not awarded,
@@ -351,10 +377,9 @@ class BlackjackView(discord.ui.View):
         # Dealer only draws if there exists at least one non-awarded player hand to resolve.
         if active_non_awarded:
             # Standard blackjack dealer rules: dealer must draw to 17 and stand on all 17s
-            while hand_value(self.dealer) < 17:
+            while hand_value(self.dealer) < DEALER_STANDS_ON:
                 self.dealer.append(self.deck.pop())
 
-        dv = hand_value(self.dealer)
         total_payout = 0
         # determine outcome per hand and compute total payout
         for h in self.hands:
@@ -362,25 +387,8 @@ class BlackjackView(discord.ui.View):
             if h.get('surrendered') or h.get('awarded'):
                 # surrendered hands were already handled earlier
                 continue
-            pv = hand_value(h['cards'])
-            # determine outcome; blackjack only applies if eligible and initial 2-card 21
-            is_player_blackjack = (h.get('eligible') and len(h['cards']) == 2 and pv == 21)
-            is_dealer_blackjack = (len(self.dealer) == 2 and dv == 21)
-
-            if is_player_blackjack and not is_dealer_blackjack:
-                # Reduced payout: 2.2x instead of 2.5x
-                payout = int(stake * 2.2)
-            elif pv > 21:
-                payout = 0
-            elif dv > 21:
-                payout = stake * 2
-            elif pv > dv:
-                payout = stake * 2
-            elif pv == dv:
-                payout = stake
-            else:
-                payout = 0
-
+            # blackjack (reduced 2.2x payout) only applies if eligible and initial 2-card 21
+            payout = blackjack_settle(h['cards'], self.dealer, stake, eligible=h.get('eligible'))
             total_payout += int(payout)
         # compute total to credit (immediate-awards + payouts for non-awarded hands)
         total_to_credit = int(self._immediate_awarded) + int(total_payout)
@@ -405,8 +413,7 @@ class BlackjackView(discord.ui.View):
         # Track stats and award XP for wins
         if net > 0:
             try:
-                await track_game_stat(self.ctx.author.id, "blackjack_wins")
-                await track_game_stat(self.ctx.author.id, "blackjack_plays")
+                await track_game_stats([(self.ctx.author.id, "blackjack_wins"), (self.ctx.author.id, "blackjack_plays")])
                 await check_and_award_game_achievements(self.ctx.author.id, self.cog.bot, self.ctx)
                 
                 # Award XP (80 XP for blackjack win)
@@ -442,12 +449,7 @@ class BlackjackView(discord.ui.View):
         # Add loss to global bank and apply discounts
         if net < 0:
             try:
-                async with aiosqlite.connect(DB_PATH) as db:
-                    await db.execute(
-                        "UPDATE global_bank SET balance = balance + ? WHERE id = 1",
-                        (abs(net),)
-                    )
-                    await db.commit()
+                await add_to_bank(abs(net), self.ctx.author.id)
             except Exception as e:
                 print(f"Error adding loss to bank: {e}")
             
@@ -467,6 +469,11 @@ class Blackjack(commands.Cog):
         self.bot = bot
         # track users with active games to prevent concurrent games per user
         self.active_games = set()
+        # EV hints run off the event loop
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="blackjack")
+
+    def cog_unload(self):
+        self.executor.shutdown(wait=False)
 
     @commands.command(name="blackjack", aliases=["bj"])
     async def blackjack(self, ctx, bet: str = None):
@@ -543,6 +550,7 @@ class Blackjack(commands.Cog):
             # reserve bet immediately
             data['mora'] -= amount
             await update_user_data(ctx.author.id, mora=data['mora'])
+            session_id = await open_session(ctx.author.id, "blackjack", amount)
 
             # mark active
             self.active_games.add(ctx.author.id)
@@ -554,19 +562,22 @@ class Blackjack(commands.Cog):
             if has_rigged > 0:
                 # Consume rigged deck and give instant blackjack win
                 await consume_inventory_item(ctx.author.id, "rigged_deck")
-                payout = int(amount * 2.2)
+                payout = int(amount * BLACKJACK_PAYOUT)
                 try:
                     data = await get_user_data(ctx.author.id)
                     data['mora'] += payout
                     await update_user_data(ctx.author.id, mora=data['mora'])
                 except Exception as e:
                     print(f"Error crediting blackjack payout: {e}")
+                await close_session(session_id)
 
                 # Track stats
                 try:
-                    await track_game_stat(ctx.author.id, "blackjack_wins")
-                    await track_game_stat(ctx.author.id, "blackjack_plays")
-                    await track_game_stat(ctx.author.id, "blackjack_naturals")
+                    await track_game_stats([
+                        (ctx.author.id, "blackjack_wins"),
+                        (ctx.author.id, "blackjack_plays"),
+                        (ctx.author.id, "blackjack_naturals"),
+                    ])
                     await check_and_award_game_achievements(ctx.author.id, self.bot, ctx)
                 except Exception:
                     pass
@@ -593,13 +604,14 @@ class Blackjack(commands.Cog):
             dv = hand_value(dealer_cards)
             if pv == 21:
                 # immediate player blackjack: reduced payout (2.2x instead of 2.5x)
-                payout = int(amount * 2.2)
+                payout = int(amount * BLACKJACK_PAYOUT)
                 try:
                     data = await get_user_data(ctx.author.id)
                     data['mora'] += payout
                     await update_user_data(ctx.author.id, mora=data['mora'])
                 except Exception as e:
                     print(f"Error crediting blackjack payout: {e}")
+                await close_session(session_id)
 
                 # build purple win embed and end game immediately
                 e = discord.Embed(
@@ -618,7 +630,7 @@ class Blackjack(commands.Cog):
 
             # reserved_total initially equals the amount; further actions (double/split) will increase it
             # pass starting balance (balance before reservation) so view can compute net correctly
-            view = BlackjackView(ctx, amount, deck, player_cards, dealer_cards, reserved_total=amount, cog=self, start_balance=balance)
+            view = BlackjackView(ctx, amount, deck, player_cards, dealer_cards, reserved_total=amount, cog=self, start_balance=balance, session_id=session_id)
             embed = view.embed()
             message = await send_embed(ctx, embed, view=view)
             view.message = message
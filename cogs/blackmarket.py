@@ -1,11 +1,15 @@
 import discord
 from discord.ext import commands
 import aiosqlite
+import math
 import random
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from config import DB_PATH
 from utils.database import get_user_data, update_user_data, require_enrollment
 from utils.embed import send_embed
+from utils.item_catalog import ItemCatalog
+from utils.timer_wheel import TimedView
 
 
 # Item definitions with emojis
@@ -222,6 +226,41 @@ ITEMS = {
     }
 }
 
+# Extra names players use for items (ids and display names always work)
+ITEM_ALIASES = {
+    "dice": "lucky_dice",
+    "chip": "golden_chip",
+    "xp": "xp_booster",
+    "booster": "xp_booster",
+    "key": "bankers_key",
+    "streak shield": "streak_shield",
+    "shield": "streak_shield",
+    "streak card": "hot_streak",
+    "deck": "rigged_deck",
+    "plasma": "plasma_canon",
+    "plasma cannon": "plasma_canon",
+    "cannon": "plasma_canon",
+    "crate": "special_crate",
+    "upgrade": "bank_upgrade",
+    "gun": "shotgun",
+    "pack": "thiefpack",
+    "dog": "guarddog",
+    "random chest": "random",
+    "regular chest": "regular",
+    "diamond chest": "diamond",
+}
+
+# Name lookup plus rarity/price tables, shared by buy, sell, use and grant
+CATALOG = ItemCatalog(ITEMS, ITEM_ALIASES)
+
+
+def did_you_mean(item_name: str) -> str:
+    """' Did you mean <item>?' for a name CATALOG.resolve missed, else ''"""
+    item_id = CATALOG.suggest(item_name)
+    if item_id is None:
+        return ""
+    return f" Did you mean {ITEMS[item_id]['emoji']} **{ITEMS[item_id]['name']}**?"
+
 RARITY_COLORS = {
     "Common": 0x95A5A6,
     "Uncommon": 0x2ECC71,
@@ -232,80 +271,280 @@ RARITY_COLORS = {
 }
 
 
-async def restock_market(user_id):
-    """Restock user's personal Black Market with 12-hour rotation (rarer items appear less often)"""
+# Rotation length; every user's market rolls over on the same wall-clock boundary
+CYCLE_SECONDS = 12 * 3600
+
+# Chance for an item of each rarity to show up in a rotation
+APPEARANCE_ODDS = {
+    "Common": 0.90,
+    "Uncommon": 0.75,
+    "Rare": 0.60,
+    "Epic": 0.40,
+    "Legendary": 0.25,
+    "Mythic": 0.05,  # EXTREMELY RARE
+}
+
+# Stock range per rarity (inclusive)
+STOCK_RANGES = {
+    "Common": (3, 6),
+    "Uncommon": (2, 4),
+    "Rare": (1, 3),
+    "Epic": (1, 2),
+    "Legendary": (1, 1),
+    "Mythic": (1, 1),
+}
+
+MIN_ITEMS = 7
+
+
+def current_cycle(now: float = None) -> int:
+    return int((time.time() if now is None else now) // CYCLE_SECONDS)
+
+
+def seconds_until_rotation(now: float = None) -> int:
+    now = time.time() if now is None else now
+    return int((current_cycle(now) + 1) * CYCLE_SECONDS - now)
+
+
+def roll_market(user_id: int, cycle: int) -> dict:
+    """Stock for one user's market in one rotation: {item_id: stock}.
+
+    Seeded from (user_id, cycle), so the same rotation always rolls the same
+    items and quantities and nothing needs to be stored until someone buys.
+    """
+    rng = random.Random(f"blackmarket:{user_id}:{cycle}")
+    selected = [
+        item_id for item_id, item in ITEMS.items()
+        if rng.random() < APPEARANCE_ODDS.get(item["rarity"], APPEARANCE_ODDS["Mythic"])
+    ]
+
+    # Ensure at least 7 items are selected
+    if len(selected) < MIN_ITEMS:
+        remaining = [item_id for item_id in ITEMS if item_id not in selected]
+        selected.extend(rng.sample(remaining, min(MIN_ITEMS - len(selected), len(remaining))))
+
+    stock = {}
+    for item_id in selected:
+        low, high = STOCK_RANGES.get(ITEMS[item_id]["rarity"], (1, 1))
+        stock[item_id] = rng.randint(low, high)
+    return stock
+
+
+async def get_market_stock(user_id: int, cycle: int = None, db=None) -> dict:
+    """Remaining stock this rotation: rolled stock minus this rotation's purchases"""
+    cycle = current_cycle() if cycle is None else cycle
+    stock = roll_market(user_id, cycle)
+    sql = "SELECT item_id, bought FROM black_market_purchases WHERE user_id = ? AND cycle = ?"
+    if db is not None:
+        async with db.execute(sql, (user_id, cycle)) as cursor:
+            bought = await cursor.fetchall()
+    else:
+        async with aiosqlite.connect(DB_PATH) as conn:
+            async with conn.execute(sql, (user_id, cycle)) as cursor:
+                bought = await cursor.fetchall()
+    for item_id, count in bought:
+        if item_id in stock:
+            stock[item_id] = max(0, stock[item_id] - count)
+    return stock
+
+
+async def record_purchase(db, user_id: int, item_id: str, amount: int, cycle: int) -> bool:
+    """Add to the rotation's purchase count; False if that would oversell the item.
+
+    One row per (user, item): a purchase in a new rotation overwrites the old
+    count instead of adding to it, so the table never needs clearing.
+    """
+    rolled_stock = roll_market(user_id, cycle).get(item_id, 0)
+    cursor = await db.execute("""
+        INSERT INTO black_market_purchases (user_id, item_id, cycle, bought)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(user_id, item_id) DO UPDATE SET
+            bought = CASE WHEN cycle = excluded.cycle THEN bought + excluded.bought ELSE excluded.bought END,
+            cycle = excluded.cycle
+        WHERE cycle != excluded.cycle OR bought + excluded.bought <= ?
+    """, (user_id, item_id, cycle, amount, rolled_stock))
+    return cursor.rowcount > 0
+
+
+LISTINGS_PAGE_SIZE = 10
+
+
+def parse_price(text: str):
+    """'250000', '250k' or '1.5m' -> int; None if it isn't a price"""
+    text = text.strip().lower().replace(",", "")
+    scale = 1
+    if text[-1:] in ("k", "m"):
+        scale = 1_000 if text[-1] == "k" else 1_000_000
+        text = text[:-1]
+    try:
+        value = float(text) * scale
+    except ValueError:
+        return None
+    # "inf", "nan" and "1e400" parse as floats but are not prices, and
+    # SQLite can't bind an integer past 64 bits
+    if not math.isfinite(value) or abs(value) >= 2**63:
+        return None
+    return int(value)
+
+
+def parse_listing_filters(args) -> dict:
+    """Split `gpm` arguments into item / rarity / price range filters.
+
+    Rarity is a rarity name, a price range looks like 100k-2m, 100k- or -2m,
+    and whatever is left is resolved as an item name.
+    """
+    filters = {"item_id": None, "rarity": None, "min_price": None, "max_price": None}
+    rarities = {rarity.lower(): rarity for rarity in CATALOG.by_rarity if rarity}
+    words = []
+    for arg in args:
+        if arg.lower() in rarities:
+            filters["rarity"] = rarities[arg.lower()]
+        elif "-" in arg and all(part == "" or parse_price(part) is not None for part in arg.split("-", 1)):
+            low, high = arg.split("-", 1)
+            filters["min_price"] = parse_price(low) if low else None
+            filters["max_price"] = parse_price(high) if high else None
+        else:
+            words.append(arg)
+    if words:
+        # a search may guess: it only lists, it doesn't spend anything
+        query = " ".join(words)
+        filters["item_id"] = CATALOG.resolve(query) or CATALOG.suggest(query)
+        if filters["item_id"] is None:
+            raise ValueError(" ".join(words))
+    return filters
+
+
+async def fetch_listings_page(filters: dict, after=None, before=None, limit: int = LISTINGS_PAGE_SIZE) -> list:
+    """One page of player listings ordered by (item_id, price, listing_id).
+
+    Keyset pagination: pass the last row's key as after for the next page or
+    the first row's key as before for the previous one. Only the visible page
+    is read, using idx_listings_item_price.
+    """
+    where, params = [], []
+    if filters.get("item_id"):
+        where.append("item_id = ?")
+        params.append(filters["item_id"])
+    elif filters.get("rarity"):
+        item_ids = CATALOG.by_rarity.get(filters["rarity"], [])
+        where.append(f"item_id IN ({', '.join('?' * len(item_ids)) or 'NULL'})")
+        params.extend(item_ids)
+    if filters.get("min_price") is not None:
+        where.append("price >= ?")
+        params.append(filters["min_price"])
+    if filters.get("max_price") is not None:
+        where.append("price <= ?")
+        params.append(filters["max_price"])
+
+    order = "ASC"
+    if after is not None:
+        where.append("(item_id, price, listing_id) > (?, ?, ?)")
+        params.extend(after)
+    elif before is not None:
+        where.append("(item_id, price, listing_id) < (?, ?, ?)")
+        params.extend(before)
+        order = "DESC"
+
+    sql = "SELECT listing_id, seller_id, item_id, price FROM black_market_listings"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY item_id {order}, price {order}, listing_id {order} LIMIT ?"
+    params.append(limit)
+
     async with aiosqlite.connect(DB_PATH) as db:
-        # Check if we've already restocked in the last 12 hours for this user
-        async with db.execute(
-            "SELECT last_restock FROM black_market_stock WHERE user_id = ? LIMIT 1",
-            (user_id,)
-        ) as cursor:
-            result = await cursor.fetchone()
-        
-        if result:
-            last_restock = datetime.fromisoformat(result[0])
-            time_since_restock = datetime.now() - last_restock
-            if time_since_restock < timedelta(hours=12):
-                return  # Already restocked within last 12 hours
-        
-        # Clear old stock for this user
-        await db.execute("DELETE FROM black_market_stock WHERE user_id = ?", (user_id,))
-        
-        # Rotation chances based on rarity (daily cycle)
-        selected_items = []
-        for item_id, item in ITEMS.items():
-            # Determine if item appears today based on rarity
-            appears = False
-            if item["rarity"] == "Common":
-                appears = random.random() < 0.90  # 90% chance to appear
-            elif item["rarity"] == "Uncommon":
-                appears = random.random() < 0.75  # 75% chance
-            elif item["rarity"] == "Rare":
-                appears = random.random() < 0.60  # 60% chance
-            elif item["rarity"] == "Epic":
-                appears = random.random() < 0.40  # 40% chance
-            elif item["rarity"] == "Legendary":
-                appears = random.random() < 0.25  # 25% chance
-            else:  # Mythic
-                appears = random.random() < 0.05  # 5% chance (EXTREMELY RARE)
-            
-            if appears:
-                selected_items.append((item_id, item))
-        
-        # Ensure at least 7 items are selected
-        if len(selected_items) < 7:
-            # Add random items until we have 7
-            remaining_items = [(iid, itm) for iid, itm in ITEMS.items() if iid not in [x[0] for x in selected_items]]
-            needed = 7 - len(selected_items)
-            selected_items.extend(random.sample(remaining_items, min(needed, len(remaining_items))))
-        
-        # Insert selected items into stock
-        for item_id, item in selected_items:
-            # Set stock quantities based on rarity (REDUCED)
-            if item["rarity"] == "Common":
-                stock = random.randint(3, 6)
-            elif item["rarity"] == "Uncommon":
-                stock = random.randint(2, 4)
-            elif item["rarity"] == "Rare":
-                stock = random.randint(1, 3)
-            elif item["rarity"] == "Epic":
-                stock = random.randint(1, 2)
-            elif item["rarity"] == "Legendary":
-                # Rigged Deck always has stock of 1
-                if item_id == "rigged_deck":
-                    stock = 1
-                else:
-                    stock = 1
-            else:  # Mythic
-                stock = 1
-            
-            # Insert into stock with user_id
-            await db.execute("""
-                INSERT INTO black_market_stock (user_id, item_id, stock, price, last_restock)
-                VALUES (?, ?, ?, ?, ?)
-            """, (user_id, item_id, stock, item["base_price"], datetime.now().isoformat()))
-        
-        await db.commit()
+        async with db.execute(sql, params) as cursor:
+            rows = await cursor.fetchall()
+    if order == "DESC":
+        rows.reverse()
+    return rows
+
+
+def listing_key(row) -> tuple:
+    listing_id, _seller_id, item_id, price = row
+    return (item_id, price, listing_id)
+
+
+class ListingsView(TimedView):
+    """Player market browser; each button press fetches just the next or previous page"""
+
+    def __init__(self, cog, ctx, filters: dict, rows: list):
+        super().__init__(timeout=180)
+        self.cog = cog
+        self.ctx = ctx
+        self.filters = filters
+        self.rows = rows[:LISTINGS_PAGE_SIZE]
+        self.page = 1
+        self.has_next = len(rows) > LISTINGS_PAGE_SIZE
+        self.update_buttons()
+
+    def update_buttons(self):
+        self.previous_button.disabled = self.page <= 1
+        self.next_button.disabled = not self.has_next
+
+    def filter_text(self) -> str:
+        parts = []
+        if self.filters.get("item_id"):
+            item = ITEMS[self.filters["item_id"]]
+            parts.append(f"{item['emoji']} {item['name']}")
+        elif self.filters.get("rarity"):
+            parts.append(self.filters["rarity"])
+        low, high = self.filters.get("min_price"), self.filters.get("max_price")
+        if low is not None or high is not None:
+            parts.append(f"{low or 0:,} - {f'{high:,}' if high is not None else 'any'} mora")
+        return " | ".join(parts)
+
+    def get_embed(self):
+        description = "Buy from other players with `gbuylist <listing id>`"
+        if self.filter_text():
+            description += f"\nFilter: {self.filter_text()}"
+        embed = discord.Embed(title="📋 Player Listings", description=description, color=0x000000)
+        embed.set_author(name=self.ctx.author.display_name, icon_url=self.ctx.author.display_avatar.url)
+
+        for listing_id, seller_id, item_id, price in self.rows:
+            if item_id not in ITEMS:
+                continue
+            item = ITEMS[item_id]
+            # cached user if we have one, otherwise a mention (no API call per listing)
+            seller = self.cog.bot.get_user(seller_id)
+            seller_name = seller.display_name if seller else f"<@{seller_id}>"
+
+            value = f"{item['emoji']} **{item['name']}**\n"
+            value += f"└ Seller: {seller_name}\n"
+            value += f"└ Price: {price:,} <:mora:1437958309255577681>"
+            embed.add_field(name=f"Listing #{listing_id}", value=value, inline=False)
+
+        embed.set_footer(text=f"Page {self.page} • Use 'gbl <id>' to purchase")
+        return embed
+
+    async def show(self, interaction, rows, page, has_next):
+        self.rows = rows[:LISTINGS_PAGE_SIZE]
+        self.page = page
+        self.has_next = has_next
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.get_embed(), view=self)
+
+    @discord.ui.button(label="◀️ Previous", style=discord.ButtonStyle.gray)
+    async def previous_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.user.id != self.ctx.author.id:
+            return await interaction.response.send_message("<a:X_:1437951830393884788> This isn't your menu!", ephemeral=True)
+        rows = await fetch_listings_page(self.filters, before=listing_key(self.rows[0]))
+        if len(rows) < LISTINGS_PAGE_SIZE or self.page <= 2:
+            # back at the start (or listings before us were bought): reload page 1
+            rows = await fetch_listings_page(self.filters, limit=LISTINGS_PAGE_SIZE + 1)
+            return await self.show(interaction, rows, 1, len(rows) > LISTINGS_PAGE_SIZE)
+        await self.show(interaction, rows, self.page - 1, True)
+
+    @discord.ui.button(label="Next ▶️", style=discord.ButtonStyle.gray)
+    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.user.id != self.ctx.author.id:
+            return await interaction.response.send_message("<a:X_:1437951830393884788> This isn't your menu!", ephemeral=True)
+        # one extra row tells us whether there is a page after this one
+        rows = await fetch_listings_page(self.filters, after=listing_key(self.rows[-1]), limit=LISTINGS_PAGE_SIZE + 1)
+        if not rows:
+            self.has_next = False
+            self.update_buttons()
+            return await interaction.response.edit_message(view=self)
+        await self.show(interaction, rows, self.page + 1, len(rows) > LISTINGS_PAGE_SIZE)
 
 
 class BlackMarket(commands.Cog):
@@ -318,9 +557,6 @@ class BlackMarket(commands.Cog):
         if not await require_enrollment(ctx):
             return
 
-        # Auto-restock if new day (daily rotation)
-        await restock_market(ctx.author.id)
-
         data = await get_user_data(ctx.author.id)
         mora = data.get("mora", 0)
 
@@ -331,22 +567,15 @@ class BlackMarket(commands.Cog):
         )
         embed.set_author(name=ctx.author.display_name, icon_url=ctx.author.display_avatar.url)
 
-        # Get current stock for this user
-        async with aiosqlite.connect(DB_PATH) as db:
-            async with db.execute(
-                "SELECT item_id, stock, price FROM black_market_stock WHERE user_id = ? ORDER BY price DESC",
-                (ctx.author.id,)
-            ) as cursor:
-                stocks = await cursor.fetchall()
+        # Get current stock for this user (derived from the rotation, no writes)
+        stocks = await get_market_stock(ctx.author.id)
 
-        for item_id, stock, price in stocks:
-            if item_id not in ITEMS:
-                continue
-            
+        for item_id, stock in sorted(stocks.items(), key=lambda entry: CATALOG.price_of[entry[0]] or 0, reverse=True):
             item = ITEMS[item_id]
+            price = CATALOG.price_of[item_id]
             
             # Skip items that are not purchasable (price is None)
-            if price is None or item.get('base_price') is None:
+            if price is None:
                 continue
             
             stock_text = f"**{stock}** in stock" if stock > 0 else "**OUT OF STOCK**"
@@ -367,24 +596,12 @@ class BlackMarket(commands.Cog):
                 "SELECT COUNT(*) FROM black_market_listings"
             ) as cursor:
                 listing_count = (await cursor.fetchone())[0]
-            
-            # Get user's last restock time
-            async with db.execute(
-                "SELECT last_restock FROM black_market_stock WHERE user_id = ? LIMIT 1",
-                (ctx.author.id,)
-            ) as cursor:
-                restock_result = await cursor.fetchone()
         
-        # Calculate next rotation time (12 hours from last restock)
-        if restock_result:
-            last_restock = datetime.fromisoformat(restock_result[0])
-            next_rotation = last_restock + timedelta(hours=12)
-            time_until = next_rotation - datetime.now()
-            hours_left = max(0, int(time_until.total_seconds() // 3600))
-            minutes_left = max(0, int((time_until.total_seconds() % 3600) // 60))
-            time_text = f"{hours_left}h {minutes_left}m" if hours_left > 0 else f"{minutes_left}m"
-        else:
-            time_text = "now"
+        # Calculate next rotation time
+        time_until = seconds_until_rotation()
+        hours_left = time_until // 3600
+        minutes_left = (time_until % 3600) // 60
+        time_text = f"{hours_left}h {minutes_left}m" if hours_left > 0 else f"{minutes_left}m"
         
         embed.set_footer(text=f"Check out player listings (use 'gpm') | Next rotation in {time_text}")
         await ctx.send(embed=embed)
@@ -395,9 +612,6 @@ class BlackMarket(commands.Cog):
         if not await require_enrollment(ctx):
             return
 
-        # Auto-restock if new day
-        await restock_market(ctx.author.id)
-
         if not args:
             return await ctx.send("<a:X_:1437951830393884788> Usage: `gbuy <item name> [amount]`\nExample: `gbuy lucky dice` or `gbuy rigged deck 2`")
 
@@ -412,32 +626,24 @@ class BlackMarket(commands.Cog):
         if amount < 1:
             return await ctx.send("<a:X_:1437951830393884788> Amount must be at least 1!")
 
-        # Find item
-        item_id = None
-        item_name_lower = item_name.lower().replace(" ", "_")
-        
-        for iid, item in ITEMS.items():
-            if iid == item_name_lower or item["name"].lower() == item_name.lower():
-                item_id = iid
-                break
+        # Exact name, id or alias only: a guess must not spend mora
+        item_id = CATALOG.resolve(item_name)
 
         if item_id is None:
-            return await ctx.send("<a:X_:1437951830393884788> Item not found! Use `gblackmarket` to see available items.")
+            return await ctx.send(f"<a:X_:1437951830393884788> Item not found!{did_you_mean(item_name)} Use `gblackmarket` to see available items.")
 
         item = ITEMS[item_id]
 
         # Check stock for this user
         async with aiosqlite.connect(DB_PATH) as db:
-            async with db.execute(
-                "SELECT stock, price FROM black_market_stock WHERE user_id = ? AND item_id = ?",
-                (ctx.author.id, item_id)
-            ) as cursor:
-                result = await cursor.fetchone()
+            cycle = current_cycle()
+            stocks = await get_market_stock(ctx.author.id, cycle, db=db)
             
-            if not result:
+            if item_id not in stocks or CATALOG.price_of[item_id] is None:
                 return await ctx.send("<a:X_:1437951830393884788> This item isn't in today's cycle. Try again in the next cycle.")
             
-            stock, price = result
+            stock = stocks[item_id]
+            price = CATALOG.price_of[item_id]
             
             if stock <= 0:
                 return await ctx.send(f"<a:X_:1437951830393884788> {item['emoji']} **{item['name']}** is OUT OF STOCK! Wait for tomorrow's restock or check player listings with `gpm`")
@@ -490,10 +696,8 @@ class BlackMarket(commands.Cog):
                     return await ctx.send(f"<a:X_:1437951830393884788> Purchasing {amount} would exceed the maximum stack limit ({max_stack}) for {item['emoji']} **{item['name']}**! You currently have {current_qty}.")
 
             # Purchase item - decrease stock
-            await db.execute(
-                "UPDATE black_market_stock SET stock = stock - ? WHERE user_id = ? AND item_id = ?",
-                (amount, ctx.author.id, item_id)
-            )
+            if not await record_purchase(db, ctx.author.id, item_id, amount, cycle):
+                return await ctx.send(f"<a:X_:1437951830393884788> {item['emoji']} **{item['name']}** just sold out!")
             
             # Deduct mora
             await db.execute(
@@ -544,17 +748,11 @@ class BlackMarket(commands.Cog):
         if price < 1000:
             return await ctx.send("<a:X_:1437951830393884788> Minimum listing price is 1,000 <:mora:1437958309255577681>")
 
-        # Find item
-        item_id = None
-        item_name_lower = item_name.lower().replace(" ", "_")
-        
-        for iid, item in ITEMS.items():
-            if iid == item_name_lower or item["name"].lower() == item_name.lower():
-                item_id = iid
-                break
+        # Exact name, id or alias only: a guess must not list the wrong item
+        item_id = CATALOG.resolve(item_name)
 
         if item_id is None:
-            return await ctx.send("<a:X_:1437951830393884788> Item not found!")
+            return await ctx.send(f"<a:X_:1437951830393884788> Item not found!{did_you_mean(item_name)}")
 
         # Check if user owns it
         async with aiosqlite.connect(DB_PATH) as db:
@@ -594,18 +792,25 @@ class BlackMarket(commands.Cog):
         await ctx.send(embed=embed)
 
     @commands.command(name="pm", aliases=["playermarket", "listings"])
-    async def view_listings(self, ctx):
-        """View player listings on the Black Market"""
+    async def view_listings(self, ctx, *args):
+        """View player listings on the Black Market
+        
+        Usage: gpm [item] [rarity] [min-max]
+        Example: gpm lucky dice 100k-500k  |  gpm legendary
+        """
         if not await require_enrollment(ctx):
             return
 
-        async with aiosqlite.connect(DB_PATH) as db:
-            async with db.execute(
-                "SELECT listing_id, seller_id, item_id, price FROM black_market_listings ORDER BY price ASC LIMIT 20"
-            ) as cursor:
-                listings = await cursor.fetchall()
+        try:
+            filters = parse_listing_filters(args)
+        except ValueError as e:
+            return await ctx.send(f"<a:X_:1437951830393884788> Item not found: {e}")
+
+        listings = await fetch_listings_page(filters, limit=LISTINGS_PAGE_SIZE + 1)
 
         if not listings:
+            if any(value is not None for value in filters.values()):
+                return await ctx.send("<a:X_:1437951830393884788> No listings match that filter.")
             embed = discord.Embed(
                 title="Player Listings",
                 description="No items listed by players yet!\n\nUse `gsell <price> <item>` to list your items.",
@@ -613,36 +818,8 @@ class BlackMarket(commands.Cog):
             )
             return await ctx.send(embed=embed)
 
-        embed = discord.Embed(
-            title="📋 Player Listings",
-            description="Buy from other players with `gbuylist <listing id>`",
-            color=0x000000
-        )
-        embed.set_author(name=ctx.author.display_name, icon_url=ctx.author.display_avatar.url)
-
-        for listing_id, seller_id, item_id, price in listings:
-            if item_id not in ITEMS:
-                continue
-            
-            item = ITEMS[item_id]
-            try:
-                seller = await self.bot.fetch_user(seller_id)
-                seller_name = seller.display_name
-            except:
-                seller_name = f"User {seller_id}"
-            
-            value = f"{item['emoji']} **{item['name']}**\n"
-            value += f"└ Seller: {seller_name}\n"
-            value += f"└ Price: {price:,} <:mora:1437958309255577681>"
-            
-            embed.add_field(
-                name=f"Listing #{listing_id}",
-                value=value,
-                inline=False
-            )
-
-        embed.set_footer(text="Use 'gbl <id>' to purchase")
-        await ctx.send(embed=embed)
+        view = ListingsView(self, ctx, filters, listings)
+        view.message = await ctx.send(embed=view.get_embed(), view=view)
 
     @commands.command(name="bl", aliases=["buylist", "buylisting"])
     async def buy_listing(self, ctx, listing_id: int = None):
@@ -790,13 +967,13 @@ class BlackMarket(commands.Cog):
     @commands.is_owner()
     async def force_restock(self, ctx):
         """[Owner] Force restock your personal Black Market"""
-        # Clear existing stock to force restock for the owner
+        # Stock is rolled from the rotation, so clearing purchases refills it
         async with aiosqlite.connect(DB_PATH) as db:
-            await db.execute("DELETE FROM black_market_stock WHERE user_id = ?", (ctx.author.id,))
+            await db.execute("DELETE FROM black_market_purchases WHERE user_id = ?", (ctx.author.id,))
             await db.commit()
         
-        await restock_market(ctx.author.id)
-        await ctx.send("<a:Check:1437951818452832318> Your Black Market restocked with 7 items!")
+        stock = roll_market(ctx.author.id, current_cycle())
+        await ctx.send(f"<a:Check:1437951818452832318> Your Black Market restocked with {len(stock)} items!")
 
 
 async def setup(bot):
@@ -1,18 +1,114 @@
 import discord
 from discord.ext import commands
 import aiohttp
+import json
 import os
+import time
 from collections import defaultdict
-from datetime import datetime, timedelta
+from utils.conversation_store import ConversationStore
+
+
+# Seconds between progressive edits of a streamed reply (keeps us under Discord's edit rate limit)
+STREAM_EDIT_INTERVAL = 1.0
+# How many AI requests a single user may have running at once
+MAX_IN_FLIGHT_PER_USER = 1
+
+
+class ChatBackendError(Exception):
+    """Raised when the completion endpoint returns an error response"""
+
+
+class ChatBackend:
+    """Streams chat completions from an OpenAI-compatible HTTP endpoint.
+
+    One pooled session is kept for the lifetime of the cog so every request
+    reuses warm keep-alive connections instead of paying TCP/TLS setup again.
+    The base URL is configurable (OPENAI_BASE_URL) so the cog can be pointed
+    at a local stub server.
+    """
+
+    def __init__(self, api_key: str, base_url: str = "https://api.openai.com/v1", model: str = "gpt-3.5-turbo"):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.session = None
+
+    async def start(self):
+        if self.session and not self.session.closed:
+            return
+        connector = aiohttp.TCPConnector(limit=20, keepalive_timeout=60, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            # No hard total limit while streaming, but give up if the stream stalls
+            timeout=aiohttp.ClientTimeout(total=None, connect=5, sock_read=10)
+        )
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def stream(self, messages: list):
+        """Yield content chunks of the completion as the server sends them"""
+        await self.start()
+        async with self.session.post(
+            f"{self.base_url}/chat/completions",
+            json={
+                "model": self.model,
+                "messages": messages,
+                "max_tokens": 150,
+                "temperature": 0.9,
+                "stream": True,
+            }
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                raise ChatBackendError(f"{response.status}: {error_text[:200]}")
+
+            # Server-sent events: one "data: {...}" line per chunk, ended by "data: [DONE]"
+            async for raw_line in response.content:
+                line = raw_line.decode("utf-8", errors="ignore").strip()
+                if not line.startswith("data:"):
+                    continue
+                payload = line[5:].strip()
+                if payload == "[DONE]":
+                    break
+                try:
+                    data = json.loads(payload)
+                except ValueError:
+                    continue
+                choices = data.get("choices") or []
+                if not choices:
+                    continue
+                content = (choices[0].get("delta") or {}).get("content")
+                if content:
+                    yield content
 
 
 class Chat(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.api_key = os.getenv('OPENAI_API_KEY')
-        # Store conversation history per user (last 10 messages, expires after 30 min)
-        self.conversations = defaultdict(list)
-        self.last_activity = {}
+        self.backend = ChatBackend(
+            self.api_key,
+            base_url=os.getenv('OPENAI_BASE_URL', "https://api.openai.com/v1"),
+            model=os.getenv('OPENAI_MODEL', "gpt-3.5-turbo")
+        )
+        # Conversation history per user (token-budgeted, expires after 30 min of inactivity)
+        self.conversations = ConversationStore(user_budget=600, max_turns=10, ttl=30 * 60)
+        # Number of AI requests currently running per user
+        self.in_flight = defaultdict(int)
+
+    async def cog_load(self):
+        if self.api_key:
+            await self.backend.start()
+
+    async def cog_unload(self):
+        await self.backend.close()
         
     def _get_system_prompt(self):
         """System prompt to make the bot sound natural"""
@@ -24,69 +120,44 @@ You help with questions, chat about games, and just hang out like a friend.
 If asked about games, you know the server has: slots, blackjack, coinflip, wheel, mines, rps, connect4, tictactoe, dice.
 Don't mention you're an AI unless directly asked."""
 
-    def _clean_old_conversations(self):
-        """Remove conversations older than 30 minutes"""
-        now = datetime.now()
-        cutoff = now - timedelta(minutes=30)
-        old_users = [uid for uid, time in self.last_activity.items() if time < cutoff]
-        for uid in old_users:
-            if uid in self.conversations:
-                del self.conversations[uid]
-            del self.last_activity[uid]
-
-    async def _get_ai_response(self, user_id: int, message: str) -> str:
-        """Get AI response from OpenAI"""
+    async def _stream_ai_response(self, user_id: int, message: str):
+        """Yield the AI response from OpenAI in chunks as they arrive"""
         if not self.api_key:
-            return "I'm not configured yet! The bot owner needs to add an OpenAI API key to the .env file."
-        
-        # Clean old conversations
-        self._clean_old_conversations()
-        
-        # Add user message to history
-        self.conversations[user_id].append({"role": "user", "content": message})
-        
-        # Keep only last 10 messages (5 exchanges)
-        if len(self.conversations[user_id]) > 10:
-            self.conversations[user_id] = self.conversations[user_id][-10:]
+            yield "I'm not configured yet! The bot owner needs to add an OpenAI API key to the .env file."
+            return
         
-        # Update last activity
-        self.last_activity[user_id] = datetime.now()
+        # Add user message to history (expires idle conversations and trims to the token budget)
+        self.conversations.add(user_id, "user", message)
         
         # Build messages for API
         messages = [{"role": "system", "content": self._get_system_prompt()}]
-        messages.extend(self.conversations[user_id])
+        messages.extend(self.conversations.messages(user_id))
         
+        reply = []
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": "gpt-3.5-turbo",
-                        "messages": messages,
-                        "max_tokens": 150,
-                        "temperature": 0.9,
-                    },
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        print(f"OpenAI API error: {error_text}")
-                        return "Sorry, I'm having trouble thinking right now. Try again in a sec?"
-                    
-                    data = await response.json()
-                    ai_message = data["choices"][0]["message"]["content"].strip()
-                    
-                    # Add AI response to history
-                    self.conversations[user_id].append({"role": "assistant", "content": ai_message})
-                    
-                    return ai_message
+            async for chunk in self.backend.stream(messages):
+                reply.append(chunk)
+                yield chunk
+        except ChatBackendError as e:
+            print(f"OpenAI API error: {e}")
+            if not reply:
+                yield "Sorry, I'm having trouble thinking right now. Try again in a sec?"
+            return
         except Exception as e:
             print(f"Error getting AI response: {e}")
-            return "My brain just lagged out lol, try again?"
+            if not reply:
+                yield "My brain just lagged out lol, try again?"
+            return
+        
+        ai_message = "".join(reply).strip()
+        if ai_message:
+            # Add AI response to history
+            self.conversations.add(user_id, "assistant", ai_message)
+
+    async def _get_ai_response(self, user_id: int, message: str) -> str:
+        """Get the full AI response from OpenAI"""
+        chunks = [chunk async for chunk in self._stream_ai_response(user_id, message)]
+        return "".join(chunks).strip()
 
     @commands.command(name="hey", aliases=["chat", "ask"])
     async def chat_with_bot(self, ctx, *, message: str = None):
@@ -134,19 +205,45 @@ Don't mention you're an AI unless directly asked."""
             await ctx.send("To start a conversation do `ghey how are you`")
             return
         
-        # Show typing indicator
-        async with ctx.typing():
-            response = await self._get_ai_response(ctx.author.id, message)
+        # Only allow a limited number of pending replies per user
+        if self.in_flight[ctx.author.id] >= MAX_IN_FLIGHT_PER_USER:
+            await ctx.send("Hold up, I'm still answering your last message 😅")
+            return
         
-        await ctx.send(response)
+        self.in_flight[ctx.author.id] += 1
+        try:
+            text = ""
+            reply_msg = None
+            last_edit = 0.0
+            
+            # Show typing indicator until the first chunk arrives, then edit the reply as it streams in
+            async with ctx.typing():
+                async for chunk in self._stream_ai_response(ctx.author.id, message):
+                    text += chunk
+                    if not text.strip():
+                        continue
+                    now = time.monotonic()
+                    if reply_msg is None:
+                        reply_msg = await ctx.send(text[:2000])
+                        last_edit = now
+                    elif now - last_edit >= STREAM_EDIT_INTERVAL:
+                        await reply_msg.edit(content=text[:2000])
+                        last_edit = now
+            
+            text = text.strip()[:2000]
+            if reply_msg is None:
+                await ctx.send(text or "My brain just lagged out lol, try again?")
+            elif reply_msg.content != text:
+                await reply_msg.edit(content=text)
+        finally:
+            self.in_flight[ctx.author.id] -= 1
+            if self.in_flight[ctx.author.id] <= 0:
+                del self.in_flight[ctx.author.id]
     
     @commands.command(name="forget", aliases=["reset"])
     async def forget_conversation(self, ctx):
         """Clear your conversation history with the bot"""
-        if ctx.author.id in self.conversations:
-            del self.conversations[ctx.author.id]
-        if ctx.author.id in self.last_activity:
-            del self.last_activity[ctx.author.id]
+        self.conversations.clear(ctx.author.id)
         await ctx.send("Forgot our whole convo, starting fresh! 🧠")
 
 
@@ -1,10 +1,10 @@
 import random
 import discord
 from discord.ext import commands
-import aiosqlite
-from config import DB_PATH
-from utils.database import get_user_data, update_user_data, require_enrollment, track_game_stat, check_and_award_game_achievements, add_account_exp
+from utils.database import get_user_data, update_user_data, require_enrollment, track_game_stat, track_game_stats, check_and_award_game_achievements, add_account_exp
 from utils.embed import send_embed
+from utils.global_bank import add_to_bank
+from utils.game_math import PREMIUM_FLIP_LUCK, LUCKY_DICE_CHANCE, GOLDEN_CHIP_BONUS, HOT_STREAK_REFUND
 
 
 class CoinFlip(commands.Cog):
@@ -82,7 +82,7 @@ class CoinFlip(commands.Cog):
                 is_premium = await premium_cog.is_premium(ctx.author.id)
             
             # Premium users get +8% win chance
-            if is_premium and flip_result != choice and random.random() < 0.08:
+            if is_premium and flip_result != choice and random.random() < PREMIUM_FLIP_LUCK:
                 flip_result = choice  # Premium luck override
             
             # Check for Lucky Dice (adds +5% win chance)
@@ -91,7 +91,7 @@ class CoinFlip(commands.Cog):
             
             if has_lucky > 0:
                 # 5% chance to override loss into win
-                if flip_result != choice and random.random() < 0.05:
+                if flip_result != choice and random.random() < LUCKY_DICE_CHANCE:
                     flip_result = choice  # Lucky override!
                     await consume_active_item(ctx.author.id, "lucky_dice")
             
@@ -104,7 +104,7 @@ class CoinFlip(commands.Cog):
                 
                 chip_bonus = 0
                 if has_chip > 0:
-                    chip_bonus = int(bet * 0.3)
+                    chip_bonus = int(bet * GOLDEN_CHIP_BONUS)
                     bet += chip_bonus
                     await consume_inventory_item(ctx.author.id, "golden_chip")
                 
@@ -114,8 +114,7 @@ class CoinFlip(commands.Cog):
                 
                 # Track stats and check achievements
                 try:
-                    await track_game_stat(ctx.author.id, "coinflip_wins")
-                    await track_game_stat(ctx.author.id, "coinflip_plays")
+                    await track_game_stats([(ctx.author.id, "coinflip_wins"), (ctx.author.id, "coinflip_plays")])
                     await check_and_award_game_achievements(ctx.author.id, self.bot, ctx)
                 except Exception:
                     pass
@@ -149,7 +148,7 @@ class CoinFlip(commands.Cog):
                 refund = 0
                 
                 if has_hot > 0:
-                    refund = int(bet * 0.5)
+                    refund = int(bet * HOT_STREAK_REFUND)
                     await consume_active_item(ctx.author.id, "hot_streak")
                     new_mora = mora - bet + refund
                 else:
@@ -170,12 +169,7 @@ class CoinFlip(commands.Cog):
                     pass
                 
                 # Add loss to global bank (only non-refunded amount)
-                async with aiosqlite.connect(DB_PATH) as db:
-                    await db.execute(
-                        "UPDATE global_bank SET balance = balance + ? WHERE id = 1",
-                        (bet - refund,)
-                    )
-                    await db.commit()
+                await add_to_bank(bet - refund, ctx.author.id)
                 
                 loss_msg = f"💥 **{flip_result}** - Lost {bet:,} <:mora:1437958309255577681>"
                 if refund > 0:
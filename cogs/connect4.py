@@ -1,41 +1,58 @@
 import asyncio
-import random
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import discord
 from discord.ext import commands
 
-from utils.database import track_game_stat, check_and_award_game_achievements, add_account_exp
+from utils.database import track_game_stat, track_game_stats, check_and_award_game_achievements, add_account_exp
 from utils.embed import send_embed
+from utils.edit_dispatcher import edits
+from utils import connect4_engine as engine
 
 
 class Connect4Board:
-    ROWS = 6
-    COLS = 7
+    """Connect 4 board stored as bitboards (one mask per player plus an occupancy mask)."""
+    ROWS = engine.ROWS
+    COLS = engine.COLS
 
     def __init__(self):
-        # board[row][col], row 0 is bottom
-        self.board = [[0 for _ in range(self.COLS)] for _ in range(self.ROWS)]
+        # stones[player] has a bit set for each of that player's discs, row 0 is bottom
+        self.stones = {1: 0, 2: 0}
+        self.mask = 0
+        self.last_move = None
 
     def place(self, col, player):
         """Place a disc for player (1 or 2) in column col. Returns (row,col) or None if column full."""
-        if col < 0 or col >= self.COLS:
+        if col < 0 or col >= self.COLS or not self.can_play(col):
             return None
-        for r in range(self.ROWS):
-            if self.board[r][col] == 0:
-                self.board[r][col] = player
-                return (r, col)
-        return None
+        row = bin(self.mask & engine.COLUMN_MASKS[col]).count("1")
+        move_bit = engine.bit(row, col)
+        self.stones[player] |= move_bit
+        self.mask |= move_bit
+        self.last_move = (row, col)
+        return (row, col)
+
+    def can_play(self, col):
+        return engine.can_play(self.mask, col)
+
+    def cell(self, row, col):
+        b = engine.bit(row, col)
+        if self.stones[1] & b:
+            return 1
+        if self.stones[2] & b:
+            return 2
+        return 0
 
     def is_full(self):
-        return all(self.board[self.ROWS - 1][c] != 0 for c in range(self.COLS))
+        return not any(self.can_play(c) for c in range(self.COLS))
 
     def render(self):
         # render top-down with buttons
         emoji = {0: "⬜", 1: "🔴", 2: "🟡"}
         lines = []
         for r in range(self.ROWS - 1, -1, -1):
-            line = "".join(emoji[self.board[r][c]] + " " for c in range(self.COLS))
+            line = "".join(emoji[self.cell(r, c)] + " " for c in range(self.COLS))
             lines.append(line)
         # add emoji column numbers
         number_emojis = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣", "6️⃣", "7️⃣"]
@@ -43,51 +60,17 @@ class Connect4Board:
         return "\n".join(lines)
 
     def check_win(self, player):
-        # check horizontal
-        for r in range(self.ROWS):
-            count = 0
-            for c in range(self.COLS):
-                count = count + 1 if self.board[r][c] == player else 0
-                if count >= 4:
-                    return True
-        # check vertical
-        for c in range(self.COLS):
-            count = 0
-            for r in range(self.ROWS):
-                count = count + 1 if self.board[r][c] == player else 0
-                if count >= 4:
-                    return True
-        # diagonal checks
-        for r in range(self.ROWS):
-            for c in range(self.COLS):
-                if self._check_direction(r, c, 1, 1, player):
-                    return True
-                if self._check_direction(r, c, 1, -1, player):
-                    return True
-        return False
-
-    def _check_direction(self, r, c, dr, dc, player):
-        cnt = 0
-        for i in range(4):
-            rr = r + dr * i
-            cc = c + dc * i
-            if (
-                0 <= rr < self.ROWS
-                and 0 <= cc < self.COLS
-                and self.board[rr][cc] == player
-            ):
-                cnt += 1
-            else:
-                break
-        return cnt >= 4
+        return engine.has_four(self.stones[player])
 
 
 class Connect4View(discord.ui.View):
     def __init__(
-        self, board: Connect4Board, players, starter, ctx, cog, timeout: float = 300.0
+        self, board: Connect4Board, players, starter, ctx, cog, timeout: float = 300.0,
+        difficulty: str = engine.DEFAULT_DIFFICULTY,
     ):
         super().__init__(timeout=timeout)
         self.board = board
+        self.difficulty = difficulty
         # players: [discord.Member, discord.Member]
         self.players = players
         # map 1 -> players[0], 2 -> players[1]
@@ -151,14 +134,15 @@ class Connect4View(discord.ui.View):
                 if not getattr(winner, "bot", False):
                     try:
                         # Track stats
-                        await track_game_stat(winner.id, "connect4_wins")
-                        await track_game_stat(winner.id, "connect4_plays")
-                        await track_game_stat(loser.id, "connect4_plays")
+                        await track_game_stats([
+                            (winner.id, "connect4_wins"),
+                            (winner.id, "connect4_plays"),
+                            (loser.id, "connect4_plays"),
+                        ])
                         
                         # Track multiplayer games if vs player
                         if not getattr(loser, "bot", False):
-                            await track_game_stat(winner.id, "multiplayer_games")
-                            await track_game_stat(loser.id, "multiplayer_games")
+                            await track_game_stats([(winner.id, "multiplayer_games"), (loser.id, "multiplayer_games")])
                         
                         await check_and_award_game_achievements(winner.id, self.cog.bot, self.ctx)
                         
@@ -197,11 +181,9 @@ class Connect4View(discord.ui.View):
                 
                 # Track play stats for both players on draw
                 try:
-                    await track_game_stat(self.players[0].id, "connect4_plays")
-                    await track_game_stat(self.players[1].id, "connect4_plays")
+                    await track_game_stats([(self.players[0].id, "connect4_plays"), (self.players[1].id, "connect4_plays")])
                     if not getattr(self.players[0], "bot", False) and not getattr(self.players[1], "bot", False):
-                        await track_game_stat(self.players[0].id, "multiplayer_games")
-                        await track_game_stat(self.players[1].id, "multiplayer_games")
+                        await track_game_stats([(self.players[0].id, "multiplayer_games"), (self.players[1].id, "multiplayer_games")])
                 except Exception:
                     pass
                 
@@ -223,7 +205,7 @@ class Connect4View(discord.ui.View):
             # disable buttons for full columns
             for idx, item in enumerate(self.children):
                 try:
-                    item.disabled = self.board.board[self.board.ROWS - 1][idx] != 0
+                    item.disabled = not self.board.can_play(idx)
                 except Exception:
                     pass
 
@@ -234,47 +216,26 @@ class Connect4View(discord.ui.View):
                 # fallback to editing the message directly if response already used
                 if self.message:
                     try:
-                        await self.message.edit(embed=embed, view=self)
+                        await edits.edit(self.message, embed=embed, view=self)
                     except Exception:
                         pass
 
             # if it's the bot's turn, make an automated AI move
             if getattr(next_player, "bot", False):
-                # small delay to simulate thinking
-                await asyncio.sleep(0.6)
-
-                def choose_bot_col():
-                    # prefer immediate winning move for bot (player 2)
-                    for c in range(self.board.COLS):
-                        pos = self.board.place(c, 2)
-                        if pos:
-                            won = self.board.check_win(2)
-                            self.board.board[pos[0]][pos[1]] = 0
-                            if won:
-                                return c
-                    # block player's immediate win
-                    for c in range(self.board.COLS):
-                        pos = self.board.place(c, 1)
-                        if pos:
-                            will_win = self.board.check_win(1)
-                            self.board.board[pos[0]][pos[1]] = 0
-                            if will_win:
-                                return c
-                    # prefer center column
-                    center = self.board.COLS // 2
-                    if self.board.board[self.board.ROWS - 1][center] == 0:
-                        return center
-                    # fallback: random available column
-                    avail = [
-                        c
-                        for c in range(self.board.COLS)
-                        if self.board.board[self.board.ROWS - 1][c] == 0
-                    ]
-                    if not avail:
-                        return None
-                    return random.choice(avail)
-
-                bot_col = choose_bot_col()
+                # search runs in the cog's thread pool so the event loop never blocks
+                loop = asyncio.get_running_loop()
+                try:
+                    bot_col = await loop.run_in_executor(
+                        self.cog.executor,
+                        self.cog.engine.best_move,
+                        self.board.stones[2],
+                        self.board.mask,
+                        self.difficulty,
+                    )
+                except Exception as e:
+                    print(f"Connect4 engine error: {e}")
+                    avail = [c for c in engine.MOVE_ORDER if self.board.can_play(c)]
+                    bot_col = avail[0] if avail else None
                 if bot_col is not None:
                     self.board.place(bot_col, 2)
                     # update embed after bot move
@@ -306,7 +267,7 @@ class Connect4View(discord.ui.View):
                         # edit message and stop
                         if self.message:
                             try:
-                                await self.message.edit(embed=embed2, view=self)
+                                await edits.edit(self.message, embed=embed2, view=self)
                             except Exception:
                                 pass
                         self.stop()
@@ -319,8 +280,7 @@ class Connect4View(discord.ui.View):
                         
                         # Track play stats for both players on draw
                         try:
-                            await track_game_stat(self.players[0].id, "connect4_plays")
-                            await track_game_stat(self.players[1].id, "connect4_plays")
+                            await track_game_stats([(self.players[0].id, "connect4_plays"), (self.players[1].id, "connect4_plays")])
                         except Exception:
                             pass
                         
@@ -328,7 +288,7 @@ class Connect4View(discord.ui.View):
                             item.disabled = True
                         if self.message:
                             try:
-                                await self.message.edit(embed=embed2, view=self)
+                                await edits.edit(self.message, embed=embed2, view=self)
                             except Exception:
                                 pass
                         self.stop()
@@ -344,14 +304,12 @@ class Connect4View(discord.ui.View):
                     # disable buttons for full columns
                     for idx, item in enumerate(self.children):
                         try:
-                            item.disabled = (
-                                self.board.board[self.board.ROWS - 1][idx] != 0
-                            )
+                            item.disabled = not self.board.can_play(idx)
                         except Exception:
                             pass
                     if self.message:
                         try:
-                            await self.message.edit(embed=embed2, view=self)
+                            await edits.edit(self.message, embed=embed2, view=self)
                         except Exception:
                             pass
 
@@ -371,7 +329,7 @@ class Connect4View(discord.ui.View):
                     )
                 )
                 embed.set_footer(text="Game timed out.")
-                await self.message.edit(embed=embed, view=self)
+                await edits.edit(self.message, embed=embed, view=self)
             except Exception:
                 pass
 
@@ -381,11 +339,20 @@ class Connect4(commands.Cog):
         self.bot = bot
         # track active connect4 games per channel to avoid duplicates
         self.active_connect4 = {}
+        # shared search engine (transposition table persists between moves) and its worker threads.
+        # The search is pure Python and holds the GIL, so the threads keep the event loop
+        # responsive but don't run two searches in parallel
+        self.engine = engine.Connect4Engine()
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="connect4")
+
+    def cog_unload(self):
+        self.executor.shutdown(wait=False)
 
     @commands.command(name="connect4", aliases=["c4"])
-    async def connect4(self, ctx, opponent: Optional[discord.Member] = None):
+    async def connect4(self, ctx, opponent: Optional[discord.Member] = None, difficulty: str = engine.DEFAULT_DIFFICULTY):
         """Start a Connect 4 game. Usage: gconnect4 @opponent
         If no opponent is provided, this will start a local game vs the bot.
+        Bot difficulty can be easy, medium, hard or expert (e.g. gconnect4 expert).
         The board is displayed as a visual grid - click buttons to drop your piece.
         """
         import traceback
@@ -398,6 +365,13 @@ class Connect4(commands.Cog):
                 )
                 return
 
+            difficulty = difficulty.lower()
+            if difficulty not in engine.DIFFICULTIES:
+                await ctx.send(
+                    f"Unknown difficulty. Choose one of: {', '.join(engine.DIFFICULTIES)}"
+                )
+                return
+
             if opponent is None or opponent.bot:
                 # play vs bot (bot user)
                 players = [ctx.author, self.bot.user]
@@ -410,7 +384,7 @@ class Connect4(commands.Cog):
                 players = [ctx.author, opponent]
 
             board = Connect4Board()
-            view = Connect4View(board, players, ctx.author, ctx, self)
+            view = Connect4View(board, players, ctx.author, ctx, self, difficulty=difficulty)
             self.active_connect4[ctx.channel.id] = view
 
             embed = discord.Embed(
@@ -6,7 +6,8 @@ import discord
 from discord.ext import commands
 
 from config import DB_PATH
-from utils.database import ensure_user_db, get_user_data, require_enrollment
+from utils import epoch
+from utils.database import bootstrap_user, ensure_user_db, forget_bootstrapped, get_user_data, require_enrollment
 from utils.embed import send_embed
 
 
@@ -20,9 +21,12 @@ class Daily(commands.Cog):
                 CREATE TABLE IF NOT EXISTS daily_claims (
                     user_id INTEGER PRIMARY KEY,
                     last_claim TEXT NOT NULL,
-                    streak INTEGER DEFAULT 1
+                    streak INTEGER DEFAULT 1,
+                    last_claim_ts INTEGER
                 )
             """)
+            # last_claim is written with utcnow()
+            await epoch.ensure_epoch_column(db, "daily_claims", "last_claim", utc=True)
             await db.commit()
     
     @commands.command(name="start")
@@ -51,11 +55,10 @@ class Daily(commands.Cog):
                     "INSERT INTO users (user_id, mora, dust, fates, enrolled) VALUES (?, ?, ?, ?, ?)",
                     (ctx.author.id, 50000, 0, 0, 1)
                 )
+            # Wishes, chests and account rows in the same transaction
+            await bootstrap_user(ctx.author.id, db)
             await db.commit()
         
-        # Now ensure all other tables are set up
-        await ensure_user_db(ctx.author.id)
-        
         embed = discord.Embed(
             title="✅ Welcome to the Bot!",
             description=f"Welcome {ctx.author.mention}! You've started your journey!",
@@ -136,6 +139,7 @@ class Daily(commands.Cog):
                         pass  # Table might not exist or no data
                 
                 await db.commit()
+            forget_bootstrapped(target_id)
             
             embed = discord.Embed(
                 title="✅ User Removed",
@@ -164,15 +168,14 @@ class Daily(commands.Cog):
 
             async with aiosqlite.connect(DB_PATH) as db:
                 async with db.execute(
-                    "SELECT last_claim, streak FROM daily_claims WHERE user_id = ?",
+                    f"SELECT {epoch.epoch_sql('last_claim', utc=True)}, streak FROM daily_claims WHERE user_id = ?",
                     (ctx.author.id,),
                 ) as cursor:
                     row = await cursor.fetchone()
 
                 if row:
-                    last_claim_str, streak = row
-                    last_claim = datetime.fromisoformat(last_claim_str)
-                    time_diff = now - last_claim
+                    last_claim_ts, streak = row
+                    time_diff = timedelta(seconds=epoch.to_epoch(now, utc=True) - last_claim_ts)
 
                     if time_diff < timedelta(hours=24):
                         time_left = timedelta(hours=24) - time_diff
@@ -237,10 +240,10 @@ class Daily(commands.Cog):
 
                 await db.execute(
                     """
-                    INSERT OR REPLACE INTO daily_claims (user_id, last_claim, streak)
-                    VALUES (?, ?, ?)
+                    INSERT OR REPLACE INTO daily_claims (user_id, last_claim, last_claim_ts, streak)
+                    VALUES (?, ?, ?, ?)
                 """,
-                    (ctx.author.id, now.isoformat(), display_streak),
+                    (ctx.author.id, now.isoformat(), epoch.to_epoch(now, utc=True), display_streak),
                 )
 
                 await db.commit()
@@ -5,28 +5,26 @@ import random
 from config import DB_PATH
 from utils.embed import send_embed
 from utils.database import require_enrollment
+from utils.timer_wheel import TimedView
+from utils.edit_dispatcher import edits
+from utils.session_journal import open_session, checkpoint, close_session
+from utils.stat_store import add_stats, max_stats, get_stats
+# Card values and multiplier progression
+from utils.game_math import (
+    HILO_CARD_RANKS as CARD_RANKS,
+    HILO_CARD_SUITS as CARD_SUITS,
+    HILO_CARD_VALUES as CARD_VALUES,
+    HILO_MULTIPLIERS as MULTIPLIERS,
+    HILO_MAX_MULTIPLIER,
+    HILO_MAX_STREAK,
+    HILO_JOKER_CHANCE,
+    HILO_JOKER_MULTIPLIER,
+    hilo_multiplier,
+)
 
-# Card values
-CARD_RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-CARD_SUITS = ['♠', '♥', '♦', '♣']
-CARD_VALUES = {
-    '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9,
-    '10': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14
-}
+MULTIPLIER_TEXT = " | ".join(f"{streak}: {mult}x" for streak, mult in MULTIPLIERS.items()) + f" | {max(MULTIPLIERS) + 1}+: {HILO_MAX_MULTIPLIER}x"
 
-# Multiplier progression (lowered)
-MULTIPLIERS = {
-    1: 1.3,
-    2: 1.6,
-    3: 2.0,
-    4: 2.4,
-    5: 3.0,
-    6: 3.8,
-    7: 5.0,
-    8: 7.0
-}
-
-class HiLoView(discord.ui.View):
+class HiLoView(TimedView):
     def __init__(self, game_data, cog):
         super().__init__(timeout=120)
         self.game_data = game_data
@@ -46,22 +44,17 @@ class HiLoView(discord.ui.View):
         
         game = self.cog.active_games[user_id]
         streak = game['streak']
-        multiplier = MULTIPLIERS.get(streak, 10.0)
+        multiplier = hilo_multiplier(streak)
         winnings = int(game['bet'] * multiplier)
         
         # Update balance
         async with aiosqlite.connect(DB_PATH) as db:
             await db.execute("UPDATE users SET mora = mora + ? WHERE user_id = ?", (winnings, user_id))
+            await close_session(game.get('session_id'), db=db)
             
             # Update stats
-            await db.execute("""
-                INSERT INTO game_stats (user_id, hilo_games, hilo_cashouts, hilo_best_streak)
-                VALUES (?, 1, 1, ?)
-                ON CONFLICT(user_id) DO UPDATE SET
-                    hilo_games = hilo_games + 1,
-                    hilo_cashouts = hilo_cashouts + 1,
-                    hilo_best_streak = MAX(hilo_best_streak, ?)
-            """, (user_id, streak, streak))
+            await add_stats(user_id, {'hilo_games': 1, 'hilo_cashouts': 1}, db)
+            await max_stats(user_id, {'hilo_best_streak': streak}, db)
             
             cursor = await db.execute("SELECT mora FROM users WHERE user_id = ?", (user_id,))
             balance = (await cursor.fetchone())[0]
@@ -88,7 +81,7 @@ class HiLoView(discord.ui.View):
             item.disabled = True
         
         if self.message:
-            await self.message.edit(embed=embed, view=self)
+            await edits.edit(self.message, embed=embed, view=self)
         
         del self.cog.active_games[user_id]
     
@@ -117,7 +110,7 @@ class HiLo(commands.Cog):
     
     def draw_card(self):
         """Draw a random card or joker (0.2% chance)"""
-        if random.random() < 0.002:  # 0.2% chance
+        if random.random() < HILO_JOKER_CHANCE:  # 0.2% chance
             return "🃏"
         rank = random.choice(CARD_RANKS)
         suit = random.choice(CARD_SUITS)
@@ -159,14 +152,12 @@ class HiLo(commands.Cog):
                     "• Cash out anytime to keep your winnings\n"
                     "• Wrong guess = lose everything\n\n"
                     "**Multipliers:**\n"
-                    "1 streak: 1.5x | 2: 2.0x | 3: 2.5x\n"
-                    "4: 3.0x | 5: 4.0x | 6: 5.0x\n"
-                    "7: 7.0x | 8+: 10.0x\n\n"
+                    f"{MULTIPLIER_TEXT}\n\n"
                     "**Special:**\n"
-                    "• Joker (0.2%): Instant 50x win!\n"
+                    f"• Joker ({HILO_JOKER_CHANCE:.1%}): Instant {HILO_JOKER_MULTIPLIER}x win!\n"
                     "• Same card: Continue with no penalty\n"
                     "• Aces count as high (14)\n"
-                    "• Max 10 streak (auto cash out)"
+                    f"• Max {HILO_MAX_STREAK} streak (auto cash out)"
                 ),
                 color=0x3498DB
             )
@@ -192,8 +183,9 @@ class HiLo(commands.Cog):
             if not row or row[0] < bet_amount:
                 return await ctx.send(f"❌ You don't have enough mora! Balance: {row[0] if row else 0:,} <:mora:1437958309255577681>")
             
-            # Deduct bet
+            # Deduct bet (journaled in the same transaction so a restart can refund it)
             await db.execute("UPDATE users SET mora = mora - ? WHERE user_id = ?", (bet_amount, ctx.author.id))
+            session_id = await open_session(ctx.author.id, "hilo", bet_amount, db=db)
             await db.commit()
         
         # Start game
@@ -201,20 +193,20 @@ class HiLo(commands.Cog):
         
         # Handle starting with joker (rare)
         if current_card == "🃏":
-            return await self.handle_joker(ctx, bet_amount)
+            return await self.handle_joker(ctx, bet_amount, session_id)
         
         game_data = {
             "user_id": ctx.author.id,
             "bet": bet_amount,
             "current_card": current_card,
             "streak": 0,
-            "used_cards": [current_card]
+            "used_cards": [current_card],
+            "session_id": session_id
         }
         
         self.active_games[ctx.author.id] = game_data
         
-        multiplier = MULTIPLIERS.get(0, 1.0)
-        potential = int(bet_amount * MULTIPLIERS.get(1, 1.5))
+        potential = int(bet_amount * hilo_multiplier(1))
         
         embed = discord.Embed(
             title="🎴 HI-LO GAME",
@@ -256,7 +248,7 @@ class HiLo(commands.Cog):
             game['current_card'] = new_card
             game['used_cards'].append(new_card)
             
-            multiplier = MULTIPLIERS.get(game['streak'] + 1, 10.0)
+            multiplier = hilo_multiplier(game['streak'] + 1)
             potential = int(game['bet'] * multiplier)
             
             embed = discord.Embed(
@@ -283,13 +275,14 @@ class HiLo(commands.Cog):
             game['used_cards'].append(new_card)
             
             # Check for max streak (auto cash out)
-            if game['streak'] >= 10:
+            if game['streak'] >= HILO_MAX_STREAK:
                 return await self.force_cashout(interaction, view)
             
-            multiplier = MULTIPLIERS.get(game['streak'], 10.0)
-            next_multiplier = MULTIPLIERS.get(game['streak'] + 1, 10.0)
+            multiplier = hilo_multiplier(game['streak'])
+            next_multiplier = hilo_multiplier(game['streak'] + 1)
             current_win = int(game['bet'] * multiplier)
             next_win = int(game['bet'] * next_multiplier)
+            await checkpoint(game.get('session_id'), cashout=current_win, state={"streak": game['streak']})
             
             embed = discord.Embed(
                 title="<a:Trophy:1438199339586424925> CORRECT!",
@@ -308,14 +301,9 @@ class HiLo(commands.Cog):
         else:
             # Wrong guess - lose
             async with aiosqlite.connect(DB_PATH) as db:
-                await db.execute("""
-                    INSERT INTO game_stats (user_id, hilo_games, hilo_busts, hilo_best_streak)
-                    VALUES (?, 1, 1, ?)
-                    ON CONFLICT(user_id) DO UPDATE SET
-                        hilo_games = hilo_games + 1,
-                        hilo_busts = hilo_busts + 1,
-                        hilo_best_streak = MAX(hilo_best_streak, ?)
-                """, (user_id, game['streak'], game['streak']))
+                await add_stats(user_id, {'hilo_games': 1, 'hilo_busts': 1}, db)
+                await max_stats(user_id, {'hilo_best_streak': game['streak']}, db)
+                await close_session(game.get('session_id'), db=db)
                 await db.commit()
             
             # Apply golden card cashback (10%)
@@ -360,22 +348,17 @@ class HiLo(commands.Cog):
         if game['streak'] == 0:
             return await interaction.response.send_message("❌ You need at least 1 correct guess to cash out!", ephemeral=True)
         
-        multiplier = MULTIPLIERS.get(game['streak'], 10.0)
+        multiplier = hilo_multiplier(game['streak'])
         winnings = int(game['bet'] * multiplier)
         profit = winnings - game['bet']
         
         # Update balance
         async with aiosqlite.connect(DB_PATH) as db:
             await db.execute("UPDATE users SET mora = mora + ? WHERE user_id = ?", (winnings, user_id))
+            await close_session(game.get('session_id'), db=db)
             
-            await db.execute("""
-                INSERT INTO game_stats (user_id, hilo_games, hilo_cashouts, hilo_best_streak)
-                VALUES (?, 1, 1, ?)
-                ON CONFLICT(user_id) DO UPDATE SET
-                    hilo_games = hilo_games + 1,
-                    hilo_cashouts = hilo_cashouts + 1,
-                    hilo_best_streak = MAX(hilo_best_streak, ?)
-            """, (user_id, game['streak'], game['streak']))
+            await add_stats(user_id, {'hilo_games': 1, 'hilo_cashouts': 1}, db)
+            await max_stats(user_id, {'hilo_best_streak': game['streak']}, db)
             
             cursor = await db.execute("SELECT mora FROM users WHERE user_id = ?", (user_id,))
             balance = (await cursor.fetchone())[0]
@@ -408,21 +391,16 @@ class HiLo(commands.Cog):
         user_id = interaction.user.id
         game = self.active_games[user_id]
         
-        multiplier = 10.0
+        multiplier = HILO_MAX_MULTIPLIER
         winnings = int(game['bet'] * multiplier)
         profit = winnings - game['bet']
         
         async with aiosqlite.connect(DB_PATH) as db:
             await db.execute("UPDATE users SET mora = mora + ? WHERE user_id = ?", (winnings, user_id))
+            await close_session(game.get('session_id'), db=db)
             
-            await db.execute("""
-                INSERT INTO game_stats (user_id, hilo_games, hilo_cashouts, hilo_best_streak)
-                VALUES (?, 1, 1, 10)
-                ON CONFLICT(user_id) DO UPDATE SET
-                    hilo_games = hilo_games + 1,
-                    hilo_cashouts = hilo_cashouts + 1,
-                    hilo_best_streak = MAX(hilo_best_streak, 10)
-            """, (user_id,))
+            await add_stats(user_id, {'hilo_games': 1, 'hilo_cashouts': 1}, db)
+            await max_stats(user_id, {'hilo_best_streak': HILO_MAX_STREAK}, db)
             
             cursor = await db.execute("SELECT mora FROM users WHERE user_id = ?", (user_id,))
             balance = (await cursor.fetchone())[0]
@@ -432,8 +410,8 @@ class HiLo(commands.Cog):
             title="🏆 MAX STREAK - AUTO CASHOUT!",
             description=(
                 f"**Final Card:** {game['current_card']}\n"
-                f"**Streak:** 10 (MAX)\n"
-                f"**Multiplier:** 10.0x\n\n"
+                f"**Streak:** {HILO_MAX_STREAK} (MAX)\n"
+                f"**Multiplier:** {multiplier}x\n\n"
                 f"**Bet:** {game['bet']:,} <:mora:1437958309255577681>\n"
                 f"**Won:** {winnings:,} <:mora:1437958309255577681>\n"
                 f"**Profit:** {profit:+,} <:mora:1437958309255577681>\n\n"
@@ -450,20 +428,15 @@ class HiLo(commands.Cog):
         await interaction.response.edit_message(embed=embed, view=view)
         del self.active_games[user_id]
     
-    async def handle_joker(self, ctx, bet_amount):
+    async def handle_joker(self, ctx, bet_amount, session_id=None):
         """Handle joker drawn at start"""
-        winnings = int(bet_amount * 50)
+        winnings = int(bet_amount * HILO_JOKER_MULTIPLIER)
         
         async with aiosqlite.connect(DB_PATH) as db:
             await db.execute("UPDATE users SET mora = mora + ? WHERE user_id = ?", (winnings, ctx.author.id))
+            await close_session(session_id, db=db)
             
-            await db.execute("""
-                INSERT INTO game_stats (user_id, hilo_games, hilo_jokers)
-                VALUES (?, 1, 1)
-                ON CONFLICT(user_id) DO UPDATE SET
-                    hilo_games = hilo_games + 1,
-                    hilo_jokers = hilo_jokers + 1
-            """, (ctx.author.id,))
+            await add_stats(ctx.author.id, {'hilo_games': 1, 'hilo_jokers': 1}, db)
             
             cursor = await db.execute("SELECT mora FROM users WHERE user_id = ?", (ctx.author.id,))
             balance = (await cursor.fetchone())[0]
@@ -475,7 +448,7 @@ class HiLo(commands.Cog):
                 f"You drew the legendary Joker!\n\n"
                 f"**Bet:** {bet_amount:,} <:mora:1437958309255577681>\n"
                 f"**Won:** {winnings:,} <:mora:1437958309255577681>\n"
-                f"**Multiplier:** 50.0x\n\n"
+                f"**Multiplier:** {HILO_JOKER_MULTIPLIER:.1f}x\n\n"
                 f"New Balance: {balance:,} <:mora:1437958309255577681>\n\n"
                 f"Incredible luck! (0.2% chance)"
             ),
@@ -490,19 +463,14 @@ class HiLo(commands.Cog):
         user_id = interaction.user.id
         game = self.active_games[user_id]
         
-        winnings = int(game['bet'] * 50)
+        winnings = int(game['bet'] * HILO_JOKER_MULTIPLIER)
         
         async with aiosqlite.connect(DB_PATH) as db:
             await db.execute("UPDATE users SET mora = mora + ? WHERE user_id = ?", (winnings, user_id))
+            await close_session(game.get('session_id'), db=db)
             
-            await db.execute("""
-                INSERT INTO game_stats (user_id, hilo_games, hilo_jokers, hilo_best_streak)
-                VALUES (?, 1, 1, ?)
-                ON CONFLICT(user_id) DO UPDATE SET
-                    hilo_games = hilo_games + 1,
-                    hilo_jokers = hilo_jokers + 1,
-                    hilo_best_streak = MAX(hilo_best_streak, ?)
-            """, (user_id, game['streak'], game['streak']))
+            await add_stats(user_id, {'hilo_games': 1, 'hilo_jokers': 1}, db)
+            await max_stats(user_id, {'hilo_best_streak': game['streak']}, db)
             
             cursor = await db.execute("SELECT mora FROM users WHERE user_id = ?", (user_id,))
             balance = (await cursor.fetchone())[0]
@@ -516,7 +484,7 @@ class HiLo(commands.Cog):
                 f"**Streak before Joker:** {game['streak']}\n"
                 f"**Bet:** {game['bet']:,} <:mora:1437958309255577681>\n"
                 f"**Won:** {winnings:,} <:mora:1437958309255577681>\n"
-                f"**Multiplier:** 50.0x\n\n"
+                f"**Multiplier:** {HILO_JOKER_MULTIPLIER:.1f}x\n\n"
                 f"New Balance: {balance:,} <:mora:1437958309255577681>\n\n"
                 f"Incredible luck! (0.2% chance)"
             ),
@@ -532,17 +500,12 @@ class HiLo(commands.Cog):
     
     async def show_stats(self, ctx):
         """Show user's Hi-Lo statistics"""
-        async with aiosqlite.connect(DB_PATH) as db:
-            cursor = await db.execute("""
-                SELECT hilo_games, hilo_cashouts, hilo_busts, hilo_best_streak, hilo_jokers
-                FROM game_stats WHERE user_id = ?
-            """, (ctx.author.id,))
-            row = await cursor.fetchone()
+        stats = await get_stats(ctx.author.id, ('hilo_games', 'hilo_cashouts', 'hilo_busts', 'hilo_best_streak', 'hilo_jokers'))
+        games, cashouts, busts, best_streak, jokers = stats.values()
         
-        if not row or row[0] == 0:
+        if games == 0:
             return await ctx.send("❌ You haven't played any Hi-Lo games yet!")
         
-        games, cashouts, busts, best_streak, jokers = row
         cashout_rate = (cashouts / games * 100) if games > 0 else 0
         
         embed = discord.Embed(
@@ -3,12 +3,13 @@ from discord.ext import commands
 import aiosqlite
 from datetime import datetime, timedelta
 from config import DB_PATH
-from utils.database import require_enrollment
+from utils import epoch
+from utils.database import has_xp_booster, require_enrollment
 from utils.embed import send_embed
 
 
 # Import item definitions from blackmarket
-from cogs.blackmarket import ITEMS, RARITY_COLORS
+from cogs.blackmarket import ITEMS, RARITY_COLORS, CATALOG, did_you_mean
 
 
 class BankUpgradeView(discord.ui.View):
@@ -148,17 +149,11 @@ class Inventory(commands.Cog):
         if item_name is None:
             return await ctx.send("<a:X_:1437951830393884788> Usage: `guse <item name>`\nExample: `guse xp booster`")
 
-        # Find item
-        item_id = None
-        item_name_lower = item_name.lower().replace(" ", "_")
-        
-        for iid, item in ITEMS.items():
-            if iid == item_name_lower or item["name"].lower() == item_name.lower():
-                item_id = iid
-                break
+        # Exact name, id or alias only: a guess must not use up an item
+        item_id = CATALOG.resolve(item_name)
 
         if item_id is None:
-            return await ctx.send("<a:X_:1437951830393884788> Item not found!")
+            return await ctx.send(f"<a:X_:1437951830393884788> Item not found!{did_you_mean(item_name)}")
 
         item = ITEMS[item_id]
 
@@ -314,27 +309,16 @@ class Inventory(commands.Cog):
 
             # Check if already active for non-stackable items
             if not item.get("stackable", False):
-                async with db.execute(
-                    "SELECT activated_at FROM inventory WHERE user_id = ? AND item_id = ? AND activated_at IS NOT NULL",
-                    (ctx.author.id, item_id)
-                ) as cursor:
-                    active = await cursor.fetchone()
-                    
-                    if active:
-                        activated_time = datetime.fromisoformat(active[0])
-                        
-                        # Check if still active
-                        if item_id == "xp_booster":
-                            expiry = activated_time + timedelta(minutes=30)
-                            if datetime.now() < expiry:
-                                return await ctx.send(f"<a:X_:1437951830393884788> You already have an active {item['emoji']} **{item['name']}**!")
+                if item_id == "xp_booster" and await has_xp_booster(ctx.author.id):
+                    return await ctx.send(f"<a:X_:1437951830393884788> You already have an active {item['emoji']} **{item['name']}**!")
 
             # Activate item based on type
             if item_id == "xp_booster":
                 # Activate XP booster
+                activated_at = datetime.now()
                 await db.execute(
-                    "UPDATE inventory SET activated_at = ? WHERE user_id = ? AND item_id = ?",
-                    (datetime.now().isoformat(), ctx.author.id, item_id)
+                    "UPDATE inventory SET activated_at = ?, activated_at_ts = ? WHERE user_id = ? AND item_id = ?",
+                    (activated_at.isoformat(), epoch.to_epoch(activated_at), ctx.author.id, item_id)
                 )
                 await db.commit()
                 
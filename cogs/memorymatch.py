@@ -3,15 +3,15 @@ import discord
 from discord.ext import commands
 import random
 import asyncio
-import aiosqlite
 from datetime import datetime
 from typing import Union
-from config import DB_PATH
 from utils.database import get_user_data, update_user_data, ensure_user_db, require_enrollment
 from utils.embed import send_embed
+from utils.stat_store import add_stats, add_stats_many
+from utils.timer_wheel import TimedView
 
 
-class ChallengeView(discord.ui.View):
+class ChallengeView(TimedView):
     """Accept/Decline challenge buttons"""
     
     def __init__(self, challenger_id, opponent_id, bet):
@@ -47,7 +47,7 @@ class ChallengeView(discord.ui.View):
         )
 
 
-class SoloMemoryMatchView(discord.ui.View):
+class SoloMemoryMatchView(TimedView):
     """Button grid for solo memory match game"""
     
     def __init__(self, game_data, cog):
@@ -205,15 +205,7 @@ class SoloMemoryMatchView(discord.ui.View):
         await update_user_data(game['player_id'], mora=new_balance)
         
         # Update stats
-        async with aiosqlite.connect(DB_PATH) as db:
-            await db.execute("""
-                INSERT INTO game_stats (user_id, memory_games, memory_wins)
-                VALUES (?, 1, 1)
-                ON CONFLICT(user_id) DO UPDATE SET
-                    memory_games = memory_games + 1,
-                    memory_wins = memory_wins + 1
-            """, (game['player_id'],))
-            await db.commit()
+        await add_stats(game['player_id'], {'memory_games': 1, 'memory_wins': 1})
         
         # Disable all buttons
         for item in self.children:
@@ -244,6 +236,9 @@ class SoloMemoryMatchView(discord.ui.View):
             if self.message:
                 await self.message.edit(embed=embed, view=self)
         
+        # Game is over, drop the pending timeout
+        self.stop()
+        
         # Remove from active games
         if game['player_id'] in self.cog.active_games:
             del self.cog.active_games[game['player_id']]
@@ -253,15 +248,7 @@ class SoloMemoryMatchView(discord.ui.View):
         game = self.game_data
         
         # Update stats
-        async with aiosqlite.connect(DB_PATH) as db:
-            await db.execute("""
-                INSERT INTO game_stats (user_id, memory_games, memory_losses)
-                VALUES (?, 1, 1)
-                ON CONFLICT(user_id) DO UPDATE SET
-                    memory_games = memory_games + 1,
-                    memory_losses = memory_losses + 1
-            """, (game['player_id'],))
-            await db.commit()
+        await add_stats(game['player_id'], {'memory_games': 1, 'memory_losses': 1})
         
         # Disable all buttons
         for item in self.children:
@@ -287,7 +274,7 @@ class SoloMemoryMatchView(discord.ui.View):
             del self.cog.active_games[game['player_id']]
 
 
-class MemoryMatchView(discord.ui.View):
+class MemoryMatchView(TimedView):
     """Button grid for memory match game"""
     
     def __init__(self, game_data, cog):
@@ -490,24 +477,10 @@ class MemoryMatchView(discord.ui.View):
         await update_user_data(winner_id, mora=new_balance)
         
         # Update stats
-        async with aiosqlite.connect(DB_PATH) as db:
-            await db.execute("""
-                INSERT INTO game_stats (user_id, memory_games, memory_wins)
-                VALUES (?, 1, 1)
-                ON CONFLICT(user_id) DO UPDATE SET
-                    memory_games = memory_games + 1,
-                    memory_wins = memory_wins + 1
-            """, (winner_id,))
-            
-            await db.execute("""
-                INSERT INTO game_stats (user_id, memory_games, memory_losses)
-                VALUES (?, 1, 1)
-                ON CONFLICT(user_id) DO UPDATE SET
-                    memory_games = memory_games + 1,
-                    memory_losses = memory_losses + 1
-            """, (loser_id,))
-            
-            await db.commit()
+        await add_stats_many([
+            (winner_id, 'memory_games', 1), (winner_id, 'memory_wins', 1),
+            (loser_id, 'memory_games', 1), (loser_id, 'memory_losses', 1),
+        ])
         
         # Disable all buttons
         for item in self.children:
@@ -531,6 +504,9 @@ class MemoryMatchView(discord.ui.View):
             if self.message:
                 await self.message.edit(embed=embed, view=self)
         
+        # Game is over, drop the pending timeout
+        self.stop()
+        
         # Remove from active games
         game_key = f"{game['player1_id']}_{game['player2_id']}"
         if game_key in self.cog.active_games:
@@ -579,27 +555,6 @@ class MemoryMatch(commands.Cog):
         self.bot = bot
         self.active_games = {}
     
-    async def cog_load(self):
-        """Add memory match columns to database"""
-        async with aiosqlite.connect(DB_PATH) as db:
-            try:
-                await db.execute("ALTER TABLE game_stats ADD COLUMN memory_games INTEGER DEFAULT 0")
-                await db.commit()
-            except:
-                pass
-            
-            try:
-                await db.execute("ALTER TABLE game_stats ADD COLUMN memory_wins INTEGER DEFAULT 0")
-                await db.commit()
-            except:
-                pass
-            
-            try:
-                await db.execute("ALTER TABLE game_stats ADD COLUMN memory_losses INTEGER DEFAULT 0")
-                await db.commit()
-            except:
-                pass
-    
     @commands.command(name="memory", aliases=["memorymatch", "match"])
     async def memory_match(self, ctx, opponent_or_bet: Union[discord.Member, str] = None, bet: str = None):
         """Play Memory Match solo or challenge someone to PVP
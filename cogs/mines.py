@@ -1,10 +1,11 @@
 import random
 import discord
 from discord.ext import commands
-import aiosqlite
-from config import DB_PATH
 from utils.database import get_user_data, update_user_data, require_enrollment, track_game_stat, check_and_award_game_achievements, add_account_exp
+from utils.session_journal import open_session, checkpoint, close_session
 from utils.embed import send_embed
+from utils.global_bank import add_to_bank
+from utils.game_math import mines_multiplier
 
 
 BOMB = "💣"
@@ -32,6 +33,7 @@ class MinesGame:
         self.revealed = set()
         self.finished = False
         self.settle_cb = settle_cb
+        self.session_id = None
 
     @property
     def found_money_count(self):
@@ -41,13 +43,11 @@ class MinesGame:
     def potential_payout(self):
         # multiplier increases every 2 boxes: +0.2x per 2 boxes found
         # Perfect game (all 13 boxes) = 3x multiplier
-        boxes_found = self.found_money_count
-        max_boxes = self.total_cells - self.bombs  # 16 - 3 = 13
-        if boxes_found == max_boxes:
-            multiplier = 3.0  # Perfect game bonus
-        else:
-            multiplier = 1.0 + 0.2 * (boxes_found // 2)
-        return int(self.bet * multiplier)
+        return int(self.bet * self.multiplier)
+
+    @property
+    def multiplier(self):
+        return mines_multiplier(self.found_money_count, self.total_cells, self.bombs)
 
     def reveal_index(self, idx: int):
         if self.finished:
@@ -135,6 +135,9 @@ class MinesButton(discord.ui.Button):
                     pass
             return
 
+        # safe reveal: a restart now pays out what cashing out would
+        await checkpoint(game.session_id, cashout=game.potential_payout, state={"revealed": len(game.revealed)})
+
         embed = view.make_embed()
         await interaction.response.edit_message(embed=embed, view=view)
 
@@ -270,14 +273,8 @@ class MinesView(discord.ui.View):
             name=game.user.display_name, icon_url=game.user.display_avatar.url
         )
         embed.add_field(name="Bet", value=f"{game.bet:,}", inline=True)
-        # Calculate multiplier: +0.2x every 2 boxes, 3x for perfect game
-        boxes_found = game.found_money_count
-        max_boxes = game.total_cells - game.bombs
-        if boxes_found == max_boxes:
-            multiplier = 3.0
-        else:
-            multiplier = 1.0 + 0.2 * (boxes_found // 2)
-        embed.add_field(name="Multiplier", value=f"{multiplier:.1f}x", inline=True)
+        # Multiplier: +0.2x every 2 boxes, 3x for perfect game
+        embed.add_field(name="Multiplier", value=f"{game.multiplier:.1f}x", inline=True)
         embed.add_field(
             name="Potential Payout", value=f"{game.potential_payout:,}", inline=True
         )
@@ -355,6 +352,7 @@ class Mines(commands.Cog):
 
             # deduct bet up-front (escrow)
             await update_user_data(ctx.author.id, mora=mora - bet_amount)
+            session_id = await open_session(ctx.author.id, "mines", bet_amount)
 
             # settle callback: credit payout (amount) back to user if won cashout, or zero on loss
             async def settle_cb(user, amount: int, won: bool):
@@ -367,20 +365,17 @@ class Mines(commands.Cog):
                         )
                     elif not won:
                         # Lost the game - add bet to bank
-                        async with aiosqlite.connect(DB_PATH) as db:
-                            await db.execute(
-                                "UPDATE global_bank SET balance = balance + ? WHERE id = 1",
-                                (bet_amount,)
-                            )
-                            await db.commit()
+                        await add_to_bank(bet_amount, user.id)
                     # (no DM) result notification is intentionally suppressed to avoid sending users DMs
                 except Exception as e:
                     print(f"Error in mines settle_cb: {e}")
+                await close_session(session_id)
 
             # create game and view
             game = MinesGame(
                 ctx.author, bet_amount, bombs=3, size=4, settle_cb=settle_cb
             )
+            game.session_id = session_id
             view = MinesView(game)
             embed = view.make_embed()
             await send_embed(ctx, embed, view=view)
@@ -6,13 +6,16 @@ from discord.ext import commands
 import aiosqlite
 
 from config import OWNER_ID, DB_PATH
+from utils import epoch
 from utils.constants import filtered_words
 from utils.database import (
     add_chest_with_type,
+    forget_bootstrapped,
     get_user_data,
     reset_wishes,
     update_user_data,
 )
+from utils.global_bank import add_to_bank, get_bank_balance, set_bank_balance
 from utils.logger import setup_logger
 
 logger = setup_logger("Moderation")
@@ -468,32 +471,17 @@ class Moderation(commands.Cog):
             await ctx.send(f"Gave {amount} 🪱 Fish Bait to {target_member.display_name}.")
             return
 
-        # Black Market Items
-        blackmarket_items = {
-            "lucky_dice": ("<:dice:1457965149137670186>", "Lucky Dice"),
-            "golden_chip": ("<:goldenchip:1457964285207646264>", "Golden Chip"),
-            "xp_booster": ("<:exp:1437553839359397928>", "XP Booster"),
-            "bankers_key": ("<a:bankerskey:1457962936076075049>", "Banker's Key"),
-            "streak_shield": ("<a:shield:1457967376799629324>", "Streak Shield"),
-            "hot_streak": ("<:streak:1457966635838214247>", "Hot Streak Card"),
-            "rigged_deck": ("<a:deck:1457965675082551306>", "Rigged Deck"),
-            "plasma_canon": ("<:plasmacanon:1457975521521434624>", "Plasma Canon"),
-            "special_crate": ("<a:crate:1457969509770985492>", "Special Crate"),
-            "bank_upgrade": ("<:upgrade:1457983244682268695>", "Bank Upgrade"),
-            "shotgun": ("🔫", "Shotgun"),
-            "thiefpack": ("🎒", "Thief Pack"),
-            "guarddog": ("🐕", "Guard Dog"),
-            "fence": ("<:fench:1458002114260242454>", "Spiky Fence"),
-            "lock": ("🔒", "Lock")
-        }
+        # Black Market Items (purchasable ones; chests are handled above)
+        from cogs.blackmarket import ITEMS, CATALOG, did_you_mean
+        item_id = CATALOG.resolve(item)
         
-        if item_lower in blackmarket_items:
-            emoji, name = blackmarket_items[item_lower]
+        if item_id is not None and CATALOG.price_of[item_id] is not None:
+            emoji, name = ITEMS[item_id]["emoji"], ITEMS[item_id]["name"]
             async with aiosqlite.connect(DB_PATH) as db:
                 # Check if user already has this item
                 async with db.execute(
                     "SELECT quantity FROM inventory WHERE user_id = ? AND item_id = ?",
-                    (target_member.id, item_lower)
+                    (target_member.id, item_id)
                 ) as cursor:
                     result = await cursor.fetchone()
                 
@@ -501,20 +489,20 @@ class Moderation(commands.Cog):
                     # Update existing
                     await db.execute(
                         "UPDATE inventory SET quantity = quantity + ? WHERE user_id = ? AND item_id = ?",
-                        (amount, target_member.id, item_lower)
+                        (amount, target_member.id, item_id)
                     )
                 else:
                     # Insert new
                     await db.execute(
                         "INSERT INTO inventory (user_id, item_id, quantity) VALUES (?, ?, ?)",
-                        (target_member.id, item_lower, amount)
+                        (target_member.id, item_id, amount)
                     )
                 await db.commit()
             
             await ctx.send(f"Gave {amount} {emoji} **{name}** to {target_member.display_name}.")
             return
 
-        await ctx.send(f"Unknown item: {item}. Check ggrant help for available items.")
+        await ctx.send(f"Unknown item: {item}.{did_you_mean(item)} Check ggrant help for available items.")
 
     @commands.command(name="remove", aliases=["take"])
     async def remove(self, ctx, member: discord.Member, amount: int):
@@ -587,10 +575,7 @@ class Moderation(commands.Cog):
             )
             
             # Also remove from global bank
-            await db.execute(
-                "UPDATE global_bank SET balance = balance - ? WHERE id = 1",
-                (amount,)
-            )
+            await add_to_bank(-amount, member.id, db=db, exact=True)
             
             await db.commit()
         
@@ -615,14 +600,7 @@ class Moderation(commands.Cog):
 
         async with aiosqlite.connect(DB_PATH) as db:
             # Get current global bank balance
-            cursor = await db.execute("SELECT balance FROM global_bank WHERE id = 1")
-            row = await cursor.fetchone()
-            
-            if not row:
-                await ctx.send("Global bank not found.")
-                return
-            
-            current_balance = row[0]
+            current_balance = await get_bank_balance(db)
             
             if current_balance < amount:
                 await ctx.send(f"Global bank only has {current_balance:,} <:mora:1437958309255577681>. Cannot remove {amount:,}.")
@@ -631,10 +609,7 @@ class Moderation(commands.Cog):
             new_balance = current_balance - amount
             
             # Update global bank
-            await db.execute(
-                "UPDATE global_bank SET balance = ? WHERE id = 1",
-                (new_balance,)
-            )
+            await add_to_bank(-amount, ctx.author.id, db=db, exact=True)
             
             await db.commit()
         
@@ -659,21 +634,11 @@ class Moderation(commands.Cog):
 
         async with aiosqlite.connect(DB_PATH) as db:
             # Get current global bank balance
-            cursor = await db.execute("SELECT balance FROM global_bank WHERE id = 1")
-            row = await cursor.fetchone()
-            
-            if not row:
-                await ctx.send("Global bank not found.")
-                return
-            
-            current_balance = row[0]
+            current_balance = await get_bank_balance(db)
             new_balance = current_balance + amount
             
             # Update global bank
-            await db.execute(
-                "UPDATE global_bank SET balance = ? WHERE id = 1",
-                (new_balance,)
-            )
+            await add_to_bank(amount, ctx.author.id, db=db, exact=True)
             
             await db.commit()
         
@@ -753,7 +718,7 @@ class Moderation(commands.Cog):
                     "p2p_loans",
                     "rob_cooldowns",
                     "rob_items",
-                    "game_stats",
+                    "user_stats",
                     "transaction_logs",
                     "pulls",
                     "dispatches",
@@ -769,6 +734,7 @@ class Moderation(commands.Cog):
                         pass  # Table might not exist or have different structure
                 
                 await db.commit()
+            forget_bootstrapped(member.id)
             
             embed = discord.Embed(
                 title="🗑️ User Data Wiped",
@@ -1354,14 +1320,14 @@ class Moderation(commands.Cog):
         try:
             async with aiosqlite.connect(DB_PATH) as db:
                 async with db.execute(
-                    "SELECT last_claim FROM daily_claims WHERE user_id=?",
+                    f"SELECT {epoch.epoch_sql('last_claim', utc=True)} FROM daily_claims WHERE user_id=?",
                     (ctx.author.id,),
                 ) as cur:
                     row = await cur.fetchone()
 
-                if row and row[0]:
-                    last_claim = dt.fromisoformat(row[0])
-                    next_claim = last_claim + timedelta(hours=24)
+                if row and row[0] is not None:
+                    # daily claims are stored in UTC
+                    next_claim = epoch.from_epoch(row[0], utc=True) + timedelta(hours=24)
                     now = dt.utcnow()
 
                     if now >= next_claim:
@@ -1794,7 +1760,7 @@ class Moderation(commands.Cog):
                     "achievements", "badges", "fishing", "caught_fish", "pets",
                     "quests", "user_items", "shop_purchases", "game_limits",
                     "user_settings", "trades", "premium_users", "rob_items",
-                    "rob_cooldowns", "game_stats", "fish_caught", "fish_pets"
+                    "rob_cooldowns", "user_stats", "fish_caught", "fish_pets"
                 ]
                 
                 total_deleted = 0
@@ -1807,11 +1773,12 @@ class Moderation(commands.Cog):
                 
                 # Reset global bank to 1M
                 try:
-                    await db.execute("UPDATE global_bank SET balance = 1000000 WHERE id = 1")
+                    await set_bank_balance(1000000, db=db)
                 except:
                     pass
                 
                 await db.commit()
+            forget_bootstrapped()
             
             embed = discord.Embed(
                 title="✅ Database Wiped",
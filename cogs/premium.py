@@ -5,6 +5,7 @@ from discord import ui
 import aiosqlite
 from datetime import datetime, timedelta
 from config import DB_PATH
+from utils import epoch
 from utils.embed import send_embed
 
 
@@ -331,7 +332,8 @@ class Premium(commands.Cog):
                         expires_at TEXT,
                         subscribed_at TEXT,
                         lifetime INTEGER DEFAULT 0,
-                        custom_badge TEXT DEFAULT NULL
+                        custom_badge TEXT DEFAULT NULL,
+                        expires_at_ts INTEGER
                     )
                 """)
                 # Add custom_badge column if it doesn't exist
@@ -339,6 +341,7 @@ class Premium(commands.Cog):
                     await db.execute("ALTER TABLE premium_users ADD COLUMN custom_badge TEXT DEFAULT NULL")
                 except:
                     pass  # Column already exists
+                await epoch.ensure_epoch_column(db, "premium_users", "expires_at", where="lifetime = 0")
                 await db.commit()
         except Exception as e:
             print(f"Error loading Premium cog: {e}")
@@ -356,28 +359,13 @@ class Premium(commands.Cog):
     async def is_premium(self, user_id: int, tier: str = None) -> bool:
         """Check if user has active premium subscription"""
         async with aiosqlite.connect(DB_PATH) as db:
+            # Lifetime, no expiry set, or not expired yet (all premium tiers have same features now)
+            expires = epoch.epoch_sql("expires_at")
             cursor = await db.execute(
-                "SELECT tier, expires_at, lifetime FROM premium_users WHERE user_id = ?",
-                (user_id,)
+                f"SELECT 1 FROM premium_users WHERE user_id = ? AND (lifetime OR {expires} IS NULL OR {expires} >= ?)",
+                (user_id, epoch.now())
             )
-            row = await cursor.fetchone()
-            if not row:
-                return False
-            
-            user_tier, expires_at, lifetime = row
-            
-            # Lifetime premium
-            if lifetime:
-                return True
-            
-            # Check if expired
-            if expires_at:
-                expiry = datetime.fromisoformat(expires_at)
-                if datetime.now() > expiry:
-                    return False
-            
-            # All premium tiers have same features now
-            return True
+            return await cursor.fetchone() is not None
     
     async def get_premium_info(self, user_id: int):
         """Get user's premium subscription info"""
@@ -490,14 +478,15 @@ class Premium(commands.Cog):
             else:
                 expires_at = datetime.now() + timedelta(days=days)
                 await db.execute("""
-                    INSERT INTO premium_users (user_id, tier, expires_at, subscribed_at, lifetime)
-                    VALUES (?, 'premium', ?, ?, 0)
+                    INSERT INTO premium_users (user_id, tier, expires_at, expires_at_ts, subscribed_at, lifetime)
+                    VALUES (?, 'premium', ?, ?, ?, 0)
                     ON CONFLICT(user_id) DO UPDATE SET
                         tier = 'premium',
                         expires_at = excluded.expires_at,
+                        expires_at_ts = excluded.expires_at_ts,
                         subscribed_at = excluded.subscribed_at,
                         lifetime = 0
-                """, (user.id, expires_at.isoformat(), subscribed_at.isoformat()))
+                """, (user.id, expires_at.isoformat(), epoch.to_epoch(expires_at), subscribed_at.isoformat()))
             await db.commit()
         
         await ctx.send(
@@ -1,16 +1,12 @@
 
 import discord
 from discord.ext import commands
-import aiosqlite
 import random
-from config import DB_PATH
-from utils.database import get_user_data, update_user_data, require_enrollment, track_game_stat, check_and_award_game_achievements, add_account_exp
+from utils.database import get_user_data, update_user_data, require_enrollment, track_game_stat, track_game_stats, check_and_award_game_achievements, add_account_exp
 from utils.embed import send_embed
-
-
-# Roulette wheel layout
-RED_NUMBERS = [1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36]
-BLACK_NUMBERS = [2, 4, 6, 8, 10, 11, 13, 15, 17, 20, 22, 24, 26, 28, 29, 31, 33, 35]
+from utils.global_bank import add_to_bank
+# Roulette wheel layout and bet rules
+from utils.game_math import RED_NUMBERS, roulette_multiplier
 
 
 class Roulette(commands.Cog):
@@ -29,66 +25,7 @@ class Roulette(commands.Cog):
 
     def check_win(self, number, bet_type, bet_value):
         """Check if the bet won and return payout multiplier"""
-        # Straight up bet
-        if bet_type == "straight":
-            if number == bet_value:
-                return 30
-            return 0
-
-        # Red/Black
-        if bet_type == "red":
-            if number in RED_NUMBERS:
-                return 1
-            return 0
-        
-        if bet_type == "black":
-            if number in BLACK_NUMBERS:
-                return 1
-            return 0
-
-        # Odd/Even (0 loses)
-        if bet_type == "odd":
-            if number != 0 and number % 2 == 1:
-                return 1
-            return 0
-        
-        if bet_type == "even":
-            if number != 0 and number % 2 == 0:
-                return 1
-            return 0
-
-        # Low/High (0 loses)
-        if bet_type == "low":
-            if 1 <= number <= 18:
-                return 1
-            return 0
-        
-        if bet_type == "high":
-            if 19 <= number <= 36:
-                return 1
-            return 0
-
-        # Dozens
-        if bet_type == "dozen":
-            if bet_value == 1 and 1 <= number <= 12:
-                return 2
-            elif bet_value == 2 and 13 <= number <= 24:
-                return 2
-            elif bet_value == 3 and 25 <= number <= 36:
-                return 2
-            return 0
-
-        # Columns
-        if bet_type == "column":
-            if bet_value == 1 and number % 3 == 1 and number != 0:
-                return 2
-            elif bet_value == 2 and number % 3 == 2 and number != 0:
-                return 2
-            elif bet_value == 3 and number % 3 == 0 and number != 0:
-                return 2
-            return 0
-
-        return 0
+        return roulette_multiplier(number, bet_type, bet_value)
 
     @commands.command(name="roulette", aliases=["rlt"])
     async def roulette(self, ctx, bet_type: str = None, bet_value: str = None, amount: str = None):
@@ -227,8 +164,7 @@ class Roulette(commands.Cog):
             
             # Track stats
             try:
-                await track_game_stat(ctx.author.id, "roulette_wins")
-                await track_game_stat(ctx.author.id, "roulette_plays")
+                await track_game_stats([(ctx.author.id, "roulette_wins"), (ctx.author.id, "roulette_plays")])
                 await check_and_award_game_achievements(ctx.author.id, self.bot, ctx)
                 
                 # Award XP
@@ -272,12 +208,7 @@ class Roulette(commands.Cog):
             
             # Add loss to global bank
             try:
-                async with aiosqlite.connect(DB_PATH) as db:
-                    await db.execute(
-                        "UPDATE global_bank SET balance = balance + ? WHERE id = 1",
-                        (bet_amount,)
-                    )
-                    await db.commit()
+                await add_to_bank(bet_amount, ctx.author.id)
             except Exception:
                 pass
             
@@ -5,7 +5,7 @@ from datetime import datetime, timedelta
 import discord
 from discord.ext import commands
 
-from utils.database import get_user_data, update_user_data, track_game_stat, check_and_award_game_achievements, add_account_exp
+from utils.database import get_user_data, update_user_data, track_game_stat, track_game_stats, check_and_award_game_achievements, add_account_exp
 from utils.embed import send_embed
 
 
@@ -97,8 +97,7 @@ class RPS(commands.Cog):
 
             # Track game stat and check achievements
             try:
-                await track_game_stat(ctx.author.id, "rps_wins")
-                await track_game_stat(ctx.author.id, "rps_plays")
+                await track_game_stats([(ctx.author.id, "rps_wins"), (ctx.author.id, "rps_plays")])
                 await check_and_award_game_achievements(ctx.author.id, self.bot, ctx)
             except Exception:
                 pass
@@ -1,11 +1,16 @@
 import discord
 from discord.ext import commands
 import aiosqlite
-import asyncio
 import random
 from datetime import datetime
 from config import DB_PATH
 from utils.embed import send_embed
+from utils.timer_wheel import timers
+from utils.edit_dispatcher import edits
+from utils.session_journal import open_session, checkpoint, close_session
+from utils.stat_store import add_stats, min_stats, set_stats, get_stat, get_stats
+from utils.message_router import router
+from utils.scramble_index import ScrambleIndex
 
 
 class EndlessCashOutView(discord.ui.View):
@@ -29,108 +34,104 @@ class EndlessCashOutView(discord.ui.View):
         await interaction.message.edit(view=self)
 
 
-# Word lists by difficulty (200 words each)
-WORD_LISTS = {
-    "easy": [
-        "TEAM", "RACE", "JUMP", "CAKE", "PARK", "BIRD", "FISH", "STAR", "MOON", "TREE",
-        "BOAT", "DOOR", "FIRE", "GOLD", "HOME", "KING", "LION", "RAIN", "WIND", "SNOW",
-        "COIN", "DECK", "FROG", "GIFT", "HAND", "IRON", "JADE", "KITE", "LAMP", "MASK",
-        "NOTE", "OVER", "PEAK", "RING", "SHIP", "TIDE", "UNIT", "VASE", "WAVE", "ZONE",
-        "BELL", "CARD", "DIAL", "EPIC", "FLAG", "GAME", "HERO", "ISLE", "JOKE", "KEYS",
-        "LUCK", "MAZE", "NEWS", "OPEN", "PAGE", "QUIZ", "RUST", "SAFE", "TIME", "UNDO",
-        "ARCH", "BARN", "CLAW", "DAWN", "EDGE", "FARM", "GATE", "HILL", "INCH", "JAIL",
-        "KEEP", "LEAF", "MIST", "NEST", "OATH", "PATH", "QUIT", "ROBE", "SAIL", "TAIL",
-        "UGLY", "VINE", "WISE", "YARN", "ZOOM", "APEX", "BOLT", "CAVE", "DUCK", "EAST",
-        "FANG", "GULF", "HAWK", "ICON", "JUNK", "KIWI", "LAVA", "MINT", "NOON", "OPAL",
-        "PEAR", "REEF", "SALT", "TENT", "VEIL", "WAND", "YELL", "ZERO", "AREA", "BEAM",
-        "COAT", "DEER", "EXAM", "FOIL", "GLOW", "HIVE", "IRIS", "JADE", "KNEE", "LENS",
-        "MOLD", "NAIL", "OVEN", "PAWS", "RICE", "SAGE", "TOMB", "URGE", "VIEW", "WOLF",
-        "YAWN", "ABLE", "BEAM", "COIL", "DUSK", "EARN", "FLAP", "GAZE", "HORN", "IDOL",
-        "JUMP", "KIND", "LOUD", "MILD", "NAVY", "ONLY", "PLUG", "RAMP", "SILK", "TOAD",
-        "UNIT", "VICE", "WAIT", "YOLK", "ZEAL", "ACNE", "BASH", "COZY", "DROP", "EVEN",
-        "FOAM", "GRIP", "HOUR", "IDEA", "JUST", "KALE", "LURE", "MUTE", "NUMB", "OVAL",
-        "PACT", "RASH", "SLAP", "TRIM", "UNDO", "VOWS", "WASP", "YANK", "ZEST", "ACME",
-        "BUFF", "CRIB", "DUEL", "EMIT", "FOLD", "GRAM", "HUGE", "ITCH", "JOLT", "KELP",
-        "LOOP", "MOTH", "NEON", "ODDS", "PALM", "RUSE", "SODA", "TAXI", "UNIT", "VERB"
-    ],
-    "medium": [
-        "APPLE", "PHONE", "MUSIC", "MONEY", "WATER", "HOUSE", "CHAIR", "TABLE", "CLOCK", "LIGHT",
-        "PAPER", "SHIRT", "PANTS", "SHOES", "WATCH", "BREAD", "LUNCH", "DRINK", "SMILE", "HEART",
-        "BEACH", "CLOUD", "STORM", "GRASS", "PLANT", "STONE", "RIVER", "OCEAN", "WORLD", "SPEED",
-        "PIZZA", "SWEET", "SPICY", "FRESH", "CLEAN", "QUICK", "SLEEP", "DREAM", "PARTY", "DANCE",
-        "POWER", "MAGIC", "BRAVE", "SMART", "HAPPY", "PEACE", "TRUST", "VOICE", "MOVIE", "SIGHT",
-        "PLACE", "SPACE", "TRAIN", "PLANE", "DRIVE", "FIGHT", "WRITE", "LEARN", "TEACH", "COUNT",
-        "ABOUT", "AFTER", "ANGLE", "ARROW", "BADGE", "BAKER", "BENCH", "BLEND", "BLOCK", "BOARD",
-        "BRAIN", "BRAKE", "BRAND", "BRICK", "BUNCH", "BURST", "CABIN", "CANAL", "CANDY", "CARGO",
-        "CATCH", "CHAIN", "CHARM", "CHEAP", "CHEST", "CHIEF", "CHINA", "CLAIM", "CLASS", "COACH",
-        "COAST", "CORAL", "COUCH", "COURT", "COVER", "CRACK", "CRASH", "CRAZY", "CREAM", "CROWN",
-        "CURVE", "DAILY", "DAIRY", "DEPTH", "DIRTY", "DOUBT", "DRAFT", "DRAIN", "DRAWN", "DROWN",
-        "EAGLE", "EARLY", "EARTH", "EMPTY", "ENEMY", "ENJOY", "EQUAL", "ERROR", "EXACT", "EXTRA",
-        "FANCY", "FAULT", "FEVER", "FIELD", "FINAL", "FLAME", "FLASH", "FLEET", "FLOOD", "FLOUR",
-        "FLUID", "FORGE", "FORTH", "FRAME", "FRANK", "FRAUD", "FROST", "FRUIT", "GAUGE", "GHOST",
-        "GIANT", "GLORY", "GLOVE", "GRACE", "GRADE", "GRAIN", "GRAND", "GRANT", "GREET", "GRIEF",
-        "GRILL", "GRIND", "GROSS", "GROUP", "GROVE", "GUARD", "GUESS", "GUEST", "GUIDE", "GUILT",
-        "HARSH", "HASTE", "HEART", "HOBBY", "HONEY", "HONOR", "HORSE", "HOTEL", "HUMAN", "HUMOR",
-        "IDEAL", "IMAGE", "INDEX", "INNER", "INPUT", "ISSUE", "IVORY", "JOKER", "JOINT", "JUICE",
-        "KNIFE", "LABEL", "LABOR", "LASER", "LAYER", "LEGAL", "LEMON", "LEVEL", "LIMIT", "LOCAL",
-        "LOOSE", "LOWER", "LOYAL", "LUCKY", "LUNAR", "MAJOR", "MAPLE", "MARCH", "MATCH", "MAYOR"
-    ],
-    "hard": [
-        "KITCHEN", "BROTHER", "WEATHER", "HOLIDAY", "PICTURE", "CHICKEN", "WEEKEND", "WELCOME",
-        "MORNING", "EVENING", "RAINBOW", "THUNDER", "BLANKET", "BEDROOM", "TEACHER", "STUDENT",
-        "COMPUTER", "BIRTHDAY", "SHOPPING", "LIBRARY", "HISTORY", "SCIENCE", "ENGLISH", "MYSTERY",
-        "FREEDOM", "BALANCE", "BENEFIT", "CONTROL", "CULTURE", "FASHION", "NETWORK", "PROBLEM",
-        "QUALITY", "SUCCESS", "TRAFFIC", "VITAMIN", "WEATHER", "ACCOUNT", "CONTEST", "PRESENT",
-        "SERVICE", "MESSAGE", "FORWARD", "CHAPTER", "COMPASS", "HEALTHY", "REGULAR", "SECTION",
-        "BROTHER", "DISPLAY", "EVENING", "FIFTEEN", "GENERAL", "HIMSELF", "IMPROVE", "JUSTICE",
-        "ADVANCE", "ANCIENT", "ANOTHER", "ANXIETY", "ANYBODY", "ARRIVAL", "ARTICLE", "ATTEMPT",
-        "AVERAGE", "AWESOME", "BATTERY", "BENEATH", "BESIDES", "BETWEEN", "BILLION", "BLANKET",
-        "BOULDER", "BOUNCE", "BRACKET", "BREATHE", "BRIDGE", "BURNING", "CABINET", "CALCIUM",
-        "CAPABLE", "CAPTAIN", "CAPTURE", "CAREFUL", "CENTURY", "CERTAIN", "CHAMBER", "CHANNEL",
-        "CHAPTER", "CHARITY", "CHARTER", "CHICKEN", "CIRCUIT", "CITIZEN", "CLASSIC", "CLIMATE",
-        "CLOTHES", "COCONUT", "COLLEGE", "COMBINE", "COMMAND", "COMMENT", "COMPANY", "COMPARE",
-        "COMPASS", "COMPLEX", "CONCEPT", "CONCERN", "CONDUCT", "CONFIRM", "CONNECT", "CONSENT",
-        "CONTAIN", "CONTENT", "CONTEST", "CONTEXT", "CONTROL", "CONVERT", "CONVICT", "CORRECT",
-        "COUNCIL", "COUNTER", "COUNTRY", "COURAGE", "CRYSTAL", "CULTURE", "CURRENT", "CUSTOMS",
-        "CUTTING", "DECLINE", "DEFAULT", "DEFENSE", "DELIVER", "DENSITY", "DEPOSIT", "DESCEND",
-        "DESERVE", "DESKTOP", "DESPITE", "DESTROY", "DEVELOP", "DIAMOND", "DIGITAL", "DISCUSS",
-        "DISEASE", "DISMISS", "DISPLAY", "DISPUTE", "DISTANT", "DIVERSE", "DOLPHIN", "DRAWING",
-        "ECONOMY", "EDITION", "ELDERLY", "ELEMENT", "EMPEROR", "ENDLESS", "ENFORCE", "ENGINEER",
-        "ENHANCE", "EPISODE", "ESSENCE", "EVENING", "EVIDENT", "EXACTLY", "EXAMINE", "EXAMPLE",
-        "EXCLAIM", "EXCLUDE", "EXECUTE", "EXPENSE", "EXPLAIN", "EXPLORE", "EXPRESS", "EXTREME",
-        "FACTORY", "FACULTY", "FAILURE", "FANTASY", "FASHION", "FEATURE", "FEDERAL", "FIFTEEN",
-        "FIGHTER", "FINANCE", "FORTUNE", "FORWARD", "FOUNDER", "FREEDOM", "FREQUENT", "FRIENDS",
-        "FUNERAL", "GALLERY", "GARBAGE", "GATEWAY", "GENERAL", "GENETIC", "GESTURE", "GLIMPSE"
-    ],
-    "expert": [
-        "CHOCOLATE", "TELEPHONE", "YESTERDAY", "BEAUTIFUL", "IMPORTANT", "SOMETHING", "DIFFERENT",
-        "SOMEWHERE", "EVERYBODY", "SOMETHING", "COMMUNITY", "EDUCATION", "CHRISTMAS", "WEDNESDAY",
-        "SEPTEMBER", "HAMBURGER", "VALENTINE", "PINEAPPLE", "BUTTERFLY", "FANTASTIC", "CELEBRATE",
-        "ADVENTURE", "BREAKFAST", "UNDERSTAND", "APARTMENT", "NEWSPAPER", "WEDNESDAY", "SPAGHETTI",
-        "EMERGENCY", "DANGEROUS", "CHARACTER", "MARKETING", "AFTERNOON", "RECOMMEND", "STRUCTURE",
-        "KNOWLEDGE", "CHALLENGE", "ATTENTION", "INTERVIEW", "OPERATION", "PERMANENT", "PRINCIPAL",
-        "BEAUTIFUL", "NECESSARY", "CONFIDENT", "EQUIPMENT", "LANDSCAPE", "MESSENGER", "SCIENTIST",
-        "RECOGNIZE", "TECHNIQUE", "YESTERDAY", "NIGHTMARE", "WONDERFUL", "CROCODILE", "ORGANIZED",
-        "ABANDONED", "ABILITIES", "ABSORBING", "ABUNDANCE", "ACADEMIC", "ACCESSORY", "ACCOMPANY",
-        "ACCORDION", "ACCORDING", "ACCUSTOM", "ACHIEVING", "ACOUSTIC", "ACQUAINT", "ACTIVATED",
-        "ADDICTION", "ADJUSTING", "ADMISSION", "ADMITTING", "ADVANCING", "ADVENTURE", "ADVERTISE",
-        "AESTHETIC", "AFFECTION", "AFTERMATH", "AFTERNOON", "AGREEABLE", "AGREEMENT", "ALGORITHM",
-        "ALIGNMENT", "ALONGSIDE", "ALPHABETS", "ALTERNATE", "AMAZEMENT", "AMBITIOUS", "AMBULANCE",
-        "AMENDMENT", "AMPLIFIER", "AMUSEMENT", "ANALYZING", "ANCESTORS", "ANCHORING", "ANIMATION",
-        "ANNOUNCED", "ANSWERING", "ANXIOUSLY", "APARTMENT", "APOLOGIZE", "APPARATUS", "APPEARING",
-        "APPETIZER", "APPLIANCE", "APPOINTED", "APPRAISAL", "ARCHITECT", "ARGUMENTS", "ARMADILLO",
-        "AROMATICS", "ARRANGING", "ARTIFACTS", "ARTILLERY", "ASCENDING", "ASPARAGUS", "ASPERSION",
-        "ASSESSING", "ASSIGNING", "ASSISTANT", "ASSOCIATE", "ASSURANCE", "ASTRONOMY", "ATHLETICS",
-        "ATTACKING", "ATTAINING", "ATTEMPTED", "ATTENDING", "ATTENTION", "ATTITUDES", "ATTRACTED",
-        "ATTRIBUTE", "AUCTIONED", "AUDACIOUS", "AUDIENCES", "AUTHENTIC", "AUTHORITY", "AUTOMATED",
-        "AUTOMATIC", "AUTUMN", "AVAILABLE", "AVERAGING", "AWAKENING", "AWARENESS", "BACKBOARD",
-        "BACKLIGHT", "BACKSPACE", "BACKWARDS", "BACTERIAL", "BALANCING", "BALLPOINT", "BANDWIDTH",
-        "BANKRUPTCY", "BARBECUE", "BAREFOOT", "BARGAINED", "BAROMETER", "BARRICADE", "BASICALLY",
-        "BASKETBALL", "BATTERIES", "BEAUTIFUL", "BEGINNERS", "BEGINNING", "BEHAVIOUR", "BELIEVERS",
-        "BELONGING", "BENCHMARK", "BENEFICIAL", "BETRAYING", "BEVERAGES", "BIOGRAPHY", "BIOLOGIST",
-        "BIRTHDAYS", "BLACKJACK", "BLACKMAIL", "BLACKNESS", "BLESSINGS", "BLINDNESS", "BLOODSHOT"
-    ]
-}
+# Word pool (difficulty tiers are scored from the letters, see utils/scramble_index.py)
+SCRAMBLE_WORDS = [
+    "TEAM", "RACE", "JUMP", "CAKE", "PARK", "BIRD", "FISH", "STAR", "MOON", "TREE",
+    "BOAT", "DOOR", "FIRE", "GOLD", "HOME", "KING", "LION", "RAIN", "WIND", "SNOW",
+    "COIN", "DECK", "FROG", "GIFT", "HAND", "IRON", "JADE", "KITE", "LAMP", "MASK",
+    "NOTE", "OVER", "PEAK", "RING", "SHIP", "TIDE", "UNIT", "VASE", "WAVE", "ZONE",
+    "BELL", "CARD", "DIAL", "EPIC", "FLAG", "GAME", "HERO", "ISLE", "JOKE", "KEYS",
+    "LUCK", "MAZE", "NEWS", "OPEN", "PAGE", "QUIZ", "RUST", "SAFE", "TIME", "UNDO",
+    "ARCH", "BARN", "CLAW", "DAWN", "EDGE", "FARM", "GATE", "HILL", "INCH", "JAIL",
+    "KEEP", "LEAF", "MIST", "NEST", "OATH", "PATH", "QUIT", "ROBE", "SAIL", "TAIL",
+    "UGLY", "VINE", "WISE", "YARN", "ZOOM", "APEX", "BOLT", "CAVE", "DUCK", "EAST",
+    "FANG", "GULF", "HAWK", "ICON", "JUNK", "KIWI", "LAVA", "MINT", "NOON", "OPAL",
+    "PEAR", "REEF", "SALT", "TENT", "VEIL", "WAND", "YELL", "ZERO", "AREA", "BEAM",
+    "COAT", "DEER", "EXAM", "FOIL", "GLOW", "HIVE", "IRIS", "JADE", "KNEE", "LENS",
+    "MOLD", "NAIL", "OVEN", "PAWS", "RICE", "SAGE", "TOMB", "URGE", "VIEW", "WOLF",
+    "YAWN", "ABLE", "BEAM", "COIL", "DUSK", "EARN", "FLAP", "GAZE", "HORN", "IDOL",
+    "JUMP", "KIND", "LOUD", "MILD", "NAVY", "ONLY", "PLUG", "RAMP", "SILK", "TOAD",
+    "UNIT", "VICE", "WAIT", "YOLK", "ZEAL", "ACNE", "BASH", "COZY", "DROP", "EVEN",
+    "FOAM", "GRIP", "HOUR", "IDEA", "JUST", "KALE", "LURE", "MUTE", "NUMB", "OVAL",
+    "PACT", "RASH", "SLAP", "TRIM", "UNDO", "VOWS", "WASP", "YANK", "ZEST", "ACME",
+    "BUFF", "CRIB", "DUEL", "EMIT", "FOLD", "GRAM", "HUGE", "ITCH", "JOLT", "KELP",
+    "LOOP", "MOTH", "NEON", "ODDS", "PALM", "RUSE", "SODA", "TAXI", "UNIT", "VERB",
+    "APPLE", "PHONE", "MUSIC", "MONEY", "WATER", "HOUSE", "CHAIR", "TABLE", "CLOCK", "LIGHT",
+    "PAPER", "SHIRT", "PANTS", "SHOES", "WATCH", "BREAD", "LUNCH", "DRINK", "SMILE", "HEART",
+    "BEACH", "CLOUD", "STORM", "GRASS", "PLANT", "STONE", "RIVER", "OCEAN", "WORLD", "SPEED",
+    "PIZZA", "SWEET", "SPICY", "FRESH", "CLEAN", "QUICK", "SLEEP", "DREAM", "PARTY", "DANCE",
+    "POWER", "MAGIC", "BRAVE", "SMART", "HAPPY", "PEACE", "TRUST", "VOICE", "MOVIE", "SIGHT",
+    "PLACE", "SPACE", "TRAIN", "PLANE", "DRIVE", "FIGHT", "WRITE", "LEARN", "TEACH", "COUNT",
+    "ABOUT", "AFTER", "ANGLE", "ARROW", "BADGE", "BAKER", "BENCH", "BLEND", "BLOCK", "BOARD",
+    "BRAIN", "BRAKE", "BRAND", "BRICK", "BUNCH", "BURST", "CABIN", "CANAL", "CANDY", "CARGO",
+    "CATCH", "CHAIN", "CHARM", "CHEAP", "CHEST", "CHIEF", "CHINA", "CLAIM", "CLASS", "COACH",
+    "COAST", "CORAL", "COUCH", "COURT", "COVER", "CRACK", "CRASH", "CRAZY", "CREAM", "CROWN",
+    "CURVE", "DAILY", "DAIRY", "DEPTH", "DIRTY", "DOUBT", "DRAFT", "DRAIN", "DRAWN", "DROWN",
+    "EAGLE", "EARLY", "EARTH", "EMPTY", "ENEMY", "ENJOY", "EQUAL", "ERROR", "EXACT", "EXTRA",
+    "FANCY", "FAULT", "FEVER", "FIELD", "FINAL", "FLAME", "FLASH", "FLEET", "FLOOD", "FLOUR",
+    "FLUID", "FORGE", "FORTH", "FRAME", "FRANK", "FRAUD", "FROST", "FRUIT", "GAUGE", "GHOST",
+    "GIANT", "GLORY", "GLOVE", "GRACE", "GRADE", "GRAIN", "GRAND", "GRANT", "GREET", "GRIEF",
+    "GRILL", "GRIND", "GROSS", "GROUP", "GROVE", "GUARD", "GUESS", "GUEST", "GUIDE", "GUILT",
+    "HARSH", "HASTE", "HEART", "HOBBY", "HONEY", "HONOR", "HORSE", "HOTEL", "HUMAN", "HUMOR",
+    "IDEAL", "IMAGE", "INDEX", "INNER", "INPUT", "ISSUE", "IVORY", "JOKER", "JOINT", "JUICE",
+    "KNIFE", "LABEL", "LABOR", "LASER", "LAYER", "LEGAL", "LEMON", "LEVEL", "LIMIT", "LOCAL",
+    "LOOSE", "LOWER", "LOYAL", "LUCKY", "LUNAR", "MAJOR", "MAPLE", "MARCH", "MATCH", "MAYOR",
+    "KITCHEN", "BROTHER", "WEATHER", "HOLIDAY", "PICTURE", "CHICKEN", "WEEKEND", "WELCOME",
+    "MORNING", "EVENING", "RAINBOW", "THUNDER", "BLANKET", "BEDROOM", "TEACHER", "STUDENT",
+    "COMPUTER", "BIRTHDAY", "SHOPPING", "LIBRARY", "HISTORY", "SCIENCE", "ENGLISH", "MYSTERY",
+    "FREEDOM", "BALANCE", "BENEFIT", "CONTROL", "CULTURE", "FASHION", "NETWORK", "PROBLEM",
+    "QUALITY", "SUCCESS", "TRAFFIC", "VITAMIN", "WEATHER", "ACCOUNT", "CONTEST", "PRESENT",
+    "SERVICE", "MESSAGE", "FORWARD", "CHAPTER", "COMPASS", "HEALTHY", "REGULAR", "SECTION",
+    "BROTHER", "DISPLAY", "EVENING", "FIFTEEN", "GENERAL", "HIMSELF", "IMPROVE", "JUSTICE",
+    "ADVANCE", "ANCIENT", "ANOTHER", "ANXIETY", "ANYBODY", "ARRIVAL", "ARTICLE", "ATTEMPT",
+    "AVERAGE", "AWESOME", "BATTERY", "BENEATH", "BESIDES", "BETWEEN", "BILLION", "BLANKET",
+    "BOULDER", "BOUNCE", "BRACKET", "BREATHE", "BRIDGE", "BURNING", "CABINET", "CALCIUM",
+    "CAPABLE", "CAPTAIN", "CAPTURE", "CAREFUL", "CENTURY", "CERTAIN", "CHAMBER", "CHANNEL",
+    "CHAPTER", "CHARITY", "CHARTER", "CHICKEN", "CIRCUIT", "CITIZEN", "CLASSIC", "CLIMATE",
+    "CLOTHES", "COCONUT", "COLLEGE", "COMBINE", "COMMAND", "COMMENT", "COMPANY", "COMPARE",
+    "COMPASS", "COMPLEX", "CONCEPT", "CONCERN", "CONDUCT", "CONFIRM", "CONNECT", "CONSENT",
+    "CONTAIN", "CONTENT", "CONTEST", "CONTEXT", "CONTROL", "CONVERT", "CONVICT", "CORRECT",
+    "COUNCIL", "COUNTER", "COUNTRY", "COURAGE", "CRYSTAL", "CULTURE", "CURRENT", "CUSTOMS",
+    "CUTTING", "DECLINE", "DEFAULT", "DEFENSE", "DELIVER", "DENSITY", "DEPOSIT", "DESCEND",
+    "DESERVE", "DESKTOP", "DESPITE", "DESTROY", "DEVELOP", "DIAMOND", "DIGITAL", "DISCUSS",
+    "DISEASE", "DISMISS", "DISPLAY", "DISPUTE", "DISTANT", "DIVERSE", "DOLPHIN", "DRAWING",
+    "ECONOMY", "EDITION", "ELDERLY", "ELEMENT", "EMPEROR", "ENDLESS", "ENFORCE", "ENGINEER",
+    "ENHANCE", "EPISODE", "ESSENCE", "EVENING", "EVIDENT", "EXACTLY", "EXAMINE", "EXAMPLE",
+    "EXCLAIM", "EXCLUDE", "EXECUTE", "EXPENSE", "EXPLAIN", "EXPLORE", "EXPRESS", "EXTREME",
+    "FACTORY", "FACULTY", "FAILURE", "FANTASY", "FASHION", "FEATURE", "FEDERAL", "FIFTEEN",
+    "FIGHTER", "FINANCE", "FORTUNE", "FORWARD", "FOUNDER", "FREEDOM", "FREQUENT", "FRIENDS",
+    "FUNERAL", "GALLERY", "GARBAGE", "GATEWAY", "GENERAL", "GENETIC", "GESTURE", "GLIMPSE",
+    "CHOCOLATE", "TELEPHONE", "YESTERDAY", "BEAUTIFUL", "IMPORTANT", "SOMETHING", "DIFFERENT",
+    "SOMEWHERE", "EVERYBODY", "SOMETHING", "COMMUNITY", "EDUCATION", "CHRISTMAS", "WEDNESDAY",
+    "SEPTEMBER", "HAMBURGER", "VALENTINE", "PINEAPPLE", "BUTTERFLY", "FANTASTIC", "CELEBRATE",
+    "ADVENTURE", "BREAKFAST", "UNDERSTAND", "APARTMENT", "NEWSPAPER", "WEDNESDAY", "SPAGHETTI",
+    "EMERGENCY", "DANGEROUS", "CHARACTER", "MARKETING", "AFTERNOON", "RECOMMEND", "STRUCTURE",
+    "KNOWLEDGE", "CHALLENGE", "ATTENTION", "INTERVIEW", "OPERATION", "PERMANENT", "PRINCIPAL",
+    "BEAUTIFUL", "NECESSARY", "CONFIDENT", "EQUIPMENT", "LANDSCAPE", "MESSENGER", "SCIENTIST",
+    "RECOGNIZE", "TECHNIQUE", "YESTERDAY", "NIGHTMARE", "WONDERFUL", "CROCODILE", "ORGANIZED",
+    "ABANDONED", "ABILITIES", "ABSORBING", "ABUNDANCE", "ACADEMIC", "ACCESSORY", "ACCOMPANY",
+    "ACCORDION", "ACCORDING", "ACCUSTOM", "ACHIEVING", "ACOUSTIC", "ACQUAINT", "ACTIVATED",
+    "ADDICTION", "ADJUSTING", "ADMISSION", "ADMITTING", "ADVANCING", "ADVENTURE", "ADVERTISE",
+    "AESTHETIC", "AFFECTION", "AFTERMATH", "AFTERNOON", "AGREEABLE", "AGREEMENT", "ALGORITHM",
+    "ALIGNMENT", "ALONGSIDE", "ALPHABETS", "ALTERNATE", "AMAZEMENT", "AMBITIOUS", "AMBULANCE",
+    "AMENDMENT", "AMPLIFIER", "AMUSEMENT", "ANALYZING", "ANCESTORS", "ANCHORING", "ANIMATION",
+    "ANNOUNCED", "ANSWERING", "ANXIOUSLY", "APARTMENT", "APOLOGIZE", "APPARATUS", "APPEARING",
+    "APPETIZER", "APPLIANCE", "APPOINTED", "APPRAISAL", "ARCHITECT", "ARGUMENTS", "ARMADILLO",
+    "AROMATICS", "ARRANGING", "ARTIFACTS", "ARTILLERY", "ASCENDING", "ASPARAGUS", "ASPERSION",
+    "ASSESSING", "ASSIGNING", "ASSISTANT", "ASSOCIATE", "ASSURANCE", "ASTRONOMY", "ATHLETICS",
+    "ATTACKING", "ATTAINING", "ATTEMPTED", "ATTENDING", "ATTENTION", "ATTITUDES", "ATTRACTED",
+    "ATTRIBUTE", "AUCTIONED", "AUDACIOUS", "AUDIENCES", "AUTHENTIC", "AUTHORITY", "AUTOMATED",
+    "AUTOMATIC", "AUTUMN", "AVAILABLE", "AVERAGING", "AWAKENING", "AWARENESS", "BACKBOARD",
+    "BACKLIGHT", "BACKSPACE", "BACKWARDS", "BACTERIAL", "BALANCING", "BALLPOINT", "BANDWIDTH",
+    "BANKRUPTCY", "BARBECUE", "BAREFOOT", "BARGAINED", "BAROMETER", "BARRICADE", "BASICALLY",
+    "BASKETBALL", "BATTERIES", "BEAUTIFUL", "BEGINNERS", "BEGINNING", "BEHAVIOUR", "BELIEVERS",
+    "BELONGING", "BENCHMARK", "BENEFICIAL", "BETRAYING", "BEVERAGES", "BIOGRAPHY", "BIOLOGIST",
+    "BIRTHDAYS", "BLACKJACK", "BLACKMAIL", "BLACKNESS", "BLESSINGS", "BLINDNESS", "BLOODSHOT"
+]
+
+# Anagram index, precomputed scrambles and entropy-scored difficulty tiers
+word_index = ScrambleIndex(SCRAMBLE_WORDS)
+WORD_LISTS = word_index.tiers
 
 DIFFICULTY_MULTIPLIERS = {
     "easy": 1.5,
@@ -152,19 +153,20 @@ class Scramble(commands.Cog):
         self.active_games = {}  # user_id: game_data
         self.endless_games = {}  # user_id: endless game data
 
+    def cog_unload(self):
+        router.unregister_owner(self)
+
+    def release_route(self, user_id, channel_id):
+        """Stop routing the user's messages once neither mode has a game in that channel"""
+        for games in (self.active_games, self.endless_games):
+            game = games.get(user_id)
+            if game and game.get("channel_id") == channel_id:
+                return
+        router.unregister(channel_id, user_id, self.handle_answer)
+
     def scramble_word(self, word):
-        """Scramble a word ensuring it's different from original"""
-        chars = list(word)
-        scrambled = chars.copy()
-        
-        # Keep scrambling until it's different
-        max_attempts = 50
-        for _ in range(max_attempts):
-            random.shuffle(scrambled)
-            if ''.join(scrambled) != word:
-                break
-        
-        return ''.join(scrambled)
+        """Scramble a word (never the word itself or another valid answer)"""
+        return word_index.scramble(word)
 
     @commands.command(name="scramble", aliases=["wordscramble", "ws"])
     async def scramble(self, ctx, bet: str = None, difficulty: str = None):
@@ -249,13 +251,15 @@ class Scramble(commands.Cog):
                 
                 if balance < bet_amount:
                     return await ctx.send(f"❌ You don't have enough mora! Balance: {balance:,} <:mora:1437958309255577681>")
+                
+                # Deduct bet
+                await db.execute("UPDATE users SET mora = mora - ? WHERE user_id = ?", (bet_amount, ctx.author.id))
+                session_id = await open_session(ctx.author.id, "scramble", bet_amount, db=db)
+                await db.commit()
         else:
             # DM play - no balance check needed
             balance = 0
-            
-            # Deduct bet
-            await db.execute("UPDATE users SET mora = mora - ? WHERE user_id = ?", (bet_amount, ctx.author.id))
-            await db.commit()
+            session_id = None
         
         # Determine difficulty
         if difficulty and difficulty.lower() in WORD_LISTS:
@@ -285,11 +289,13 @@ class Scramble(commands.Cog):
             "multiplier": DIFFICULTY_MULTIPLIERS[diff],
             "start_time": datetime.now(),
             "time_limit": time_limit,
+            "session_id": session_id,
             "hint_used": False,
             "revealed_letters": set(),
             "channel_id": ctx.channel.id,
             "message_id": None  # Will store game message ID
         }
+        router.register(ctx.channel.id, ctx.author.id, self.handle_answer)
         
         # Create difficulty stars
         diff_stars = {
@@ -320,28 +326,21 @@ class Scramble(commands.Cog):
         game_msg = await ctx.send(embed=embed)
         self.active_games[ctx.author.id]["message_id"] = game_msg.id
         
-        # Start timeout checker and countdown updater
-        asyncio.create_task(self.game_timeout(ctx.author.id, time_limit))
-        asyncio.create_task(self.update_countdown(ctx.author.id, game_msg, ctx.channel))
+        # Register timeout and countdown with the shared timer wheel
+        timers.schedule(("scramble", ctx.author.id), time_limit, self.game_timeout, ctx.author.id)
+        timers.schedule(("scramble_countdown", ctx.author.id), 1, self.update_countdown, ctx.author.id, game_msg)
 
-    async def game_timeout(self, user_id, time_limit):
+    async def game_timeout(self, user_id):
         """Handle game timeout"""
         try:
-            await asyncio.sleep(time_limit)
-            
             if user_id in self.active_games:
                 game = self.active_games[user_id]
                 
                 # Update stats
                 async with aiosqlite.connect(DB_PATH) as db:
-                    await db.execute("""
-                        INSERT INTO game_stats (user_id, scramble_games, scramble_losses)
-                        VALUES (?, 1, 1)
-                        ON CONFLICT(user_id) DO UPDATE SET
-                            scramble_games = scramble_games + 1,
-                            scramble_losses = scramble_losses + 1,
-                            scramble_streak = 0
-                    """, (user_id,))
+                    await add_stats(user_id, {'scramble_games': 1, 'scramble_losses': 1}, db)
+                    await set_stats(user_id, {'scramble_streak': 0}, db)
+                    await close_session(game.get('session_id'), db=db)
                     await db.commit()
                 
                 # Send timeout message to the channel where game was started
@@ -366,22 +365,23 @@ class Scramble(commands.Cog):
                         pass
                 
                 del self.active_games[user_id]
-        except asyncio.CancelledError:
-            # Task was cancelled (game finished before timeout)
-            pass
+                timers.cancel(("scramble_countdown", user_id))
+                self.release_route(user_id, game['channel_id'])
         except Exception as e:
             print(f"Error in game_timeout: {e}")
 
-    async def update_countdown(self, user_id, message, channel):
-        """Update the game embed with countdown timer"""
+    async def update_countdown(self, user_id, message):
+        """Update the game embed with countdown timer (re-armed every second on the timer wheel)"""
         try:
-            while user_id in self.active_games:
+            if user_id in self.active_games:
                 game = self.active_games[user_id]
+                if game['message_id'] != message.id:
+                    return  # a newer game owns the countdown now
                 elapsed = (datetime.now() - game['start_time']).total_seconds()
                 remaining = max(0, game['time_limit'] - int(elapsed))
                 
                 if remaining <= 0:
-                    break
+                    return
                 
                 # Create difficulty stars
                 diff_stars = {
@@ -416,14 +416,13 @@ class Scramble(commands.Cog):
                 embed.set_footer(text=f"Bet: {game['bet']:,} mora | Speed bonus if under 10s!")
                 
                 try:
-                    await message.edit(embed=embed)
+                    await edits.edit(message, embed=embed)
                 except:
-                    break  # Message was deleted or can't be edited
+                    return  # Message was deleted or can't be edited
                 
-                await asyncio.sleep(1)  # Update every second
+                # Update every second
+                timers.schedule(("scramble_countdown", user_id), 1, self.update_countdown, user_id, message)
                 
-        except asyncio.CancelledError:
-            pass
         except Exception as e:
             print(f"Error in update_countdown: {e}")
 
@@ -553,6 +552,7 @@ class Scramble(commands.Cog):
             
             # Deduct bet
             await db.execute("UPDATE users SET mora = mora - ? WHERE user_id = ?", (bet_amount, ctx.author.id))
+            session_id = await open_session(ctx.author.id, "scramble_endless", bet_amount, db=db)
             await db.commit()
         
         # Starting multiplier - first word gives 1x (break even)
@@ -571,8 +571,10 @@ class Scramble(commands.Cog):
             "multiplier": start_mult,
             "start_time": datetime.now(),
             "channel_id": ctx.channel.id,
-            "message_id": None  # Will store message ID for reply checking
+            "message_id": None,  # Will store message ID for reply checking
+            "session_id": session_id
         }
+        router.register(ctx.channel.id, ctx.author.id, self.handle_answer)
         
         await self.show_endless_word(ctx)
 
@@ -615,6 +617,7 @@ class Scramble(commands.Cog):
         # Give winnings
         async with aiosqlite.connect(DB_PATH) as db:
             await db.execute("UPDATE users SET mora = mora + ? WHERE user_id = ?", (winnings, user_id))
+            await close_session(game.get("session_id"), db=db)
             await db.commit()
         
         profit = winnings - game["bet"]
@@ -634,6 +637,7 @@ class Scramble(commands.Cog):
         
         await channel.send(embed=embed)
         del self.endless_games[user_id]
+        self.release_route(user_id, game["channel_id"])
 
     async def endless_lose(self, user_id, channel):
         """Lose in endless mode"""
@@ -641,6 +645,7 @@ class Scramble(commands.Cog):
             return
         
         game = self.endless_games[user_id]
+        await close_session(game.get("session_id"))
         
         embed = discord.Embed(
             title="💥 WRONG ANSWER!",
@@ -657,13 +662,10 @@ class Scramble(commands.Cog):
         
         await channel.send(embed=embed)
         del self.endless_games[user_id]
+        self.release_route(user_id, game["channel_id"])
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        """Listen for answers to active games"""
-        if message.author.bot:
-            return
-        
+    async def handle_answer(self, message):
+        """Check an answer (routed here by bot.on_message while a game is running)"""
         # Check endless game first
         if message.author.id in self.endless_games:
             game = self.endless_games[message.author.id]
@@ -672,17 +674,15 @@ class Scramble(commands.Cog):
             if not message.reference or message.reference.message_id != game.get("message_id"):
                 return
             
-            if message.content.startswith('g'):
-                return
-            
             user_answer = message.content.strip().upper()
             
-            if user_answer == game["word"]:
+            if word_index.is_answer(game["word"], user_answer):
                 # Correct!
                 await message.add_reaction("✅")
                 
                 game["round"] += 1
                 game["multiplier"] = min(game["multiplier"] + 0.5, 10.0)
+                await checkpoint(game.get("session_id"), cashout=int(game["bet"] * game["multiplier"]), state={"round": game["round"]})
                 
                 # Check max
                 if game["round"] > 15 or game["multiplier"] >= 10.0:
@@ -716,10 +716,6 @@ class Scramble(commands.Cog):
         if not message.reference or message.reference.message_id != game.get("message_id"):
             return
         
-        # Check if it's a command
-        if message.content.startswith('g'):
-            return
-        
         user_answer = message.content.strip().upper()
         
         # Calculate time taken
@@ -729,7 +725,7 @@ class Scramble(commands.Cog):
             return  # Timeout will handle it
         
         # Check answer
-        if user_answer == game["word"]:
+        if word_index.is_answer(game["word"], user_answer):
             # Correct!
             base_win = int(game["bet"] * game["multiplier"])
             
@@ -743,23 +739,15 @@ class Scramble(commands.Cog):
             # Update balance
             async with aiosqlite.connect(DB_PATH) as db:
                 await db.execute("UPDATE users SET mora = mora + ? WHERE user_id = ?", (total_win, message.author.id))
+                await close_session(game.get("session_id"), db=db)
                 
                 # Get current streak
-                cursor = await db.execute("SELECT scramble_streak FROM game_stats WHERE user_id = ?", (message.author.id,))
-                row = await cursor.fetchone()
-                current_streak = row[0] if row else 0
+                current_streak = await get_stat(message.author.id, 'scramble_streak', db)
                 new_streak = current_streak + 1
                 
                 # Update stats
-                await db.execute("""
-                    INSERT INTO game_stats (user_id, scramble_games, scramble_wins, scramble_streak, scramble_best_time)
-                    VALUES (?, 1, 1, 1, ?)
-                    ON CONFLICT(user_id) DO UPDATE SET
-                        scramble_games = scramble_games + 1,
-                        scramble_wins = scramble_wins + 1,
-                        scramble_streak = scramble_streak + 1,
-                        scramble_best_time = MIN(scramble_best_time, ?)
-                """, (message.author.id, time_taken, time_taken))
+                await add_stats(message.author.id, {'scramble_games': 1, 'scramble_wins': 1, 'scramble_streak': 1}, db)
+                await min_stats(message.author.id, {'scramble_best_time': time_taken}, db)
                 
                 # Get updated balance
                 cursor = await db.execute("SELECT mora FROM users WHERE user_id = ?", (message.author.id,))
@@ -793,6 +781,9 @@ class Scramble(commands.Cog):
             
             # Remove game
             del self.active_games[message.author.id]
+            self.release_route(message.author.id, game["channel_id"])
+            timers.cancel(("scramble", message.author.id))
+            timers.cancel(("scramble_countdown", message.author.id))
             
         elif len(user_answer) >= 3:  # Only respond to serious attempts
             # Wrong answer
@@ -808,17 +799,12 @@ class Scramble(commands.Cog):
 
     async def show_stats(self, ctx):
         """Show user's scramble statistics"""
-        async with aiosqlite.connect(DB_PATH) as db:
-            cursor = await db.execute("""
-                SELECT scramble_games, scramble_wins, scramble_losses, scramble_streak, scramble_best_time
-                FROM game_stats WHERE user_id = ?
-            """, (ctx.author.id,))
-            row = await cursor.fetchone()
+        stats = await get_stats(ctx.author.id, ('scramble_games', 'scramble_wins', 'scramble_losses', 'scramble_streak', 'scramble_best_time'))
+        games, wins, losses, streak, best_time = stats.values()
         
-        if not row or row[0] == 0:
+        if games == 0:
             return await ctx.send("❌ You haven't played any scramble games yet!")
         
-        games, wins, losses, streak, best_time = row
         win_rate = (wins / games * 100) if games > 0 else 0
         avg_time = best_time if best_time else 0
         
@@ -2,11 +2,11 @@ import asyncio
 import random
 import discord
 from discord.ext import commands
-import aiosqlite
-from config import DB_PATH
-from utils.database import get_user_data, update_user_data, require_enrollment, track_game_stat, check_and_award_game_achievements, add_account_exp
+from utils.database import get_user_data, update_user_data, require_enrollment, track_game_stat, track_game_stats, check_and_award_game_achievements, add_account_exp
 from utils.embed import send_embed
+from utils.global_bank import add_to_bank
 from utils.transaction_logger import log_transaction
+from utils.game_math import slots_symbol_pool, slots_apply_premium, slots_multiplier
 
 
 class Slots(commands.Cog):
@@ -68,20 +68,8 @@ class Slots(commands.Cog):
                 )
                 return
 
-            # Slot symbols with weighted probabilities
-            symbols = {
-                "🍒": 50,  # 50% chance per reel (~12.5% win rate)
-                "🍋": 35,  # 35% chance (~4.3% win rate)
-                "🍊": 10,  # 10% chance (~0.1% win rate)
-                "🍇": 3,   # 3% chance (rare)
-                "💎": 1,   # 1% chance (very rare)
-                "7️⃣": 1,  # 1% chance (jackpot)
-            }
-
-            # Create weighted list
-            symbol_pool = []
-            for symbol, weight in symbols.items():
-                symbol_pool.extend([symbol] * weight)
+            # Slot symbols with weighted probabilities (see utils/game_math.py)
+            symbol_pool = slots_symbol_pool()
 
             # Deduct bet amount first
             await update_user_data(ctx.author.id, mora=mora - bet_amount)
@@ -110,27 +98,15 @@ class Slots(commands.Cog):
             reel2 = random.choice(symbol_pool)
             reel3 = random.choice(symbol_pool)
             
-            # Premium users get 10% chance to force a matching reel
-            if is_premium and not (reel1 == reel2 == reel3):
-                if random.random() < 0.10:
-                    # Force a match (pick the most valuable symbol of the three)
-                    symbol_values = {"7️⃣": 6, "💎": 5, "🍇": 4, "🍊": 3, "🍋": 2, "🍒": 1}
-                    best_symbol = max([reel1, reel2, reel3], key=lambda s: symbol_values.get(s, 0))
-                    reel1 = reel2 = reel3 = best_symbol
+            # Premium users get 10% chance to force a matching reel (most valuable symbol of the three)
+            if is_premium:
+                reel1, reel2, reel3 = slots_apply_premium([reel1, reel2, reel3], random.random())
 
             # Check for win
-            payout_multipliers = {
-                "🍒": 1.5,
-                "🍋": 2,
-                "🍊": 3,
-                "🍇": 6,
-                "💎": 12,
-                "7️⃣": 30,
-            }
-
-            if reel1 == reel2 == reel3:
+            multiplier = slots_multiplier([reel1, reel2, reel3])
+
+            if multiplier > 0:
                 # Win!
-                multiplier = payout_multipliers.get(reel1, 2)
                 payout = bet_amount * multiplier
                 
                 # Get current mora and add payout
@@ -148,8 +124,7 @@ class Slots(commands.Cog):
 
                 # Track stats and check achievements
                 try:
-                    await track_game_stat(ctx.author.id, "slots_wins")
-                    await track_game_stat(ctx.author.id, "slots_plays")
+                    await track_game_stats([(ctx.author.id, "slots_wins"), (ctx.author.id, "slots_plays")])
                     await check_and_award_game_achievements(ctx.author.id, self.bot, ctx)
                 except Exception:
                     pass
@@ -217,12 +192,7 @@ class Slots(commands.Cog):
                     pass
                 
                 # Add loss to global bank
-                async with aiosqlite.connect(DB_PATH) as db:
-                    await db.execute(
-                        "UPDATE global_bank SET balance = balance + ? WHERE id = 1",
-                        (bet_amount,)
-                    )
-                    await db.commit()
+                await add_to_bank(bet_amount, ctx.author.id)
 
                 embed = discord.Embed(title="🎰 Slot Machine", color=0x95A5A6)
                 embed.set_author(
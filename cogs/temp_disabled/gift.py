@@ -3,6 +3,7 @@ from discord.ext import commands
 import aiosqlite
 from config import DB_PATH
 from utils.embed import send_embed
+from utils.global_bank import add_to_bank
 from utils.database import get_user_data, ensure_user_db
 
 
@@ -101,10 +102,7 @@ class Gift(commands.Cog):
                 
                 # Add tax to global bank (only for mora gifts)
                 if db_column == "mora":
-                    await db.execute(
-                        "UPDATE global_bank SET balance = balance + ? WHERE id = 1",
-                        (tax_amount,)
-                    )
+                    await add_to_bank(tax_amount, ctx.author.id, db=db, exact=True)
                 
                 # Log the gift
                 await db.execute(
@@ -1,28 +1,15 @@
 import random
+from typing import Optional
 import discord
 from discord.ext import commands
-from utils.database import get_user_data, update_user_data, track_game_stat, check_and_award_game_achievements, add_account_exp
+from utils import tictactoe_table
+from utils.database import get_user_data, update_user_data, track_game_stats, check_and_award_game_achievements, add_account_exp
 from utils.embed import send_embed
 
 
 def check_winner(board):
-    # board is list of 9 elements: None, 'X', or 'O'
-    lines = (
-        (0, 1, 2),
-        (3, 4, 5),
-        (6, 7, 8),
-        (0, 3, 6),
-        (1, 4, 7),
-        (2, 5, 8),
-        (0, 4, 8),
-        (2, 4, 6),
-    )
-    for a, b, c in lines:
-        if board[a] and board[a] == board[b] == board[c]:
-            return board[a]
-    if all(x is not None for x in board):
-        return "draw"
-    return None
+    # board is list of 9 elements: None, 'X', or 'O'; X always moves first, so every board is in the table
+    return tictactoe_table.winner(board)
 
 
 class BoxButton(discord.ui.Button):
@@ -75,11 +62,9 @@ class BoxButton(discord.ui.Button):
                 
                 # Track play stats for both players on draw
                 try:
-                    await track_game_stat(view.player_x, "tictactoe_plays")
-                    await track_game_stat(view.player_o, "tictactoe_plays")
+                    await track_game_stats([(view.player_x, "tictactoe_plays"), (view.player_o, "tictactoe_plays")])
                     if not view.vs_bot:
-                        await track_game_stat(view.player_x, "multiplayer_games")
-                        await track_game_stat(view.player_o, "multiplayer_games")
+                        await track_game_stats([(view.player_x, "multiplayer_games"), (view.player_o, "multiplayer_games")])
                 except Exception:
                     pass
             else:
@@ -100,14 +85,15 @@ class BoxButton(discord.ui.Button):
                         await update_user_data(winner_id, mora=data['mora'])
                         
                         # Track stats
-                        await track_game_stat(winner_id, "tictactoe_wins")
-                        await track_game_stat(winner_id, "tictactoe_plays")
-                        await track_game_stat(loser_id, "tictactoe_plays")
+                        await track_game_stats([
+                            (winner_id, "tictactoe_wins"),
+                            (winner_id, "tictactoe_plays"),
+                            (loser_id, "tictactoe_plays"),
+                        ])
                         
                         # Track multiplayer games if vs player
                         if not view.vs_bot:
-                            await track_game_stat(winner_id, "multiplayer_games")
-                            await track_game_stat(loser_id, "multiplayer_games")
+                            await track_game_stats([(winner_id, "multiplayer_games"), (loser_id, "multiplayer_games")])
                         
                         await check_and_award_game_achievements(winner_id, view.cog.bot, view.ctx)
                         
@@ -154,9 +140,10 @@ class BoxButton(discord.ui.Button):
 
 
 class TicTacToeView(discord.ui.View):
-    def __init__(self, ctx, player_x: int, player_o: int, vs_bot: bool, cog):
+    def __init__(self, ctx, player_x: int, player_o: int, vs_bot: bool, cog, level: str = tictactoe_table.DEFAULT_LEVEL):
         super().__init__(timeout=None)  # No timeout during active gameplay
         self.ctx = ctx
+        self.level = level
         self.player_x = player_x
         self.player_o = player_o
         self.vs_bot = vs_bot
@@ -190,11 +177,10 @@ class TicTacToeView(discord.ui.View):
         return emb
 
     async def bot_move(self):
-        # simple bot: pick random empty cell
-        empties = [i for i, v in enumerate(self.board) if v is None]
-        if not empties:
+        # one lookup in the precomputed perfect-play table (with some deliberate mistakes below "perfect")
+        choice = tictactoe_table.choose_move(self.board, self.level)
+        if choice is None:
             return
-        choice = random.choice(empties)
         # set board and update button state
         self.board[choice] = self.bot_mark
         for item in self.children:
@@ -222,11 +208,9 @@ class TicTacToeView(discord.ui.View):
                 
                 # Track play stats for both players on draw
                 try:
-                    await track_game_stat(self.player_x, "tictactoe_plays")
-                    await track_game_stat(self.player_o, "tictactoe_plays")
+                    await track_game_stats([(self.player_x, "tictactoe_plays"), (self.player_o, "tictactoe_plays")])
                     if not self.vs_bot:
-                        await track_game_stat(self.player_x, "multiplayer_games")
-                        await track_game_stat(self.player_o, "multiplayer_games")
+                        await track_game_stats([(self.player_x, "multiplayer_games"), (self.player_o, "multiplayer_games")])
                 except Exception:
                     pass
             else:
@@ -247,14 +231,15 @@ class TicTacToeView(discord.ui.View):
                         await update_user_data(winner_id, mora=data['mora'])
                         
                         # Track stats
-                        await track_game_stat(winner_id, "tictactoe_wins")
-                        await track_game_stat(winner_id, "tictactoe_plays")
-                        await track_game_stat(loser_id, "tictactoe_plays")
+                        await track_game_stats([
+                            (winner_id, "tictactoe_wins"),
+                            (winner_id, "tictactoe_plays"),
+                            (loser_id, "tictactoe_plays"),
+                        ])
                         
                         # Track multiplayer games if vs player
                         if not self.vs_bot:
-                            await track_game_stat(winner_id, "multiplayer_games")
-                            await track_game_stat(loser_id, "multiplayer_games")
+                            await track_game_stats([(winner_id, "multiplayer_games"), (loser_id, "multiplayer_games")])
                         
                         await check_and_award_game_achievements(winner_id, self.cog.bot, self.ctx)
                         
@@ -360,11 +345,17 @@ class TicTacToe(commands.Cog):
         self.pending_challenges = set()
 
     @commands.command(name="tictactoe", aliases=["tt","ttt"])
-    async def tictactoe(self, ctx, opponent: discord.Member = None):
+    async def tictactoe(self, ctx, opponent: Optional[discord.Member] = None, level: str = tictactoe_table.DEFAULT_LEVEL):
         """Start a 3x3 TicTacToe. Usage: gtictactoe [@opponent]
         If no opponent is provided, you play vs the bot.
+        Bot level can be easy, normal, hard or perfect (e.g. gtictactoe hard).
         Click the gray boxes to play.
         """
+        level = level.lower()
+        if level not in tictactoe_table.LEVELS:
+            await ctx.send(f"Unknown level. Choose one of: {', '.join(tictactoe_table.LEVELS)}")
+            return
+
         player_x = ctx.author.id
         if opponent and opponent.bot:
             # if opponent is the bot, treat as vs bot
@@ -384,7 +375,7 @@ class TicTacToe(commands.Cog):
                 return
             self.active_games.add(game_key)
             vs_bot = True
-            view = TicTacToeView(ctx, player_x, player_o, vs_bot, self)
+            view = TicTacToeView(ctx, player_x, player_o, vs_bot, self, level=level)
             view.game_key = game_key
             embed = view.embed()
             message = await send_embed(ctx, embed, view=view)
@@ -5,22 +5,14 @@ import random
 from config import DB_PATH
 from utils.embed import send_embed
 from utils.database import require_enrollment
-
+from utils.timer_wheel import TimedView
+from utils.edit_dispatcher import edits
+from utils.session_journal import open_session, checkpoint, close_session
+from utils.stat_store import add_stats, max_stats, get_stats
 # Floor multipliers
-FLOOR_MULTIPLIERS = {
-    1: 1.3,
-    2: 1.6,
-    3: 2.0,
-    4: 2.5,
-    5: 3.0,
-    6: 3.5,
-    7: 4.5,
-    8: 6.0,
-    9: 8.0,
-    10: 10.0
-}
+from utils.game_math import TOWER_FLOOR_MULTIPLIERS as FLOOR_MULTIPLIERS
 
-class TowerView(discord.ui.View):
+class TowerView(TimedView):
     def __init__(self, game_data, cog):
         super().__init__(timeout=120)
         self.game_data = game_data
@@ -82,6 +74,7 @@ class TowerView(discord.ui.View):
         
         # Can't cash out on floor 0
         if floor == 0:
+            await close_session(game.get('session_id'))
             del self.cog.active_games[user_id]
             return
         
@@ -91,16 +84,11 @@ class TowerView(discord.ui.View):
         # Update balance
         async with aiosqlite.connect(DB_PATH) as db:
             await db.execute("UPDATE users SET mora = mora + ? WHERE user_id = ?", (winnings, user_id))
+            await close_session(game.get('session_id'), db=db)
             
             # Update stats
-            await db.execute("""
-                INSERT INTO game_stats (user_id, tower_games, tower_cashouts, tower_highest_floor)
-                VALUES (?, 1, 1, ?)
-                ON CONFLICT(user_id) DO UPDATE SET
-                    tower_games = tower_games + 1,
-                    tower_cashouts = tower_cashouts + 1,
-                    tower_highest_floor = MAX(tower_highest_floor, ?)
-            """, (user_id, floor, floor))
+            await add_stats(user_id, {'tower_games': 1, 'tower_cashouts': 1}, db)
+            await max_stats(user_id, {'tower_highest_floor': floor}, db)
             
             cursor = await db.execute("SELECT mora FROM users WHERE user_id = ?", (user_id,))
             balance = (await cursor.fetchone())[0]
@@ -126,7 +114,7 @@ class TowerView(discord.ui.View):
             item.disabled = True
         
         if self.message:
-            await self.message.edit(embed=embed, view=self)
+            await edits.edit(self.message, embed=embed, view=self)
         
         del self.cog.active_games[user_id]
 
@@ -194,8 +182,9 @@ class Tower(commands.Cog):
             if not row or row[0] < bet_amount:
                 return await ctx.send(f"❌ You don't have enough mora! Balance: {row[0] if row else 0:,} <:mora:1437958309255577681>")
             
-            # Deduct bet
+            # Deduct bet (journaled in the same transaction so a restart can refund it)
             await db.execute("UPDATE users SET mora = mora - ? WHERE user_id = ?", (bet_amount, ctx.author.id))
+            session_id = await open_session(ctx.author.id, "tower", bet_amount, db=db)
             await db.commit()
         
         # Start game
@@ -203,7 +192,8 @@ class Tower(commands.Cog):
             "user_id": ctx.author.id,
             "bet": bet_amount,
             "floor": 0,
-            "history": []  # Track which tiles were traps
+            "history": [],  # Track which tiles were traps
+            "session_id": session_id
         }
         
         self.active_games[ctx.author.id] = game_data
@@ -222,6 +212,7 @@ class Tower(commands.Cog):
         
         multiplier = FLOOR_MULTIPLIERS[floor]
         current_win = int(game_data['bet'] * multiplier)
+        await checkpoint(game_data.get('session_id'), cashout=current_win, state={"floor": floor})
         
         # Get next floor info if not max
         if floor < 10:
@@ -249,7 +240,7 @@ class Tower(commands.Cog):
         view = TowerView(game_data, self)
         
         if interaction:
-            view.message = await interaction.message.edit(embed=embed, view=view)
+            view.message = await edits.edit(interaction.message, embed=embed, view=view)
         else:
             view.message = await send_embed(ctx, embed, view=view)
     
@@ -266,17 +257,13 @@ class Tower(commands.Cog):
         
         # Check if hit trap
         if tile_num == trap_tile:
-            # Hit trap - lose
+            # Hit trap - lose (the escrowed bet is gone, so the journal closes with the stats)
             async with aiosqlite.connect(DB_PATH) as db:
-                await db.execute("""
-                    INSERT INTO game_stats (user_id, tower_games, tower_traps, tower_highest_floor)
-                    VALUES (?, 1, 1, ?)
-                    ON CONFLICT(user_id) DO UPDATE SET
-                        tower_games = tower_games + 1,
-                        tower_traps = tower_traps + 1,
-                        tower_highest_floor = MAX(tower_highest_floor, ?)
-                """, (user_id, floor - 1, floor - 1))
+                await add_stats(user_id, {'tower_games': 1, 'tower_traps': 1}, db)
+                await max_stats(user_id, {'tower_highest_floor': floor - 1}, db)
+                await close_session(game.get('session_id'), db=db)
                 await db.commit()
+            del self.active_games[user_id]
             
             # Apply golden card cashback (10%)
             bank_cog = interaction.client.get_cog('Bank')
@@ -313,7 +300,6 @@ class Tower(commands.Cog):
                 item.disabled = True
             
             await interaction.response.edit_message(embed=embed, view=view)
-            del self.active_games[user_id]
         else:
             # Safe tile!
             game['history'].append({
@@ -380,15 +366,10 @@ class Tower(commands.Cog):
         # Update balance
         async with aiosqlite.connect(DB_PATH) as db:
             await db.execute("UPDATE users SET mora = mora + ? WHERE user_id = ?", (winnings, user_id))
+            await close_session(game.get('session_id'), db=db)
             
-            await db.execute("""
-                INSERT INTO game_stats (user_id, tower_games, tower_cashouts, tower_highest_floor)
-                VALUES (?, 1, 1, ?)
-                ON CONFLICT(user_id) DO UPDATE SET
-                    tower_games = tower_games + 1,
-                    tower_cashouts = tower_cashouts + 1,
-                    tower_highest_floor = MAX(tower_highest_floor, ?)
-            """, (user_id, floor, floor))
+            await add_stats(user_id, {'tower_games': 1, 'tower_cashouts': 1}, db)
+            await max_stats(user_id, {'tower_highest_floor': floor}, db)
             
             cursor = await db.execute("SELECT mora FROM users WHERE user_id = ?", (user_id,))
             balance = (await cursor.fetchone())[0]
@@ -426,16 +407,10 @@ class Tower(commands.Cog):
         
         async with aiosqlite.connect(DB_PATH) as db:
             await db.execute("UPDATE users SET mora = mora + ? WHERE user_id = ?", (winnings, user_id))
+            await close_session(game.get('session_id'), db=db)
             
-            await db.execute("""
-                INSERT INTO game_stats (user_id, tower_games, tower_cashouts, tower_highest_floor, tower_perfect)
-                VALUES (?, 1, 1, 10, 1)
-                ON CONFLICT(user_id) DO UPDATE SET
-                    tower_games = tower_games + 1,
-                    tower_cashouts = tower_cashouts + 1,
-                    tower_highest_floor = 10,
-                    tower_perfect = tower_perfect + 1
-            """, (user_id,))
+            await add_stats(user_id, {'tower_games': 1, 'tower_cashouts': 1, 'tower_perfect': 1}, db)
+            await max_stats(user_id, {'tower_highest_floor': 10}, db)
             
             cursor = await db.execute("SELECT mora FROM users WHERE user_id = ?", (user_id,))
             balance = (await cursor.fetchone())[0]
@@ -465,17 +440,12 @@ class Tower(commands.Cog):
     
     async def show_stats(self, ctx):
         """Show user's Tower statistics"""
-        async with aiosqlite.connect(DB_PATH) as db:
-            cursor = await db.execute("""
-                SELECT tower_games, tower_cashouts, tower_traps, tower_highest_floor, tower_perfect
-                FROM game_stats WHERE user_id = ?
-            """, (ctx.author.id,))
-            row = await cursor.fetchone()
+        stats = await get_stats(ctx.author.id, ('tower_games', 'tower_cashouts', 'tower_traps', 'tower_highest_floor', 'tower_perfect'))
+        games, cashouts, traps, highest, perfect = stats.values()
         
-        if not row or row[0] == 0:
+        if games == 0:
             return await ctx.send("❌ You haven't played any Tower games yet!")
         
-        games, cashouts, traps, highest, perfect = row
         cashout_rate = (cashouts / games * 100) if games > 0 else 0
         
         embed = discord.Embed(
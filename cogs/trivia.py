@@ -7,146 +7,15 @@ from datetime import datetime
 from config import DB_PATH
 from utils.database import get_user_data, update_user_data, require_enrollment
 from utils.embed import send_embed
-
-# Easy trivia questions database with math
-TRIVIA_QUESTIONS = [
-    # Math Questions (40 questions)
-    {"question": "What is 5 + 3?", "answer": "8"},
-    {"question": "What is 10 - 4?", "answer": "6"},
-    {"question": "What is 2 x 5?", "answer": "10"},
-    {"question": "What is 15 + 5?", "answer": "20"},
-    {"question": "What is 7 + 8?", "answer": "15"},
-    {"question": "What is 20 - 10?", "answer": "10"},
-    {"question": "What is 3 x 4?", "answer": "12"},
-    {"question": "What is 12 + 8?", "answer": "20"},
-    {"question": "What is 25 - 5?", "answer": "20"},
-    {"question": "What is 6 x 2?", "answer": "12"},
-    {"question": "What is 9 + 9?", "answer": "18"},
-    {"question": "What is 30 - 15?", "answer": "15"},
-    {"question": "What is 5 x 5?", "answer": "25"},
-    {"question": "What is 100 - 50?", "answer": "50"},
-    {"question": "What is 8 + 7?", "answer": "15"},
-    {"question": "What is 4 x 3?", "answer": "12"},
-    {"question": "What is 13 + 7?", "answer": "20"},
-    {"question": "What is 40 - 20?", "answer": "20"},
-    {"question": "What is 7 x 2?", "answer": "14"},
-    {"question": "What is 11 + 9?", "answer": "20"},
-    {"question": "What is 50 - 25?", "answer": "25"},
-    {"question": "What is 10 x 2?", "answer": "20"},
-    {"question": "What is 6 + 6?", "answer": "12"},
-    {"question": "What is 18 - 9?", "answer": "9"},
-    {"question": "What is 3 x 3?", "answer": "9"},
-    {"question": "What is 14 + 6?", "answer": "20"},
-    {"question": "What is 35 - 15?", "answer": "20"},
-    {"question": "What is 8 x 2?", "answer": "16"},
-    {"question": "What is 17 + 3?", "answer": "20"},
-    {"question": "What is 60 - 30?", "answer": "30"},
-    {"question": "What is 9 x 2?", "answer": "18"},
-    {"question": "What is 12 + 12?", "answer": "24"},
-    {"question": "What is 45 - 20?", "answer": "25"},
-    {"question": "What is 6 x 3?", "answer": "18"},
-    {"question": "What is 19 + 1?", "answer": "20"},
-    {"question": "What is 70 - 40?", "answer": "30"},
-    {"question": "What is 4 x 5?", "answer": "20"},
-    {"question": "What is 16 + 4?", "answer": "20"},
-    {"question": "What is 80 - 50?", "answer": "30"},
-    {"question": "What is 11 x 2?", "answer": "22"},
-    
-    # Easy General Knowledge (30 questions)
-    {"question": "What color is the sky?", "answer": "BLUE"},
-    {"question": "What color is grass?", "answer": "GREEN"},
-    {"question": "How many days in a week?", "answer": "7"},
-    {"question": "What animal says meow?", "answer": "CAT"},
-    {"question": "What animal says woof?", "answer": "DOG"},
-    {"question": "What do bees make?", "answer": "HONEY"},
-    {"question": "What is frozen water?", "answer": "ICE"},
-    {"question": "What color is a banana?", "answer": "YELLOW"},
-    {"question": "How many legs does a cat have?", "answer": "4"},
-    {"question": "What is the opposite of hot?", "answer": "COLD"},
-    {"question": "What color is snow?", "answer": "WHITE"},
-    {"question": "What do cows give us to drink?", "answer": "MILK"},
-    {"question": "How many fingers on one hand?", "answer": "5"},
-    {"question": "What animal has a trunk?", "answer": "ELEPHANT"},
-    {"question": "What color is an apple?", "answer": "RED"},
-    {"question": "How many eyes do you have?", "answer": "2"},
-    {"question": "What do birds use to fly?", "answer": "WINGS"},
-    {"question": "What season comes after winter?", "answer": "SPRING"},
-    {"question": "How many wheels on a car?", "answer": "4"},
-    {"question": "What animal has 8 legs?", "answer": "SPIDER"},
-    {"question": "What do fish live in?", "answer": "WATER"},
-    {"question": "What color is the sun?", "answer": "YELLOW"},
-    {"question": "How many months in a year?", "answer": "12"},
-    {"question": "What animal is king of the jungle?", "answer": "LION"},
-    {"question": "What do you use to write?", "answer": "PEN"},
-    {"question": "How many legs does a spider have?", "answer": "8"},
-    {"question": "What do chickens lay?", "answer": "EGGS"},
-    {"question": "What shape is a ball?", "answer": "CIRCLE"},
-    {"question": "How many corners on a square?", "answer": "4"},
-    {"question": "What animal says moo?", "answer": "COW"},
-
-
-    {"question": "What city hosted the 2012 Olympics?", "answer": "LONDON"},
-    {"question": "Who invented the telephone?", "answer": "BELL"},
-    {"question": "What is the largest continent?", "answer": "ASIA"},
-    {"question": "What river runs through Egypt?", "answer": "NILE"},
-    {"question": "Who was known as the Iron Lady?", "answer": "THATCHER"},
-    {"question": "What is the capital of Spain?", "answer": "MADRID"},
-    {"question": "What country gifted the Statue of Liberty to the US?", "answer": "FRANCE"},
-
-    # Entertainment & Pop Culture (25 questions)
-    {"question": "What is the name of the fairy in Peter Pan?", "answer": "TINKERBELL"},
-    {"question": "What is Superman's weakness?", "answer": "KRYPTONITE"},
-    {"question": "What is the fastest car brand?", "answer": "BUGATTI"},
-    {"question": "What company created the iPhone?", "answer": "APPLE"},
-    {"question": "What Disney movie features a magic carpet?", "answer": "ALADDIN"},
-    {"question": "What is Mario's brother's name?", "answer": "LUIGI"},
-    {"question": "What color is Sonic the Hedgehog?", "answer": "BLUE"},
-    {"question": "What is the most popular search engine?", "answer": "GOOGLE"},
-    {"question": "What animal is Pikachu?", "answer": "MOUSE"},
-    {"question": "What is the name of Harry Potter's owl?", "answer": "HEDWIG"},
-    {"question": "What is Batman's real name?", "answer": "BRUCE"},
-    {"question": "What company makes PlayStation?", "answer": "SONY"},
-    {"question": "What is the most viewed video on YouTube?", "answer": "BABYSHARK"},
-    {"question": "What movie features Jack and Rose on a ship?", "answer": "TITANIC"},
-    {"question": "What is the name of Thor's hammer?", "answer": "MJOLNIR"},
-    {"question": "What is the currency in Fortnite?", "answer": "VBUCKS"},
-    {"question": "What game involves building with blocks?", "answer": "MINECRAFT"},
-    {"question": "What is Iron Man's real name?", "answer": "TONYSTARK"},
-    {"question": "What is the most streamed song on Spotify?", "answer": "BLINDINGLIGHTS"},
-    {"question": "What princess has very long hair?", "answer": "RAPUNZEL"},
-    {"question": "What color is the Facebook logo?", "answer": "BLUE"},
-    {"question": "What game has a battle royale mode?", "answer": "FORTNITE"},
-    {"question": "What is Link's fairy companion called in Zelda?", "answer": "NAVI"},
-    {"question": "What animal is Tom in Tom and Jerry?", "answer": "CAT"},
-    {"question": "What superhero can shrink and grow?", "answer": "ANTMAN"},
-
-    # Food & Miscellaneous (20 questions)
-    {"question": "What is the main ingredient in bread?", "answer": "FLOUR"},
-    {"question": "What fruit is red and often mistaken for a vegetable?", "answer": "TOMATO"},
-    {"question": "What is the most popular pizza topping?", "answer": "PEPPERONI"},
-    {"question": "What beverage contains caffeine?", "answer": "COFFEE"},
-    {"question": "What is sushi traditionally wrapped in?", "answer": "SEAWEED"},
-    {"question": "What nut is used to make marzipan?", "answer": "ALMOND"},
-    {"question": "What is the main ingredient in guacamole?", "answer": "AVOCADO"},
-    {"question": "What type of pasta is shaped like a tube?", "answer": "PENNE"},
-    {"question": "What is the hottest chili pepper?", "answer": "CAROLINAREAPER"},
-    {"question": "What do you call a person who doesn't eat meat?", "answer": "VEGETARIAN"},
-    {"question": "What is the main ingredient in hummus?", "answer": "CHICKPEAS"},
-    {"question": "What drink is made from fermented grapes?", "answer": "WINE"},
-    {"question": "What is the most expensive spice?", "answer": "SAFFRON"},
-    {"question": "What country is famous for maple syrup?", "answer": "CANADA"},
-    {"question": "What is a baby kangaroo called?", "answer": "JOEY"},
-    {"question": "What color is a giraffe's tongue?", "answer": "PURPLE"},
-    {"question": "What is the fear of spiders called?", "answer": "ARACHNOPHOBIA"},
-    {"question": "What is the world's most popular sport?", "answer": "SOCCER"},
-    {"question": "What is the largest bird in the world?", "answer": "OSTRICH"},
-    {"question": "What is the fear of heights called?", "answer": "ACROPHOBIA"},
-]
+from utils.timer_wheel import timers, TimedView
+from utils.session_journal import open_session, close_session
+from utils.trivia_bank import bank
+from utils.message_router import router
 
 
 class TriviaGame:
     """Represents an active trivia PvP game"""
-    def __init__(self, player1_id, player2_id, total_questions, bet, player1_channel_id=None, player2_channel_id=None, original_channel_id=None):
+    def __init__(self, player1_id, player2_id, total_questions, bet, player1_channel_id=None, player2_channel_id=None, original_channel_id=None, guild_id=None):
         self.player1_id = player1_id
         self.player2_id = player2_id
         self.total_questions = total_questions
@@ -158,8 +27,8 @@ class TriviaGame:
         self.player1_correct = 0  # Questions answered correctly by player 1
         self.player2_correct = 0  # Questions answered correctly by player 2
         
-        # Generate question list for this game
-        self.questions = random.sample(TRIVIA_QUESTIONS, min(total_questions, len(TRIVIA_QUESTIONS)))
+        # Generate question list for this game (no repeats per guild until the bank is used up)
+        self.questions = bank.sample(guild_id, total_questions)
         
         self.game_active = True
         self.winner = None
@@ -167,6 +36,7 @@ class TriviaGame:
         self.player1_channel_id = player1_channel_id  # Separate channel for player 1
         self.player2_channel_id = player2_channel_id  # Separate channel for player 2
         self.original_channel_id = original_channel_id  # Original channel where command was run
+        self.session_ids = ()  # Journal rows holding both bets until the game ends
         
         # Track when each player started their current question
         self.player1_question_start = None
@@ -191,6 +61,9 @@ class Trivia(commands.Cog):
         self.active_games = {}  # channel_id: TriviaGame
         self.pending_challenges = {}  # user_id: challenge_data
 
+    def cog_unload(self):
+        router.unregister_owner(self)
+
     @commands.command(name="trivia", aliases=["tpvp", "triviaduel"])
     async def trivia(self, ctx, opponent: discord.Member = None, rounds: int = None, bet: int = None):
         """Challenge someone to a trivia duel!
@@ -229,7 +102,8 @@ class Trivia(commands.Cog):
                 ),
                 color=0x9B59B6
             )
-            embed.set_footer(text="70 easy questions available (40 math, 30 general)")
+            breakdown = ", ".join(f"{count} {category}" for category, count in bank.categories.items())
+            embed.set_footer(text=f"{len(bank)} questions available ({breakdown})")
             return await ctx.send(embed=embed)
         
         if opponent.bot:
@@ -307,9 +181,12 @@ class Trivia(commands.Cog):
         self.pending_challenges[opponent.id]["message"] = msg
         
         # Auto-decline after 60 seconds
-        await asyncio.sleep(60)
-        if opponent.id in self.pending_challenges:
-            del self.pending_challenges[opponent.id]
+        timers.schedule(("trivia_challenge", opponent.id), 60, self.expire_challenge, opponent.id, msg, embed)
+
+    async def expire_challenge(self, opponent_id, msg, embed):
+        """Auto-decline a challenge that was not answered in time"""
+        if opponent_id in self.pending_challenges:
+            del self.pending_challenges[opponent_id]
             embed.description += "\n\n❌ **Challenge expired!**"
             embed.color = 0x95A5A6
             try:
@@ -323,6 +200,10 @@ class Trivia(commands.Cog):
         async with aiosqlite.connect(DB_PATH) as db:
             await db.execute("UPDATE users SET mora = mora - ? WHERE user_id = ?", (bet, player1_id))
             await db.execute("UPDATE users SET mora = mora - ? WHERE user_id = ?", (bet, player2_id))
+            session_ids = (
+                await open_session(player1_id, "trivia", bet, db=db),
+                await open_session(player2_id, "trivia", bet, db=db),
+            )
             await db.commit()
         
         # Get players
@@ -389,13 +270,17 @@ class Trivia(commands.Cog):
             async with aiosqlite.connect(DB_PATH) as db:
                 await db.execute("UPDATE users SET mora = mora + ? WHERE user_id = ?", (bet, player1_id))
                 await db.execute("UPDATE users SET mora = mora + ? WHERE user_id = ?", (bet, player2_id))
+                await close_session(*session_ids, db=db)
                 await db.commit()
             return
         
         # Create game with both channel IDs
-        game = TriviaGame(player1_id, player2_id, rounds, bet, player1_channel.id, player2_channel.id, original_channel.id)
+        game = TriviaGame(player1_id, player2_id, rounds, bet, player1_channel.id, player2_channel.id, original_channel.id, guild_id=guild.id)
+        game.session_ids = session_ids
         self.active_games[player1_channel.id] = game
         self.active_games[player2_channel.id] = game
+        router.register(player1_channel.id, player1_id, self.handle_answer)
+        router.register(player2_channel.id, player2_id, self.handle_answer)
         
         # Send welcome message to each player's channel
         # Send ping first (outside embed) so players get notified
@@ -496,7 +381,7 @@ class Trivia(commands.Cog):
             title=f"Question {question_num + 1}/{game.total_questions}",
             description=(
                 f"**{player.mention}**\n\n"
-                f"# {question['question']}\n\n"
+                f"# {question.question}\n\n"
                 f"Type your answer in chat!\n"
                 f"🔄 Skips: **{skips_left}** | 💡 Hints: **{hints_left}**"
             ),
@@ -534,6 +419,7 @@ class Trivia(commands.Cog):
         total_pot = game.bet * 2
         async with aiosqlite.connect(DB_PATH) as db:
             await db.execute("UPDATE users SET mora = mora + ? WHERE user_id = ?", (total_pot, winner_id))
+            await close_session(*game.session_ids, db=db)
             await db.commit()
         
         profit = total_pot - game.bet
@@ -591,6 +477,8 @@ class Trivia(commands.Cog):
             del self.active_games[game.player1_channel_id]
         if game.player2_channel_id in self.active_games:
             del self.active_games[game.player2_channel_id]
+        router.unregister(game.player1_channel_id, game.player1_id, self.handle_answer)
+        router.unregister(game.player2_channel_id, game.player2_id, self.handle_answer)
         
         # Delete both channels after delay
         await asyncio.sleep(10)
@@ -681,7 +569,7 @@ class Trivia(commands.Cog):
             hints_left = game.player2_hints
         
         # Reveal a random letter from the answer
-        answer = current_question['answer']
+        answer = current_question.answer
         available_positions = [i for i, char in enumerate(answer) if i not in revealed_letters and char.isalnum()]
         
         if not available_positions:
@@ -703,15 +591,8 @@ class Trivia(commands.Cog):
         
         await ctx.send(f"💡 **Hint:** `{hint_string}`\n**{hints_left}** hints remaining.")
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        """Listen for trivia answers"""
-        if message.author.bot:
-            return
-        
-        if message.content.startswith('g'):
-            return
-        
+    async def handle_answer(self, message):
+        """Check a trivia answer (routed here by bot.on_message while a game is running)"""
         game = self.active_games.get(message.channel.id)
         if not game or not game.game_active:
             return
@@ -735,14 +616,9 @@ class Trivia(commands.Cog):
             current_question = game.questions[game.player2_current]
             question_start = game.player2_question_start
         
-        # Check answer (case insensitive, remove spaces/special chars)
-        user_answer = ''.join(c.upper() for c in message.content if c.isalnum())
-        correct_answer = ''.join(c.upper() for c in current_question['answer'] if c.isalnum())
-        
-        # Accept exact match OR if one contains the other (for partial name answers like TONY vs TONYSTARK)
-        is_correct = (user_answer == correct_answer or 
-                     (len(user_answer) >= 4 and user_answer in correct_answer) or
-                     (len(correct_answer) >= 4 and correct_answer in user_answer))
+        # Check answer against the pre-normalized answer and aliases (case insensitive,
+        # ignores spaces/special chars, accepts partial names like TONY vs TONYSTARK)
+        is_correct = current_question.check(message.content)
         
         if is_correct:
             # Correct answer!
@@ -815,7 +691,7 @@ class Trivia(commands.Cog):
             await message.add_reaction("❌")
 
 
-class TriviaAcceptView(discord.ui.View):
+class TriviaAcceptView(TimedView):
     """Accept/Decline buttons for trivia challenge"""
     
     def __init__(self, cog, opponent_id):
@@ -833,6 +709,7 @@ class TriviaAcceptView(discord.ui.View):
         
         challenge = self.cog.pending_challenges[self.opponent_id]
         del self.cog.pending_challenges[self.opponent_id]
+        timers.cancel(("trivia_challenge", self.opponent_id))
         
         await interaction.response.send_message("✅ Challenge accepted! Starting game...", ephemeral=True)
         
@@ -859,6 +736,7 @@ class TriviaAcceptView(discord.ui.View):
             return await interaction.response.send_message("❌ Challenge expired!", ephemeral=True)
         
         del self.cog.pending_challenges[self.opponent_id]
+        timers.cancel(("trivia_challenge", self.opponent_id))
         
         await interaction.response.send_message("❌ Challenge declined.", ephemeral=True)
         
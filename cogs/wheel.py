@@ -6,6 +6,8 @@ from utils.database import get_user_data, update_user_data
 from utils.embed import send_embed
 from utils.transaction_logger import log_transaction
 from utils.logger import setup_logger
+from utils.edit_dispatcher import edits
+from utils.game_math import wheel_pool as build_wheel_pool, WHEEL_BANKRUPT_PENALTY
 
 logger = setup_logger("Wheel")
 
@@ -112,42 +114,19 @@ class Wheel(commands.Cog):
             if premium_cog:
                 is_premium = await premium_cog.is_premium(ctx.author.id)
 
-            # Premium users get improved odds (lower weight on bad outcomes, higher on good)
-            if is_premium:
-                segments = [
-                    ("💸 Bankrupt", 0, 1),      # 1% (same)
-                    ("💔 0.2x", 0.2, 15),       # 15% (reduced from 20%)
-                    ("🎯 0.5x", 0.5, 20),       # 20% (reduced from 24%)
-                    ("💰 1.2x", 1.2, 22),       # 22% (increased from 20%)
-                    ("💎 2x", 2, 26),           # 26% (increased from 24%)
-                    ("💵 5x", 5, 9),            # 9% (increased from 6%)
-                    ("🌟 10x", 10, 5),          # 5% (increased from 4%)
-                    ("👑 JACKPOT", 50, 2),      # 2% (doubled from 1%)
-                ]
-            else:
-                segments = [
-                    ("💸 Bankrupt", 0, 1),
-                    ("💔 0.2x", 0.2, 20),
-                    ("🎯 0.5x", 0.5, 24),
-                    ("💰 1.2x", 1.2, 20),
-                    ("💎 2x", 2, 24),
-                    ("💵 5x", 5, 6),
-                    ("🌟 10x", 10, 4),
-                    ("👑 JACKPOT", 50, 1),
-                ]
-
-            wheel_pool = []
-            for segment, multiplier, weight in segments:
-                wheel_pool.extend([(segment, multiplier)] * weight)
+            # Premium users get improved odds (see utils/game_math.py)
+            wheel_pool = build_wheel_pool(premium=is_premium)
 
             try:
                 spin_msg = await ctx.send("**Spinning the wheel...** 🎡")
                 await asyncio.sleep(1)
 
+                # Animation frames are fire-and-forget: under load the
+                # dispatcher skips stale frames instead of queueing them
                 for i in range(3):
                     random_seg = random.choice(wheel_pool)
-                    await spin_msg.edit(
-                        content=f"🎡 **Spinning the wheel...** {random_seg[0]}"
+                    edits.submit(
+                        spin_msg, content=f"🎡 **Spinning the wheel...** {random_seg[0]}"
                     )
                     await asyncio.sleep(0.5)
             except (discord.errors.HTTPException, RuntimeError):
@@ -160,7 +139,7 @@ class Wheel(commands.Cog):
                 # Bankrupt: lose bet + 10% of remaining mora
                 data = await get_user_data(ctx.author.id)
                 current_mora = data.get("mora", 0)
-                penalty = int(current_mora * 0.10)
+                penalty = int(current_mora * WHEEL_BANKRUPT_PENALTY)
                 total_loss = bet_amount + penalty
                 
                 if penalty > 0:
@@ -233,7 +212,7 @@ class Wheel(commands.Cog):
 
             try:
                 if 'spin_msg' in locals():
-                    await spin_msg.edit(content=None, embed=embed)
+                    await edits.edit(spin_msg, content=None, embed=embed)
                 else:
                     await ctx.send(embed=embed)
             except (discord.errors.HTTPException, RuntimeError):
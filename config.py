@@ -14,3 +14,7 @@ OWNER_ID = 873464016217968640
 # Maintenance Mode
 
 MAINTENANCE_MODE = False
+
+# Global Bank
+# Buffer game-loss credits in memory and write them every few seconds
+BANK_WRITE_BEHIND = False
@@ -0,0 +1,157 @@
+"""Count the database round trips behind gbal and gbank.
+
+Runs against a scratch database (never casino.db) seeded with players,
+deposits, loans and cards, and replays the reads each command makes:
+
+    old   get_user_data + one SELECT per table
+    new   utils.bank_view: one joined query + the cached pool figures
+
+Every statement SQLite runs (including the implicit BEGIN/COMMIT) and
+every connection opened is counted.
+require_enrollment runs first in both versions and is counted separately.
+
+Usage:
+    python scripts/bench_balance_view.py [players] [calls]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import aiosqlite
+
+# Add parent directory to path to import utils
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import bank_view, database, global_bank, transaction_logger
+
+
+class Counter:
+    def __init__(self):
+        self.statements = 0
+        self.connections = 0
+
+    def install(self):
+        """Trace every statement SQLite runs on every connection opened from now on"""
+        counter = self
+        connect = aiosqlite.Connection._connect
+
+        def trace(statement):
+            counter.statements += 1
+
+        async def traced_connect(self):
+            conn = await connect(self)
+            counter.connections += 1
+            await conn.set_trace_callback(trace)
+            return conn
+
+        aiosqlite.Connection._connect = traced_connect
+
+    def snapshot(self):
+        return self.statements, self.connections
+
+
+async def seed(path, players):
+    for module in (database, bank_view, global_bank, transaction_logger):
+        module.DB_PATH = path
+    await database.init_db()
+    rng = random.Random(7)
+    async with aiosqlite.connect(path) as db:
+        await db.executescript("""
+            CREATE TABLE IF NOT EXISTS user_bank_deposits (user_id INTEGER PRIMARY KEY, deposited_amount INTEGER DEFAULT 0, interest_earned INTEGER DEFAULT 0);
+            CREATE TABLE IF NOT EXISTS user_loans (user_id INTEGER PRIMARY KEY, loan_amount INTEGER DEFAULT 0, penalty_amount INTEGER DEFAULT 0,
+                due_date TEXT, penalty_applied INTEGER DEFAULT 0, last_loan_date TEXT, daily_loan_count INTEGER DEFAULT 0,
+                loan_count_date TEXT, loan_ban_until TEXT);
+            CREATE TABLE IF NOT EXISTS bank_cards (user_id INTEGER PRIMARY KEY, card_tier INTEGER DEFAULT 0, purchased_at TEXT);
+            CREATE TABLE IF NOT EXISTS rob_items (user_id INTEGER PRIMARY KEY, shotgun INTEGER DEFAULT 0, mask INTEGER DEFAULT 0,
+                night_vision INTEGER DEFAULT 0, lockpicker INTEGER DEFAULT 0, guard_dog INTEGER DEFAULT 0,
+                guard_dog_expires TEXT, spiky_fence INTEGER DEFAULT 0, lock INTEGER DEFAULT 0);
+        """)
+        for user_id in range(1, players + 1):
+            await db.execute("INSERT OR REPLACE INTO users (user_id, mora, dust, fates, enrolled) VALUES (?, ?, 0, 0, 1)", (user_id, rng.randint(0, 10**7)))
+            await db.execute("INSERT INTO user_bank_deposits (user_id, deposited_amount) VALUES (?, ?)", (user_id, rng.randint(0, 10**7)))
+            if rng.random() < 0.3:
+                await db.execute("INSERT INTO user_loans (user_id, loan_amount, due_date) VALUES (?, ?, '2030-01-01T00:00:00')", (user_id, rng.randint(1, 10**6)))
+            await db.execute("INSERT INTO bank_cards (user_id, card_tier) VALUES (?, ?)", (user_id, rng.randint(0, 2)))
+            await db.execute("INSERT INTO rob_items (user_id, shotgun) VALUES (?, ?)", (user_id, rng.randint(0, 1)))
+        await db.commit()
+    await global_bank.init_global_bank()
+    # warm up the per-user rows ensure_user_db creates on first touch
+    for user_id in range(1, players + 1):
+        await database.ensure_user_db(user_id)
+
+
+async def old_gbal(user_id):
+    data = await database.get_user_data(user_id)
+    async with aiosqlite.connect(database.DB_PATH) as db:
+        cursor = await db.execute("SELECT deposited_amount, interest_earned FROM user_bank_deposits WHERE user_id = ?", (user_id,))
+        await cursor.fetchone()
+    return data["mora"]
+
+
+async def new_gbal(user_id):
+    return (await bank_view.get_balance_view(user_id))["mora"]
+
+
+async def old_gbank(user_id):
+    async with aiosqlite.connect(database.DB_PATH) as db:
+        cursor = await db.execute("SELECT total_loans_given, total_penalties_collected FROM global_bank WHERE id = 1")
+        await cursor.fetchone()
+        await global_bank.get_bank_balance(db)
+        cursor = await db.execute("SELECT deposited_amount, interest_earned FROM user_bank_deposits WHERE user_id = ?", (user_id,))
+        await cursor.fetchone()
+        cursor = await db.execute("SELECT SUM(deposited_amount), SUM(interest_earned) FROM user_bank_deposits")
+        await cursor.fetchone()
+        cursor = await db.execute(
+            "SELECT shotgun, mask, night_vision, lockpicker, guard_dog, guard_dog_expires, spiky_fence, lock FROM rob_items WHERE user_id = ?",
+            (user_id,)
+        )
+        await cursor.fetchone()
+
+
+async def new_gbank(user_id):
+    await bank_view.get_balance_view(user_id, with_rob_items=True)
+    await bank_view.get_pool_stats()
+
+
+async def measure(counter, label, read, players, calls):
+    rng = random.Random(1)
+    users = [rng.randint(1, players) for _ in range(calls)]
+    before = counter.snapshot()
+    started = time.perf_counter()
+    for user_id in users:
+        await read(user_id)
+    elapsed = time.perf_counter() - started
+    statements = (counter.statements - before[0]) / calls
+    connections = (counter.connections - before[1]) / calls
+    print(f"{label:<10} {statements:>7.1f} statements {connections:>5.1f} connections {elapsed / calls * 1000:>8.2f} ms per call")
+    return statements
+
+
+async def main(players, calls):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        await seed(path, players)
+        counter = Counter()
+        counter.install()
+
+        print(f"{players:,} players, {calls:,} calls per read path\n")
+        await measure(counter, "enroll", lambda uid: database.require_enrollment(SimpleNamespace(author=SimpleNamespace(id=uid))), players, calls)
+        print()
+        old = await measure(counter, "gbal old", old_gbal, players, calls)
+        new = await measure(counter, "gbal new", new_gbal, players, calls)
+        print(f"{'':<10} {old / new:.0f}x fewer statements\n")
+        old = await measure(counter, "gbank old", old_gbank, players, calls)
+        new = await measure(counter, "gbank new", new_gbank, players, calls)
+        print(f"{'':<10} {old / new:.1f}x fewer statements")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    asyncio.run(main(players, calls))
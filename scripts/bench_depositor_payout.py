@@ -0,0 +1,87 @@
+"""Benchmark the depositor interest payout made when a loan is taken.
+
+Runs against a scratch database (never casino.db). Pays the same pot to the
+same depositors two ways:
+
+    per-row    the old loop: one UPDATE per depositor, int() truncation
+    set-based  utils.global_bank.PRO_RATA_SQL: one statement with
+               largest-remainder rounding
+
+and reports the time each takes and how much of the pot actually reached
+depositors (the per-row loop drops the rounding remainders).
+
+Usage:
+    python scripts/bench_depositor_payout.py [depositors] [pot]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+import aiosqlite
+
+# Add parent directory to path to import utils
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.global_bank import distribute_to_depositors
+
+
+async def seed(path, depositors):
+    rng = random.Random(42)
+    async with aiosqlite.connect(path) as db:
+        await db.execute("""
+            CREATE TABLE user_bank_deposits (
+                user_id INTEGER PRIMARY KEY,
+                deposited_amount INTEGER DEFAULT 0,
+                interest_earned INTEGER DEFAULT 0
+            )
+        """)
+        await db.executemany(
+            "INSERT INTO user_bank_deposits (user_id, deposited_amount) VALUES (?, ?)",
+            [(10**17 + i, rng.choice([0, rng.randint(1, 5_000), rng.randint(10_000, 1_000_000)])) for i in range(depositors)]
+        )
+        await db.commit()
+
+
+async def per_row(db, pot):
+    cursor = await db.execute("SELECT SUM(deposited_amount) FROM user_bank_deposits")
+    total_deposits = (await cursor.fetchone())[0] or 0
+    cursor = await db.execute("SELECT user_id, deposited_amount FROM user_bank_deposits WHERE deposited_amount > 0")
+    for depositor_id, deposit_amount in await cursor.fetchall():
+        share = int((deposit_amount / total_deposits) * pot)
+        await db.execute(
+            "UPDATE user_bank_deposits SET interest_earned = interest_earned + ? WHERE user_id = ?",
+            (share, depositor_id)
+        )
+
+
+async def run(label, payout, depositors, pot):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        await seed(path, depositors)
+        async with aiosqlite.connect(path) as db:
+            started = time.perf_counter()
+            await payout(db, pot)
+            await db.commit()
+            elapsed = time.perf_counter() - started
+            cursor = await db.execute("SELECT SUM(interest_earned), COUNT(*) FROM user_bank_deposits WHERE interest_earned > 0")
+            paid, paid_count = await cursor.fetchone()
+        print(f"{label:<10} {elapsed * 1000:>9.1f} ms   paid {paid or 0:>10,} of {pot:,} to {paid_count:,} depositors")
+        return elapsed
+    finally:
+        os.remove(path)
+
+
+async def main(depositors, pot):
+    print(f"{depositors:,} depositors, pot {pot:,}\n")
+    slow = await run("per-row", per_row, depositors, pot)
+    fast = await run("set-based", distribute_to_depositors, depositors, pot)
+    print(f"\n{slow / fast:.1f}x faster")
+
+
+if __name__ == "__main__":
+    depositors = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    pot = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    asyncio.run(main(depositors, pot))
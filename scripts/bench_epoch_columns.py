@@ -0,0 +1,140 @@
+"""Check and time the epoch twins added by utils/epoch.py.
+
+Runs against a scratch database (never casino.db). Seeds premium users and
+loans the way an older build wrote them (ISO text only), then:
+
+1. ensure_epoch_column backfills <column>_ts; every value must equal
+   epoch.to_epoch() of the text, for local and UTC columns.
+2. Rows an old build still running inserts or updates after the migration
+   (text only) must get a matching _ts from the triggers, and read the
+   same through epoch_sql as through the text.
+3. The premium check and an overdue-loan sweep are timed the old way
+   (fetch rows, datetime.fromisoformat) and the new way (compare in SQL),
+   and the sweep's query plan is printed.
+
+Usage:
+    python scripts/bench_epoch_columns.py [rows] [checks]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import aiosqlite
+
+# Add parent directory to path to import utils
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import epoch
+
+
+async def seed(db, rows, rng):
+    await db.execute("CREATE TABLE premium_users (user_id INTEGER PRIMARY KEY, expires_at TEXT, lifetime INTEGER DEFAULT 0)")
+    await db.execute("CREATE TABLE user_loans (user_id INTEGER PRIMARY KEY, loan_amount INTEGER DEFAULT 0, due_date TEXT)")
+    await db.execute("CREATE TABLE daily_claims (user_id INTEGER PRIMARY KEY, last_claim TEXT NOT NULL)")
+    now = datetime.now()
+    for user_id in range(1, rows + 1):
+        expires = now + timedelta(seconds=rng.randint(-90 * 86400, 90 * 86400), microseconds=rng.randint(0, 999999))
+        await db.execute("INSERT INTO premium_users VALUES (?, ?, 0)", (user_id, expires.isoformat()))
+        due = now + timedelta(seconds=rng.randint(-86400, 86400))
+        await db.execute("INSERT INTO user_loans VALUES (?, ?, ?)", (user_id, rng.choice([0, 0, 1000]), due.isoformat()))
+        await db.execute("INSERT INTO daily_claims VALUES (?, ?)", (user_id, (datetime.utcnow() - timedelta(hours=rng.randint(0, 72))).isoformat()))
+    await db.commit()
+
+
+async def check_backfill(db, table, column, utc, errors):
+    cursor = await db.execute(f"SELECT {column}, {column}_ts, {epoch.epoch_sql(column, utc=utc)} FROM {table}")
+    for text, ts, read in await cursor.fetchall():
+        expected = epoch.to_epoch(text, utc=utc)
+        if ts != expected or read != expected:
+            errors.append(f"{table}.{column} {text!r}: ts={ts} read={read} expected={expected}")
+
+
+async def main(rows, checks):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    rng = random.Random(5)
+    errors = []
+    try:
+        async with aiosqlite.connect(path) as db:
+            await seed(db, rows, rng)
+            started = time.perf_counter()
+            await epoch.ensure_epoch_column(db, "premium_users", "expires_at", where="lifetime = 0")
+            await epoch.ensure_epoch_column(db, "user_loans", "due_date", where="loan_amount > 0")
+            await epoch.ensure_epoch_column(db, "daily_claims", "last_claim", utc=True)
+            await db.commit()
+            print(f"migrated {rows:,} rows x 3 tables in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+            # an old build writes text only after the migration ran:
+            # a new row, and an extended expiry on an existing one
+            late = datetime.now() + timedelta(days=3)
+            await db.execute("INSERT INTO premium_users (user_id, expires_at) VALUES (?, ?)", (rows + 1, late.isoformat()))
+            await db.execute("UPDATE premium_users SET expires_at = ? WHERE user_id = 1", ((late + timedelta(days=30)).isoformat(),))
+            await db.execute("UPDATE user_loans SET due_date = ? WHERE user_id = 1", (late.isoformat(),))
+            await db.commit()
+
+            await check_backfill(db, "premium_users", "expires_at", False, errors)
+            await check_backfill(db, "user_loans", "due_date", False, errors)
+            await check_backfill(db, "daily_claims", "last_claim", True, errors)
+            cursor = await db.execute(f"SELECT {epoch.epoch_sql('expires_at')} FROM premium_users WHERE user_id = ?", (rows + 1,))
+            if (await cursor.fetchone())[0] != epoch.to_epoch(late):
+                errors.append("text-only row written after the migration reads wrong")
+
+            users = [rng.randint(1, rows) for _ in range(checks)]
+
+            started = time.perf_counter()
+            old = []
+            for user_id in users:
+                cursor = await db.execute("SELECT expires_at, lifetime FROM premium_users WHERE user_id = ?", (user_id,))
+                expires_at, lifetime = await cursor.fetchone()
+                old.append(bool(lifetime) or datetime.now() <= datetime.fromisoformat(expires_at))
+            old_time = time.perf_counter() - started
+
+            expires = epoch.epoch_sql("expires_at")
+            started = time.perf_counter()
+            new = []
+            for user_id in users:
+                cursor = await db.execute(
+                    f"SELECT 1 FROM premium_users WHERE user_id = ? AND (lifetime OR {expires} IS NULL OR {expires} >= ?)",
+                    (user_id, epoch.now())
+                )
+                new.append(await cursor.fetchone() is not None)
+            new_time = time.perf_counter() - started
+            # rows within a second of expiring can legitimately flip between the two runs
+            mismatches = sum(a != b for a, b in zip(old, new))
+            print(f"premium check   parse {old_time / checks * 1e6:>7.1f} us   sql {new_time / checks * 1e6:>7.1f} us   ({mismatches} differ)")
+            if mismatches > 1:
+                errors.append(f"premium check disagrees on {mismatches} of {checks} users")
+
+            started = time.perf_counter()
+            cursor = await db.execute("SELECT user_id, due_date FROM user_loans WHERE loan_amount > 0")
+            # whole seconds, so the text and the epoch comparison cut at the same instant
+            now = datetime.now().replace(microsecond=0)
+            overdue_old = sorted(u for u, due in await cursor.fetchall() if datetime.fromisoformat(due) < now)
+            old_time = time.perf_counter() - started
+            sweep = "SELECT user_id FROM user_loans WHERE loan_amount > 0 AND due_date_ts < ?"
+            started = time.perf_counter()
+            cursor = await db.execute(sweep, (epoch.to_epoch(now),))
+            overdue_new = sorted(row[0] for row in await cursor.fetchall())
+            new_time = time.perf_counter() - started
+            print(f"overdue sweep   parse {old_time * 1000:>7.2f} ms   sql {new_time * 1000:>7.2f} ms   ({len(overdue_new):,} overdue)")
+            if overdue_old != overdue_new:
+                errors.append("overdue sweep results differ")
+            cursor = await db.execute("EXPLAIN QUERY PLAN " + sweep, (0,))
+            for row in await cursor.fetchall():
+                print(f"  plan: {row[-1]}")
+    finally:
+        os.remove(path)
+
+    for error in errors[:10]:
+        print(f"FAIL {error}")
+    print("PASS" if not errors else f"FAIL ({len(errors)} problems)")
+    return not errors
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    checks = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    sys.exit(0 if asyncio.run(main(rows, checks)) else 1)
@@ -0,0 +1,148 @@
+"""Benchmark global bank credits under concurrent game losses.
+
+Runs against a scratch database (never casino.db). Each worker plays the
+part of a game crediting a loss to the bank, all at once, in three modes:
+
+    hot-row       the old UPDATE global_bank ... WHERE id = 1
+    sharded       utils.global_bank.add_to_bank, one shard per user id
+    write-behind  sharded + BANK_WRITE_BEHIND, flushed every FLUSH_SECONDS
+
+and reports wall time, write transactions, time spent waiting for the write
+lock and whether the final balance is exact.
+
+Note that SQLite takes one write lock per database, not per row, so the
+shards on their own do not shorten the queue; the wait drops when credits
+are batched by the write-behind buffer.
+
+Usage:
+    python scripts/bench_global_bank.py [workers] [credits_per_worker]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+import aiosqlite
+
+# Add parent directory to path to import utils
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from utils import global_bank
+
+START = 1_000_000
+
+
+class Stats:
+    def __init__(self):
+        self.writes = 0
+        self.lock_wait = 0.0
+
+
+async def fresh_db(sharded: bool):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    async with aiosqlite.connect(path) as db:
+        await db.execute("PRAGMA journal_mode=WAL")
+        await db.execute("""
+            CREATE TABLE global_bank (
+                id INTEGER PRIMARY KEY DEFAULT 1,
+                balance INTEGER DEFAULT 0,
+                total_loans_given INTEGER DEFAULT 0,
+                total_penalties_collected INTEGER DEFAULT 0
+            )
+        """)
+        await db.execute("INSERT INTO global_bank (id, balance) VALUES (1, ?)", (START,))
+        await db.commit()
+    global_bank.DB_PATH = path
+    global_bank._initialized = False
+    if sharded:
+        await global_bank.init_global_bank()
+    return path
+
+
+async def timed_write(stats, path, sql, params):
+    async with aiosqlite.connect(path, timeout=60) as db:
+        started = time.perf_counter()
+        await db.execute("BEGIN IMMEDIATE")
+        stats.lock_wait += time.perf_counter() - started
+        await db.execute(sql, params)
+        await db.commit()
+    stats.writes += 1
+
+
+async def hot_row_worker(stats, path, user_id, credits):
+    for _ in range(credits):
+        await timed_write(stats, path, "UPDATE global_bank SET balance = balance + ? WHERE id = 1", (1, ))
+        await asyncio.sleep(0)
+
+
+async def sharded_worker(stats, path, user_id, credits):
+    for _ in range(credits):
+        await timed_write(
+            stats, path,
+            "UPDATE global_bank_shards SET balance = balance + ? WHERE shard = ?",
+            (1, global_bank.shard_for(user_id))
+        )
+        await asyncio.sleep(0)
+
+
+async def write_behind_worker(stats, path, user_id, credits):
+    for _ in range(credits):
+        await global_bank.add_to_bank(1, user_id)
+        await asyncio.sleep(0)
+
+
+async def run(mode, worker, workers, credits):
+    path = await fresh_db(sharded=mode != "hot-row")
+    stats = Stats()
+    config.BANK_WRITE_BEHIND = mode == "write-behind"
+    flusher = None
+    if config.BANK_WRITE_BEHIND:
+        async def flush_loop():
+            while True:
+                await asyncio.sleep(global_bank.FLUSH_SECONDS)
+                if await global_bank.flush_pending():
+                    stats.writes += 1
+        flusher = asyncio.create_task(flush_loop())
+    try:
+        users = random.sample(range(10**6, 10**7), workers)
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(stats, path, user_id, credits) for user_id in users))
+        elapsed = time.perf_counter() - started
+
+        expected = START + workers * credits
+        if mode == "hot-row":
+            async with aiosqlite.connect(path) as db:
+                cursor = await db.execute("SELECT balance FROM global_bank WHERE id = 1")
+                stored = live = (await cursor.fetchone())[0]
+        else:
+            # reads before the final flush must already include buffered credits
+            live = await global_bank.get_bank_balance()
+            if flusher:
+                flusher.cancel()
+                if await global_bank.flush_pending():
+                    stats.writes += 1
+            stored = await global_bank.get_bank_balance()
+        exact = "yes" if live == stored == expected else f"NO ({live:,}/{stored:,} != {expected:,})"
+        print(f"{mode:<13} {elapsed:>8.2f}s {stats.writes:>8} writes {stats.lock_wait:>9.2f}s lock wait   exact: {exact}")
+    finally:
+        config.BANK_WRITE_BEHIND = False
+        os.remove(path)
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+async def main(workers, credits):
+    print(f"{workers} concurrent games x {credits} losses each, {global_bank.SHARDS} shards\n")
+    await run("hot-row", hot_row_worker, workers, credits)
+    await run("sharded", sharded_worker, workers, credits)
+    await run("write-behind", write_behind_worker, workers, credits)
+
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    credits = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    asyncio.run(main(workers, credits))
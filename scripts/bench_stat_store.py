@@ -0,0 +1,191 @@
+"""Check the game_stats migration to utils/stat_store.py and time both layouts.
+
+Runs against a scratch database (never casino.db) seeded with a wide
+game_stats table the way older builds left it (columns added by ALTER TABLE
+over time, so positions differ from the CREATE statement), then:
+
+1. init_db migrates it: every non-zero legacy value must read back the same
+   through get_stats, and the game_stats view must return the legacy row
+   column for column.
+2. Writes and reads are timed on the old table (kept as game_stats_legacy)
+   and the store: one stat bump, a finished two-player match, and the 14
+   stats the achievement check reads. Statements are counted too.
+3. Adding a stat is timed: ALTER TABLE on the wide table against a first
+   write of a new name.
+
+Usage:
+    python scripts/bench_stat_store.py [players] [calls]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+import aiosqlite
+
+# Add parent directory to path to import utils
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_balance_view import Counter
+from utils import database, stat_store
+
+# The columns in the order an older database ends up with them
+LEGACY_COLUMNS = (
+    "rps_wins", "rps_plays", "connect4_wins", "connect4_plays", "tictactoe_wins", "tictactoe_plays",
+    "blackjack_wins", "blackjack_plays", "blackjack_naturals", "slots_plays", "slots_jackpots",
+    "coinflip_wins", "coinflip_plays", "coinflip_streak", "mines_plays", "mines_max_tiles",
+    "multiplayer_games", "total_earned", "max_wallet", "rob_success", "rob_attempts",
+    "games_played_types", "mines_wins", "scramble_games", "scramble_wins", "scramble_losses",
+    "scramble_streak", "scramble_best_time", "hilo_games", "hilo_cashouts", "hilo_busts",
+    "hilo_best_streak", "hilo_jokers", "tower_games", "tower_cashouts", "tower_traps",
+    "tower_highest_floor", "tower_perfect", "memory_games", "memory_wins", "memory_losses",
+)
+
+
+async def seed(path, players, rng):
+    async with aiosqlite.connect(path) as db:
+        columns = ", ".join(
+            f"{name} TEXT DEFAULT ''" if name == "games_played_types"
+            else f"{name} REAL DEFAULT 0" if name == "scramble_best_time"
+            else f"{name} INTEGER DEFAULT 0"
+            for name in LEGACY_COLUMNS
+        )
+        await db.execute(f"CREATE TABLE game_stats (user_id INTEGER PRIMARY KEY, {columns})")
+        rows = []
+        for user_id in range(1, players + 1):
+            row = [user_id]
+            for name in LEGACY_COLUMNS:
+                if name == "games_played_types":
+                    row.append(rng.choice(["", "rps,slots"]))
+                elif name == "scramble_best_time":
+                    row.append(rng.choice([0, round(rng.uniform(2, 60), 2)]))
+                else:
+                    row.append(rng.choice([0, 0, rng.randint(1, 500)]))
+            rows.append(row)
+        await db.executemany(f"INSERT INTO game_stats VALUES ({', '.join('?' * (len(LEGACY_COLUMNS) + 1))})", rows)
+        await db.commit()
+
+
+async def check_migration(path, players, errors):
+    async with aiosqlite.connect(path) as db:
+        cursor = await db.execute(f"SELECT user_id, {', '.join(LEGACY_COLUMNS)} FROM game_stats_legacy ORDER BY user_id")
+        legacy = await cursor.fetchall()
+        cursor = await db.execute(f"SELECT user_id, {', '.join(LEGACY_COLUMNS)} FROM game_stats ORDER BY user_id")
+        view = {row[0]: row for row in await cursor.fetchall()}
+        for row in legacy:
+            stats = await stat_store.get_stats(row[0], LEGACY_COLUMNS, db)
+            for name, value in zip(LEGACY_COLUMNS, row[1:]):
+                if stats[name] != (value or 0):
+                    errors.append(f"user {row[0]} {name}: legacy {value!r} store {stats[name]!r}")
+            viewed = view.get(row[0])
+            # a player whose legacy row was all zeros has no stats and no view row
+            if (viewed is None and any(row[1:])) or (viewed and [v or 0 for v in viewed] != [v or 0 for v in row]):
+                errors.append(f"user {row[0]}: game_stats view row differs from the legacy row")
+    print(f"migrated {players:,} players x {len(LEGACY_COLUMNS)} columns")
+
+
+async def time_calls(counter, label, call, users):
+    before = counter.snapshot()
+    started = time.perf_counter()
+    for user_id in users:
+        await call(user_id)
+    elapsed = time.perf_counter() - started
+    statements = (counter.statements - before[0]) / len(users)
+    print(f"{label:<24} {statements:>5.1f} statements {elapsed / len(users) * 1e6:>9.1f} us per call")
+
+
+async def old_track(user_id, stat_name="rps_plays"):
+    async with aiosqlite.connect(database.DB_PATH) as db:
+        await db.execute("INSERT OR IGNORE INTO game_stats_legacy (user_id) VALUES (?)", (user_id,))
+        await db.execute(f"UPDATE game_stats_legacy SET {stat_name} = {stat_name} + 1 WHERE user_id = ?", (user_id,))
+        await db.commit()
+
+
+async def old_match(user_id):
+    loser_id = user_id + 1
+    for uid, stat in ((user_id, "tictactoe_wins"), (user_id, "tictactoe_plays"), (loser_id, "tictactoe_plays"),
+                      (user_id, "multiplayer_games"), (loser_id, "multiplayer_games")):
+        await old_track(uid, stat)
+
+
+async def new_match(user_id):
+    loser_id = user_id + 1
+    await database.track_game_stats([(user_id, "tictactoe_wins"), (user_id, "tictactoe_plays"), (loser_id, "tictactoe_plays")])
+    await database.track_game_stats([(user_id, "multiplayer_games"), (loser_id, "multiplayer_games")])
+
+
+async def old_read(user_id):
+    async with aiosqlite.connect(database.DB_PATH) as db:
+        cursor = await db.execute("SELECT * FROM game_stats_legacy WHERE user_id = ?", (user_id,))
+        return await cursor.fetchone()
+
+
+async def new_read(user_id):
+    return await stat_store.get_stats(user_id, database.ACHIEVEMENT_STATS)
+
+
+async def main(players, calls):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    rng = random.Random(9)
+    errors = []
+    try:
+        database.DB_PATH = stat_store.DB_PATH = path
+        await seed(path, players, rng)
+        started = time.perf_counter()
+        await database.init_db()
+        print(f"init_db with the migration took {(time.perf_counter() - started) * 1000:.1f} ms")
+        await check_migration(path, players, errors)
+
+        counter = Counter()
+        counter.install()
+        users = [rng.randint(1, players - 1) for _ in range(calls)]
+        print()
+        await time_calls(counter, "bump one stat (old)", old_track, users)
+        await time_calls(counter, "bump one stat (new)", lambda uid: database.track_game_stat(uid, "rps_plays"), users)
+        await time_calls(counter, "match result (old)", old_match, users)
+        await time_calls(counter, "match result (new)", new_match, users)
+        await time_calls(counter, "achievement read (old)", old_read, users)
+        await time_calls(counter, "achievement read (new)", new_read, users)
+
+        # both layouts took the same bumps, so they must still agree
+        async with aiosqlite.connect(path) as db:
+            for user_id in set(users):
+                cursor = await db.execute("SELECT rps_plays, tictactoe_plays, multiplayer_games FROM game_stats_legacy WHERE user_id = ?", (user_id,))
+                old = list(await cursor.fetchone())
+                new = list((await stat_store.get_stats(user_id, ("rps_plays", "tictactoe_plays", "multiplayer_games"), db)).values())
+                if old != new:
+                    errors.append(f"user {user_id} after the timed writes: legacy {old} store {new}")
+
+            cursor = await db.execute("EXPLAIN QUERY PLAN SELECT tower_games FROM game_stats WHERE user_id = ?", (1,))
+            print("\nview point lookup plan:")
+            for row in await cursor.fetchall():
+                print(f"  {row[-1]}")
+
+            print()
+            started = time.perf_counter()
+            await db.execute("ALTER TABLE game_stats_legacy ADD COLUMN plinko_plays INTEGER DEFAULT 0")
+            await db.execute("UPDATE game_stats_legacy SET plinko_plays = plinko_plays + 1 WHERE user_id = 1")
+            await db.commit()
+            print(f"new stat, ALTER TABLE + first write   {(time.perf_counter() - started) * 1000:>7.2f} ms")
+            started = time.perf_counter()
+            await stat_store.add_stats(1, {"plinko_plays": 1}, db)
+            await db.commit()
+            print(f"new stat, registered on first write   {(time.perf_counter() - started) * 1000:>7.2f} ms")
+            cursor = await db.execute("SELECT plinko_plays FROM game_stats WHERE user_id = 1")
+            if (await cursor.fetchone())[0] != 1:
+                errors.append("a newly registered stat is missing from the game_stats view")
+    finally:
+        os.remove(path)
+
+    for error in errors[:10]:
+        print(f"FAIL {error}")
+    print("PASS" if not errors else f"FAIL ({len(errors)} problems)")
+    return not errors
+
+
+if __name__ == "__main__":
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    sys.exit(0 if asyncio.run(main(players, calls)) else 1)
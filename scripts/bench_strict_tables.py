@@ -0,0 +1,200 @@
+"""Before/after numbers for scripts/migrate_strict_tables.py.
+
+Builds a scratch database (never casino.db) with init_db and the rob and
+settings tables, seeds players whose items arrive interleaved over time the
+way a live bot writes them, and copies it three ways:
+
+    before          the tables as init_db and the cogs create them
+    after           migrate_strict_tables: STRICT everywhere, WITHOUT ROWID
+                    for the (user_id, item) tables
+    all no-rowid    the same, but the user_id tables WITHOUT ROWID too
+                    (what the tool deliberately does not do)
+
+For each copy it prints the vacuumed file size, the bytes per table
+(table + its indexes, from dbstat when SQLite has it) and the time per point
+lookup for the queries the bot runs, on a plain sqlite3 connection so the
+aiosqlite thread hop does not hide the difference. The migrated copy is also
+compared row for row with the original.
+
+Usage:
+    python scripts/bench_strict_tables.py [players] [lookups]
+"""
+import asyncio
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+# Add parent directory to path to import utils
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import migrate_strict_tables as tool
+from utils import database
+
+ITEMS = ("xp_booster", "lucky_dice", "golden_chip", "rigged_deck", "hot_streak", "insurance",
+         "streak_shield", "mystery_box", "loaded_dice", "card_counter", "bank_booster", "thief_mask")
+
+LOOKUPS = {
+    "users": ("SELECT mora, dust, fates FROM users WHERE user_id = ?", 1),
+    "accounts": ("SELECT level, exp FROM accounts WHERE user_id = ?", 1),
+    "chest_inventory": ("SELECT common, exquisite, precious, luxurious FROM chest_inventory WHERE user_id = ?", 1),
+    "rob_items": ("SELECT shotgun, mask, lock FROM rob_items WHERE user_id = ?", 1),
+    "game_limits": ("SELECT unlimited_games FROM game_limits WHERE user_id = ?", 1),
+    "inventory": ("SELECT quantity FROM inventory WHERE user_id = ? AND item_id = ?", 2),
+    "inventory (all)": ("SELECT item_id, quantity FROM inventory WHERE user_id = ?", 1),
+    "active_items": ("SELECT uses_remaining FROM active_items WHERE user_id = ? AND item_id = ?", 2),
+    "user_items": ("SELECT count FROM user_items WHERE user_id = ? AND item_key = ?", 2),
+}
+
+
+async def build(path, players, rng):
+    database.DB_PATH = path
+    await database.init_db()
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS rob_items (user_id INTEGER PRIMARY KEY, shotgun INTEGER DEFAULT 0, mask INTEGER DEFAULT 0,
+            night_vision INTEGER DEFAULT 0, lockpicker INTEGER DEFAULT 0, guard_dog INTEGER DEFAULT 0,
+            guard_dog_expires TEXT, spiky_fence INTEGER DEFAULT 0, lock INTEGER DEFAULT 0);
+        CREATE TABLE IF NOT EXISTS game_limits (user_id INTEGER PRIMARY KEY, unlimited_games INTEGER DEFAULT 0);
+    """)
+    for user_id in range(1, players + 1):
+        conn.execute("INSERT INTO users (user_id, mora, dust, fates, enrolled) VALUES (?, ?, ?, ?, 1)",
+                     (user_id, rng.randint(0, 10**7), rng.randint(0, 5000), rng.randint(0, 50)))
+        conn.execute("INSERT INTO accounts (user_id, exp, level) VALUES (?, ?, ?)", (user_id, rng.randint(0, 5000), rng.randint(0, 80)))
+        conn.execute("INSERT INTO chest_inventory (user_id, common) VALUES (?, ?)", (user_id, rng.randint(0, 9)))
+        conn.execute("INSERT INTO rob_items (user_id, shotgun) VALUES (?, ?)", (user_id, rng.randint(0, 2)))
+        conn.execute("INSERT INTO game_limits (user_id) VALUES (?)", (user_id,))
+    # items arrive over the bot's lifetime, so rowid order is not key order
+    events = [(user_id, table, item)
+              for user_id in range(1, players + 1)
+              for table, count in (("inventory", 5), ("active_items", 2), ("user_items", 3))
+              for item in rng.sample(ITEMS, count)]
+    rng.shuffle(events)
+    for user_id, table, item in events:
+        if table == "inventory":
+            conn.execute("INSERT INTO inventory (user_id, item_id, quantity) VALUES (?, ?, ?)", (user_id, item, rng.randint(1, 5)))
+        elif table == "active_items":
+            conn.execute("INSERT INTO active_items (user_id, item_id, activated_at, uses_remaining) VALUES (?, ?, ?, ?)",
+                         (user_id, item, "2026-01-01T00:00:00", rng.randint(1, 3)))
+        else:
+            conn.execute("INSERT INTO user_items (user_id, item_key, count) VALUES (?, ?, ?)", (user_id, item, rng.randint(1, 20)))
+    conn.commit()
+    conn.execute("VACUUM")
+    conn.close()
+
+
+def without_rowid_everywhere(path):
+    conn = sqlite3.connect(path, isolation_level=None)
+    for table, key in tool.TABLES.items():
+        if len(key) > 1:
+            continue
+        columns = tool.columns_of(conn, table)
+        names = ", ".join(name for name, *_ in columns)
+        sql = tool.create_sql(table + "__nr", columns, key).replace(") STRICT", ") WITHOUT ROWID, STRICT")
+        with tool.transaction(conn):
+            conn.execute(sql)
+            conn.execute(f"INSERT INTO {table}__nr ({names}) SELECT {names} FROM {table} ORDER BY user_id")
+            conn.execute(f"DROP TABLE {table}")
+            conn.execute(f"ALTER TABLE {table}__nr RENAME TO {table}")
+    conn.execute("VACUUM")
+    conn.close()
+
+
+def table_bytes(conn):
+    try:
+        rows = conn.execute("""
+            SELECT COALESCE(m.tbl_name, d.name), SUM(d.pgsize)
+            FROM dbstat d LEFT JOIN sqlite_master m ON m.name = d.name
+            GROUP BY 1
+        """).fetchall()
+    except sqlite3.OperationalError:
+        return {}
+    return dict(rows)
+
+
+def time_lookups(conn, keys):
+    results = {}
+    for label, (sql, arity) in LOOKUPS.items():
+        table = label.split()[0]
+        params = keys[table] if arity == 2 else [(user_id,) for user_id, *_ in keys[table]]
+        started = time.perf_counter()
+        for key in params:
+            conn.execute(sql, key).fetchall()
+        results[label] = (time.perf_counter() - started) / len(params) * 1e6
+    return results
+
+
+def same_rows(before, after):
+    for table in tool.TABLES:
+        b = sqlite3.connect(before)
+        a = sqlite3.connect(after)
+        columns = [name for name, *_ in tool.columns_of(b, table)]
+        order = ", ".join(tool.TABLES[table])
+        rows_before = b.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY {order}").fetchall()
+        rows_after = a.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY {order}").fetchall()
+        b.close()
+        a.close()
+        if rows_before != rows_after:
+            return table
+    return None
+
+
+async def main(players, lookups):
+    workdir = tempfile.mkdtemp()
+    rng = random.Random(11)
+    ok = True
+    try:
+        before = os.path.join(workdir, "before.db")
+        await build(before, players, rng)
+        after = os.path.join(workdir, "after.db")
+        everywhere = os.path.join(workdir, "all_no_rowid.db")
+        shutil.copy(before, after)
+
+        started = time.perf_counter()
+        ok = tool.migrate(after, chunk=5000, log=lambda line: None)
+        print(f"{players:,} players; migrate_strict_tables took {time.perf_counter() - started:.2f}s")
+        shutil.copy(after, everywhere)
+        without_rowid_everywhere(everywhere)
+
+        differs = same_rows(before, after)
+        if differs:
+            print(f"FAIL {differs} differs after the migration")
+            ok = False
+
+        conn = sqlite3.connect(before)
+        keys = {table: rng.sample(conn.execute(f"SELECT {', '.join(key)} FROM {table}").fetchall(), min(lookups, players))
+                for table, key in tool.TABLES.items()}
+        conn.close()
+
+        copies = {"before": before, "after": after, "all no-rowid": everywhere}
+        sizes, timings = {}, {}
+        for label, path in copies.items():
+            conn = sqlite3.connect(path)
+            sizes[label] = table_bytes(conn)
+            time_lookups(conn, keys)    # warm the page cache
+            timings[label] = time_lookups(conn, keys)
+            conn.close()
+
+        header = "".join(f"{label:>14}" for label in copies)
+        print(f"\n{'file size':<18}{header}")
+        print(f"{'':<18}" + "".join(f"{os.path.getsize(path) / 1e6:>11.2f} MB" for path in copies.values()))
+        if sizes["before"]:
+            print(f"\n{'KB per table':<18}{header}")
+            for table in tool.TABLES:
+                print(f"{table:<18}" + "".join(f"{sizes[label].get(table, 0) / 1024:>14,.0f}" for label in copies))
+        print(f"\n{'us per lookup':<18}{header}")
+        for query in LOOKUPS:
+            print(f"{query:<18}" + "".join(f"{timings[label][query]:>14.2f}" for label in copies))
+    finally:
+        shutil.rmtree(workdir)
+
+    print("\nPASS" if ok else "\nFAIL")
+    return ok
+
+
+if __name__ == "__main__":
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    sys.exit(0 if asyncio.run(main(players, lookups)) else 1)
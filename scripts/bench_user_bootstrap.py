@@ -0,0 +1,113 @@
+"""Count the statements spent making sure a player's rows exist.
+
+Runs against a scratch database (never casino.db) seeded with enrolled
+players, and compares per call:
+
+    old   init_db + ensure_user_db probing each per-user table, as every
+          helper used to do before reading
+    new   bootstrap_user at enrollment, then the memoized ensure_user_db
+          and the joined get_user_data
+
+Every statement SQLite runs (including the implicit BEGIN/COMMIT) and
+every connection opened is counted.
+
+Usage:
+    python scripts/bench_user_bootstrap.py [players] [calls]
+"""
+import asyncio
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import aiosqlite
+
+# Add parent directory to path to import utils
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_balance_view import Counter
+from config import RESET_TIME
+from utils import database
+
+
+async def old_ensure(user_id):
+    await database.init_db(force=True)
+    async with aiosqlite.connect(database.DB_PATH) as db:
+        for table in ("users", "user_wishes", "chests", "chest_inventory", "accounts"):
+            async with db.execute(f"SELECT * FROM {table} WHERE user_id=?", (user_id,)) as cursor:
+                row = await cursor.fetchone()
+            if row is None and table == "users":
+                return False
+            if row is None and table == "user_wishes":
+                await db.execute("INSERT INTO user_wishes (user_id, count, reset, pity) VALUES (?, 0, ?, 0)",
+                                 (user_id, (datetime.datetime.now() + RESET_TIME).isoformat()))
+                await db.commit()
+
+
+async def old_get_user_data(user_id):
+    await old_ensure(user_id)
+    async with aiosqlite.connect(database.DB_PATH) as db:
+        async with db.execute("SELECT mora, dust, fates FROM users WHERE user_id=?", (user_id,)) as cursor:
+            row = await cursor.fetchone()
+        async with db.execute("SELECT count FROM user_wishes WHERE user_id=?", (user_id,)) as cursor:
+            await cursor.fetchone()
+    return row[0]
+
+
+async def new_get_user_data(user_id):
+    return (await database.get_user_data(user_id))["mora"]
+
+
+def enroll(user_id):
+    return database.require_enrollment(SimpleNamespace(author=SimpleNamespace(id=user_id)))
+
+
+async def measure(counter, label, call, users):
+    before = counter.snapshot()
+    started = time.perf_counter()
+    for user_id in users:
+        await call(user_id)
+    elapsed = time.perf_counter() - started
+    statements = (counter.statements - before[0]) / len(users)
+    connections = (counter.connections - before[1]) / len(users)
+    print(f"{label:<16} {statements:>7.1f} statements {connections:>5.1f} connections {elapsed / len(users) * 1000:>8.2f} ms per call")
+    return statements
+
+
+async def main(players, calls):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        database.DB_PATH = path
+        await database.init_db()
+        counter = Counter()
+        counter.install()
+
+        print(f"{players:,} players, {calls:,} calls per path\n")
+        await measure(counter, "enroll (new)", enroll, list(range(1, players + 1)))
+        async with aiosqlite.connect(path) as db:
+            cursor = await db.execute(
+                "SELECT COUNT(*) FROM users u JOIN user_wishes w USING (user_id) JOIN chests c USING (user_id) "
+                "JOIN chest_inventory i USING (user_id) JOIN accounts a USING (user_id)"
+            )
+            complete = (await cursor.fetchone())[0]
+        print(f"{'':<16} {complete:,} of {players:,} players have every per-user row\n")
+
+        rng = random.Random(1)
+        users = [rng.randint(1, players) for _ in range(calls)]
+        old = await measure(counter, "ensure old", old_ensure, users)
+        new = await measure(counter, "ensure new", database.ensure_user_db, users)
+        print(f"{'':<16} {old:.0f} -> {new:.0f} statements (the memo answers after the first call)\n")
+        old = await measure(counter, "get_user_data old", old_get_user_data, users)
+        new = await measure(counter, "get_user_data new", new_get_user_data, users)
+        print(f"{'':<16} {old / new:.0f}x fewer statements")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    asyncio.run(main(players, calls))
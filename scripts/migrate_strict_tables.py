@@ -0,0 +1,294 @@
+"""Rebuild the per-user hot tables as STRICT tables clustered on their key.
+
+users, accounts, chest_inventory, user_items, inventory, active_items,
+rob_items and game_limits are read and written by (user_id) or
+(user_id, item) on almost every command. They were created over time as
+loosely typed tables, with columns bolted on by ALTER TABLE. This tool
+rebuilds each one in place:
+
+    key (user_id)         STRICT rowid table. An INTEGER PRIMARY KEY already
+                          is the rowid, so the rows are clustered on user_id;
+                          WITHOUT ROWID measured the same size and lookup
+                          time (scripts/bench_strict_tables.py times both)
+    key (user_id, item)   WITHOUT ROWID, STRICT. The rowid table kept every row
+                          twice (table + the primary key's autoindex) and a
+                          lookup went through both b-trees
+
+Columns, defaults and NOT NULLs are taken from the live table, so columns
+added by cogs are kept. Declared types become STRICT types (INT* -> INTEGER,
+CHAR/CLOB/TEXT/TIMESTAMP/DATE* -> TEXT, REAL/FLOA/DOUB -> REAL, anything
+else -> ANY). Indexes and triggers on the table are recreated.
+
+Each table is checked first: duplicate or NULL keys and values STRICT would
+refuse (e.g. 12.5 in an INTEGER column, which STRICT rejects instead of
+storing) are reported and the table is skipped. Those values point at code
+that writes the wrong type; once a table is STRICT such a write raises
+instead of being stored, so fix the writer first. --check only runs these
+checks.
+
+Rows are copied in key order in chunks of --chunk, one transaction per
+chunk, into <table>__strict; the copy is compared row for row with the
+original, then the tables are swapped in one short transaction. Stop the
+bot first: writes made while a table is being copied would be lost. A copy
+of the database is written to <db>.pre-strict.bak before anything changes,
+and the file is vacuumed at the end so the freed pages are returned.
+
+Usage:
+    python scripts/migrate_strict_tables.py --check
+    python scripts/migrate_strict_tables.py [--db casino.db] [--tables users inventory] [--chunk 5000] [--yes]
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+
+# Add parent directory to path to import config
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import DB_PATH
+
+# table -> primary key
+TABLES = {
+    "users": ("user_id",),
+    "accounts": ("user_id",),
+    "chest_inventory": ("user_id",),
+    "user_items": ("user_id", "item_key"),
+    "inventory": ("user_id", "item_id"),
+    "active_items": ("user_id", "item_id"),
+    "rob_items": ("user_id",),
+    "game_limits": ("user_id",),
+}
+
+SUFFIX = "__strict"
+
+# what a STRICT column of each type accepts (typeof() of the stored value)
+ACCEPTS = {
+    "INTEGER": ("integer", "null"),
+    "REAL": ("integer", "real", "null"),
+    "TEXT": ("text", "null"),
+    "ANY": ("integer", "real", "text", "blob", "null"),
+}
+
+
+def strict_type(declared: str) -> str:
+    """STRICT type for a declared column type, following SQLite's affinity rules"""
+    declared = declared.upper()
+    if "INT" in declared:
+        return "INTEGER"
+    if any(word in declared for word in ("CHAR", "CLOB", "TEXT", "TIMESTAMP", "DATE")):
+        return "TEXT"
+    if any(word in declared for word in ("REAL", "FLOA", "DOUB")):
+        return "REAL"
+    return "ANY"
+
+
+def columns_of(conn, table):
+    """[(name, strict type, not null, default)] of a live table"""
+    return [
+        (name, strict_type(declared), bool(notnull), default)
+        for _, name, declared, notnull, default, _ in conn.execute(f"PRAGMA table_info('{table}')")
+    ]
+
+
+def is_migrated(conn, table) -> bool:
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+    return bool(row) and row[0].rstrip().upper().endswith("STRICT")
+
+
+def create_sql(table, columns, key) -> str:
+    lines = []
+    for name, type_, notnull, default in columns:
+        line = f"{name} {type_}"
+        if notnull or name in key:
+            line += " NOT NULL"
+        if default is not None:
+            line += f" DEFAULT {default}"
+        lines.append(line)
+    lines.append(f"PRIMARY KEY ({', '.join(key)})")
+    options = "WITHOUT ROWID, STRICT" if len(key) > 1 else "STRICT"
+    body = ",\n    ".join(lines)
+    return f"CREATE TABLE {table} (\n    {body}\n) {options}"
+
+
+def check_table(conn, table, key) -> list:
+    """Reasons the table cannot be copied into its STRICT layout as is"""
+    columns = columns_of(conn, table)
+    names = {name for name, *_ in columns}
+    missing = [column for column in key if column not in names]
+    if missing:
+        return [f"key column(s) {', '.join(missing)} missing"]
+    problems = []
+    key_list = ", ".join(key)
+    nulls = conn.execute(f"SELECT COUNT(*) FROM {table} WHERE {' OR '.join(f'{k} IS NULL' for k in key)}").fetchone()[0]
+    if nulls:
+        problems.append(f"{nulls} row(s) with a NULL key")
+    duplicates = conn.execute(f"SELECT COUNT(*) FROM (SELECT 1 FROM {table} GROUP BY {key_list} HAVING COUNT(*) > 1)").fetchone()[0]
+    if duplicates:
+        problems.append(f"{duplicates} duplicated key(s): SELECT {key_list}, COUNT(*) FROM {table} GROUP BY {key_list} HAVING COUNT(*) > 1")
+    for name, type_, _, _ in columns:
+        allowed = ", ".join(f"'{t}'" for t in ACCEPTS[type_])
+        bad = conn.execute(f"SELECT COUNT(*) FROM {table} WHERE typeof({name}) NOT IN ({allowed})").fetchone()[0]
+        if bad:
+            problems.append(f"{bad} value(s) in {name} that a STRICT {type_} column refuses: SELECT * FROM {table} WHERE typeof({name}) NOT IN ({allowed})")
+    return problems
+
+
+@contextmanager
+def transaction(conn):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def copy_chunks(conn, table, key, columns, chunk) -> int:
+    """Copy table into table__strict in key order, one transaction per chunk"""
+    target = table + SUFFIX
+    names = ", ".join(name for name, *_ in columns)
+    key_list = ", ".join(key)
+    last_key = None
+    copied = 0
+    while True:
+        if last_key is None:
+            where, params = "", ()
+        else:
+            where, params = f"WHERE ({key_list}) > ({', '.join('?' * len(key))})", last_key
+        with transaction(conn):
+            cursor = conn.execute(
+                f"INSERT INTO {target} ({names}) SELECT {names} FROM {table} {where} ORDER BY {key_list} LIMIT ?",
+                (*params, chunk)
+            )
+        copied += cursor.rowcount
+        if cursor.rowcount < chunk:
+            return copied
+        last_key = conn.execute(
+            f"SELECT {key_list} FROM {target} ORDER BY {', '.join(k + ' DESC' for k in key)} LIMIT 1"
+        ).fetchone()
+
+
+def migrate_table(conn, table, key, chunk, log=print) -> bool:
+    if is_migrated(conn, table):
+        log(f"  {table}: already STRICT")
+        return True
+    problems = check_table(conn, table, key)
+    if problems:
+        log(f"  {table}: skipped")
+        for problem in problems:
+            log(f"    - {problem}")
+        return False
+
+    columns = columns_of(conn, table)
+    target = table + SUFFIX
+    names = ", ".join(name for name, *_ in columns)
+    extras = [sql for (sql,) in conn.execute(
+        "SELECT sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL", (table,)
+    )]
+
+    started = time.perf_counter()
+    with transaction(conn):
+        conn.execute(f"DROP TABLE IF EXISTS {target}")
+        conn.execute(create_sql(target, columns, key))
+    copied = copy_chunks(conn, table, key, columns, chunk)
+
+    # every row must have come across unchanged (STRICT may only turn 5.0 into 5)
+    differ = conn.execute(
+        f"SELECT COUNT(*) FROM (SELECT {names} FROM {table} EXCEPT SELECT {names} FROM {target})"
+    ).fetchone()[0]
+    total = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    if differ or copied != total:
+        conn.execute(f"DROP TABLE {target}")
+        log(f"  {table}: copy check failed ({copied} of {total} rows copied, {differ} differ), table left as it was")
+        return False
+
+    # legacy_alter_table stops RENAME from rewriting or re-checking views that mention the table
+    conn.execute("PRAGMA legacy_alter_table = ON")
+    try:
+        with transaction(conn):
+            conn.execute(f"DROP TABLE {table}")
+            conn.execute(f"ALTER TABLE {target} RENAME TO {table}")
+            for sql in extras:
+                conn.execute(sql)
+    finally:
+        conn.execute("PRAGMA legacy_alter_table = OFF")
+    layout = "WITHOUT ROWID, STRICT" if len(key) > 1 else "STRICT"
+    log(f"  {table}: {copied:,} rows -> {layout} in {time.perf_counter() - started:.2f}s")
+    return True
+
+
+def migrate(path, tables=None, chunk=5000, vacuum=True, log=print) -> bool:
+    """Migrate the given tables (default: all of TABLES that exist) in the database at path"""
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        existing = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        ok = True
+        for table in tables or TABLES:
+            if table not in existing:
+                log(f"  {table}: not in this database")
+                continue
+            ok = migrate_table(conn, table, TABLES[table], chunk, log) and ok
+        if vacuum:
+            conn.execute("VACUUM")
+        return ok
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the per-user hot tables as STRICT / WITHOUT ROWID tables")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--tables", nargs="+", choices=list(TABLES), default=None)
+    parser.add_argument("--chunk", type=int, default=5000, help="rows copied per transaction")
+    parser.add_argument("--check", action="store_true", help="only report what would stop a table from migrating")
+    parser.add_argument("--no-vacuum", action="store_true")
+    parser.add_argument("--yes", action="store_true", help="do not ask for confirmation")
+    opts = parser.parse_args()
+
+    if not os.path.exists(opts.db):
+        print(f"No database at {opts.db}")
+        return 1
+    tables = opts.tables or list(TABLES)
+
+    if opts.check:
+        conn = sqlite3.connect(opts.db)
+        existing = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        clean = True
+        for table in tables:
+            if table not in existing:
+                print(f"  {table}: not in this database")
+            elif is_migrated(conn, table):
+                print(f"  {table}: already STRICT")
+            else:
+                problems = check_table(conn, table, TABLES[table])
+                clean = clean and not problems
+                print(f"  {table}: {'ready' if not problems else 'needs fixing'}")
+                for problem in problems:
+                    print(f"    - {problem}")
+        conn.close()
+        return 0 if clean else 1
+
+    print(f"Rebuilding {', '.join(tables)} in {opts.db}")
+    print("The bot must be stopped while this runs.")
+    if not opts.yes and input("\nProceed? (yes/no): ").strip().lower() != "yes":
+        print("Migration cancelled.")
+        return 1
+
+    backup = opts.db + ".pre-strict.bak"
+    source, copy = sqlite3.connect(opts.db), sqlite3.connect(backup)
+    source.backup(copy)
+    source.close()
+    copy.close()
+    print(f"Backup written to {backup}")
+
+    size = os.path.getsize(opts.db)
+    ok = migrate(opts.db, tables, opts.chunk, vacuum=not opts.no_vacuum)
+    print(f"\nFile size {size / 1e6:.1f} MB -> {os.path.getsize(opts.db) / 1e6:.1f} MB")
+    print("✓ Migration complete!" if ok else "⚠ Some tables were skipped, see above")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
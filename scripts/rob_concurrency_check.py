@@ -0,0 +1,133 @@
+"""Fire robs in parallel against one target and check nothing is lost.
+
+Runs against a scratch database (never casino.db). A crowd of robbers hits
+the same target at once, with Plasma Canons and normal robs mixed, while
+"game payouts" keep crediting the target's wallet on separate connections.
+Afterwards:
+
+- total mora + bank deposits == starting total + payouts - rob penalties
+- every robber's wallet moved by exactly what the transaction log says
+- one Plasma Canon was consumed per plasma_rob log entry
+- no wallet or deposit went negative
+
+Any lost update (a rob overwriting a payout or another rob) breaks the first
+two checks.
+
+Usage:
+    python scripts/rob_concurrency_check.py [robbers] [payouts]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+
+import aiosqlite
+
+# Add parent directory to path to import utils
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import rob_settlement, transaction_logger
+
+TARGET_ID = 1
+TARGET_WALLET = 50_000_000
+TARGET_BANK = 20_000_000
+ROBBER_WALLET = 1_000_000
+PLASMA_PER_ROBBER = 3
+PAYOUT = 7_777
+
+
+async def create_schema(path, robbers):
+    async with aiosqlite.connect(path) as db:
+        await db.executescript("""
+            CREATE TABLE users (user_id INTEGER PRIMARY KEY, mora INTEGER DEFAULT 0);
+            CREATE TABLE user_bank_deposits (user_id INTEGER PRIMARY KEY, deposited_amount INTEGER DEFAULT 0, interest_earned INTEGER DEFAULT 0);
+            CREATE TABLE inventory (user_id INTEGER, item_id TEXT, quantity INTEGER DEFAULT 0, activated_at TIMESTAMP, PRIMARY KEY (user_id, item_id));
+            CREATE TABLE rob_items (user_id INTEGER PRIMARY KEY, shotgun INTEGER DEFAULT 0, mask INTEGER DEFAULT 0,
+                night_vision INTEGER DEFAULT 0, lockpicker INTEGER DEFAULT 0, guard_dog INTEGER DEFAULT 0,
+                guard_dog_expires TEXT, spiky_fence INTEGER DEFAULT 0, lock INTEGER DEFAULT 0);
+            CREATE TABLE rob_cooldowns (user_id INTEGER PRIMARY KEY, last_rob TEXT, was_successful INTEGER DEFAULT 0, last_rob_ts INTEGER);
+        """)
+        await db.execute("INSERT INTO users VALUES (?, ?)", (TARGET_ID, TARGET_WALLET))
+        await db.execute("INSERT INTO user_bank_deposits (user_id, deposited_amount) VALUES (?, ?)", (TARGET_ID, TARGET_BANK))
+        for robber_id in robbers:
+            await db.execute("INSERT INTO users VALUES (?, ?)", (robber_id, ROBBER_WALLET))
+            await db.execute("INSERT INTO inventory (user_id, item_id, quantity) VALUES (?, 'plasma_canon', ?)", (robber_id, PLASMA_PER_ROBBER))
+            await db.execute("INSERT INTO rob_items (user_id, shotgun, mask, night_vision, lockpicker) VALUES (?, 1, 1, 1, 1)", (robber_id,))
+        await transaction_logger.init_transaction_logs(db)
+        await db.commit()
+
+
+async def game_payout(path):
+    """What a game crediting the target looks like: a single atomic add"""
+    async with aiosqlite.connect(path, timeout=30) as db:
+        await db.execute("UPDATE users SET mora = mora + ? WHERE user_id = ?", (PAYOUT, TARGET_ID))
+        await db.commit()
+
+
+async def main(robber_count: int, payout_count: int):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    rob_settlement.DB_PATH = path
+    transaction_logger.DB_PATH = path
+    robbers = list(range(100, 100 + robber_count))
+    try:
+        await create_schema(path, robbers)
+
+        rng = random.Random(0)
+        jobs = []
+        for robber_id in robbers:
+            jobs += [rob_settlement.settle_plasma_rob(robber_id, TARGET_ID, "target") for _ in range(PLASMA_PER_ROBBER + 1)]
+            jobs += [rob_settlement.settle_rob(robber_id, TARGET_ID, "target", rng=rng) for _ in range(2)]
+        jobs += [game_payout(path) for _ in range(payout_count)]
+        random.shuffle(jobs)
+        results = await asyncio.gather(*jobs)
+
+        statuses = {}
+        for outcome in results:
+            if outcome:
+                statuses[outcome["status"]] = statuses.get(outcome["status"], 0) + 1
+        print(f"{len(jobs)} concurrent jobs: {statuses}, {payout_count} payouts")
+
+        async with aiosqlite.connect(path) as db:
+            async def scalar(sql, params=()):
+                cursor = await db.execute(sql, params)
+                return (await cursor.fetchone())[0] or 0
+
+            total = await scalar("SELECT SUM(mora) FROM users") + await scalar("SELECT SUM(deposited_amount) FROM user_bank_deposits")
+            penalties = -await scalar("SELECT SUM(amount) FROM transaction_logs WHERE event_type = 'rob_fail'")
+            expected = TARGET_WALLET + TARGET_BANK + ROBBER_WALLET * robber_count + PAYOUT * payout_count - penalties
+            failures = []
+            if total != expected:
+                failures.append(f"total {total:,} != expected {expected:,} (lost {expected - total:,})")
+
+            for robber_id in robbers:
+                wallet = await scalar("SELECT mora FROM users WHERE user_id = ?", (robber_id,))
+                logged = await scalar("SELECT SUM(amount) FROM transaction_logs WHERE user_id = ?", (robber_id,))
+                if wallet != ROBBER_WALLET + logged:
+                    failures.append(f"robber {robber_id}: wallet {wallet:,} != {ROBBER_WALLET:,} + logged {logged:,}")
+
+            fired = await scalar("SELECT COUNT(*) FROM transaction_logs WHERE event_type = 'plasma_rob'")
+            left = await scalar("SELECT SUM(quantity) FROM inventory WHERE item_id = 'plasma_canon'")
+            if fired + left != PLASMA_PER_ROBBER * robber_count:
+                failures.append(f"{fired} plasma robs logged but {PLASMA_PER_ROBBER * robber_count - left} canons consumed")
+
+            negative = await scalar("SELECT COUNT(*) FROM users WHERE mora < 0")
+            negative += await scalar("SELECT COUNT(*) FROM user_bank_deposits WHERE deposited_amount < 0")
+            if negative:
+                failures.append(f"{negative} negative balances")
+
+        if failures:
+            print("FAIL")
+            for failure in failures:
+                print(f"  {failure}")
+            return 1
+        print(f"OK: total conserved at {total:,} ({penalties:,} taken as rob penalties)")
+        return 0
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    robber_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    payout_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    sys.exit(asyncio.run(main(robber_count, payout_count)))
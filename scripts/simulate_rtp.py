@@ -0,0 +1,300 @@
+"""Monte-Carlo RTP / house edge simulator for the casino games.
+
+Runs the payout rules from utils/game_math.py (the same tables the cogs use)
+through NumPy-vectorized simulations split into chunks across a process pool,
+and reports per game and item modifier:
+
+    RTP        total returned / total wagered
+    edge       1 - RTP
+    win%       rounds that returned more than the stake
+    std        standard deviation of the per-round net result (in bets)
+    dd p50/p99 median / 99th percentile of the max drawdown (in bets) over
+               sessions of --session consecutive flat-bet rounds
+
+Interactive games are played with a fixed strategy, listed as the variant:
+hilo and tower cash out at a target streak/floor, mines cashes out after a
+number of boxes, blackjack hits below --bj-hit-to and never doubles, splits
+or surrenders.
+
+Requires numpy (pip install numpy); the bot itself does not.
+
+Usage:
+    python scripts/simulate_rtp.py
+    python scripts/simulate_rtp.py --games slots coinflip --rounds 50000000
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Add parent directory to path to import utils
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    print("This script needs numpy: pip install numpy")
+    sys.exit(1)
+
+from utils import game_math as gm
+
+
+# ---------------------------------------------------------------------------
+# Per-game vectorized round simulators. Each returns the amount paid back per
+# round in units of the stake (1.0 = stake returned, 0 = stake lost). Values
+# below zero mean the player lost more than the stake (wheel bankrupt penalty).
+# ---------------------------------------------------------------------------
+
+def sim_slots(rng, n, variant, opts):
+    symbols = list(gm.SLOT_SYMBOLS)
+    weights = np.array([gm.SLOT_SYMBOLS[s] for s in symbols], dtype=float)
+    payouts = np.array([gm.SLOT_PAYOUTS[s] for s in symbols], dtype=float)
+    ranks = np.array([gm.SLOT_SYMBOL_RANK[s] for s in symbols])
+
+    reels = rng.choice(len(symbols), size=(n, 3), p=weights / weights.sum())
+    match = (reels[:, 0] == reels[:, 1]) & (reels[:, 1] == reels[:, 2])
+    symbol = reels[:, 0].copy()
+    if variant == "premium":
+        forced = ~match & (rng.random(n) < gm.PREMIUM_SLOTS_MATCH)
+        best = np.take_along_axis(reels, ranks[reels].argmax(axis=1)[:, None], axis=1)[:, 0]
+        symbol[forced] = best[forced]
+        match |= forced
+    return np.where(match, payouts[symbol], 0.0)
+
+
+def sim_coinflip(rng, n, variant, opts):
+    win = rng.random(n) < 0.5
+    if variant == "premium":
+        win |= rng.random(n) < gm.PREMIUM_FLIP_LUCK
+    elif variant == "lucky_dice":
+        win |= rng.random(n) < gm.LUCKY_DICE_CHANCE
+    win_return = 2.0 + (gm.GOLDEN_CHIP_BONUS if variant == "golden_chip" else 0.0)
+    loss_return = gm.HOT_STREAK_REFUND if variant == "hot_streak" else 0.0
+    return np.where(win, win_return, loss_return)
+
+
+def sim_roulette(rng, n, variant, opts):
+    bet_type, _, value = variant.partition(":")
+    bet_value = int(value) if value else None
+    table = np.array([gm.roulette_multiplier(num, bet_type, bet_value) for num in range(37)], dtype=float)
+    numbers = rng.integers(0, 37, size=n)
+    mult = table[numbers]
+    return np.where(mult > 0, mult + 1.0, 0.0)
+
+
+def sim_wheel(rng, n, variant, opts):
+    segments = gm.WHEEL_SEGMENTS_PREMIUM if variant == "premium" else gm.WHEEL_SEGMENTS
+    mults = np.array([m for _, m, _ in segments], dtype=float)
+    weights = np.array([w for _, _, w in segments], dtype=float)
+    ret = mults[rng.choice(len(segments), size=n, p=weights / weights.sum())]
+    # Bankrupt also takes 10% of the balance left after the bet was deducted
+    penalty = gm.WHEEL_BANKRUPT_PENALTY * (opts.balance_bets - 1)
+    return np.where(ret == 0, -penalty, ret)
+
+
+def _hilo_draw(rng, size):
+    """Card values 2-14, or -1 for the joker."""
+    values = rng.integers(2, 15, size=size)
+    return np.where(rng.random(size) < gm.HILO_JOKER_CHANCE, -1, values)
+
+
+def sim_hilo(rng, n, variant, opts):
+    target = min(int(variant.split("@")[1]), gm.HILO_MAX_STREAK)
+    ret = np.zeros(n)
+    current = _hilo_draw(rng, n)
+    joker = current == -1
+    ret[joker] = gm.HILO_JOKER_MULTIPLIER
+    active = ~joker
+    streak = np.zeros(n, dtype=np.int64)
+    mult_table = np.array([gm.hilo_multiplier(s) for s in range(gm.HILO_MAX_STREAK + 1)])
+
+    while active.any():
+        idx = np.flatnonzero(active)
+        prev = current[idx]
+        nxt = _hilo_draw(rng, idx.size)
+        # Always guess the more likely direction
+        guess_higher = prev <= 8
+
+        hit_joker = nxt == -1
+        push = nxt == prev
+        correct = np.where(guess_higher, nxt > prev, nxt < prev) & ~hit_joker & ~push
+        bust = ~hit_joker & ~push & ~correct
+
+        ret[idx[hit_joker]] = gm.HILO_JOKER_MULTIPLIER
+        active[idx[hit_joker | bust]] = False
+        current[idx[~hit_joker]] = nxt[~hit_joker]
+        streak[idx[correct]] += 1
+
+        done = idx[correct][streak[idx[correct]] >= target]
+        ret[done] = mult_table[streak[done]]
+        active[done] = False
+    return ret
+
+
+def sim_tower(rng, n, variant, opts):
+    target = min(int(variant.split("@")[1]), gm.TOWER_MAX_FLOOR)
+    traps = rng.integers(0, gm.TOWER_TILES, size=(n, target))
+    picks = rng.integers(0, gm.TOWER_TILES, size=(n, target))
+    survived = (traps != picks).all(axis=1)
+    return np.where(survived, gm.TOWER_FLOOR_MULTIPLIERS[target], 0.0)
+
+
+def sim_mines(rng, n, variant, opts):
+    total = gm.MINES_SIZE * gm.MINES_SIZE
+    safe = total - gm.MINES_BOMBS
+    boxes = min(int(variant.split("@")[1]), safe)
+    bombs_hit = rng.hypergeometric(gm.MINES_BOMBS, safe, boxes, size=n)
+    return np.where(bombs_hit == 0, gm.mines_multiplier(boxes, total, gm.MINES_BOMBS), 0.0)
+
+
+def _bj_add(total, soft, card):
+    """Add card points to a hand and demote soft aces (11 -> 1) while busting."""
+    total = total + card
+    soft = soft + (card == 11)
+    for _ in range(4):
+        demote = (total > 21) & (soft > 0)
+        total = np.where(demote, total - 10, total)
+        soft = np.where(demote, soft - 1, soft)
+    return total, soft
+
+
+def sim_blackjack(rng, n, variant, opts):
+    deck = np.array([gm.card_points(r) for r in gm.DECK_RANKS for _ in gm.DECK_SUITS], dtype=np.int8)
+    cards = rng.permuted(np.tile(deck, (n, 1)), axis=1)
+    rows = np.arange(n)
+    zero = np.zeros(n, dtype=np.int64)
+
+    p_total, p_soft = _bj_add(zero, zero, cards[:, 0])
+    p_total, p_soft = _bj_add(p_total, p_soft, cards[:, 1])
+    d_total, d_soft = _bj_add(zero, zero, cards[:, 2])
+    d_total, d_soft = _bj_add(d_total, d_soft, cards[:, 3])
+    next_card = np.full(n, 4)
+
+    ret = np.zeros(n)
+    natural = p_total == 21
+    ret[natural] = gm.BLACKJACK_PAYOUT
+    playing = ~natural
+    instant = np.zeros(n, dtype=bool)
+
+    # Player hits below the threshold; reaching 21 on a hit pays 2x immediately
+    while True:
+        hit = playing & (p_total < opts.bj_hit_to)
+        if not hit.any():
+            break
+        idx = rows[hit]
+        p_total[idx], p_soft[idx] = _bj_add(p_total[idx], p_soft[idx], cards[idx, next_card[idx]])
+        next_card[idx] += 1
+        hit21 = idx[p_total[idx] == 21]
+        instant[hit21] = True
+        ret[hit21] = 2.0
+        playing[idx[p_total[idx] >= 21]] = False
+
+    # Dealer draws to 17 for the hands that stood
+    stood = playing
+    while True:
+        draw = stood & (d_total < gm.DEALER_STANDS_ON)
+        if not draw.any():
+            break
+        idx = rows[draw]
+        d_total[idx], d_soft[idx] = _bj_add(d_total[idx], d_soft[idx], cards[idx, next_card[idx]])
+        next_card[idx] += 1
+
+    win = stood & ((d_total > 21) | (p_total > d_total))
+    push = stood & ~win & (p_total == d_total)
+    ret[win] = 2.0
+    ret[push] = 1.0
+
+    if variant == "golden_chip":
+        # Chip bonus is applied at settlement (not on the instant natural payout)
+        bonus = (ret > 1) & ~natural
+        ret[bonus] += (ret[bonus] - 1) * gm.GOLDEN_CHIP_BONUS
+    return ret
+
+
+GAMES = {
+    "slots": (sim_slots, ["base", "premium", "golden_card"]),
+    "coinflip": (sim_coinflip, ["base", "premium", "lucky_dice", "hot_streak", "golden_chip", "golden_card"]),
+    "roulette": (sim_roulette, ["red", "odd", "low", "dozen:1", "column:1", "straight:17"]),
+    "wheel": (sim_wheel, ["base", "premium", "golden_card"]),
+    "hilo": (sim_hilo, ["cashout@1", "cashout@2", "cashout@3", "cashout@5", "cashout@10"]),
+    "tower": (sim_tower, ["cashout@1", "cashout@3", "cashout@5", "cashout@10"]),
+    "mines": (sim_mines, ["cashout@2", "cashout@4", "cashout@8", "cashout@13"]),
+    "blackjack": (sim_blackjack, ["base", "golden_chip", "golden_card"]),
+}
+
+
+def _run_chunk(job):
+    game, variant, n, seed, opts = job
+    rng = np.random.default_rng(seed)
+    sim, _ = GAMES[game]
+    ret = sim(rng, n, variant, opts)
+    net = ret - 1.0
+    if variant == "golden_card":
+        # Golden bank card: 10% of every loss comes back
+        net = np.where(net < 0, net * (1 - gm.GOLDEN_CARD_CASHBACK), net)
+
+    sessions = net[: n - n % opts.session].reshape(-1, opts.session)
+    balance = np.cumsum(sessions, axis=1)
+    peak = np.maximum(np.maximum.accumulate(balance, axis=1), 0.0)
+    drawdowns = (peak - balance).max(axis=1)
+    return game, variant, n, float(net.sum()), float(np.square(net).sum()), int((net > 0).sum()), drawdowns.astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte-Carlo RTP / house edge simulator")
+    parser.add_argument("--games", nargs="+", choices=list(GAMES), default=list(GAMES))
+    parser.add_argument("--rounds", type=int, default=10_000_000, help="rounds per game variant")
+    parser.add_argument("--chunk", type=int, default=1_000_000, help="rounds per worker task")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--session", type=int, default=1_000, help="rounds per drawdown session")
+    parser.add_argument("--balance-bets", type=float, default=10.0,
+                        help="balance in bets when the wheel bankrupt penalty hits")
+    parser.add_argument("--bj-hit-to", type=int, default=17, help="blackjack: hit while below this total")
+    opts = parser.parse_args()
+    opts.chunk = max(opts.session, opts.chunk - opts.chunk % opts.session)
+
+    seeds = np.random.SeedSequence(opts.seed)
+    jobs = []
+    for game in opts.games:
+        for variant in GAMES[game][1]:
+            remaining = opts.rounds
+            while remaining > 0:
+                n = min(opts.chunk, remaining)
+                jobs.append((game, variant, n, seeds.spawn(1)[0], opts))
+                remaining -= n
+
+    results = {}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=opts.workers) as pool:
+        for game, variant, n, net_sum, net_sq, wins, drawdowns in pool.map(_run_chunk, jobs):
+            acc = results.setdefault((game, variant), [0, 0.0, 0.0, 0, []])
+            acc[0] += n
+            acc[1] += net_sum
+            acc[2] += net_sq
+            acc[3] += wins
+            acc[4].append(drawdowns)
+    elapsed = time.perf_counter() - started
+
+    header = f"{'game':<10} {'variant':<12} {'rounds':>12} {'RTP':>8} {'edge':>8} {'win%':>7} {'std':>7} {'dd p50':>8} {'dd p99':>8}"
+    print(header)
+    print("-" * len(header))
+    total_rounds = 0
+    for game in opts.games:
+        for variant in GAMES[game][1]:
+            n, net_sum, net_sq, wins, drawdowns = results[(game, variant)]
+            total_rounds += n
+            mean = net_sum / n
+            std = max(net_sq / n - mean * mean, 0.0) ** 0.5
+            dd = np.concatenate(drawdowns) if drawdowns else np.zeros(1)
+            dd50, dd99 = (np.percentile(dd, [50, 99]) if dd.size else (0.0, 0.0))
+            print(
+                f"{game:<10} {variant:<12} {n:>12,} {1 + mean:>8.2%} {-mean:>8.2%} "
+                f"{wins / n:>7.2%} {std:>7.3f} {dd50:>8.1f} {dd99:>8.1f}"
+            )
+    print(f"\n{total_rounds:,} rounds in {elapsed:.1f}s ({total_rounds / max(elapsed, 1e-9):,.0f} rounds/s, {opts.workers} workers)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Check the closed-form account EXP path against the old level-by-level loop.
+
+1. apply_exp must give the same (level, exp) as subtracting
+   exp_required_for_level one level at a time, for random and edge inputs.
+2. On a scratch database (never casino.db), add_account_exp must leave the
+   same level, exp, Mora, level claims and badges as the old loop that
+   called grant_level_rewards once per level, and the statement count is
+   printed for both.
+
+Usage:
+    python scripts/verify_account_exp.py [cases] [levels]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+from types import SimpleNamespace
+
+import aiosqlite
+
+# Add parent directory to path to import utils
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_balance_view import Counter
+from utils import database
+from utils.database import apply_exp, exp_required_for_level, level_reward_mora
+
+
+def loop_exp(level, exp, amount):
+    exp += amount
+    needed = exp_required_for_level(level)
+    while exp >= needed:
+        exp -= needed
+        level += 1
+        needed = exp_required_for_level(level)
+    return level, exp
+
+
+def check_formula(cases):
+    rng = random.Random(3)
+    inputs = [(0, 0, 0), (0, 0, 999), (0, 0, 1000), (0, 999, 1), (5, 0, 2000), (0, 0, 10**7)]
+    for _ in range(cases):
+        level = rng.randint(0, 300)
+        inputs.append((level, rng.randint(0, exp_required_for_level(level) - 1), rng.choice([rng.randint(0, 5000), rng.randint(0, 10**7)])))
+    for level, exp, amount in inputs:
+        expected = loop_exp(level, exp, amount)
+        got = apply_exp(level, exp, amount)
+        if got != expected:
+            print(f"FAIL apply_exp{(level, exp, amount)} = {got}, loop gives {expected}")
+            return False
+    print(f"apply_exp matches the loop on {len(inputs):,} inputs")
+    return True
+
+
+async def old_grant_level_rewards(user_id, level):
+    # the per-level version: one connection and several statements per level
+    async with aiosqlite.connect(database.DB_PATH) as db:
+        async with db.execute("SELECT claimed FROM level_claims WHERE user_id=? AND level=?", (user_id, level)) as cur:
+            row = await cur.fetchone()
+            if row and row[0]:
+                return False
+        await db.execute("INSERT OR REPLACE INTO level_claims (user_id, level, claimed) VALUES (?, ?, 1)", (user_id, level))
+        async with db.execute("SELECT mora FROM users WHERE user_id=?", (user_id,)) as cur:
+            current = (await cur.fetchone())[0]
+        await db.execute("UPDATE users SET mora=? WHERE user_id=?", (current + level_reward_mora(level), user_id))
+        rank = level // 20
+        for badge, min_rank in database.TIER_BADGES:
+            if rank < min_rank:
+                await db.execute("DELETE FROM badges WHERE user_id=? AND badge_key=?", (user_id, badge))
+        for badge, min_rank in database.TIER_BADGES:
+            if rank >= min_rank:
+                async with db.execute("SELECT 1 FROM badges WHERE user_id=? AND badge_key=?", (user_id, badge)) as cur:
+                    has_badge = await cur.fetchone()
+                if not has_badge:
+                    await db.execute("INSERT OR IGNORE INTO badges (user_id, badge_key, awarded_at) VALUES (?, ?, '')", (user_id, badge))
+        await db.commit()
+        return True
+
+
+async def old_add_account_exp(user_id, amount):
+    level, exp, needed = await database.get_account_level(user_id)
+    exp += amount
+    while exp >= needed:
+        exp -= needed
+        level += 1
+        needed = exp_required_for_level(level)
+        await old_grant_level_rewards(user_id, level)
+    async with aiosqlite.connect(database.DB_PATH) as db:
+        await db.execute("UPDATE accounts SET level=?, exp=? WHERE user_id=?", (level, exp, user_id))
+        await db.commit()
+
+
+async def snapshot(user_id):
+    async with aiosqlite.connect(database.DB_PATH) as db:
+        cur = await db.execute("SELECT a.level, a.exp, u.mora FROM accounts a JOIN users u USING (user_id) WHERE user_id=?", (user_id,))
+        account = await cur.fetchone()
+        cur = await db.execute("SELECT level FROM level_claims WHERE user_id=? AND claimed ORDER BY level", (user_id,))
+        claims = [row[0] for row in await cur.fetchall()]
+        cur = await db.execute("SELECT badge_key FROM badges WHERE user_id=? ORDER BY badge_key", (user_id,))
+        badges = [row[0] for row in await cur.fetchall()]
+    return account, claims, badges
+
+
+async def check_database(levels):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        database.DB_PATH = path
+        await database.init_db()
+        for user_id in (1, 2):
+            await database.require_enrollment(SimpleNamespace(author=SimpleNamespace(id=user_id)))
+            # a previously claimed level in the middle must not pay twice
+            async with aiosqlite.connect(path) as db:
+                await db.execute("INSERT INTO level_claims (user_id, level, claimed) VALUES (?, 7, 1)", (user_id,))
+                await db.commit()
+        amount = sum(exp_required_for_level(level) for level in range(levels)) + 123
+
+        counter = Counter()
+        counter.install()
+        await old_add_account_exp(1, amount)
+        old_statements = counter.statements
+        await database.add_account_exp(2, amount)
+        new_statements = counter.statements - old_statements
+
+        old, new = await snapshot(1), await snapshot(2)
+        print(f"{levels} levels in one grant: old loop {old_statements} statements, closed form {new_statements}")
+        if old != new:
+            print(f"FAIL database state differs:\n  old {old}\n  new {new}")
+            return False
+        print(f"database state matches: level {new[0][0]}, exp {new[0][1]:,}, mora {new[0][2]:,}, badges {len(new[2])}")
+        return True
+    finally:
+        os.remove(path)
+
+
+async def main(cases, levels):
+    ok = check_formula(cases)
+    ok = await check_database(levels) and ok
+    print("PASS" if ok else "FAIL")
+    return ok
+
+
+if __name__ == "__main__":
+    cases = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    levels = int(sys.argv[2]) if len(sys.argv) > 2 else 65
+    sys.exit(0 if asyncio.run(main(cases, levels)) else 1)
@@ -0,0 +1,81 @@
+"""Check blackjack settlement against the exact odds from utils/blackjack_ev.py.
+
+For a set of fixed positions, deals the rest of the deck at random, lets the
+dealer draw to 17 and settles each hand with blackjack_settle (the same helper
+BlackjackView.finish_and_settle uses). The average net result of standing and
+doubling must match the exact EV within a few standard errors.
+
+Usage:
+    python scripts/verify_blackjack_ev.py [rounds]
+"""
+import os
+import random
+import sys
+
+# Add parent directory to path to import utils
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.game_math import DEALER_STANDS_ON, blackjack_settle, hand_value, make_deck
+from utils import blackjack_ev
+
+# (player cards, dealer upcard)
+POSITIONS = [
+    (["10♠", "6♥"], "10♦"),
+    (["10♠", "7♥"], "6♦"),
+    (["9♠", "2♥"], "5♣"),
+    (["A♠", "7♥"], "9♦"),
+    (["5♠", "3♥"], "A♦"),
+    (["10♠", "10♥"], "7♣"),
+]
+STAKE = 1_000
+TOLERANCE = 4.0  # standard errors
+
+
+def play_out(cards, upcard, double):
+    """Deal one random continuation and return the net result in stakes."""
+    seen = cards + [upcard]
+    deck = [c for c in make_deck() if c not in seen]
+    random.shuffle(deck)
+    dealer = [upcard, deck.pop()]
+    hand = list(cards)
+    stake = STAKE
+    if double:
+        stake *= 2
+        hand.append(deck.pop())
+        if hand_value(hand) == 21:
+            # instant 21 is paid before the dealer plays
+            return 1.0 * stake / STAKE
+        if hand_value(hand) > 21:
+            return -stake / STAKE
+    while hand_value(dealer) < DEALER_STANDS_ON:
+        dealer.append(deck.pop())
+    return (blackjack_settle(hand, dealer, stake) - stake) / STAKE
+
+
+def check(cards, upcard, action, exact, rounds):
+    results = [play_out(cards, upcard, action == "double") for _ in range(rounds)]
+    mean = sum(results) / rounds
+    var = sum((r - mean) ** 2 for r in results) / (rounds - 1)
+    stderr = (var / rounds) ** 0.5
+    ok = abs(mean - exact) <= TOLERANCE * stderr
+    print(f"{' '.join(cards):>10} vs {upcard:<4} {action:<7} exact {exact:+.4f}  simulated {mean:+.4f} ± {stderr:.4f}  {'OK' if ok else 'MISMATCH'}")
+    return ok
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    random.seed(2024)
+    failures = 0
+    for cards, upcard in POSITIONS:
+        evs = blackjack_ev.action_evs(cards, upcard, cards + [upcard], can_double=True)
+        for action in ("stand", "double"):
+            if not check(cards, upcard, action, evs[action], rounds):
+                failures += 1
+
+    if failures:
+        print(f"\n✗ {failures} settlement check(s) disagree with the exact odds")
+        sys.exit(1)
+    print("\n✓ Settlement matches the exact odds")
+
+
+if __name__ == "__main__":
+    main()
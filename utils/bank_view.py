@@ -0,0 +1,105 @@
+"""Read path for gbal and gbank.
+
+Everything the two commands show about one player (wallet, deposit, loan,
+bank card, and for gbank the rob items) comes back from a single joined
+query on one connection. The server-wide figures (bank balance, total
+deposits and interest) are the same for everyone and change constantly, so
+they come from one aggregate query cached for POOL_TTL seconds.
+
+    view = await get_balance_view(user_id)
+    pool = await get_pool_stats()
+
+Loans and owner commands keep using global_bank.get_bank_balance(), which
+is never cached.
+"""
+import time
+
+import aiosqlite
+
+from config import DB_PATH
+from utils import global_bank
+
+POOL_TTL = 5    # seconds
+
+BALANCE_VIEW_SQL = """
+    SELECT u.mora,
+           COALESCE(d.deposited_amount, 0), COALESCE(d.interest_earned, 0),
+           COALESCE(l.loan_amount, 0), COALESCE(l.penalty_amount, 0), l.due_date,
+           COALESCE(c.card_tier, 0),
+           COALESCE(g.total_loans_given, 0), COALESCE(g.total_penalties_collected, 0)
+           {rob_columns}
+    FROM users u
+    LEFT JOIN user_bank_deposits d ON d.user_id = u.user_id
+    LEFT JOIN user_loans l ON l.user_id = u.user_id
+    LEFT JOIN bank_cards c ON c.user_id = u.user_id
+    LEFT JOIN global_bank g ON g.id = 1
+    {rob_join}
+    WHERE u.user_id = ?
+"""
+
+ROB_COLUMNS = ("shotgun", "mask", "night_vision", "lockpicker", "guard_dog", "guard_dog_expires", "spiky_fence", "lock")
+
+POOL_SQL = """
+    SELECT (SELECT COALESCE(SUM(balance), 0) FROM global_bank_shards),
+           COALESCE(SUM(deposited_amount), 0), COALESCE(SUM(interest_earned), 0)
+    FROM user_bank_deposits
+"""
+
+_pool_cache = None      # (expires at, stored balance, total deposits, total interest)
+
+
+def _query(with_rob_items: bool) -> str:
+    if not with_rob_items:
+        return BALANCE_VIEW_SQL.format(rob_columns="", rob_join="")
+    return BALANCE_VIEW_SQL.format(
+        rob_columns="".join(f", r.{column}" for column in ROB_COLUMNS),
+        rob_join="LEFT JOIN rob_items r ON r.user_id = u.user_id",
+    )
+
+
+async def get_balance_view(user_id: int, with_rob_items: bool = False) -> dict:
+    """One player's bank-facing data in one query (zeros for a missing user)"""
+    async with aiosqlite.connect(DB_PATH) as db:
+        cursor = await db.execute(_query(with_rob_items), (user_id,))
+        row = await cursor.fetchone()
+    if row is None:
+        row = (0, 0, 0, 0, 0, None, 0, 0, 0) + (None,) * (len(ROB_COLUMNS) if with_rob_items else 0)
+    view = {
+        "mora": row[0] or 0,
+        "deposited": row[1],
+        "interest": row[2],
+        "loan_amount": row[3],
+        "penalty_amount": row[4],
+        "due_date": row[5],
+        "card_tier": row[6],
+        "total_loans_given": row[7],
+        "total_penalties_collected": row[8],
+    }
+    if with_rob_items:
+        view["rob_items"] = dict(zip(ROB_COLUMNS, row[9:])) if row[9] is not None else None
+    return view
+
+
+async def get_pool_stats() -> dict:
+    """Global bank balance and deposit totals, cached for POOL_TTL seconds"""
+    global _pool_cache
+    now = time.monotonic()
+    if _pool_cache is None or now >= _pool_cache[0]:
+        await global_bank.init_global_bank()
+        async with aiosqlite.connect(DB_PATH) as db:
+            cursor = await db.execute(POOL_SQL)
+            stored, deposits, interest = await cursor.fetchone()
+        _pool_cache = (now + POOL_TTL, stored, deposits, interest)
+    _, stored, deposits, interest = _pool_cache
+    return {
+        # unflushed write-behind credits are live, not cached
+        "balance": stored + global_bank.unflushed(),
+        "total_deposits": deposits,
+        "total_interest": interest,
+    }
+
+
+def invalidate_pool_stats():
+    """Drop the cached pool figures (after a deposit or withdrawal)"""
+    global _pool_cache
+    _pool_cache = None
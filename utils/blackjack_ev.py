@@ -0,0 +1,198 @@
+"""Exact-probability blackjack engine for EV hints and payout checks.
+
+Plays the house rules from cogs/blackjack.py over the composition of the
+cards still unseen (single deck, reshuffled every game):
+
+- dealer draws to 17 and stands on all 17s (no peek, hole card unknown)
+- a hand that reaches 21 on a hit or double is paid 2x immediately
+- double takes exactly one card, split is only on the initial pair,
+  surrender returns half the stake
+
+The dealer-outcome distribution and the hit/stand values are memoized
+recursions keyed by (player total, soft flag, dealer upcard, deck signature),
+where the deck signature is the tuple of remaining counts per card value.
+All EVs are net results in units of the original stake (+1.0 = win the
+stake, -1.0 = lose it).
+"""
+from functools import lru_cache
+
+from utils.game_math import DEALER_STANDS_ON
+
+# deck signature index: 0 = ace, 1..8 = 2..9, 9 = ten-valued cards
+FULL_DECK = (4, 4, 4, 4, 4, 4, 4, 4, 4, 16)
+BUST = 22
+DEALER_OUTCOMES = (17, 18, 19, 20, 21, BUST)
+CACHE_SIZE = 200_000
+
+ACTIONS = ("hit", "stand", "double", "split", "surrender")
+
+
+def card_index(card: str) -> int:
+    """Deck signature index of a card string such as '10♠' or 'A♥'."""
+    rank = card[:-1]
+    if rank == "A":
+        return 0
+    if rank in ("10", "J", "Q", "K"):
+        return 9
+    return int(rank) - 1
+
+
+def remaining_deck(seen_cards) -> tuple:
+    """Deck signature of a fresh deck with the given cards removed."""
+    counts = list(FULL_DECK)
+    for card in seen_cards:
+        counts[card_index(card)] -= 1
+    return tuple(counts)
+
+
+def hand_state(cards):
+    """(total, soft) of a hand, soft meaning an ace is still counted as 11."""
+    total, soft = 0, False
+    for card in cards:
+        total, soft = _add(total, soft, card_index(card))
+    return total, soft
+
+
+def _add(total: int, soft: bool, idx: int):
+    total += idx + 1
+    if idx == 0 and total + 10 <= 21:
+        total += 10
+        soft = True
+    if total > 21 and soft:
+        total -= 10
+        soft = False
+    return total, soft
+
+
+def _draw(deck: tuple, idx: int) -> tuple:
+    return deck[:idx] + (deck[idx] - 1,) + deck[idx + 1:]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def dealer_distribution(total: int, soft: bool, deck: tuple) -> tuple:
+    """Probabilities of the dealer finishing on 17..21 or bust (DEALER_OUTCOMES order)."""
+    if total > 21:
+        return (0.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+    if total >= DEALER_STANDS_ON:
+        dist = [0.0] * len(DEALER_OUTCOMES)
+        dist[total - DEALER_STANDS_ON] = 1.0
+        return tuple(dist)
+    remaining = sum(deck)
+    dist = [0.0] * len(DEALER_OUTCOMES)
+    for idx, count in enumerate(deck):
+        if not count:
+            continue
+        p = count / remaining
+        sub = dealer_distribution(*_add(total, soft, idx), _draw(deck, idx))
+        for i, q in enumerate(sub):
+            dist[i] += p * q
+    return tuple(dist)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def stand_ev(total: int, upcard: int, deck: tuple) -> float:
+    """EV of standing on total against the dealer upcard (deck index)."""
+    dist = dealer_distribution(*_add(0, False, upcard), deck)
+    ev = 0.0
+    for outcome, p in zip(DEALER_OUTCOMES, dist):
+        if outcome == BUST or outcome < total:
+            ev += p
+        elif outcome > total:
+            ev -= p
+    return ev
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def hit_ev(total: int, soft: bool, upcard: int, deck: tuple) -> float:
+    """EV of taking a card and then playing on optimally (hit or stand)."""
+    remaining = sum(deck)
+    ev = 0.0
+    for idx, count in enumerate(deck):
+        if not count:
+            continue
+        p = count / remaining
+        new_total, new_soft = _add(total, soft, idx)
+        if new_total == 21:
+            ev += p  # instant 21 pays 2x without the dealer playing
+        elif new_total > 21:
+            ev -= p
+        else:
+            rest = _draw(deck, idx)
+            ev += p * max(stand_ev(new_total, upcard, rest), hit_ev(new_total, new_soft, upcard, rest))
+    return ev
+
+
+def double_ev(total: int, soft: bool, upcard: int, deck: tuple) -> float:
+    """EV of doubling: one card on twice the stake."""
+    remaining = sum(deck)
+    ev = 0.0
+    for idx, count in enumerate(deck):
+        if not count:
+            continue
+        p = count / remaining
+        new_total, _ = _add(total, soft, idx)
+        if new_total == 21:
+            ev += p * 2
+        elif new_total > 21:
+            ev -= p * 2
+        else:
+            ev += p * 2 * stand_ev(new_total, upcard, _draw(deck, idx))
+    return ev
+
+
+def best_ev(total: int, soft: bool, upcard: int, deck: tuple, can_double: bool = False) -> float:
+    ev = max(stand_ev(total, upcard, deck), hit_ev(total, soft, upcard, deck))
+    if can_double:
+        ev = max(ev, double_ev(total, soft, upcard, deck))
+    return ev
+
+
+def split_ev(pair_index: int, upcard: int, deck: tuple) -> float:
+    """EV of splitting a pair, summed over both hands.
+
+    Each hand is valued independently against the same deck (the usual
+    approximation); split hands may double and a two-card 21 is not a natural.
+    """
+    remaining = sum(deck)
+    ev = 0.0
+    for idx, count in enumerate(deck):
+        if not count:
+            continue
+        p = count / remaining
+        total, soft = _add(*_add(0, False, pair_index), idx)
+        ev += p * best_ev(total, soft, upcard, _draw(deck, idx), can_double=True)
+    return 2 * ev
+
+
+def action_evs(cards, dealer_upcard: str, seen_cards, can_double=False, can_split=False, can_surrender=False) -> dict:
+    """EV of every available action for a hand.
+
+    seen_cards must include every card visible to the player (all hands and
+    the dealer upcard); the dealer hole card is treated as unseen.
+    """
+    deck = remaining_deck(seen_cards)
+    upcard = card_index(dealer_upcard)
+    total, soft = hand_state(cards)
+    evs = {
+        "hit": hit_ev(total, soft, upcard, deck),
+        "stand": stand_ev(total, upcard, deck),
+    }
+    if can_double:
+        evs["double"] = double_ev(total, soft, upcard, deck)
+    if can_split:
+        evs["split"] = split_ev(card_index(cards[0]), upcard, deck)
+    if can_surrender:
+        evs["surrender"] = -0.5
+    return evs
+
+
+def best_action(evs: dict) -> str:
+    return max(evs, key=evs.get)
+
+
+def cache_info() -> dict:
+    return {
+        "dealer": dealer_distribution.cache_info(),
+        "stand": stand_ev.cache_info(),
+        "hit": hit_ev.cache_info(),
+    }
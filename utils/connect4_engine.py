@@ -0,0 +1,212 @@
+"""Bitboard Connect 4 position and negamax/alpha-beta search for the bot opponent.
+
+Board layout: each column uses ROWS + 1 bits (the extra bit is a sentinel so
+shifts never bleed into the next column). Bit index = col * (ROWS + 1) + row,
+row 0 is the bottom. A position is two integers: the stones of the side to
+move and the mask of all occupied cells.
+
+The search is pure Python with no discord imports so it can run in a thread
+pool without touching the event loop.
+"""
+import random
+import time
+
+ROWS = 6
+COLS = 7
+H1 = ROWS + 1
+MAX_MOVES = ROWS * COLS
+
+BOTTOM_MASK = sum(1 << (c * H1) for c in range(COLS))
+BOARD_MASK = BOTTOM_MASK * ((1 << ROWS) - 1)
+COLUMN_MASKS = [((1 << ROWS) - 1) << (c * H1) for c in range(COLS)]
+TOP_MASKS = [1 << (ROWS - 1 + c * H1) for c in range(COLS)]
+BOTTOM_MASKS = [1 << (c * H1) for c in range(COLS)]
+# Center-first move ordering makes alpha-beta cut off much earlier
+MOVE_ORDER = sorted(range(COLS), key=lambda c: abs(COLS // 2 - c))
+
+WIN_SCORE = 1_000_000
+
+# name -> (max depth, time budget in seconds, chance of a random move)
+DIFFICULTIES = {
+    "easy": (2, 0.05, 0.35),
+    "medium": (4, 0.1, 0.1),
+    "hard": (8, 0.3, 0.0),
+    "expert": (MAX_MOVES, 0.8, 0.0),
+}
+DEFAULT_DIFFICULTY = "hard"
+
+
+def bit(row: int, col: int) -> int:
+    return 1 << (col * H1 + row)
+
+
+def has_four(stones: int) -> bool:
+    """True if `stones` contains four in a row (constant number of shifts)."""
+    for shift in (1, H1, H1 - 1, H1 + 1):  # vertical, horizontal, both diagonals
+        pairs = stones & (stones >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
+
+
+def winning_cells(stones: int, mask: int) -> int:
+    """Empty cells that would complete four in a row for `stones`."""
+    # vertical
+    r = (stones << 1) & (stones << 2) & (stones << 3)
+    for shift in (H1, H1 - 1, H1 + 1):
+        p = (stones << shift) & (stones << (2 * shift))
+        r |= p & (stones << (3 * shift))
+        r |= p & (stones >> shift)
+        p = (stones >> shift) & (stones >> (2 * shift))
+        r |= p & (stones << shift)
+        r |= p & (stones >> (3 * shift))
+    return r & (BOARD_MASK ^ mask)
+
+
+def can_play(mask: int, col: int) -> bool:
+    return not (mask & TOP_MASKS[col])
+
+
+def play(current: int, mask: int, col: int):
+    """Play `col` for the side to move. Returns (next_current, next_mask, move_bit).
+
+    The returned `next_current` belongs to the opponent, who is now to move.
+    """
+    new_mask = mask | (mask + BOTTOM_MASKS[col])
+    move_bit = new_mask ^ mask
+    return current ^ mask, new_mask, move_bit
+
+
+def _popcount(x: int) -> int:
+    return bin(x).count("1")
+
+
+class _Timeout(Exception):
+    pass
+
+
+class _Search:
+    """Node count and deadline of one best_move call, so concurrent searches don't share them"""
+    __slots__ = ("nodes", "deadline")
+
+    def __init__(self, budget: float):
+        self.nodes = 0
+        self.deadline = time.perf_counter() + budget
+
+
+class Connect4Engine:
+    """Iterative-deepening negamax with alpha-beta pruning and a transposition table.
+
+    The transposition table is keyed by `current + mask`, which is unique per
+    position, and survives between moves so later turns reuse earlier work.
+    One engine may serve several searches at once from different threads:
+    per-search state lives in a _Search, and the table only sees single
+    dict gets and sets.
+    """
+
+    def __init__(self, max_tt_entries: int = 500_000):
+        self.tt = {}
+        self.max_tt_entries = max_tt_entries
+
+    def best_move(self, current: int, mask: int, difficulty: str = DEFAULT_DIFFICULTY, rng=random):
+        """Return the column the side to move should play, or None if the board is full."""
+        max_depth, budget, blunder_chance = DIFFICULTIES.get(difficulty, DIFFICULTIES[DEFAULT_DIFFICULTY])
+        legal = [c for c in MOVE_ORDER if can_play(mask, c)]
+        if not legal:
+            return None
+
+        # Always take an immediate win
+        for col in legal:
+            _, _, move_bit = play(current, mask, col)
+            if has_four(current | move_bit):
+                return col
+
+        if blunder_chance and rng.random() < blunder_chance:
+            return rng.choice(legal)
+
+        if len(self.tt) > self.max_tt_entries:
+            self.tt.clear()
+
+        search = _Search(budget)
+        moves_left = MAX_MOVES - _popcount(mask)
+        best = legal[0]
+        for depth in range(1, min(max_depth, moves_left) + 1):
+            try:
+                score, col = self._root(search, current, mask, depth, legal)
+            except _Timeout:
+                break
+            best = col
+            if abs(score) >= WIN_SCORE - MAX_MOVES:
+                break  # forced result found, deeper search won't change it
+        return best
+
+    def _root(self, search, current, mask, depth, legal):
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        best_score, best_col = -WIN_SCORE - 1, legal[0]
+        for col in legal:
+            nxt, nmask, _ = play(current, mask, col)
+            score = -self._negamax(search, nxt, nmask, depth - 1, -beta, -alpha)
+            if score > best_score:
+                best_score, best_col = score, col
+            alpha = max(alpha, score)
+        return best_score, best_col
+
+    def _negamax(self, search, current, mask, depth, alpha, beta):
+        search.nodes += 1
+        if not search.nodes & 1023 and time.perf_counter() > search.deadline:
+            raise _Timeout()
+
+        opponent = current ^ mask
+        moves_played = _popcount(mask)
+        # The previous move was the opponent's; did it win?
+        if has_four(opponent):
+            return -(WIN_SCORE - moves_played)
+        if moves_played == MAX_MOVES:
+            return 0
+        if depth == 0:
+            return self._evaluate(current, mask)
+
+        key = current + mask
+        entry = self.tt.get(key)
+        if entry is not None and entry[0] >= depth:
+            _, flag, value = entry
+            if flag == 0:
+                return value
+            if flag < 0:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        original_alpha = alpha
+        best = -WIN_SCORE - 1
+        for col in MOVE_ORDER:
+            if mask & TOP_MASKS[col]:
+                continue
+            nxt, nmask, _ = play(current, mask, col)
+            score = -self._negamax(search, nxt, nmask, depth - 1, -beta, -alpha)
+            if score > best:
+                best = score
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                break
+
+        # flag: -1 lower bound, 0 exact, 1 upper bound
+        if best <= original_alpha:
+            flag = 1
+        elif best >= beta:
+            flag = -1
+        else:
+            flag = 0
+        self.tt[key] = (depth, flag, best)
+        return best
+
+    @staticmethod
+    def _evaluate(current, mask):
+        """Heuristic for the side to move: threats and center control."""
+        opponent = current ^ mask
+        threats = _popcount(winning_cells(current, mask)) - _popcount(winning_cells(opponent, mask))
+        center = COLUMN_MASKS[COLS // 2]
+        return threats * 10 + (_popcount(current & center) - _popcount(opponent & center)) * 3
@@ -1,9 +1,18 @@
 import datetime
 import asyncio
+import math
 import aiosqlite
 from config import DB_PATH, RESET_TIME
+from utils import epoch, stat_store
 
-async def init_db():
+_schema_ready = False       # init_db has run in this process
+_bootstrapped = set()       # user ids whose per-user rows are known to exist
+
+async def init_db(force=False):
+    """Create tables and run migrations. Runs once per process unless force."""
+    global _schema_ready
+    if _schema_ready and not force:
+        return
     async with aiosqlite.connect(DB_PATH) as db:
         # Bot Settings (for persistent configuration)
         await db.execute("""
@@ -202,8 +211,10 @@ async def init_db():
             item_id TEXT,
             quantity INTEGER DEFAULT 0,
             activated_at TIMESTAMP,
+            activated_at_ts INTEGER,
             PRIMARY KEY (user_id, item_id)
         )""")
+        await epoch.ensure_epoch_column(db, "inventory", "activated_at", where="activated_at_ts IS NOT NULL")
         # Active items with usage tracking
         await db.execute("""
         CREATE TABLE IF NOT EXISTS active_items (
@@ -213,37 +224,15 @@ async def init_db():
             uses_remaining INTEGER DEFAULT 0,
             PRIMARY KEY (user_id, item_id)
         )""")
-        # Black market global stock (shared by everyone)
-        # Migration: Drop and recreate black_market_stock table with user_id
-        try:
-            # Check if user_id column exists
-            async with db.execute("PRAGMA table_info(black_market_stock)") as cursor:
-                columns = await cursor.fetchall()
-                has_user_id = any(col[1] == 'user_id' for col in columns)
-                
-            if not has_user_id:
-                # Drop old table and recreate with new schema
-                await db.execute("DROP TABLE IF EXISTS black_market_stock")
-                await db.execute("""
-                CREATE TABLE black_market_stock (
-                    user_id INTEGER,
-                    item_id TEXT,
-                    stock INTEGER DEFAULT 0,
-                    price INTEGER DEFAULT 0,
-                    last_restock TIMESTAMP,
-                    PRIMARY KEY (user_id, item_id)
-                )""")
-                await db.commit()
-        except Exception as e:
-            print(f"Migration error for black_market_stock: {e}")
-        
+        # Black market stock is rolled per user and rotation (see cogs/blackmarket.py);
+        # only what each user bought in their latest rotation is stored
+        await db.execute("DROP TABLE IF EXISTS black_market_stock")
         await db.execute("""
-        CREATE TABLE IF NOT EXISTS black_market_stock (
+        CREATE TABLE IF NOT EXISTS black_market_purchases (
             user_id INTEGER,
             item_id TEXT,
-            stock INTEGER DEFAULT 0,
-            price INTEGER DEFAULT 0,
-            last_restock TIMESTAMP,
+            cycle INTEGER,
+            bought INTEGER DEFAULT 0,
             PRIMARY KEY (user_id, item_id)
         )""")
         
@@ -257,57 +246,10 @@ async def init_db():
             quantity INTEGER DEFAULT 1,
             listed_at TIMESTAMP
         )""")
-        # Chest inventory (regular and diamond chests)
-        await db.execute("""
-        CREATE TABLE IF NOT EXISTS chest_inventory (
-            user_id INTEGER,
-            chest_type TEXT,
-            quantity INTEGER DEFAULT 0,
-            PRIMARY KEY (user_id, chest_type)
-        )""")
-        # Game statistics table for achievement tracking
+        # Player market browsing: keyset pages on (item_id, price, listing_id)
         await db.execute("""
-        CREATE TABLE IF NOT EXISTS game_stats (
-            user_id INTEGER PRIMARY KEY,
-            rps_wins INTEGER DEFAULT 0,
-            rps_plays INTEGER DEFAULT 0,
-            connect4_wins INTEGER DEFAULT 0,
-            connect4_plays INTEGER DEFAULT 0,
-            tictactoe_wins INTEGER DEFAULT 0,
-            tictactoe_plays INTEGER DEFAULT 0,
-            blackjack_wins INTEGER DEFAULT 0,
-            blackjack_plays INTEGER DEFAULT 0,
-            blackjack_naturals INTEGER DEFAULT 0,
-            slots_plays INTEGER DEFAULT 0,
-            slots_jackpots INTEGER DEFAULT 0,
-            coinflip_wins INTEGER DEFAULT 0,
-            coinflip_plays INTEGER DEFAULT 0,
-            coinflip_streak INTEGER DEFAULT 0,
-            mines_wins INTEGER DEFAULT 0,
-            mines_plays INTEGER DEFAULT 0,
-            mines_max_tiles INTEGER DEFAULT 0,
-            scramble_games INTEGER DEFAULT 0,
-            scramble_wins INTEGER DEFAULT 0,
-            scramble_losses INTEGER DEFAULT 0,
-            scramble_streak INTEGER DEFAULT 0,
-            scramble_best_time REAL DEFAULT 0,
-            hilo_games INTEGER DEFAULT 0,
-            hilo_cashouts INTEGER DEFAULT 0,
-            hilo_busts INTEGER DEFAULT 0,
-            hilo_best_streak INTEGER DEFAULT 0,
-            hilo_jokers INTEGER DEFAULT 0,
-            tower_games INTEGER DEFAULT 0,
-            tower_cashouts INTEGER DEFAULT 0,
-            tower_traps INTEGER DEFAULT 0,
-            tower_highest_floor INTEGER DEFAULT 0,
-            tower_perfect INTEGER DEFAULT 0,
-            multiplayer_games INTEGER DEFAULT 0,
-            total_earned INTEGER DEFAULT 0,
-            max_wallet INTEGER DEFAULT 0,
-            rob_success INTEGER DEFAULT 0,
-            rob_attempts INTEGER DEFAULT 0,
-            games_played_types TEXT DEFAULT ''
-        )""")
+        CREATE INDEX IF NOT EXISTS idx_listings_item_price
+        ON black_market_listings (item_id, price, listing_id)""")
         # Per-user consumable / misc item storage (e.g., exp bottles)
         await db.execute("""
         CREATE TABLE IF NOT EXISTS user_items (
@@ -336,52 +278,16 @@ async def init_db():
             caught_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )""")
         
-        # Migration: Add mines_wins column if it doesn't exist
-        try:
-            await db.execute("ALTER TABLE game_stats ADD COLUMN mines_wins INTEGER DEFAULT 0")
-            await db.commit()
-        except:
-            pass  # Column already exists
-        
-        # Migration: Add scramble columns if they don't exist
-        try:
-            await db.execute("ALTER TABLE game_stats ADD COLUMN scramble_games INTEGER DEFAULT 0")
-            await db.execute("ALTER TABLE game_stats ADD COLUMN scramble_wins INTEGER DEFAULT 0")
-            await db.execute("ALTER TABLE game_stats ADD COLUMN scramble_losses INTEGER DEFAULT 0")
-            await db.execute("ALTER TABLE game_stats ADD COLUMN scramble_streak INTEGER DEFAULT 0")
-            await db.execute("ALTER TABLE game_stats ADD COLUMN scramble_best_time REAL DEFAULT 0")
-            await db.commit()
-        except:
-            pass  # Columns already exist
-        
-        # Migration: Add hilo columns if they don't exist
-        try:
-            await db.execute("ALTER TABLE game_stats ADD COLUMN hilo_games INTEGER DEFAULT 0")
-            await db.execute("ALTER TABLE game_stats ADD COLUMN hilo_cashouts INTEGER DEFAULT 0")
-            await db.execute("ALTER TABLE game_stats ADD COLUMN hilo_busts INTEGER DEFAULT 0")
-            await db.execute("ALTER TABLE game_stats ADD COLUMN hilo_best_streak INTEGER DEFAULT 0")
-            await db.execute("ALTER TABLE game_stats ADD COLUMN hilo_jokers INTEGER DEFAULT 0")
-            await db.commit()
-        except:
-            pass  # Columns already exist
-        
-        # Migration: Add tower columns if they don't exist
-        try:
-            await db.execute("ALTER TABLE game_stats ADD COLUMN tower_games INTEGER DEFAULT 0")
-            await db.execute("ALTER TABLE game_stats ADD COLUMN tower_cashouts INTEGER DEFAULT 0")
-            await db.execute("ALTER TABLE game_stats ADD COLUMN tower_traps INTEGER DEFAULT 0")
-            await db.execute("ALTER TABLE game_stats ADD COLUMN tower_highest_floor INTEGER DEFAULT 0")
-            await db.execute("ALTER TABLE game_stats ADD COLUMN tower_perfect INTEGER DEFAULT 0")
-            await db.commit()
-        except:
-            pass  # Columns already exist
+        # Game statistics for achievement tracking (migrates the old wide game_stats table)
+        await stat_store.init_stat_store(db)
         
         await db.commit()
+    _schema_ready = True
 
 async def is_enrolled(user_id):
     """Check if user is enrolled in the bot"""
+    await init_db()
     async with aiosqlite.connect(DB_PATH) as db:
-        await init_db()
         async with db.execute("SELECT enrolled FROM users WHERE user_id=?", (user_id,)) as cursor:
             row = await cursor.fetchone()
             return row and row[0] == 1
@@ -390,52 +296,75 @@ async def require_enrollment(ctx):
     """Check if user is enrolled, auto-enroll if not. Always returns True."""
     if not await is_enrolled(ctx.author.id):
         # Auto-enroll the user
+        await init_db()
         async with aiosqlite.connect(DB_PATH) as db:
-            await init_db()
             # Create user with starting balance
             await db.execute(
                 "INSERT OR REPLACE INTO users (user_id, mora, dust, fates, enrolled) VALUES (?, ?, ?, ?, ?)",
                 (ctx.author.id, 10000, 0, 0, 1)
             )
+            await bootstrap_user(ctx.author.id, db)
             await db.commit()
     return True
 
+async def bootstrap_user(user_id, db=None):
+    """Create an enrolled user's wishes, chests and account rows in one transaction.
+
+    Called at enrollment. Every insert is OR IGNORE and selects from users,
+    so re-running it is harmless and unenrolled ids get nothing.
+    Pass db to join the caller's transaction (the caller commits).
+    """
+    if db is None:
+        async with aiosqlite.connect(DB_PATH) as conn:
+            await bootstrap_user(user_id, conn)
+            await conn.commit()
+        return
+    reset = (datetime.datetime.now() + RESET_TIME).isoformat()
+    await db.execute(
+        "INSERT OR IGNORE INTO user_wishes (user_id, count, reset, pity) SELECT user_id, 0, ?, 0 FROM users WHERE user_id=?",
+        (reset, user_id)
+    )
+    await db.execute("INSERT OR IGNORE INTO chests (user_id, count) SELECT user_id, 0 FROM users WHERE user_id=?", (user_id,))
+    await db.execute(
+        "INSERT OR IGNORE INTO chest_inventory (user_id, common, exquisite, precious, luxurious) SELECT user_id, 0, 0, 0, 0 FROM users WHERE user_id=?",
+        (user_id,)
+    )
+    await db.execute("INSERT OR IGNORE INTO accounts (user_id, exp, level, rod_level) SELECT user_id, 0, 0, 1 FROM users WHERE user_id=?", (user_id,))
+    _bootstrapped.add(user_id)
+
 async def ensure_user_db(user_id):
+    """Make sure an enrolled user's per-user rows exist.
+
+    Enrollment creates them, so this only touches the database the first
+    time a user is seen in this process (players enrolled before
+    bootstrap_user get their rows then). Returns False for unknown users.
+    """
+    if user_id in _bootstrapped:
+        return True
+    await init_db()
     async with aiosqlite.connect(DB_PATH) as db:
-        await init_db()
-        async with db.execute("SELECT * FROM users WHERE user_id=?", (user_id,)) as cursor:
-            user = await cursor.fetchone()
-            if not user:
+        async with db.execute("SELECT 1 FROM users WHERE user_id=?", (user_id,)) as cursor:
+            if not await cursor.fetchone():
                 # Don't auto-create, user must enroll first
                 return False
-        async with db.execute("SELECT * FROM user_wishes WHERE user_id=?", (user_id,)) as cursor:
-            wish = await cursor.fetchone()
-            if not wish:
-                now = datetime.datetime.now()
-                await db.execute("INSERT INTO user_wishes (user_id, count, reset, pity) VALUES (?, ?, ?, ?)",
-                                 (user_id, 0, now + RESET_TIME, 0))
-                await db.commit()
-        async with db.execute("SELECT * FROM chests WHERE user_id=?", (user_id,)) as cursor:
-            chest = await cursor.fetchone()
-            if not chest:
-                await db.execute("INSERT INTO chests (user_id, count) VALUES (?, ?)", (user_id, 0))
-                await db.commit()
-        async with db.execute("SELECT * FROM chest_inventory WHERE user_id=?", (user_id,)) as cursor:
-            inv = await cursor.fetchone()
-            if not inv:
-                await db.execute("INSERT INTO chest_inventory (user_id, common, exquisite, precious, luxurious) VALUES (?, ?, ?, ?, ?)", (user_id, 0, 0, 0, 0))
-                await db.commit()
-        # ensure account row exists
-        async with db.execute("SELECT * FROM accounts WHERE user_id=?", (user_id,)) as cursor:
-            acc = await cursor.fetchone()
-            if not acc:
-                await db.execute("INSERT INTO accounts (user_id, exp, level, rod_level) VALUES (?, ?, ?, ?)", (user_id, 0, 0, 1))
-                await db.commit()
+        await bootstrap_user(user_id, db)
+        await db.commit()
+    return True
+
+def forget_bootstrapped(user_id=None):
+    """Forget that a user's rows exist (everyone's if user_id is None) after deleting them"""
+    if user_id is None:
+        _bootstrapped.clear()
+    else:
+        _bootstrapped.discard(user_id)
 
 async def get_user_data(user_id):
-    await ensure_user_db(user_id)
     async with aiosqlite.connect(DB_PATH) as db:
-        async with db.execute("SELECT mora, dust, fates FROM users WHERE user_id=?", (user_id,)) as cursor:
+        async with db.execute(
+            "SELECT u.mora, u.dust, u.fates, COALESCE(w.count, 0) FROM users u "
+            "LEFT JOIN user_wishes w ON w.user_id = u.user_id WHERE u.user_id=?",
+            (user_id,)
+        ) as cursor:
             row = await cursor.fetchone()
         
         if not row:
@@ -449,18 +378,13 @@ async def get_user_data(user_id):
                 "total_pulls": 0
             }
         
-        # Get total pulls from user_wishes
-        async with db.execute("SELECT count FROM user_wishes WHERE user_id=?", (user_id,)) as cursor:
-            wish_row = await cursor.fetchone()
-            total_pulls = wish_row[0] if wish_row else 0
-        
         return {
             "mora": row[0],
             "dust": row[1],
             "fates": row[2],
             "intertwined_fates": row[1],  # dust is intertwined fates
             "acquaint_fates": row[2],      # fates is acquaint fates
-            "total_pulls": total_pulls
+            "total_pulls": row[3]
         }
 
 async def update_user_data(user_id, mora=None, dust=None, fates=None):
@@ -546,7 +470,6 @@ async def purge_inventory_db(user_id: int):
 
 async def get_shop_purchases_today(user_id: int):
     """Return how many shop purchases the user has made today."""
-    await ensure_user_db(user_id)
     today = datetime.date.today().isoformat()
     async with aiosqlite.connect(DB_PATH) as db:
         async with db.execute("SELECT count FROM shop_purchases WHERE user_id=? AND date=?", (user_id, today)) as cursor:
@@ -578,7 +501,6 @@ async def increment_shop_purchases(user_id: int, delta: int = 1):
 
 async def get_shop_item_purchases_today(user_id: int, item_key: str):
     """Return how many of `item_key` the user has purchased today."""
-    await ensure_user_db(user_id)
     today = datetime.date.today().isoformat()
     async with aiosqlite.connect(DB_PATH) as db:
         async with db.execute("SELECT count FROM shop_item_purchases WHERE user_id=? AND date=? AND item_key=?", (user_id, today, item_key)) as cursor:
@@ -646,7 +568,6 @@ async def add_chest_with_type(user_id, chest_type: str = 'common', amount: int =
         await db.commit()
 
 async def get_chest_count(user_id):
-    await ensure_user_db(user_id)
     async with aiosqlite.connect(DB_PATH) as db:
         async with db.execute("SELECT count FROM chests WHERE user_id=?", (user_id,)) as cursor:
             row = await cursor.fetchone()
@@ -655,7 +576,6 @@ async def get_chest_count(user_id):
 
 async def get_chest_inventory(user_id):
     """Return a dict with counts for each chest type for the user."""
-    await ensure_user_db(user_id)
     async with aiosqlite.connect(DB_PATH) as db:
         async with db.execute("SELECT common, exquisite, precious, luxurious FROM chest_inventory WHERE user_id=?", (user_id,)) as cursor:
             row = await cursor.fetchone()
@@ -667,7 +587,6 @@ async def get_chest_inventory(user_id):
 
 async def get_user_item_count(user_id: int, item_key: str):
     """Return how many of `item_key` the user currently has."""
-    await ensure_user_db(user_id)
     async with aiosqlite.connect(DB_PATH) as db:
         async with db.execute("SELECT count FROM user_items WHERE user_id=? AND item_key=?", (user_id, item_key)) as cur:
             row = await cur.fetchone()
@@ -839,10 +758,11 @@ async def mark_dispatch_claimed(dispatch_id: int):
         await db.commit()
 
 async def load_user_wish(user_id):
-    await ensure_user_db(user_id)
     async with aiosqlite.connect(DB_PATH) as db:
         async with db.execute("SELECT count, reset, pity FROM user_wishes WHERE user_id=?", (user_id,)) as cursor:
             row = await cursor.fetchone()
+            if not row:
+                return {"count": 0, "reset": datetime.datetime.now() + RESET_TIME, "pity": 0}
             return {"count": row[0], "reset": datetime.datetime.fromisoformat(row[1]), "pity": row[2]}
 
 async def save_user_wish(user_id, count, reset, pity):
@@ -868,27 +788,53 @@ async def update_chest_count(user_id, count):
         await db.commit()
 
 
-async def _exp_required_for_level(level: int) -> int:
+EXP_BASE = 1000
+EXP_STEP = 200
+
+
+def exp_required_for_level(level: int) -> int:
     """Return EXP required to reach the next level from `level`.
 
     Formula: base 1000 EXP + linear scaling (200 * level). Keep baseline 1000 as requested.
     """
-    base = 1000
-    step = 200
-    return int(base + step * max(0, int(level)))
+    return int(EXP_BASE + EXP_STEP * max(0, int(level)))
+
+
+async def _exp_required_for_level(level: int) -> int:
+    return exp_required_for_level(level)
+
+
+def apply_exp(level: int, exp: int, amount: int):
+    """Return (level, exp) after adding amount EXP, without looping level by level.
+
+    Going from level L up n levels costs the arithmetic series
+    n*(1000 + 200*L) + 100*n*(n - 1) = 100*n**2 + (900 + 200*L)*n, so the
+    number of levels gained is the largest n with that sum <= exp + amount:
+    n = floor((sqrt(b**2 + 400*total) - b) / 200) with b = 900 + 200*L.
+    math.isqrt keeps it exact for any size of grant.
+    """
+    level = int(level)
+    total = int(exp) + int(amount)
+    if total < exp_required_for_level(level):
+        return level, total
+    # the formula assumes level >= 0, as exp_required_for_level clamps it
+    base = max(0, level)
+    b = (EXP_BASE - EXP_STEP // 2) + EXP_STEP * base
+    n = (math.isqrt(b * b + 2 * EXP_STEP * total) - b) // EXP_STEP
+    spent = n * (EXP_BASE + EXP_STEP * base) + EXP_STEP * n * (n - 1) // 2
+    return level + n, total - spent
 
 
 async def get_account_level(user_id: int):
     """Return a tuple (level, exp, needed) for the user's account."""
-    await ensure_user_db(user_id)
     async with aiosqlite.connect(DB_PATH) as db:
         async with db.execute("SELECT level, exp FROM accounts WHERE user_id=?", (user_id,)) as cur:
             row = await cur.fetchone()
             if not row:
-                return 0, 0, await _exp_required_for_level(0)
+                return 0, 0, exp_required_for_level(0)
             level = int(row[0] or 0)
             exp = int(row[1] or 0)
-            needed = await _exp_required_for_level(level)
+            needed = exp_required_for_level(level)
             return level, exp, needed
 
 
@@ -902,109 +848,96 @@ async def add_account_exp(user_id: int, exp_amount: int):
     Returns:
         Tuple of (leveled_up: bool, new_level: int, old_level: int)
     """
-    await ensure_user_db(user_id)
-    
-    async with aiosqlite.connect(DB_PATH) as db:
-        # Get current level and exp
-        level, exp, needed = await get_account_level(user_id)
-        old_level = level
-        
-        # Add exp
-        exp += exp_amount
-        
-        # Check for level ups
-        leveled_up = False
-        while exp >= needed:
-            exp -= needed
-            level += 1
-            leveled_up = True
-            needed = await _exp_required_for_level(level)
-            
-            # Grant level rewards
-            await grant_level_rewards(user_id, level)
-        
-        # Update database
-        await db.execute(
-            "UPDATE accounts SET level = ?, exp = ? WHERE user_id = ?",
-            (level, exp, user_id)
-        )
-        await db.commit()
-        
-        return leveled_up, level, old_level
+    old_level, _, level, _ = await _add_account_exp(user_id, exp_amount)
+    return level > old_level, level, old_level
 
 
-async def grant_level_rewards(user_id: int, level: int):
-    """Idempotently grant level-up rewards for the given level.
+async def _add_account_exp(user_id: int, amount: int):
+    """Apply amount EXP and every level reward it earns in one transaction.
 
-    This function will check `level_claims` to avoid double-granting. Rewards are intentionally
-    conservative: 1 common chest per level, and on every 10th level give 5,000 Mora and 1 exquisite chest.
-    Achievements are awarded at levels 20, 50, and 100. Badges are awarded based on ranks (1-6).
+    Returns (old_level, old_exp, new_level, new_exp).
     """
     await ensure_user_db(user_id)
     async with aiosqlite.connect(DB_PATH) as db:
-        # Check if already claimed
-        async with db.execute("SELECT claimed FROM level_claims WHERE user_id=? AND level=?", (user_id, level)) as cur:
-            row = await cur.fetchone()
-            if row and row[0]:
-                return False
+        await db.execute("BEGIN IMMEDIATE")
+        try:
+            async with db.execute("SELECT level, exp FROM accounts WHERE user_id=?", (user_id,)) as cur:
+                row = await cur.fetchone()
+            old_level = int(row[0] or 0) if row else 0
+            old_exp = int(row[1] or 0) if row else 0
+            level, exp = apply_exp(old_level, old_exp, amount)
+            if level > old_level:
+                await _grant_level_rewards(db, user_id, old_level + 1, level)
+            await db.execute("UPDATE accounts SET level=?, exp=? WHERE user_id=?", (level, exp, user_id))
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+    return old_level, old_exp, level, exp
 
-        # Mark as claimed (insert or update)
-        await db.execute("INSERT OR REPLACE INTO level_claims (user_id, level, claimed) VALUES (?, ?, 1)", (user_id, level))
 
+TIER_BADGES = (
+    # (badge, minimum rank); rank = level // 20
+    ("<a:Medal3:1438198826799468604> Bronze Adventurer", 1),
+    ("<a:Medal2:1438198813851652117> Silver Traveler", 3),
+    ("<a:Medal:1438198856910241842> Golden Legend", 5),
+)
 
-        # Removed chest rewards - only Mora now
 
-        # Per-level Mora scaled by stage: stage = (level//20) + 1
-        try:
-            stage = (int(level) // 20) + 1
-            per_level_mora = 1000 * stage
-            async with db.execute("SELECT mora FROM users WHERE user_id=?", (user_id,)) as cur2:
-                r = await cur2.fetchone()
-                current = int(r[0] or 0) if r else 0
-            await db.execute("UPDATE users SET mora=? WHERE user_id=?", (current + per_level_mora, user_id))
-        except Exception:
-            pass
+def level_reward_mora(level: int) -> int:
+    """Mora granted for reaching level: 1000 per stage, plus 5000 per stage every 10th level."""
+    stage = (int(level) // 20) + 1
+    return 1000 * stage + (5000 * stage if level % 10 == 0 else 0)
 
-        # Every 10 levels: extra Mora (scaled by stage)
-        if level % 10 == 0:
-            try:
-                extra_mora = 5000 * stage
-                async with db.execute("SELECT mora FROM users WHERE user_id=?", (user_id,)) as cur3:
-                    r2 = await cur3.fetchone()
-                    cur_now = int(r2[0] or 0) if r2 else 0
-                await db.execute("UPDATE users SET mora=? WHERE user_id=?", (cur_now + extra_mora, user_id))
-            except Exception:
-                pass
-        
-        # Sync tier badges based on current rank (3 tiers: Bronze 1-2, Silver 3-4, Gold 5-6)
-        rank = max(0, stage - 1)
-        
-        # Define all possible tier badges
-        all_tier_badges = {
-            "<a:Medal3:1438198826799468604> Bronze Adventurer": (rank >= 1),
-            "<a:Medal2:1438198813851652117> Silver Traveler": (rank >= 3),
-            "<a:Medal:1438198856910241842> Golden Legend": (rank >= 5)
-        }
-        
-        try:
-            # Remove badges user no longer qualifies for
-            for badge_key, qualifies in all_tier_badges.items():
-                if not qualifies:
-                    await db.execute("DELETE FROM badges WHERE user_id=? AND badge_key=?", (user_id, badge_key))
-            
-            # Add badges user now qualifies for
-            for badge_key, qualifies in all_tier_badges.items():
-                if qualifies:
-                    async with db.execute("SELECT 1 FROM badges WHERE user_id=? AND badge_key=?", (user_id, badge_key)) as cur:
-                        has_badge = await cur.fetchone()
-                    if not has_badge:
-                        await db.execute("INSERT OR IGNORE INTO badges (user_id, badge_key, awarded_at) VALUES (?, ?, ?)",
-                            (user_id, badge_key, datetime.datetime.now().isoformat()))
-        except Exception:
-            pass
 
+async def grant_level_rewards(user_id: int, level: int):
+    """Idempotently grant level-up rewards for the given level.
+
+    This function will check `level_claims` to avoid double-granting. Rewards are Mora only
+    (see level_reward_mora). Badges are awarded based on ranks (1-6).
+    """
+    async with aiosqlite.connect(DB_PATH) as db:
+        granted = await _grant_level_rewards(db, user_id, level, level)
         await db.commit()
-        return True
+    return bool(granted)
+
+
+async def _grant_level_rewards(db, user_id: int, first: int, last: int):
+    """Grant the rewards for every unclaimed level in first..last on db (the caller commits).
+
+    A fixed number of statements however many levels: one claims lookup, one
+    batch of claim rows, one Mora update and the badge sync. Returns the levels granted.
+    """
+    async with db.execute(
+        "SELECT level FROM level_claims WHERE user_id=? AND level BETWEEN ? AND ? AND claimed",
+        (user_id, first, last)
+    ) as cur:
+        claimed = {row[0] for row in await cur.fetchall()}
+    levels = [level for level in range(first, last + 1) if level not in claimed]
+    if not levels:
+        return levels
+
+    await db.executemany(
+        "INSERT OR REPLACE INTO level_claims (user_id, level, claimed) VALUES (?, ?, 1)",
+        [(user_id, level) for level in levels]
+    )
+    await db.execute(
+        "UPDATE users SET mora = COALESCE(mora, 0) + ? WHERE user_id=?",
+        (sum(level_reward_mora(level) for level in levels), user_id)
+    )
+
+    # Sync tier badges to the rank of the highest level granted (Bronze 1-2, Silver 3-4, Gold 5-6)
+    rank = levels[-1] // 20
+    await db.executemany(
+        "DELETE FROM badges WHERE user_id=? AND badge_key=?",
+        [(user_id, badge) for badge, min_rank in TIER_BADGES if rank < min_rank]
+    )
+    now = datetime.datetime.now().isoformat()
+    await db.executemany(
+        "INSERT OR IGNORE INTO badges (user_id, badge_key, awarded_at) VALUES (?, ?, ?)",
+        [(user_id, badge, now) for badge, min_rank in TIER_BADGES if rank >= min_rank]
+    )
+    return levels
 
 
 async def get_card_exp_required(level: int) -> int:
@@ -1171,43 +1104,8 @@ async def add_account_exp_detailed(user_id: int, amount: int, source: str = 'unk
     if amount is None or amount <= 0:
         return {"old_level": None, "new_level": None, "old_exp": None, "new_exp": None, "levels_gained": 0}
 
-    await ensure_user_db(user_id)
-    levels_gained = 0
-    async with aiosqlite.connect(DB_PATH) as db:
-        async with db.execute("SELECT level, exp FROM accounts WHERE user_id=?", (user_id,)) as cur:
-            row = await cur.fetchone()
-            if not row:
-                level = 0
-                exp = 0
-            else:
-                level = int(row[0] or 0)
-                exp = int(row[1] or 0)
-
-        old_level = level
-        old_exp = exp
-        exp += int(amount)
-
-        # level up loop
-        while True:
-            req = await _exp_required_for_level(level)
-            if exp >= req:
-                exp -= req
-                level += 1
-                levels_gained += 1
-                # grant level rewards (idempotent)
-                try:
-                    await grant_level_rewards(user_id, level)
-                except Exception:
-                    pass
-                # continue to see if next level also reached
-                continue
-            break
-
-        # persist new values
-        await db.execute("UPDATE accounts SET level=?, exp=? WHERE user_id=?", (level, exp, user_id))
-        await db.commit()
-
-    return {"old_level": old_level, "new_level": level, "old_exp": old_exp, "new_exp": exp, "levels_gained": levels_gained}
+    old_level, old_exp, level, exp = await _add_account_exp(user_id, int(amount))
+    return {"old_level": old_level, "new_level": level, "old_exp": old_exp, "new_exp": exp, "levels_gained": level - old_level}
 
 
 async def award_achievement(user_id: int, ach_key: str, title: str, description: str = None):
@@ -1224,7 +1122,6 @@ async def award_achievement(user_id: int, ach_key: str, title: str, description:
 
 
 async def get_user_achievements(user_id: int):
-    await ensure_user_db(user_id)
     async with aiosqlite.connect(DB_PATH) as db:
         async with db.execute("SELECT ach_key, title, description, awarded_at FROM achievements WHERE user_id=?", (user_id,)) as cur:
             rows = await cur.fetchall()
@@ -1290,7 +1187,6 @@ async def check_and_award_level_achievements(user_id: int):
 
 async def get_rod_level(user_id: int) -> int:
     """Return the user's current fishing rod level."""
-    await ensure_user_db(user_id)
     async with aiosqlite.connect(DB_PATH) as db:
         async with db.execute("SELECT rod_level FROM accounts WHERE user_id=?", (user_id,)) as cur:
             row = await cur.fetchone()
@@ -1380,7 +1276,6 @@ async def add_fish_caught(user_id: int, fish_name: str, count: int = 1):
 
 async def get_user_fish_caught(user_id: int):
     """Return list of all fish caught by user with counts."""
-    await ensure_user_db(user_id)
     async with aiosqlite.connect(DB_PATH) as db:
         async with db.execute("SELECT fish_name, count, first_caught FROM fish_caught WHERE user_id=?", (user_id,)) as cur:
             rows = await cur.fetchall()
@@ -1415,7 +1310,6 @@ async def add_fish_pet(user_id: int, fish_name: str):
 
 async def get_user_fish_pets(user_id: int):
     """Return all fish pets owned by a user."""
-    await ensure_user_db(user_id)
     async with aiosqlite.connect(DB_PATH) as db:
         async with db.execute("SELECT id, fish_name, level, exp, caught_at FROM fish_pets WHERE user_id=? ORDER BY caught_at DESC", (user_id,)) as cur:
             rows = await cur.fetchall()
@@ -1489,18 +1383,12 @@ async def track_game_stat(user_id: int, stat_name: str, increment: int = 1):
         stat_name: Name of the stat (e.g., 'rps_wins', 'blackjack_plays')
         increment: Amount to increment by (default 1)
     """
-    async with aiosqlite.connect(DB_PATH) as db:
-        # Ensure row exists
-        await db.execute(
-            "INSERT OR IGNORE INTO game_stats (user_id) VALUES (?)",
-            (user_id,)
-        )
-        # Update stat
-        await db.execute(
-            f"UPDATE game_stats SET {stat_name} = {stat_name} + ? WHERE user_id = ?",
-            (increment, user_id)
-        )
-        await db.commit()
+    await stat_store.add_stats(user_id, {stat_name: increment})
+
+
+async def track_game_stats(pairs):
+    """Track several (user_id, stat_name) pairs by 1 in one write, e.g. both players of a match"""
+    await stat_store.add_stats_many((user_id, stat_name, 1) for user_id, stat_name in pairs)
 
 
 async def get_game_stat(user_id: int, stat_name: str) -> int:
@@ -1513,13 +1401,14 @@ async def get_game_stat(user_id: int, stat_name: str) -> int:
     Returns:
         The value of the stat, or 0 if not found
     """
-    async with aiosqlite.connect(DB_PATH) as db:
-        cursor = await db.execute(
-            f"SELECT {stat_name} FROM game_stats WHERE user_id = ?",
-            (user_id,)
-        )
-        row = await cursor.fetchone()
-        return row[0] if row else 0
+    return await stat_store.get_stat(user_id, stat_name)
+
+
+ACHIEVEMENT_STATS = (
+    'rps_wins', 'multiplayer_games', 'connect4_wins', 'tictactoe_wins', 'blackjack_wins',
+    'blackjack_naturals', 'slots_jackpots', 'slots_plays', 'coinflip_wins', 'coinflip_streak',
+    'mines_max_tiles', 'total_earned', 'max_wallet', 'rob_success',
+)
 
 
 async def check_and_award_game_achievements(user_id: int, bot=None, ctx=None):
@@ -1533,38 +1422,10 @@ async def check_and_award_game_achievements(user_id: int, bot=None, ctx=None):
     from utils.achievements import ACHIEVEMENTS
     
     async with aiosqlite.connect(DB_PATH) as db:
-        # Get current stats
-        cursor = await db.execute("SELECT * FROM game_stats WHERE user_id = ?", (user_id,))
-        stats = await cursor.fetchone()
-        if not stats:
+        stat_dict = await stat_store.get_stats(user_id, ACHIEVEMENT_STATS, db)
+        if not any(stat_dict.values()):
             return []
         
-        # Map column indices (user_id, rps_wins, rps_plays, ...)
-        stat_dict = {
-            'rps_wins': stats[1],
-            'rps_plays': stats[2],
-            'connect4_wins': stats[3],
-            'connect4_plays': stats[4],
-            'tictactoe_wins': stats[5],
-            'tictactoe_plays': stats[6],
-            'blackjack_wins': stats[7],
-            'blackjack_plays': stats[8],
-            'blackjack_naturals': stats[9],
-            'slots_plays': stats[10],
-            'slots_jackpots': stats[11],
-            'coinflip_wins': stats[12],
-            'coinflip_plays': stats[13],
-            'coinflip_streak': stats[14],
-            'mines_plays': stats[15],
-            'mines_max_tiles': stats[16],
-            'multiplayer_games': stats[17],
-            'total_earned': stats[18],
-            'max_wallet': stats[19],
-            'rob_success': stats[20],
-            'rob_attempts': stats[21],
-            'games_played_types': stats[22] if len(stats) > 22 else ''
-        }
-        
         # Get already unlocked achievements
         cursor = await db.execute(
             "SELECT ach_key FROM achievements WHERE user_id = ?",
@@ -1763,19 +1624,14 @@ async def consume_inventory_item(user_id, item_id):
         return True
 
 
+XP_BOOSTER_SECONDS = 30 * 60
+
+
 async def has_xp_booster(user_id):
     """Check if user has active XP booster"""
-    from datetime import datetime, timedelta
     async with aiosqlite.connect(DB_PATH) as db:
         async with db.execute(
-            "SELECT activated_at FROM inventory WHERE user_id = ? AND item_id = 'xp_booster' AND activated_at IS NOT NULL",
-            (user_id,)
+            f"SELECT 1 FROM inventory WHERE user_id = ? AND item_id = 'xp_booster' AND {epoch.epoch_sql('activated_at')} > ?",
+            (user_id, epoch.now() - XP_BOOSTER_SECONDS)
         ) as cursor:
-            result = await cursor.fetchone()
-            
-        if not result:
-            return False
-        
-        activated_time = datetime.fromisoformat(result[0])
-        expiry = activated_time + timedelta(minutes=30)
-        return datetime.now() < expiry
+            return await cursor.fetchone() is not None
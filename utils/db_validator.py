@@ -78,7 +78,7 @@ async def repair_database():
     try:
         from utils.database import init_db
         logger.info("Attempting to repair database schema...")
-        await init_db()
+        await init_db(force=True)
         
         # Re-validate
         success, issues = await validate_database()
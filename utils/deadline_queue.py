@@ -0,0 +1,126 @@
+"""Min-heap of wall-clock deadlines (loan penalties and the like).
+
+The timer wheel covers short game timeouts; this covers deadlines that are
+hours or days away and have to be rebuilt from the database after a
+restart. One background task sleeps until the earliest deadline, fires it
+and goes back to sleep, so nothing is scanned on a timer.
+
+    queue = DeadlineQueue("Loans")
+    queue.schedule_at(("loan", user_id), due, self.process_loan, user_id)
+    queue.cancel(("loan", user_id))
+
+Scheduling an existing key replaces its deadline. Replaced and cancelled
+entries stay in the heap and are skipped when they reach the top.
+Deadlines already in the past fire straight away.
+"""
+import asyncio
+import heapq
+import inspect
+import itertools
+from datetime import datetime
+
+from utils.logger import setup_logger
+
+# Re-check the clock at least this often (system clock changes, suspend)
+MAX_SLEEP = 3600
+
+
+class DeadlineQueue:
+    def __init__(self, name: str = "DeadlineQueue"):
+        self.logger = setup_logger(name)
+        self._heap = []             # (timestamp, seq, key)
+        self._entries = {}          # key -> (timestamp, seq, callback, args)
+        self._seq = itertools.count()
+        self._task = None
+        self._wakeup = None
+        self.fired = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def schedule_at(self, key, when: datetime, callback, *args):
+        """Call callback(*args) at when. Coroutine functions are awaited."""
+        self._ensure_started()
+        timestamp = when.timestamp()
+        seq = next(self._seq)
+        self._entries[key] = (timestamp, seq, callback, args)
+        heapq.heappush(self._heap, (timestamp, seq, key))
+        if self._heap[0][1] == seq:
+            # new earliest deadline: wake the sleeper so it re-arms
+            self._wakeup.set()
+        return key
+
+    def cancel(self, key) -> bool:
+        return self._entries.pop(key, None) is not None
+
+    def next_deadline(self, key):
+        entry = self._entries.get(key)
+        return datetime.fromtimestamp(entry[0]) if entry else None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._heap.clear()
+        self._entries.clear()
+
+    def _ensure_started(self):
+        if self._task is None or self._task.done():
+            self.start()
+
+    def _pop_due(self, now: float) -> list:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            timestamp, seq, key = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            if entry is None or entry[1] != seq:
+                continue    # cancelled or rescheduled
+            del self._entries[key]
+            due.append((key, entry[2], entry[3]))
+        return due
+
+    async def _run(self):
+        while True:
+            try:
+                for key, callback, args in self._pop_due(datetime.now().timestamp()):
+                    self.fired += 1
+                    await self._fire(key, callback, args)
+
+                # drop stale entries so the head is a live deadline
+                while self._heap and self._entries.get(self._heap[0][2], (None, None))[1] != self._heap[0][1]:
+                    heapq.heappop(self._heap)
+
+                self._wakeup.clear()
+                if self._heap:
+                    delay = min(MAX_SLEEP, max(0.0, self._heap[0][0] - datetime.now().timestamp()))
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                else:
+                    await self._wakeup.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Deadline queue failed: {e}", exc_info=True)
+                await asyncio.sleep(1)
+
+    async def _fire(self, key, callback, args):
+        try:
+            result = callback(*args)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            self.logger.error(f"Deadline {key} failed: {e}", exc_info=True)
@@ -0,0 +1,142 @@
+"""Coalescing message-edit dispatcher for animated game embeds.
+
+Games that redraw a message several times a second (wheel spin, scramble
+countdown, connect4 bot moves, tower/hilo auto cash out) submit edits here
+instead of calling message.edit directly:
+
+    from utils.edit_dispatcher import edits
+    edits.submit(message, content="frame 2")          # fire and forget
+    message = await edits.edit(message, embed=embed)  # wait for the result
+
+Each message has at most one edit in flight and one pending; a new edit for
+a message that is still waiting is merged into the pending one (later fields
+win), so intermediate frames are skipped rather than queued. Edits are paced
+per channel with a token bucket sized to Discord's message-edit bucket, so
+bursts wait locally instead of running into 429s.
+"""
+import asyncio
+from collections import deque
+
+import discord
+
+from utils.logger import setup_logger
+
+logger = setup_logger("EditDispatcher")
+
+EDIT_BURST = 5      # edits allowed back to back per channel
+EDIT_PER = 5.0      # seconds to refill a full burst
+
+
+class _PendingEdit:
+    __slots__ = ("message", "fields", "waiters")
+
+    def __init__(self, message, fields):
+        self.message = message
+        self.fields = fields
+        self.waiters = []
+
+
+def _consume_exception(future):
+    # fire-and-forget submitters never look at the result
+    if not future.cancelled():
+        future.exception()
+
+
+class EditDispatcher:
+    def __init__(self, burst: int = EDIT_BURST, per: float = EDIT_PER):
+        self.burst = burst
+        self.per = per
+        self._pending = {}      # message id -> _PendingEdit not sent yet
+        self._queues = {}       # channel id -> deque of message ids
+        self._buckets = {}      # channel id -> [tokens, last refill]
+        self._workers = {}      # channel id -> drain task
+        self.stats = {"submitted": 0, "sent": 0, "coalesced": 0, "dropped": 0, "failed": 0}
+
+    def submit(self, message, **fields) -> asyncio.Future:
+        """Queue an edit and return a future for the edited message."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        future.add_done_callback(_consume_exception)
+        self.stats["submitted"] += 1
+
+        pending = self._pending.get(message.id)
+        if pending is not None:
+            # latest state wins: merge into the edit that has not been sent yet
+            pending.message = message
+            pending.fields.update(fields)
+            pending.waiters.append(future)
+            self.stats["coalesced"] += 1
+            return future
+
+        pending = _PendingEdit(message, dict(fields))
+        pending.waiters.append(future)
+        self._pending[message.id] = pending
+        channel_id = message.channel.id
+        self._queues.setdefault(channel_id, deque()).append(message.id)
+        if channel_id not in self._workers:
+            self._workers[channel_id] = loop.create_task(self._drain(channel_id))
+        return future
+
+    async def edit(self, message, **fields):
+        """Queue an edit and wait for it; raises like message.edit would."""
+        return await self.submit(message, **fields)
+
+    def summary(self) -> str:
+        s = self.stats
+        return (
+            f"{s['submitted']:,} submitted | {s['sent']:,} sent | {s['coalesced']:,} coalesced | "
+            f"{s['dropped']:,} dropped | {s['failed']:,} failed | {len(self._pending):,} pending"
+        )
+
+    async def _take_token(self, channel_id):
+        loop = asyncio.get_running_loop()
+        bucket = self._buckets.setdefault(channel_id, [float(self.burst), loop.time()])
+        rate = self.burst / self.per
+        while True:
+            now = loop.time()
+            bucket[0] = min(float(self.burst), bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return
+            await asyncio.sleep((1 - bucket[0]) / rate)
+
+    async def _drain(self, channel_id):
+        queue = self._queues[channel_id]
+        try:
+            while queue:
+                await self._take_token(channel_id)
+                pending = self._pending.pop(queue.popleft(), None)
+                if pending is None:
+                    continue
+                try:
+                    result = await pending.message.edit(**pending.fields)
+                except (discord.NotFound, discord.Forbidden) as e:
+                    # message is gone or no longer ours to edit
+                    self.stats["dropped"] += len(pending.waiters)
+                    self._resolve(pending, error=e)
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    logger.warning(f"Edit of message {pending.message.id} failed: {e}")
+                    self._resolve(pending, error=e)
+                else:
+                    self.stats["sent"] += 1
+                    self._resolve(pending, result=result)
+        finally:
+            self._workers.pop(channel_id, None)
+            if not queue:
+                self._queues.pop(channel_id, None)
+
+    @staticmethod
+    def _resolve(pending, result=None, error=None):
+        for waiter in pending.waiters:
+            if waiter.done():
+                continue
+            if error is not None:
+                waiter.set_exception(error)
+            else:
+                waiter.set_result(result)
+
+
+# Shared instance used by all cogs
+edits = EditDispatcher()
@@ -0,0 +1,99 @@
+"""Unix-epoch twins for the ISO timestamp columns checked on hot paths.
+
+Premium expiry, XP booster activation, rob cooldowns, loan due dates and
+daily claims are stored as ISO strings, so every check fetched the row and
+ran datetime.fromisoformat, and nothing could range-scan them. Each of those
+columns now has an INTEGER twin named <column>_ts (whole seconds since the
+epoch) with an index, and checks compare integers in SQL.
+
+Rollout: writers fill both columns. ensure_epoch_column() adds the twin,
+backfills it from the text and indexes it on every cog load, and installs
+triggers that recompute the twin whenever a row is inserted or the text
+column is updated. An older build that still writes only the text
+therefore can't leave a missing or stale twin behind. epoch_sql(column)
+falls back to SQLite parsing the text for rows written before the twin
+existed. Sweeps use the _ts column directly.
+
+    await ensure_epoch_column(db, "rob_cooldowns", "last_rob")
+    f"SELECT {epoch_sql('last_rob')} FROM rob_cooldowns WHERE user_id = ?"
+
+Most of these columns hold naive local times (datetime.now()); pass
+utc=True for the ones written with datetime.utcnow().
+"""
+import time
+from datetime import datetime, timezone
+
+
+def now() -> int:
+    return int(time.time())
+
+
+def to_epoch(value, utc: bool = False):
+    """Epoch seconds for a datetime, ISO string or number (None stays None)"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if utc and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def from_epoch(ts, utc: bool = False):
+    """Naive datetime (local, or UTC with utc=True) for epoch seconds"""
+    if ts is None:
+        return None
+    if utc:
+        return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None)
+    return datetime.fromtimestamp(ts)
+
+
+def _parse_sql(column: str, utc: bool) -> str:
+    # Only the first 19 characters (YYYY-MM-DDTHH:MM:SS): strftime rounds
+    # fractional seconds, int(datetime.timestamp()) truncates them
+    modifier = "" if utc else ", 'utc'"
+    return f"CAST(strftime('%s', substr({column}, 1, 19){modifier}) AS INTEGER)"
+
+
+def epoch_sql(column: str, utc: bool = False, table: str = None) -> str:
+    """SQL for a column's epoch value: the _ts twin, else the text parsed by SQLite.
+
+    strftime's 'utc' modifier reads the text as local time, the same way
+    datetime.timestamp() treats a naive datetime.
+    """
+    prefix = f"{table}." if table else ""
+    return f"COALESCE({prefix}{column}_ts, {_parse_sql(prefix + column, utc)})"
+
+
+async def ensure_epoch_column(db, table: str, column: str, utc: bool = False, where: str = None):
+    """Add, backfill, index and keep in sync table.<column>_ts (idempotent, the caller commits).
+
+    where makes the index partial, e.g. "loan_amount > 0".
+    """
+    ts_column = f"{column}_ts"
+    cursor = await db.execute(f"PRAGMA table_info('{table}')")
+    info = await cursor.fetchall()
+    if ts_column not in {row[1] for row in info}:
+        await db.execute(f"ALTER TABLE {table} ADD COLUMN {ts_column} INTEGER")
+    # Match rows by primary key, not rowid: the table may be WITHOUT ROWID
+    key = [row[1] for row in sorted(info, key=lambda row: row[5]) if row[5]] or ["rowid"]
+    match = " AND ".join(f"{k} = NEW.{k}" for k in key)
+    parsed = _parse_sql(f"NEW.{column}", utc)
+    # The text is authoritative: recompute the twin whenever it is written
+    for event in ("INSERT", f"UPDATE OF {column}"):
+        name = f"trg_{table}_{ts_column}_{event.split()[0].lower()}"
+        await db.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON {table} "
+            f"WHEN NEW.{ts_column} IS NOT {parsed} "
+            f"BEGIN UPDATE {table} SET {ts_column} = {parsed} WHERE {match}; END"
+        )
+    await db.execute(
+        f"UPDATE {table} SET {ts_column} = {_parse_sql(column, utc)} "
+        f"WHERE {ts_column} IS NULL AND {column} IS NOT NULL"
+    )
+    await db.execute(
+        f"CREATE INDEX IF NOT EXISTS idx_{table}_{ts_column} ON {table} ({ts_column})"
+        + (f" WHERE {where}" if where else "")
+    )
@@ -0,0 +1,263 @@
+"""Pure payout rules for the casino games.
+
+Everything here is deterministic given the random draws: no discord, no
+database. The cogs import their tables and helpers from this module so the
+RTP simulator (scripts/simulate_rtp.py) checks exactly the rules players get.
+"""
+
+# ---------------------------------------------------------------------------
+# Item / perk modifiers shared by several games
+# ---------------------------------------------------------------------------
+GOLDEN_CARD_CASHBACK = 0.10   # golden bank card: 10% of a loss returned
+GOLDEN_CHIP_BONUS = 0.30      # golden chip: +30% of the win
+LUCKY_DICE_CHANCE = 0.05      # lucky dice: 5% chance to turn a coinflip loss into a win
+HOT_STREAK_REFUND = 0.50      # hot streak card: 50% of a coinflip loss refunded
+PREMIUM_FLIP_LUCK = 0.08      # premium: 8% chance to turn a coinflip loss into a win
+PREMIUM_SLOTS_MATCH = 0.10    # premium: 10% chance to force a slots match
+
+# ---------------------------------------------------------------------------
+# Slots
+# ---------------------------------------------------------------------------
+# symbol -> weight per reel
+SLOT_SYMBOLS = {
+    "🍒": 50,  # 50% chance per reel (~12.5% win rate)
+    "🍋": 35,  # 35% chance (~4.3% win rate)
+    "🍊": 10,  # 10% chance (~0.1% win rate)
+    "🍇": 3,   # 3% chance (rare)
+    "💎": 1,   # 1% chance (very rare)
+    "7️⃣": 1,  # 1% chance (jackpot)
+}
+# symbol -> payout multiplier on three of a kind (includes the stake)
+SLOT_PAYOUTS = {
+    "🍒": 1.5,
+    "🍋": 2,
+    "🍊": 3,
+    "🍇": 6,
+    "💎": 12,
+    "7️⃣": 30,
+}
+# symbol -> rank used when premium luck forces a match on the best symbol shown
+SLOT_SYMBOL_RANK = {"7️⃣": 6, "💎": 5, "🍇": 4, "🍊": 3, "🍋": 2, "🍒": 1}
+
+
+def slots_symbol_pool():
+    """Weighted list of symbols to pick reels from."""
+    pool = []
+    for symbol, weight in SLOT_SYMBOLS.items():
+        pool.extend([symbol] * weight)
+    return pool
+
+
+def slots_apply_premium(reels, roll: float):
+    """Premium luck: with probability PREMIUM_SLOTS_MATCH a non-match becomes three of the best symbol."""
+    if reels[0] == reels[1] == reels[2] or roll >= PREMIUM_SLOTS_MATCH:
+        return reels
+    best = max(reels, key=lambda s: SLOT_SYMBOL_RANK.get(s, 0))
+    return [best, best, best]
+
+
+def slots_multiplier(reels) -> float:
+    """Payout multiplier for a spin (0 on no match)."""
+    if reels[0] == reels[1] == reels[2]:
+        return SLOT_PAYOUTS.get(reels[0], 2)
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Roulette
+# ---------------------------------------------------------------------------
+RED_NUMBERS = [1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36]
+BLACK_NUMBERS = [2, 4, 6, 8, 10, 11, 13, 15, 17, 20, 22, 24, 26, 28, 29, 31, 33, 35]
+ROULETTE_BET_TYPES = ["straight", "red", "black", "odd", "even", "low", "high", "dozen", "column"]
+
+
+def roulette_multiplier(number: int, bet_type: str, bet_value=None) -> int:
+    """Profit multiplier for a roulette bet (the stake is returned on top when > 0)."""
+    # Straight up bet
+    if bet_type == "straight":
+        return 30 if number == bet_value else 0
+    # Red/Black
+    if bet_type == "red":
+        return 1 if number in RED_NUMBERS else 0
+    if bet_type == "black":
+        return 1 if number in BLACK_NUMBERS else 0
+    # Odd/Even (0 loses)
+    if bet_type == "odd":
+        return 1 if number != 0 and number % 2 == 1 else 0
+    if bet_type == "even":
+        return 1 if number != 0 and number % 2 == 0 else 0
+    # Low/High (0 loses)
+    if bet_type == "low":
+        return 1 if 1 <= number <= 18 else 0
+    if bet_type == "high":
+        return 1 if 19 <= number <= 36 else 0
+    # Dozens
+    if bet_type == "dozen":
+        if bet_value in (1, 2, 3) and (bet_value - 1) * 12 < number <= bet_value * 12:
+            return 2
+        return 0
+    # Columns
+    if bet_type == "column":
+        if number != 0 and bet_value in (1, 2, 3) and number % 3 == bet_value % 3:
+            return 2
+        return 0
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Wheel of fortune: (label, multiplier, weight)
+# ---------------------------------------------------------------------------
+WHEEL_SEGMENTS = [
+    ("💸 Bankrupt", 0, 1),
+    ("💔 0.2x", 0.2, 20),
+    ("🎯 0.5x", 0.5, 24),
+    ("💰 1.2x", 1.2, 20),
+    ("💎 2x", 2, 24),
+    ("💵 5x", 5, 6),
+    ("🌟 10x", 10, 4),
+    ("👑 JACKPOT", 50, 1),
+]
+# Premium users get improved odds (lower weight on bad outcomes, higher on good)
+WHEEL_SEGMENTS_PREMIUM = [
+    ("💸 Bankrupt", 0, 1),      # 1% (same)
+    ("💔 0.2x", 0.2, 15),       # 15% (reduced from 20%)
+    ("🎯 0.5x", 0.5, 20),       # 20% (reduced from 24%)
+    ("💰 1.2x", 1.2, 22),       # 22% (increased from 20%)
+    ("💎 2x", 2, 26),           # 26% (increased from 24%)
+    ("💵 5x", 5, 9),            # 9% (increased from 6%)
+    ("🌟 10x", 10, 5),          # 5% (increased from 4%)
+    ("👑 JACKPOT", 50, 2),      # 2% (doubled from 1%)
+]
+WHEEL_BANKRUPT_PENALTY = 0.10  # bankrupt also costs 10% of the remaining balance
+
+
+def wheel_pool(premium: bool = False):
+    """Weighted list of (label, multiplier) to pick a segment from."""
+    pool = []
+    for segment, multiplier, weight in (WHEEL_SEGMENTS_PREMIUM if premium else WHEEL_SEGMENTS):
+        pool.extend([(segment, multiplier)] * weight)
+    return pool
+
+
+# ---------------------------------------------------------------------------
+# Hi-Lo
+# ---------------------------------------------------------------------------
+HILO_CARD_RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+HILO_CARD_SUITS = ['♠', '♥', '♦', '♣']
+HILO_CARD_VALUES = {
+    '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8, '9': 9,
+    '10': 10, 'J': 11, 'Q': 12, 'K': 13, 'A': 14
+}
+# streak -> cash out multiplier (lowered)
+HILO_MULTIPLIERS = {
+    1: 1.3,
+    2: 1.6,
+    3: 2.0,
+    4: 2.4,
+    5: 3.0,
+    6: 3.8,
+    7: 5.0,
+    8: 7.0
+}
+HILO_MAX_MULTIPLIER = 10.0  # streaks past the table, and the forced cash out
+HILO_MAX_STREAK = 10
+HILO_JOKER_CHANCE = 0.002
+HILO_JOKER_MULTIPLIER = 50
+
+
+def hilo_multiplier(streak: int) -> float:
+    return HILO_MULTIPLIERS.get(streak, HILO_MAX_MULTIPLIER)
+
+
+# ---------------------------------------------------------------------------
+# Tower
+# ---------------------------------------------------------------------------
+TOWER_FLOOR_MULTIPLIERS = {
+    1: 1.3,
+    2: 1.6,
+    3: 2.0,
+    4: 2.5,
+    5: 3.0,
+    6: 3.5,
+    7: 4.5,
+    8: 6.0,
+    9: 8.0,
+    10: 10.0
+}
+TOWER_TILES = 3  # one trap among three tiles per floor
+TOWER_MAX_FLOOR = 10
+
+
+# ---------------------------------------------------------------------------
+# Mines
+# ---------------------------------------------------------------------------
+MINES_SIZE = 4
+MINES_BOMBS = 3
+MINES_PERFECT_MULTIPLIER = 3.0
+
+
+def mines_multiplier(boxes_found: int, total_cells: int = MINES_SIZE * MINES_SIZE, bombs: int = MINES_BOMBS) -> float:
+    """+0.2x every 2 boxes found, 3x for clearing every safe box."""
+    if boxes_found == total_cells - bombs:
+        return MINES_PERFECT_MULTIPLIER
+    return 1.0 + 0.2 * (boxes_found // 2)
+
+
+# ---------------------------------------------------------------------------
+# Blackjack
+# ---------------------------------------------------------------------------
+DECK_RANKS = ["A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K"]
+DECK_SUITS = ["♠", "♥", "♦", "♣"]
+BLACKJACK_PAYOUT = 2.2  # natural blackjack (reduced from 2.5x), includes the stake
+DEALER_STANDS_ON = 17   # dealer draws to 17 and stands on all 17s
+
+
+def make_deck():
+    return [f"{r}{s}" for r in DECK_RANKS for s in DECK_SUITS]
+
+
+def card_points(rank: str) -> int:
+    """Blackjack points of a rank, counting aces as 11."""
+    if rank == "A":
+        return 11
+    if rank in ("J", "Q", "K"):
+        return 10
+    try:
+        return int(rank)
+    except Exception:
+        return 0
+
+
+def hand_value(cards):
+    # returns best value <=21 or minimal over 21
+    total = 0
+    aces = 0
+    for c in cards:
+        rank = c[:-1]
+        if rank == "A":
+            aces += 1
+        total += card_points(rank)
+    # downgrade aces from 11 to 1 as needed
+    while total > 21 and aces:
+        total -= 10
+        aces -= 1
+    return total
+
+
+def blackjack_settle(player_cards, dealer_cards, stake: int, eligible: bool = False) -> int:
+    """Amount credited back for a hand resolved against the dealer (includes the stake)."""
+    pv = hand_value(player_cards)
+    dv = hand_value(dealer_cards)
+    # blackjack only applies if eligible and initial 2-card 21
+    is_player_blackjack = eligible and len(player_cards) == 2 and pv == 21
+    is_dealer_blackjack = len(dealer_cards) == 2 and dv == 21
+
+    if is_player_blackjack and not is_dealer_blackjack:
+        return int(stake * BLACKJACK_PAYOUT)
+    if pv > 21:
+        return 0
+    if dv > 21 or pv > dv:
+        return stake * 2
+    if pv == dv:
+        return stake
+    return 0
@@ -0,0 +1,214 @@
+"""Sharded global bank balance.
+
+Every losing bet credits the global bank, so a single balance row made all
+of those writes queue up behind one another. The balance is now spread over
+SHARDS rows in global_bank_shards: a writer touches only the shard picked by
+its user id, and the balance is the sum of the shards. The stats columns
+(total_loans_given, total_penalties_collected) stay on global_bank row 1;
+they only change on loans.
+
+With config.BANK_WRITE_BEHIND on, game losses are added to an in-memory
+total instead and written out by flush_pending() (the Bank cog runs it every
+FLUSH_SECONDS and on unload). get_bank_balance() adds the unflushed amount
+so it stays exact; a crash loses at most one interval of credits. Loans,
+repayments and owner commands always write through (exact=True).
+
+    from utils.global_bank import add_to_bank, get_bank_balance
+    await add_to_bank(bet_amount, ctx.author.id)
+"""
+import aiosqlite
+
+import config
+from config import DB_PATH
+from utils.logger import setup_logger
+
+logger = setup_logger("GlobalBank")
+
+SHARDS = 16
+FLUSH_SECONDS = 5
+STARTING_BALANCE = 1_000_000
+
+_initialized = False
+_pending = 0        # credited in memory, not yet written
+_in_flight = 0      # taken by a running flush, not yet committed
+_flushes = 0
+
+
+def shard_for(user_id) -> int:
+    return (user_id or 0) % SHARDS
+
+
+def unflushed() -> int:
+    """Credits held in memory by write-behind that are not in the shards yet"""
+    return _pending + _in_flight
+
+
+def write_behind() -> bool:
+    return getattr(config, "BANK_WRITE_BEHIND", False)
+
+
+async def init_global_bank(db=None):
+    """Create the shard rows (idempotent).
+
+    The first run moves the old single-row balance into shard 0.
+    """
+    global _initialized
+    if _initialized:
+        return
+    if db is None:
+        async with aiosqlite.connect(DB_PATH) as conn:
+            await init_global_bank(conn)
+            await conn.commit()
+        return
+
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS global_bank (
+            id INTEGER PRIMARY KEY DEFAULT 1,
+            balance INTEGER DEFAULT 0,
+            total_loans_given INTEGER DEFAULT 0,
+            total_penalties_collected INTEGER DEFAULT 0
+        )
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS global_bank_shards (
+            shard INTEGER PRIMARY KEY,
+            balance INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    cursor = await db.execute("SELECT COUNT(*) FROM global_bank_shards")
+    if (await cursor.fetchone())[0] < SHARDS:
+        cursor = await db.execute("SELECT balance FROM global_bank WHERE id = 1")
+        row = await cursor.fetchone()
+        legacy = row[0] if row and row[0] is not None else STARTING_BALANCE
+        await db.executemany(
+            "INSERT OR IGNORE INTO global_bank_shards (shard, balance) VALUES (?, 0)",
+            [(shard,) for shard in range(SHARDS)]
+        )
+        # balance now lives in the shards; keep row 1 for the loan stats
+        await db.execute(
+            "INSERT INTO global_bank (id, balance) VALUES (1, 0) ON CONFLICT(id) DO UPDATE SET balance = 0"
+        )
+        await db.execute("UPDATE global_bank_shards SET balance = balance + ? WHERE shard = 0", (legacy,))
+        logger.info(f"Moved global bank balance {legacy:,} into {SHARDS} shards")
+    _initialized = True
+
+
+async def add_to_bank(amount: int, user_id: int = None, db=None, exact: bool = False):
+    """Credit (or with a negative amount, debit) the global bank.
+
+    Pass db to write inside the caller's transaction (the caller commits).
+    """
+    global _pending
+    amount = int(amount)
+    if not amount:
+        return
+    if write_behind() and not exact and db is None:
+        _pending += amount
+        return
+    sql = "UPDATE global_bank_shards SET balance = balance + ? WHERE shard = ?"
+    params = (amount, shard_for(user_id))
+    if db is not None:
+        await init_global_bank(db)
+        await db.execute(sql, params)
+        return
+    await init_global_bank()
+    async with aiosqlite.connect(DB_PATH) as conn:
+        await conn.execute(sql, params)
+        await conn.commit()
+
+
+# Split :pot across depositors in proportion to their deposits, in one
+# statement. Everyone gets floor(deposit * pot / total); the few mora left
+# over from rounding go one each to the largest remainders (ties to the
+# lower user id), so the shares always add up to exactly :pot.
+PRO_RATA_SQL = """
+    WITH total AS (
+        SELECT SUM(deposited_amount) AS amount FROM user_bank_deposits WHERE deposited_amount > 0
+    ),
+    base AS (
+        SELECT d.user_id,
+               d.deposited_amount * :pot / t.amount AS share,
+               d.deposited_amount * :pot % t.amount AS remainder
+        FROM user_bank_deposits d, total t
+        WHERE d.deposited_amount > 0
+    ),
+    allocated AS (
+        SELECT user_id,
+               share + (ROW_NUMBER() OVER (ORDER BY remainder DESC, user_id)
+                        <= :pot - (SELECT SUM(share) FROM base)) AS share
+        FROM base
+    )
+    UPDATE user_bank_deposits
+    SET interest_earned = interest_earned + allocated.share
+    FROM allocated
+    WHERE user_bank_deposits.user_id = allocated.user_id AND allocated.share > 0
+"""
+
+
+async def distribute_to_depositors(db, pot: int) -> int:
+    """Pay pot out to depositors pro rata inside the caller's transaction.
+
+    Returns what was paid: pot, or 0 if nobody has a deposit.
+    """
+    pot = int(pot)
+    if pot <= 0:
+        return 0
+    cursor = await db.execute("SELECT 1 FROM user_bank_deposits WHERE deposited_amount > 0 LIMIT 1")
+    if await cursor.fetchone() is None:
+        return 0
+    await db.execute(PRO_RATA_SQL, {"pot": pot})
+    return pot
+
+
+async def get_bank_balance(db=None) -> int:
+    """Current global bank balance, including credits not flushed yet"""
+    sql = "SELECT COALESCE(SUM(balance), 0) FROM global_bank_shards"
+    if db is not None:
+        await init_global_bank(db)
+        cursor = await db.execute(sql)
+        stored = (await cursor.fetchone())[0]
+    else:
+        await init_global_bank()
+        async with aiosqlite.connect(DB_PATH) as conn:
+            cursor = await conn.execute(sql)
+            stored = (await cursor.fetchone())[0]
+    return stored + unflushed()
+
+
+async def set_bank_balance(amount: int, db=None):
+    """Set the balance outright (drops unflushed credits)"""
+    global _pending
+    _pending = 0
+    if db is None:
+        async with aiosqlite.connect(DB_PATH) as conn:
+            await set_bank_balance(amount, conn)
+            await conn.commit()
+        return
+    await init_global_bank(db)
+    await db.execute("UPDATE global_bank_shards SET balance = CASE shard WHEN 0 THEN ? ELSE 0 END", (int(amount),))
+
+
+async def flush_pending() -> int:
+    """Write the in-memory credits out to a shard; returns the amount written"""
+    global _pending, _in_flight, _flushes
+    if not _pending:
+        return 0
+    amount, _pending = _pending, 0
+    _in_flight += amount
+    try:
+        await init_global_bank()
+        async with aiosqlite.connect(DB_PATH) as db:
+            # rotate shards between flushes so they stay roughly even
+            await db.execute(
+                "UPDATE global_bank_shards SET balance = balance + ? WHERE shard = ?",
+                (amount, _flushes % SHARDS)
+            )
+            await db.commit()
+        _flushes += 1
+        return amount
+    except Exception as e:
+        _pending += amount
+        logger.error(f"Failed to flush {amount:,} to the global bank: {e}")
+        return 0
+    finally:
+        _in_flight -= amount
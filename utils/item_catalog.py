@@ -0,0 +1,111 @@
+"""Compiled item catalog for resolving typed item names.
+
+Built once from an item table ({item_id: {"name": ..., "rarity": ...,
+"base_price": ...}}) plus optional aliases.
+
+resolve() only accepts an exact match on the normalized id, display name
+or an alias ("lucky_dice", "Lucky Dice", "luckydice" and "dice" all work).
+Commands that spend mora or use up items go through it, so a stray word
+can never pick an item the player didn't mean.
+
+suggest() guesses for everything else: a prefix that only one item's names
+start with ("rigg" -> rigged_deck), else the closest name within a small
+edit distance ("shotgn"). Those commands show it as "did you mean ...?",
+and the market search accepts it directly.
+"""
+import re
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase alphanumerics only: "Banker's Key" -> "bankerskey" """
+    return _NON_ALNUM.sub("", name.lower())
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance with adjacent swaps, or limit + 1 once it is exceeded"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            if prev2 is not None and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+class _TrieNode:
+    __slots__ = ("children", "items")
+
+    def __init__(self):
+        self.children = {}
+        self.items = set()  # every item with a name under this node
+
+
+class ItemCatalog:
+    def __init__(self, items: dict, aliases: dict = None):
+        self.items = items
+        self.names = {}         # normalized name -> item_id
+        self.price_of = {}
+        self.by_rarity = {}
+        self._trie = _TrieNode()
+
+        for item_id, item in items.items():
+            self.price_of[item_id] = item.get("base_price")
+            self.by_rarity.setdefault(item.get("rarity"), []).append(item_id)
+            self._add_name(item_id, item_id)
+            self._add_name(item.get("name", item_id), item_id)
+        for alias, item_id in (aliases or {}).items():
+            self._add_name(alias, item_id)
+
+    def _add_name(self, name: str, item_id: str):
+        key = normalize_name(name)
+        if not key:
+            return
+        self.names.setdefault(key, item_id)
+        node = self._trie
+        node.items.add(item_id)
+        for ch in key:
+            node = node.children.setdefault(ch, _TrieNode())
+            node.items.add(item_id)
+
+    def resolve(self, name: str):
+        """Item id whose id, name or alias is exactly the typed name, else None"""
+        return self.names.get(normalize_name(name or ""))
+
+    def suggest(self, name: str):
+        """Best guess for a name resolve() missed, or None if nothing (or more than one item) fits"""
+        key = normalize_name(name or "")
+        if not key:
+            return None
+        node = self._trie
+        for ch in key:
+            node = node.children.get(ch)
+            if node is None:
+                break
+        else:
+            if len(node.items) == 1:
+                return next(iter(node.items))
+            return None  # ambiguous prefix
+
+        return self._closest(key)
+
+    def _closest(self, key: str):
+        limit = 1 if len(key) <= 5 else 2
+        best, best_ids = limit + 1, set()
+        for name, item_id in self.names.items():
+            distance = edit_distance(key, name, limit)
+            if distance < best:
+                best, best_ids = distance, {item_id}
+            elif distance == best:
+                best_ids.add(item_id)
+        if best <= limit and len(best_ids) == 1:
+            return next(iter(best_ids))
+        return None
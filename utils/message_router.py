@@ -0,0 +1,61 @@
+"""Routes chat messages to the game waiting for an answer from that author.
+
+bot.on_message parses each message once (bot check, prefix/command lookup)
+and hands anything that is not a command to the router. Games register
+interest while they are running and unregister when they end:
+
+    from utils.message_router import router
+    router.register(channel.id, user.id, self.handle_answer)
+    router.unregister(channel.id, user.id)
+
+A message costs one dict lookup on (channel_id, user_id); channels with no
+running game never reach a cog.
+"""
+from utils.logger import setup_logger
+
+logger = setup_logger("MessageRouter")
+
+
+class MessageRouter:
+    def __init__(self):
+        self._routes = {}   # (channel_id, user_id) -> async handler(message)
+        self.routed = 0
+
+    def __len__(self):
+        return len(self._routes)
+
+    def register(self, channel_id: int, user_id: int, handler):
+        """Send user_id's messages in channel_id to handler (replaces any existing route)"""
+        self._routes[(channel_id, user_id)] = handler
+
+    def unregister(self, channel_id: int, user_id: int, handler=None) -> bool:
+        """Drop a route; with handler given, only if it is still the registered one"""
+        key = (channel_id, user_id)
+        current = self._routes.get(key)
+        if current is None or (handler is not None and current != handler):
+            return False
+        del self._routes[key]
+        return True
+
+    def unregister_owner(self, owner) -> int:
+        """Drop every route whose handler is a method of owner (used on cog unload)"""
+        keys = [key for key, handler in self._routes.items() if getattr(handler, "__self__", None) is owner]
+        for key in keys:
+            del self._routes[key]
+        return len(keys)
+
+    async def dispatch(self, message) -> bool:
+        """Deliver a non-command message to its registered handler, if any"""
+        handler = self._routes.get((message.channel.id, message.author.id))
+        if handler is None:
+            return False
+        self.routed += 1
+        try:
+            await handler(message)
+        except Exception as e:
+            logger.error(f"Answer handler {getattr(handler, '__qualname__', handler)} failed: {e}", exc_info=True)
+        return True
+
+
+# Shared instance used by bot.on_message and the game cogs
+router = MessageRouter()
@@ -0,0 +1,237 @@
+"""Atomic rob resolution.
+
+A rob touches two wallets, the target's bank deposit, both players' rob
+items, the robber's cooldown, the inventory (Plasma Canon) and the
+transaction log. All of it happens here on one connection inside a single
+BEGIN IMMEDIATE transaction: balances are read after the write lock is
+taken, every debit is conditional on the balance still covering it, and
+either the whole rob lands or none of it does. A game paying out to the
+target at the same moment waits for the lock instead of being overwritten.
+
+    outcome = await settle_rob(robber_id, target_id, target_name, premium=True)
+    if outcome["status"] == "success": ...
+
+XP is awarded by the caller after the commit (it has its own level-up
+bookkeeping and does not move mora).
+"""
+import random
+from datetime import datetime, timedelta
+
+import aiosqlite
+
+from config import DB_PATH
+from utils import epoch
+from utils.transaction_logger import log_transaction
+
+MIN_TARGET_WALLET = 100_000     # normal rob: target wallet
+MIN_TARGET_TOTAL = 100_000      # plasma rob: target wallet + bank
+STEAL_RATE = 0.02
+PLASMA_WALLET_RATE = 0.06       # 3x the normal steal
+PLASMA_BANK_RATE = 0.15
+PENALTY_RANGE = (5_000, 50_000)
+
+BASE_SUCCESS = 20
+PREMIUM_BONUS = 15
+SHOTGUN_BONUS = 20
+THIEF_PACK_BONUS = 25           # mask + night vision + lockpicker
+GUARD_DOG_DEFENSE = 25
+SPIKY_FENCE_DEFENSE = 5
+MIN_SUCCESS = 5
+
+
+def cooldown_minutes(was_successful, premium: bool) -> int:
+    if premium:
+        return 20 if was_successful else 40
+    return 30 if was_successful else 60
+
+
+def success_rate(robber_items: dict, victim_items: dict, premium: bool) -> int:
+    rate = BASE_SUCCESS
+    if premium:
+        rate += PREMIUM_BONUS
+    if robber_items["shotgun"]:
+        rate += SHOTGUN_BONUS
+    if robber_items["mask"] and robber_items["night_vision"] and robber_items["lockpicker"]:
+        rate += THIEF_PACK_BONUS
+    defense = 0
+    if victim_items["guard_dog"]:
+        defense += GUARD_DOG_DEFENSE
+    if victim_items["spiky_fence"]:
+        defense += SPIKY_FENCE_DEFENSE
+    return max(MIN_SUCCESS, rate - defense)
+
+
+async def _wallet(db, user_id) -> int:
+    cursor = await db.execute("SELECT mora FROM users WHERE user_id = ?", (user_id,))
+    row = await cursor.fetchone()
+    return row[0] if row and row[0] else 0
+
+
+async def _bank(db, user_id) -> int:
+    cursor = await db.execute("SELECT deposited_amount FROM user_bank_deposits WHERE user_id = ?", (user_id,))
+    row = await cursor.fetchone()
+    return row[0] if row and row[0] else 0
+
+
+async def _debit(db, user_id, amount: int) -> bool:
+    """Take amount from a wallet only if it still covers it"""
+    cursor = await db.execute(
+        "UPDATE users SET mora = mora - ? WHERE user_id = ? AND mora >= ?",
+        (amount, user_id, amount)
+    )
+    return cursor.rowcount > 0
+
+
+async def _rob_items(db, user_id, now: datetime) -> dict:
+    cursor = await db.execute(
+        "SELECT shotgun, mask, night_vision, lockpicker, guard_dog, guard_dog_expires, spiky_fence, lock FROM rob_items WHERE user_id = ?",
+        (user_id,)
+    )
+    row = await cursor.fetchone() or (0, 0, 0, 0, 0, None, 0, 0)
+    items = dict(zip(
+        ("shotgun", "mask", "night_vision", "lockpicker", "guard_dog", "guard_dog_expires", "spiky_fence", "lock"),
+        row
+    ))
+    if items["guard_dog_expires"] and now > datetime.fromisoformat(items["guard_dog_expires"]):
+        await db.execute(
+            "UPDATE rob_items SET guard_dog = 0, guard_dog_expires = NULL WHERE user_id = ?",
+            (user_id,)
+        )
+        items["guard_dog"] = 0
+    return items
+
+
+async def _set_cooldown(db, user_id, now: datetime, successful: bool):
+    await db.execute(
+        """INSERT INTO rob_cooldowns (user_id, last_rob, last_rob_ts, was_successful)
+           VALUES (?, ?, ?, ?)
+           ON CONFLICT(user_id) DO UPDATE SET last_rob = excluded.last_rob, last_rob_ts = excluded.last_rob_ts,
+               was_successful = excluded.was_successful""",
+        (user_id, now.isoformat(), epoch.to_epoch(now), int(successful))
+    )
+
+
+async def settle_plasma_rob(robber_id: int, target_id: int, target_name: str) -> dict:
+    """Fire a Plasma Canon: guaranteed steal from wallet and bank, no cooldown.
+
+    Returns {"status": "no_plasma" | "too_poor" | "success", ...}; on success
+    also "wallet", "bank" and "stolen".
+    """
+    async with aiosqlite.connect(DB_PATH) as db:
+        await db.execute("BEGIN IMMEDIATE")
+        try:
+            target_mora = await _wallet(db, target_id)
+            bank_balance = await _bank(db, target_id)
+            if target_mora + bank_balance < MIN_TARGET_TOTAL:
+                await db.rollback()
+                return {"status": "too_poor", "total": target_mora + bank_balance}
+
+            cursor = await db.execute(
+                "UPDATE inventory SET quantity = quantity - 1 WHERE user_id = ? AND item_id = 'plasma_canon' AND quantity > 0",
+                (robber_id,)
+            )
+            if cursor.rowcount == 0:
+                await db.rollback()
+                return {"status": "no_plasma"}
+            await db.execute("DELETE FROM inventory WHERE user_id = ? AND quantity <= 0", (robber_id,))
+
+            from_wallet = min(int(target_mora * PLASMA_WALLET_RATE), target_mora)
+            from_bank = int(bank_balance * PLASMA_BANK_RATE)
+            if from_wallet > 0 and not await _debit(db, target_id, from_wallet):
+                from_wallet = 0
+            if from_bank > 0:
+                cursor = await db.execute(
+                    "UPDATE user_bank_deposits SET deposited_amount = deposited_amount - ? WHERE user_id = ? AND deposited_amount >= ?",
+                    (from_bank, target_id, from_bank)
+                )
+                if cursor.rowcount == 0:
+                    from_bank = 0
+            stolen = from_wallet + from_bank
+            await db.execute("UPDATE users SET mora = mora + ? WHERE user_id = ?", (stolen, robber_id))
+            await log_transaction(robber_id, "plasma_rob", stolen, f"Plasma Canon robbed {target_name} ({target_id})", db=db)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+    return {"status": "success", "wallet": from_wallet, "bank": from_bank, "stolen": stolen}
+
+
+async def settle_rob(robber_id: int, target_id: int, target_name: str, premium: bool = False, rng=random) -> dict:
+    """Resolve a normal rob attempt start to finish.
+
+    Returns {"status": ..., ...}:
+        cooldown  "remaining" (timedelta) until the robber may try again
+        too_poor  target wallet is under MIN_TARGET_WALLET
+        locked    the target's lock blocked the rob and broke
+        success   "stolen", "rate"
+        failed    "penalty", "rate", "guard_dog", "spiky_fence"
+    """
+    async with aiosqlite.connect(DB_PATH) as db:
+        await db.execute("BEGIN IMMEDIATE")
+        try:
+            outcome = await _settle_rob(db, robber_id, target_id, target_name, premium, rng)
+            if outcome["status"] in ("cooldown", "too_poor"):
+                await db.rollback()
+            else:
+                await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+    return outcome
+
+
+async def _settle_rob(db, robber_id, target_id, target_name, premium, rng) -> dict:
+    now = datetime.now()
+    cursor = await db.execute(
+        f"SELECT {epoch.epoch_sql('last_rob')}, was_successful FROM rob_cooldowns WHERE user_id = ?", (robber_id,)
+    )
+    row = await cursor.fetchone()
+    if row and row[0] is not None:
+        remaining = row[0] + cooldown_minutes(row[1], premium) * 60 - epoch.to_epoch(now)
+        if remaining > 0:
+            return {"status": "cooldown", "remaining": timedelta(seconds=remaining)}
+
+    target_mora = await _wallet(db, target_id)
+    if target_mora < MIN_TARGET_WALLET:
+        return {"status": "too_poor", "total": target_mora}
+
+    robber_items = await _rob_items(db, robber_id, now)
+    victim_items = await _rob_items(db, target_id, now)
+
+    if victim_items["lock"]:
+        await db.execute("UPDATE rob_items SET lock = 0 WHERE user_id = ?", (target_id,))
+        return {"status": "locked"}
+
+    rate = success_rate(robber_items, victim_items, premium)
+    success = rng.randint(1, 100) <= rate
+
+    # single-use items go whether or not the rob works
+    await db.execute(
+        """UPDATE rob_items SET mask = mask - (mask > 0),
+                                night_vision = night_vision - (night_vision > 0),
+                                lockpicker = lockpicker - (lockpicker > 0)
+           WHERE user_id = ?""",
+        (robber_id,)
+    )
+    await _set_cooldown(db, robber_id, now, success)
+
+    if success:
+        stolen = min(int(target_mora * STEAL_RATE), target_mora)
+        if stolen > 0 and await _debit(db, target_id, stolen):
+            await db.execute("UPDATE users SET mora = mora + ? WHERE user_id = ?", (stolen, robber_id))
+        else:
+            stolen = 0
+        await log_transaction(robber_id, "rob_success", stolen, f"Robbed {target_name} ({target_id})", db=db)
+        return {"status": "success", "stolen": stolen, "rate": rate}
+
+    penalty = min(rng.randint(*PENALTY_RANGE), await _wallet(db, robber_id))
+    if penalty > 0 and not await _debit(db, robber_id, penalty):
+        penalty = 0
+    await log_transaction(
+        robber_id, "rob_fail", -penalty if penalty > 0 else 0,
+        f"Failed to rob {target_name}, lost {penalty:,} mora", db=db
+    )
+    return {
+        "status": "failed", "penalty": penalty, "rate": rate,
+        "guard_dog": bool(victim_items["guard_dog"]), "spiky_fence": bool(victim_items["spiky_fence"]),
+    }
@@ -0,0 +1,101 @@
+"""Anagram index, scramble pools and difficulty tiers for Word Scramble.
+
+Built once from the word pool when the cog loads:
+
+- anagram index: sorted letters -> every accepted word with those letters,
+  so any valid rearrangement counts as a correct answer with one lookup
+- scramble pool: a few shuffles per word that are neither the word itself
+  nor another accepted anagram of it
+- difficulty: log2 of the number of distinct letter arrangements
+  (n! / product of repeated-letter counts). Longer words and words without
+  repeated letters score higher; tiers split the pool by score quantile.
+
+Extra words (e.g. a bigger bundled dictionary) can be added as accepted
+answers without making them playable.
+"""
+import math
+import random
+from collections import Counter
+
+TIERS = ("easy", "medium", "hard", "expert")
+POOL_SIZE = 8           # precomputed scrambles per word
+POOL_ATTEMPTS = 8       # shuffles tried per pool slot before giving up
+
+
+def anagram_key(word: str) -> str:
+    return "".join(sorted(word))
+
+
+def scramble_entropy(word: str) -> float:
+    """log2 of the number of distinct arrangements of the word's letters"""
+    arrangements = math.factorial(len(word))
+    for count in Counter(word).values():
+        arrangements //= math.factorial(count)
+    return math.log2(arrangements)
+
+
+class ScrambleIndex:
+    def __init__(self, words, tiers=TIERS, pool_size: int = POOL_SIZE):
+        # playable words, deduplicated in original order
+        self.words = list(dict.fromkeys(w.upper() for w in words))
+        self._anagrams = {}
+        for word in self.words:
+            self._anagrams.setdefault(anagram_key(word), set()).add(word)
+
+        self.scores = {word: scramble_entropy(word) for word in self.words}
+        self.tiers = self._split_tiers(tiers)
+        self.tier_of = {word: tier for tier, tier_words in self.tiers.items() for word in tier_words}
+
+        self.pool_size = pool_size
+        self._pools = {word: self._build_pool(word) for word in self.words}
+
+    def add_dictionary(self, words):
+        """Accept extra words as answers (they are never dealt as puzzles)"""
+        for word in words:
+            word = word.strip().upper()
+            if word.isalpha():
+                self._anagrams.setdefault(anagram_key(word), set()).add(word)
+        # scrambles that just became valid answers must not be dealt
+        self._pools = {word: self._build_pool(word) for word in self.words}
+
+    def load_dictionary(self, path: str) -> int:
+        with open(path, encoding="utf-8") as f:
+            words = [line for line in f if line.strip()]
+        self.add_dictionary(words)
+        return len(words)
+
+    def is_answer(self, word: str, guess: str) -> bool:
+        """True if guess uses exactly word's letters and is an accepted word"""
+        key = anagram_key(guess)
+        return key == anagram_key(word) and guess in self._anagrams.get(key, ())
+
+    def anagrams(self, word: str) -> set:
+        return self._anagrams.get(anagram_key(word), {word})
+
+    def scramble(self, word: str) -> str:
+        pool = self._pools.get(word) or self._build_pool(word)
+        return random.choice(pool) if pool else word
+
+    def pick(self, tier: str) -> str:
+        return random.choice(self.tiers[tier])
+
+    def _split_tiers(self, tiers) -> dict:
+        ranked = sorted(self.words, key=lambda w: (self.scores[w], w))
+        size = len(ranked)
+        split = {}
+        for i, tier in enumerate(tiers):
+            split[tier] = ranked[i * size // len(tiers):(i + 1) * size // len(tiers)]
+        return split
+
+    def _build_pool(self, word: str) -> tuple:
+        forbidden = self.anagrams(word) | {word}
+        letters = list(word)
+        pool = set()
+        for _ in range(self.pool_size * POOL_ATTEMPTS):
+            random.shuffle(letters)
+            candidate = "".join(letters)
+            if candidate not in forbidden:
+                pool.add(candidate)
+                if len(pool) >= self.pool_size:
+                    break
+        return tuple(pool)
@@ -0,0 +1,160 @@
+"""Crash-safe journal for bets held by in-progress games.
+
+Games keep their state in memory, so a restart mid-game used to lose the
+escrowed bet. Each game now writes one row here when it takes the bet,
+updates it on every transition that changes what the player is owed, and
+deletes it when it settles. Rows left behind by a previous process are
+orphans: recover_sessions() runs once at startup and pays them out.
+
+Per row:
+    escrow   mora taken from the player that has not been paid back yet
+    cashout  what the player would get from cashing out right now; when set,
+             recovery pays this instead of refunding the escrow
+    state    small JSON snapshot of the last transition (for the logs)
+
+Rows are tagged with BOOT_ID so a `greload` never touches sessions that are
+still live in this process.
+"""
+import json
+import uuid
+from datetime import datetime
+
+import aiosqlite
+
+from config import DB_PATH
+from utils.logger import setup_logger
+
+logger = setup_logger("SessionJournal")
+
+# Identifies the running process; sessions from any other boot are orphans
+BOOT_ID = uuid.uuid4().hex[:12]
+
+_initialized = False
+
+
+async def init_session_journal(db=None):
+    """Create the journal table (idempotent)"""
+    global _initialized
+    if _initialized:
+        return
+    sql = """
+        CREATE TABLE IF NOT EXISTS game_sessions (
+            session_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            boot_id TEXT NOT NULL,
+            user_id INTEGER NOT NULL,
+            game TEXT NOT NULL,
+            escrow INTEGER NOT NULL DEFAULT 0,
+            cashout INTEGER,
+            state TEXT,
+            updated_at TEXT NOT NULL
+        )
+    """
+    if db is not None:
+        await db.execute(sql)
+    else:
+        async with aiosqlite.connect(DB_PATH) as conn:
+            await conn.execute(sql)
+            await conn.commit()
+    _initialized = True
+
+
+async def open_session(user_id: int, game: str, escrow: int, cashout: int = None, state: dict = None, db=None) -> int:
+    """Record a bet taken into escrow and return the session id.
+
+    Pass the connection that deducted the bet as db so both land in the same
+    transaction (the caller commits).
+    """
+    params = (BOOT_ID, user_id, game, int(escrow), cashout, json.dumps(state) if state else None, datetime.now().isoformat())
+    sql = """INSERT INTO game_sessions (boot_id, user_id, game, escrow, cashout, state, updated_at)
+             VALUES (?, ?, ?, ?, ?, ?, ?)"""
+    if db is not None:
+        await init_session_journal(db)
+        cursor = await db.execute(sql, params)
+        return cursor.lastrowid
+    await init_session_journal()
+    async with aiosqlite.connect(DB_PATH) as conn:
+        cursor = await conn.execute(sql, params)
+        await conn.commit()
+        return cursor.lastrowid
+
+
+async def checkpoint(session_id: int, escrow: int = None, cashout: int = None, state: dict = None, db=None):
+    """Record a state transition for an open session"""
+    if session_id is None:
+        return
+    sets = ["updated_at = ?"]
+    params = [datetime.now().isoformat()]
+    if escrow is not None:
+        sets.append("escrow = ?")
+        params.append(int(escrow))
+    if cashout is not None:
+        sets.append("cashout = ?")
+        params.append(int(cashout))
+    if state is not None:
+        sets.append("state = ?")
+        params.append(json.dumps(state))
+    params.append(session_id)
+    sql = f"UPDATE game_sessions SET {', '.join(sets)} WHERE session_id = ?"
+    try:
+        if db is not None:
+            await db.execute(sql, params)
+            return
+        async with aiosqlite.connect(DB_PATH) as conn:
+            await conn.execute(sql, params)
+            await conn.commit()
+    except Exception as e:
+        logger.error(f"Failed to checkpoint session {session_id}: {e}")
+
+
+async def close_session(*session_ids, db=None):
+    """Drop settled sessions from the journal"""
+    ids = [(sid,) for sid in session_ids if sid is not None]
+    if not ids:
+        return
+    sql = "DELETE FROM game_sessions WHERE session_id = ?"
+    try:
+        if db is not None:
+            await db.executemany(sql, ids)
+            return
+        async with aiosqlite.connect(DB_PATH) as conn:
+            await conn.executemany(sql, ids)
+            await conn.commit()
+    except Exception as e:
+        logger.error(f"Failed to close sessions {session_ids}: {e}")
+
+
+async def recover_sessions():
+    """Refund or settle every session left open by a previous process.
+
+    Returns a list of (user_id, game, amount, action) for what was paid.
+    """
+    await init_session_journal()
+    recovered = []
+    async with aiosqlite.connect(DB_PATH) as db:
+        await db.execute("BEGIN IMMEDIATE")
+        cursor = await db.execute(
+            "SELECT session_id, user_id, game, escrow, cashout FROM game_sessions WHERE boot_id != ?",
+            (BOOT_ID,)
+        )
+        rows = await cursor.fetchall()
+        for session_id, user_id, game, escrow, cashout in rows:
+            if cashout is not None:
+                amount, action = int(cashout), "settled"
+            else:
+                amount, action = int(escrow), "refunded"
+            if amount > 0:
+                await db.execute("UPDATE users SET mora = mora + ? WHERE user_id = ?", (amount, user_id))
+            await db.execute("DELETE FROM game_sessions WHERE session_id = ?", (session_id,))
+            recovered.append((user_id, game, amount, action))
+        await db.commit()
+
+    for user_id, game, amount, action in recovered:
+        logger.info(f"Recovered {game} session for {user_id}: {action} {amount:,} mora")
+    if recovered:
+        try:
+            from utils.transaction_logger import log_transaction
+            for user_id, game, amount, action in recovered:
+                await log_transaction(user_id, "session_recovery", amount, f"{game} {action} after restart")
+        except Exception as e:
+            logger.error(f"Failed to log recovered sessions: {e}")
+    return recovered
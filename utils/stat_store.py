@@ -0,0 +1,181 @@
+"""Per-player game statistics stored as (user_id, stat_id) -> value rows.
+
+game_stats used to be one wide row per player with a column per stat, so
+every new game meant an ALTER TABLE on a large table, and readers picked
+values out of SELECT * by position. Stats now live in user_stats, a WITHOUT
+ROWID table keyed (user_id, stat_id), and stat_registry maps names to ids.
+A name that is not registered yet is registered on its first write, so
+adding a stat only means using it.
+
+    await add_stats(user_id, {"tower_games": 1, "tower_cashouts": 1})
+    await max_stats(user_id, {"tower_highest_floor": floor})
+    stats = await get_stats(user_id, ("tower_games", "tower_cashouts"))
+
+Each write helper is one executemany of upserts and takes db= to join the
+caller's transaction (the caller commits). Missing stats read as 0.
+
+init_stat_store() migrates the old table once: its columns are copied in
+by name, it is kept as game_stats_legacy, and game_stats becomes a view
+that pivots the store back into one row per player for ad-hoc queries.
+"""
+import re
+
+import aiosqlite
+
+from config import DB_PATH
+
+# Registered in this order on a fresh database, so the game_stats view keeps
+# the old column order
+STATS = (
+    "rps_wins", "rps_plays", "connect4_wins", "connect4_plays",
+    "tictactoe_wins", "tictactoe_plays", "blackjack_wins", "blackjack_plays",
+    "blackjack_naturals", "slots_plays", "slots_jackpots", "coinflip_wins",
+    "coinflip_plays", "coinflip_streak", "mines_wins", "mines_plays", "mines_max_tiles",
+    "scramble_games", "scramble_wins", "scramble_losses", "scramble_streak", "scramble_best_time",
+    "hilo_games", "hilo_cashouts", "hilo_busts", "hilo_best_streak", "hilo_jokers",
+    "tower_games", "tower_cashouts", "tower_traps", "tower_highest_floor", "tower_perfect",
+    "memory_games", "memory_wins", "memory_losses",
+    "multiplayer_games", "total_earned", "max_wallet", "rob_success", "rob_attempts",
+)
+
+_NAME = re.compile(r"^[a-z][a-z0-9_]*$")
+
+UPSERT_SQL = """
+    INSERT INTO user_stats (user_id, stat_id, value) VALUES (?, ?, ?)
+    ON CONFLICT(user_id, stat_id) DO UPDATE SET value = {update}
+"""
+
+_stat_ids = {}      # name -> stat_id, filled from stat_registry
+_ready = False      # init_stat_store has run in this process
+
+
+async def init_stat_store(db):
+    """Create the store, migrate a legacy game_stats table and rebuild the view (the caller commits)"""
+    global _ready
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS stat_registry (
+            stat_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        )""")
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS user_stats (
+            user_id INTEGER NOT NULL,
+            stat_id INTEGER NOT NULL,
+            value NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, stat_id)
+        ) WITHOUT ROWID""")
+    _stat_ids.clear()
+    _ready = True
+    await _resolve(db, STATS, rebuild_view=False)
+
+    async with db.execute("SELECT type FROM sqlite_master WHERE name = 'game_stats'") as cursor:
+        row = await cursor.fetchone()
+    if row and row[0] == "table":
+        async with db.execute("PRAGMA table_info('game_stats')") as cursor:
+            columns = [r[1] for r in await cursor.fetchall() if r[1] != "user_id"]
+        ids = await _resolve(db, columns, rebuild_view=False)
+        for column in columns:
+            # Zero and empty are what a missing row reads as anyway
+            await db.execute(
+                f"INSERT OR IGNORE INTO user_stats (user_id, stat_id, value) "
+                f"SELECT user_id, ?, {column} FROM game_stats "
+                f"WHERE {column} IS NOT NULL AND {column} != 0 AND {column} != ''",
+                (ids[column],)
+            )
+        await db.execute("ALTER TABLE game_stats RENAME TO game_stats_legacy")
+    await _rebuild_view(db)
+
+
+async def _rebuild_view(db):
+    async with db.execute("SELECT stat_id, name FROM stat_registry ORDER BY stat_id") as cursor:
+        registry = await cursor.fetchall()
+    columns = "".join(
+        f",\n    COALESCE(MAX(CASE stat_id WHEN {stat_id} THEN value END), 0) AS {name}"
+        for stat_id, name in registry
+    )
+    await db.execute("DROP VIEW IF EXISTS game_stats")
+    await db.execute(f"CREATE VIEW game_stats AS SELECT user_id{columns}\nFROM user_stats GROUP BY user_id")
+
+
+async def _resolve(db, names, rebuild_view=True) -> dict:
+    """stat_id for each name, registering the ones seen for the first time"""
+    if not _ready:
+        await init_stat_store(db)
+    missing = [name for name in dict.fromkeys(names) if name not in _stat_ids]
+    if missing:
+        for name in missing:
+            if not _NAME.match(name):
+                raise ValueError(f"invalid stat name: {name!r}")
+        cursor = await db.executemany("INSERT OR IGNORE INTO stat_registry (name) VALUES (?)", [(name,) for name in missing])
+        added = cursor.rowcount > 0
+        placeholders = ", ".join("?" * len(missing))
+        async with db.execute(f"SELECT name, stat_id FROM stat_registry WHERE name IN ({placeholders})", missing) as cursor:
+            _stat_ids.update(await cursor.fetchall())
+        if added and rebuild_view:
+            await _rebuild_view(db)
+    return {name: _stat_ids[name] for name in names}
+
+
+async def _write(rows, update: str, db=None):
+    """Upsert (user_id, name, value) rows in one executemany"""
+    rows = list(rows)
+    if not rows:
+        return
+    if db is None:
+        async with aiosqlite.connect(DB_PATH) as db:
+            await _write(rows, update, db)
+            await db.commit()
+        return
+    ids = await _resolve(db, [name for _, name, _ in rows])
+    await db.executemany(
+        UPSERT_SQL.format(update=update),
+        [(user_id, ids[name], value) for user_id, name, value in rows]
+    )
+
+
+async def add_stats_many(rows, db=None):
+    """Add (user_id, name, amount) rows, e.g. both players of a finished match"""
+    await _write(rows, "value + excluded.value", db)
+
+
+async def add_stats(user_id: int, increments: dict, db=None):
+    """Add each amount in {name: amount} to the player's stat"""
+    await add_stats_many(((user_id, name, amount) for name, amount in increments.items()), db)
+
+
+async def max_stats(user_id: int, values: dict, db=None):
+    """Raise each stat to the given value if it is higher (best streak, highest floor)"""
+    await _write(((user_id, name, value) for name, value in values.items()), "MAX(value, excluded.value)", db)
+
+
+async def min_stats(user_id: int, values: dict, db=None):
+    """Lower each stat to the given value if it is lower; the first write sets it (best time)"""
+    await _write(((user_id, name, value) for name, value in values.items()), "MIN(value, excluded.value)", db)
+
+
+async def set_stats(user_id: int, values: dict, db=None):
+    """Overwrite each stat (resetting a streak)"""
+    await _write(((user_id, name, value) for name, value in values.items()), "excluded.value", db)
+
+
+async def get_stats(user_id: int, names=None, db=None) -> dict:
+    """{name: value} for the given stats (0 when never written), or every stat the player has"""
+    if db is None:
+        async with aiosqlite.connect(DB_PATH) as db:
+            return await get_stats(user_id, names, db)
+    query = "SELECT r.name, s.value FROM user_stats s JOIN stat_registry r ON r.stat_id = s.stat_id WHERE s.user_id = ?"
+    params = [user_id]
+    if names is not None:
+        names = list(names)
+        query += f" AND r.name IN ({', '.join('?' * len(names))})"
+        params += names
+    async with db.execute(query, params) as cursor:
+        found = dict(await cursor.fetchall())
+    if names is None:
+        return found
+    return {name: found.get(name, 0) for name in names}
+
+
+async def get_stat(user_id: int, name: str, db=None):
+    return (await get_stats(user_id, (name,), db))[name]
+
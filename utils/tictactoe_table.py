@@ -0,0 +1,127 @@
+"""Perfect-play table for 3x3 TicTacToe.
+
+Every position reachable from the empty board (5,478 of them) is enumerated
+once at import. Each entry stores the game-theoretic outcome for the side to
+move and the value of every legal move, so a bot reply is a single dict lookup.
+
+Boards are lists of 9 cells holding None, 'X' or 'O'. Internally they are
+packed into a base-3 integer key (0 = empty, 1 = X, 2 = O).
+"""
+import random
+
+LINES = (
+    (0, 1, 2),
+    (3, 4, 5),
+    (6, 7, 8),
+    (0, 3, 6),
+    (1, 4, 7),
+    (2, 5, 8),
+    (0, 4, 8),
+    (2, 4, 6),
+)
+
+_CELL = {None: 0, 'X': 1, 'O': 2}
+_MARK = {1: 'X', 2: 'O'}
+_POW3 = tuple(3 ** i for i in range(9))
+
+# name -> chance the bot plays a random legal move instead of a best one
+LEVELS = {
+    "perfect": 0.0,
+    "hard": 0.1,
+    "normal": 0.3,
+    "easy": 0.6,
+}
+DEFAULT_LEVEL = "normal"
+
+
+def encode(board) -> int:
+    return sum(_CELL[v] * _POW3[i] for i, v in enumerate(board))
+
+
+def _winner(cells):
+    for a, b, c in LINES:
+        if cells[a] and cells[a] == cells[b] == cells[c]:
+            return _MARK[cells[a]]
+    if all(cells):
+        return "draw"
+    return None
+
+
+class _Entry:
+    __slots__ = ("winner", "to_move", "outcome", "move_values")
+
+    def __init__(self, winner, to_move, outcome, move_values):
+        # 'X', 'O', 'draw' or None for positions still in play
+        self.winner = winner
+        # 'X' or 'O'
+        self.to_move = to_move
+        # +1 win / 0 draw / -1 loss for the side to move with perfect play
+        self.outcome = outcome
+        # {cell index: outcome for the side to move after playing it}
+        self.move_values = move_values
+
+    @property
+    def best_moves(self):
+        if not self.move_values:
+            return []
+        best = max(self.move_values.values())
+        return [i for i, v in self.move_values.items() if v == best]
+
+
+def _build():
+    table = {}
+
+    def solve(cells, player):
+        key = sum(v * _POW3[i] for i, v in enumerate(cells))
+        entry = table.get(key)
+        if entry is not None:
+            return entry.outcome
+        winner = _winner(cells)
+        if winner is not None:
+            # the previous player made the last move, so the side to move never wins here
+            outcome = 0 if winner == "draw" else -1
+            table[key] = _Entry(winner, _MARK[player], outcome, {})
+            return outcome
+        move_values = {}
+        for i in range(9):
+            if cells[i]:
+                continue
+            cells[i] = player
+            move_values[i] = -solve(cells, 3 - player)
+            cells[i] = 0
+        outcome = max(move_values.values())
+        table[key] = _Entry(None, _MARK[player], outcome, move_values)
+        return outcome
+
+    solve([0] * 9, 1)
+    return table
+
+
+TABLE = _build()
+
+
+def lookup(board):
+    """Return the table entry for `board`, or None if the position is unreachable."""
+    return TABLE.get(encode(board))
+
+
+def winner(board):
+    """'X', 'O', 'draw' or None, read straight from the table."""
+    entry = lookup(board)
+    return entry.winner if entry else None
+
+
+def choose_move(board, level: str = DEFAULT_LEVEL, rng=random):
+    """Pick the bot's move for the side to move on `board`.
+
+    Higher levels play a best move more often; "perfect" never loses.
+    """
+    empties = [i for i, v in enumerate(board) if v is None]
+    if not empties:
+        return None
+    entry = lookup(board)
+    if entry is None or not entry.move_values:
+        return rng.choice(empties)
+    if rng.random() < LEVELS.get(level, LEVELS[DEFAULT_LEVEL]):
+        return rng.choice(empties)
+    return rng.choice(entry.best_moves)
@@ -0,0 +1,244 @@
+"""Shared hierarchical timer wheel for game timeouts.
+
+Games register deadlines here instead of starting a sleeping task (or a
+discord.ui.View timeout task) per game. One background task advances the
+wheel every tick and fires everything that expired in that tick as a single
+batch.
+
+    from utils.timer_wheel import timers
+    timers.schedule(("scramble", user_id), 30, self.game_timeout, user_id)
+    timers.reschedule(("scramble", user_id), 10)
+    timers.cancel(("scramble", user_id))
+
+Keys are any hashable value; scheduling an existing key replaces its timer.
+schedule, cancel and reschedule are O(1). Deadlines are rounded up to the
+next tick (TICK seconds).
+"""
+import asyncio
+import inspect
+
+import discord
+
+from utils.logger import setup_logger
+
+logger = setup_logger("TimerWheel")
+
+TICK = 0.25     # seconds per tick
+SLOTS = 64      # slots per level
+LEVELS = 3      # 64 ticks (16s), 4096 ticks (~17m), 262144 ticks (~18h) per level
+
+
+class _Timer:
+    __slots__ = ("key", "expires", "callback", "args", "slot")
+
+    def __init__(self, key, expires, callback, args):
+        self.key = key
+        self.expires = expires
+        self.callback = callback
+        self.args = args
+        self.slot = None
+
+
+class TimerWheel:
+    def __init__(self, tick: float = TICK, slots: int = SLOTS, levels: int = LEVELS):
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self._wheels = [[set() for _ in range(slots)] for _ in range(levels)]
+        self._timers = {}
+        self._now = 0           # current tick
+        self._origin = None     # loop time of tick 0
+        self._task = None
+        self._wakeup = None
+        self.fired = 0
+
+    def __len__(self):
+        return len(self._timers)
+
+    def __contains__(self, key):
+        return key in self._timers
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def schedule(self, key, delay: float, callback, *args):
+        """Call callback(*args) after delay seconds. Coroutine functions are awaited."""
+        self._ensure_started()
+        self.cancel(key)
+        if not self._timers:
+            # wheel is empty, so it can jump straight to the current tick
+            self._now = max(self._now, int(self._elapsed() // self.tick))
+        timer = _Timer(key, self._deadline(delay), callback, args)
+        self._timers[key] = timer
+        self._insert(timer)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return key
+
+    def cancel(self, key) -> bool:
+        timer = self._timers.pop(key, None)
+        if timer is None:
+            return False
+        timer.slot.discard(timer)
+        timer.slot = None
+        return True
+
+    def reschedule(self, key, delay: float) -> bool:
+        """Move an existing timer to a new deadline; False if it already fired or was cancelled."""
+        timer = self._timers.get(key)
+        if timer is None:
+            return False
+        timer.slot.discard(timer)
+        timer.expires = self._deadline(delay)
+        self._insert(timer)
+        return True
+
+    def remaining(self, key):
+        """Seconds until the timer fires, or None if there is no such timer."""
+        timer = self._timers.get(key)
+        if timer is None:
+            return None
+        return max(0.0, timer.expires * self.tick - self._elapsed())
+
+    def start(self):
+        if self._task is None or self._task.done():
+            loop = asyncio.get_running_loop()
+            self._origin = loop.time() - self._now * self.tick
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _ensure_started(self):
+        if self._task is None or self._task.done():
+            self.start()
+
+    def _elapsed(self) -> float:
+        return asyncio.get_running_loop().time() - self._origin
+
+    def _deadline(self, delay: float) -> int:
+        # round up, and never into the slot of the tick already being processed
+        ticks = int(-(-(self._elapsed() + max(0.0, delay)) // self.tick))
+        return max(ticks, self._now + 1)
+
+    def _insert(self, timer: _Timer):
+        delta = timer.expires - self._now
+        level = 0
+        span = self.slots
+        while delta >= span and level < self.levels - 1:
+            level += 1
+            span *= self.slots
+        granularity = self.slots ** level
+        slot = self._wheels[level][(timer.expires // granularity) % self.slots]
+        slot.add(timer)
+        timer.slot = slot
+
+    def _advance(self):
+        """Move one tick forward and return the timers that are due."""
+        self._now += 1
+        # cascade higher levels down whenever the level below wraps around
+        for level in range(1, self.levels):
+            granularity = self.slots ** level
+            if self._now % granularity:
+                break
+            slot = self._wheels[level][(self._now // granularity) % self.slots]
+            pending = list(slot)
+            slot.clear()
+            for timer in pending:
+                self._insert(timer)
+
+        slot = self._wheels[0][self._now % self.slots]
+        due = []
+        for timer in list(slot):
+            if timer.expires <= self._now:
+                slot.discard(timer)
+                timer.slot = None
+                del self._timers[timer.key]
+                due.append(timer)
+            else:
+                # past the top level's range, go round again
+                slot.discard(timer)
+                self._insert(timer)
+        return due
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                if not self._timers:
+                    # nothing scheduled: sleep until the next schedule() instead of ticking
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                target = int(self._elapsed() // self.tick)
+                due = []
+                while self._now < target:
+                    due.extend(self._advance())
+                if due:
+                    self.fired += len(due)
+                    loop.create_task(self._fire(due))
+                await asyncio.sleep(max(0.0, (self._now + 1) * self.tick - self._elapsed()))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Timer wheel tick failed: {e}", exc_info=True)
+                await asyncio.sleep(self.tick)
+
+    async def _fire(self, due):
+        pending = []
+        for timer in due:
+            try:
+                result = timer.callback(*timer.args)
+                if inspect.isawaitable(result):
+                    pending.append(result)
+            except Exception as e:
+                logger.error(f"Timer {timer.key!r} callback failed: {e}", exc_info=True)
+        if pending:
+            results = await asyncio.gather(*pending, return_exceptions=True)
+            for timer_result in results:
+                if isinstance(timer_result, Exception):
+                    logger.error(f"Timer callback failed: {timer_result}", exc_info=timer_result)
+
+
+# Shared instance used by all cogs
+timers = TimerWheel()
+
+
+class TimedView(discord.ui.View):
+    """discord.ui.View whose timeout lives on the shared timer wheel.
+
+    Drop-in for View(timeout=...): the deadline is pushed back on every
+    interaction, on_timeout runs when it expires and stop() cancels it.
+    """
+
+    def __init__(self, *, timeout: float = 180.0):
+        super().__init__(timeout=None)
+        self._wheel_timeout = timeout
+        if timeout is not None:
+            timers.schedule(self, timeout, self._wheel_expired)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self._wheel_timeout is not None:
+            timers.reschedule(self, self._wheel_timeout)
+        return True
+
+    def stop(self):
+        timers.cancel(self)
+        super().stop()
+
+    async def _wheel_expired(self):
+        if self.is_finished():
+            return
+        super().stop()
+        await self.on_timeout()
@@ -4,23 +4,27 @@ from datetime import datetime
 from config import DB_PATH
 
 
-async def init_transaction_logs():
+async def init_transaction_logs(db=None):
     """Initialize transaction logs table"""
+    sql = """
+        CREATE TABLE IF NOT EXISTS transaction_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            event_type TEXT NOT NULL,
+            amount INTEGER,
+            details TEXT,
+            timestamp TEXT NOT NULL
+        )
+    """
+    if db is not None:
+        await db.execute(sql)
+        return
     async with aiosqlite.connect(DB_PATH) as db:
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS transaction_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                event_type TEXT NOT NULL,
-                amount INTEGER,
-                details TEXT,
-                timestamp TEXT NOT NULL
-            )
-        """)
+        await db.execute(sql)
         await db.commit()
 
 
-async def log_transaction(user_id: int, event_type: str, amount: int = None, details: str = None):
+async def log_transaction(user_id: int, event_type: str, amount: int = None, details: str = None, db=None):
     """Log a transaction event
     
     Args:
@@ -28,14 +32,19 @@ async def log_transaction(user_id: int, event_type: str, amount: int = None, det
         event_type: Type of event (loan, deposit, withdrawal, big_win, rob, etc.)
         amount: Mora amount involved (can be negative for losses)
         details: Additional details about the transaction
+        db: Open connection to write on, so the entry commits (or rolls back)
+            with the caller's transaction; the caller commits
     """
+    sql = """INSERT INTO transaction_logs (user_id, event_type, amount, details, timestamp)
+             VALUES (?, ?, ?, ?, ?)"""
+    params = (user_id, event_type, amount, details, datetime.now().isoformat())
+    if db is not None:
+        await init_transaction_logs(db)
+        await db.execute(sql, params)
+        return
     async with aiosqlite.connect(DB_PATH) as db:
-        await init_transaction_logs()
-        await db.execute(
-            """INSERT INTO transaction_logs (user_id, event_type, amount, details, timestamp)
-               VALUES (?, ?, ?, ?, ?)""",
-            (user_id, event_type, amount, details, datetime.now().isoformat())
-        )
+        await init_transaction_logs(db)
+        await db.execute(sql, params)
         await db.commit()
 
 
@@ -0,0 +1,167 @@
+"""Indexed trivia question bank.
+
+Questions live in data/trivia_questions.json:
+
+    {"question": "...", "answer": "...", "category": "math",
+     "difficulty": "easy", "aliases": ["..."]}
+
+Everything a game needs per message is computed once at load: each question
+carries its accepted answers already normalized (uppercase alphanumerics), so
+checking a guess costs one normalization of the guess and a few string
+compares no matter how big the bank gets.
+
+Questions are indexed by category, difficulty and both. Sampling walks a
+shuffled cursor per (guild, pool), so a guild sees every question in a pool
+once before any repeats; the pool is reshuffled when the cursor runs out.
+
+    from utils.trivia_bank import bank
+    questions = bank.sample(guild_id, 10, category="math")
+    if questions[0].check(message.content): ...
+"""
+import json
+import os
+import random
+import re
+
+from utils.logger import setup_logger
+
+logger = setup_logger("TriviaBank")
+
+BANK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "trivia_questions.json")
+
+# Guesses this long may match part of an answer (TONY for TONYSTARK) or wrap it
+PARTIAL_MATCH_MIN = 4
+
+_NON_ALNUM = re.compile(r"[\W_]+")
+
+
+def normalize_answer(text: str) -> str:
+    """Uppercase alphanumerics only: 'Tony Stark!' -> 'TONYSTARK'"""
+    return _NON_ALNUM.sub("", text).upper()
+
+
+class TriviaQuestion:
+    __slots__ = ("qid", "question", "answer", "category", "difficulty", "accepted")
+
+    def __init__(self, qid, question, answer, category, difficulty, aliases=()):
+        self.qid = qid
+        self.question = question
+        self.answer = answer
+        self.category = category
+        self.difficulty = difficulty
+        # normalized forms of the answer and every alias, primary first
+        accepted = []
+        for form in (answer, *aliases):
+            norm = normalize_answer(form)
+            if norm and norm not in accepted:
+                accepted.append(norm)
+        self.accepted = tuple(accepted)
+
+    def check(self, guess: str) -> bool:
+        return self.matches(normalize_answer(guess))
+
+    def matches(self, normalized_guess: str) -> bool:
+        """Check an already normalized guess against the accepted answers"""
+        if not normalized_guess:
+            return False
+        for correct in self.accepted:
+            if normalized_guess == correct:
+                return True
+            # partial name answers, e.g. TONY vs TONYSTARK
+            if len(normalized_guess) >= PARTIAL_MATCH_MIN and normalized_guess in correct:
+                return True
+            if len(correct) >= PARTIAL_MATCH_MIN and correct in normalized_guess:
+                return True
+        return False
+
+
+class TriviaBank:
+    def __init__(self, questions=()):
+        self.questions = []
+        self._pools = {}        # (category, difficulty) -> list of question ids, None = any
+        self._cursors = {}      # (guild_id, pool key) -> [shuffled ids, position]
+        for q in questions:
+            self.add(q)
+
+    def __len__(self):
+        return len(self.questions)
+
+    @classmethod
+    def load(cls, path: str = BANK_PATH) -> "TriviaBank":
+        with open(path, encoding="utf-8") as f:
+            rows = json.load(f)
+        bank = cls(
+            TriviaQuestion(
+                i, row["question"], row["answer"],
+                row.get("category", "general"), row.get("difficulty", "easy"),
+                row.get("aliases", ()),
+            )
+            for i, row in enumerate(rows)
+        )
+        logger.info(f"Loaded {len(bank)} trivia questions from {path}")
+        return bank
+
+    def add(self, question: TriviaQuestion):
+        question.qid = len(self.questions)
+        self.questions.append(question)
+        for key in (
+            (None, None),
+            (question.category, None),
+            (None, question.difficulty),
+            (question.category, question.difficulty),
+        ):
+            self._pools.setdefault(key, []).append(question.qid)
+        # new questions join each pool on its next reshuffle
+
+    @property
+    def categories(self) -> dict:
+        """Question count per category"""
+        return {cat: len(ids) for (cat, diff), ids in self._pools.items() if cat is not None and diff is None}
+
+    @property
+    def difficulties(self) -> dict:
+        return {diff: len(ids) for (cat, diff), ids in self._pools.items() if cat is None and diff is not None}
+
+    def pool_size(self, category: str = None, difficulty: str = None) -> int:
+        return len(self._pools.get((category, difficulty), ()))
+
+    def sample(self, guild_id, count: int, category: str = None, difficulty: str = None) -> list:
+        """Next `count` questions for a guild without repeating until the pool is used up.
+
+        Returns fewer than `count` only if the pool itself is smaller.
+        """
+        key = (category, difficulty)
+        pool = self._pools.get(key)
+        if not pool:
+            return []
+        count = min(count, len(pool))
+        cursor = self._cursors.get((guild_id, key))
+        if cursor is None:
+            cursor = self._cursors[(guild_id, key)] = [self._shuffled(pool), 0]
+
+        picked = []
+        seen = set()
+        while len(picked) < count:
+            order, pos = cursor
+            if pos >= len(order):
+                # pool used up: reshuffle, keeping this game's questions out of the new order's head
+                order = self._shuffled(pool)
+                order.sort(key=lambda qid: qid in seen)
+                cursor[0], cursor[1], pos = order, 0, 0
+            qid = order[pos]
+            cursor[1] = pos + 1
+            if qid in seen:
+                continue
+            seen.add(qid)
+            picked.append(self.questions[qid])
+        return picked
+
+    @staticmethod
+    def _shuffled(pool) -> list:
+        order = list(pool)
+        random.shuffle(order)
+        return order
+
+
+# Shared instance used by the trivia cog
+bank = TriviaBank.load()